@@ -0,0 +1,122 @@
+"""Entry point for the operator: ``python -m freqtrade_operator``.
+
+With ``LEADER_ELECTION`` set, every replica starts up fully (Kubernetes
+configuration, OpenTelemetry, registered handlers, a pooled API
+connection) and then waits for the Lease; only the holder runs kopf. The
+standby serves the liveness endpoint itself while it waits. A replica that
+loses the Lease stops and exits, to come back as a standby.
+
+The standby runs no watches, so it takes over with empty caches. The state
+store cannot be filled ahead of time: it holds digests of the manifests
+this process wrote, and a leader may die between a write and its record,
+so digests derived from the objects could make the new leader skip a
+write it still owes. The first reconcile of a bot after takeover therefore
+replaces its ConfigMap and Deployment once. The bot registry is rebuilt
+from kopf's initial listing, which delivers every bot and webserver to its
+event handlers; watching them from each standby as well would double the
+watch load on the API server to save that one listing.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import socket
+import sys
+from urllib.parse import urlsplit
+
+import kopf
+from aiohttp import web
+
+from freqtrade_operator.utils.leader import (
+    LEASE_DURATION,
+    RENEW_DEADLINE,
+    RETRY_PERIOD,
+    LeaderElector,
+)
+from freqtrade_operator.utils.scope import kopf_scope
+
+logger = logging.getLogger(__name__)
+
+LIVENESS_ENDPOINT = "http://0.0.0.0:8080/healthz"
+
+
+async def _serve_standby_health(endpoint: str) -> web.AppRunner:
+    """Answer liveness probes until kopf's own health reporter takes over."""
+    url = urlsplit(endpoint)
+
+    async def healthz(request: web.Request) -> web.Response:
+        return web.json_response({"status": "standby"})
+
+    app = web.Application()
+    app.router.add_get(url.path or "/", healthz)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, url.hostname, url.port).start()
+    return runner
+
+
+async def run_elected(elector: LeaderElector, liveness_endpoint: str) -> bool:
+    """Run kopf for as long as this replica holds the Lease.
+
+    Args:
+        elector: Elector of this replica
+        liveness_endpoint: kopf liveness endpoint URL
+
+    Returns:
+        Whether leadership was lost, as opposed to a regular shutdown
+    """
+    health = await _serve_standby_health(liveness_endpoint)
+    try:
+        await elector.acquire()
+    finally:
+        await health.cleanup()
+
+    logger.info(f"Leading as {elector.identity}, starting handlers")
+    stop_flag = asyncio.Event()
+    lost = False
+
+    async def hold() -> None:
+        nonlocal lost
+        await elector.hold()
+        lost = True
+        stop_flag.set()
+
+    holder = asyncio.create_task(hold())
+    try:
+        await kopf.operator(
+            **kopf_scope(),
+            standalone=True,
+            liveness_endpoint=liveness_endpoint,
+            stop_flag=stop_flag,
+        )
+    finally:
+        holder.cancel()
+        if not lost:
+            await asyncio.to_thread(elector.release)
+    return lost
+
+
+def main() -> None:
+    """Run the operator, behind leader election when ``LEADER_ELECTION`` is set."""
+    # Loads the Kubernetes configuration and registers all handlers
+    importlib.import_module("freqtrade_operator.main")
+    liveness_endpoint = os.getenv("LIVENESS_ENDPOINT", LIVENESS_ENDPOINT)
+    if not os.getenv("LEADER_ELECTION"):
+        kopf.run(**kopf_scope(), liveness_endpoint=liveness_endpoint)
+        return
+
+    elector = LeaderElector(
+        name=os.getenv("LEADER_ELECTION_LEASE", "freqtrade-operator"),
+        namespace=os.getenv("POD_NAMESPACE", "default"),
+        identity=os.getenv("POD_NAME", socket.gethostname()),
+        lease_duration=float(os.getenv("LEADER_ELECTION_LEASE_DURATION", LEASE_DURATION)),
+        renew_deadline=float(os.getenv("LEADER_ELECTION_RENEW_DEADLINE", RENEW_DEADLINE)),
+        retry_period=float(os.getenv("LEADER_ELECTION_RETRY_PERIOD", RETRY_PERIOD)),
+    )
+    if asyncio.run(run_elected(elector, liveness_endpoint)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Caching aggregation gateway between FreqUI and bot APIs."""
@@ -0,0 +1,59 @@
+"""Entry point for the gateway: ``python -m freqtrade_operator.gateway``."""
+
+import asyncio
+import logging
+import os
+
+from aiohttp import web
+from kubernetes import config
+
+from freqtrade_operator.gateway.discovery import RegistryDiscovery, ServiceDiscovery
+from freqtrade_operator.gateway.server import create_app
+from freqtrade_operator.utils.bot_api import BotApiClient
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    """Run bot discovery and serve the gateway until cancelled."""
+    try:
+        config.load_incluster_config()
+    except config.ConfigException:
+        config.load_kube_config()
+
+    namespace = os.environ["GATEWAY_NAMESPACE"]
+    port = int(os.getenv("GATEWAY_PORT", "8000"))
+
+    # Prefer the registry published by the operator; fall back to listing
+    # bot Services when running without one
+    registry_path = os.getenv("REGISTRY_PATH")
+    discovery: RegistryDiscovery | ServiceDiscovery
+    if registry_path:
+        discovery = RegistryDiscovery(registry_path)
+    else:
+        discovery = ServiceDiscovery(
+            namespace,
+            label_selector=os.getenv("BOT_LABEL_SELECTOR", "app=freqtrade"),
+        )
+    await asyncio.to_thread(discovery.refresh)
+    discovery_task = asyncio.create_task(discovery.run())
+
+    app = create_app(discovery, BotApiClient(), password=os.getenv("GATEWAY_PASSWORD") or None)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    logger.info(f"Gateway listening on :{port} for bots in {namespace}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        discovery_task.cancel()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
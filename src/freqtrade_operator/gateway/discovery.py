@@ -0,0 +1,133 @@
+"""Bot discovery for the gateway."""
+
+import asyncio
+import base64
+import json
+import logging
+from pathlib import Path
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.utils.bot_api import BotEndpoint, get_bot_api_url
+from freqtrade_operator.utils.manifests import manifest_hash
+
+logger = logging.getLogger(__name__)
+
+
+def read_bot_password(core_v1: client.CoreV1Api, namespace: str, secret_name: str) -> str | None:
+    """Read the API password of a bot from its Secret."""
+    try:
+        secret = core_v1.read_namespaced_secret(name=secret_name, namespace=namespace)
+    except ApiException as e:
+        logger.warning(f"Cannot read API secret {namespace}/{secret_name}: {e.reason}")
+        return None
+    password = (secret.data or {}).get("password")
+    return base64.b64decode(password).decode() if password else None
+
+
+class ServiceDiscovery:
+    """Find bots through their Services and read their API credentials.
+
+    Credentials are only fetched for bots not seen before, so a steady
+    fleet costs one Service list call per refresh.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        label_selector: str = "app=freqtrade",
+        refresh_interval: float = 30.0,
+    ) -> None:
+        self.namespace = namespace
+        self.label_selector = label_selector
+        self.refresh_interval = refresh_interval
+        self.endpoints: dict[str, BotEndpoint] = {}
+        self.version = ""
+
+    def refresh(self) -> None:
+        """List bot Services and rebuild the endpoint map."""
+        core_v1 = client.CoreV1Api()
+        services = core_v1.list_namespaced_service(
+            namespace=self.namespace,
+            label_selector=self.label_selector,
+        )
+
+        endpoints: dict[str, BotEndpoint] = {}
+        for service in services.items:
+            bot = (service.metadata.labels or {}).get("bot", service.metadata.name)
+            port = next((p.port for p in service.spec.ports or [] if p.name == "api"), None)
+            if port is None:
+                continue
+            url = get_bot_api_url(service.metadata.name, self.namespace, port)
+            known = self.endpoints.get(bot)
+            if known is not None and known.url == url and known.password is not None:
+                endpoints[bot] = known
+            else:
+                password = read_bot_password(core_v1, self.namespace, f"{bot}-api")
+                endpoints[bot] = BotEndpoint(bot, self.namespace, url, password)
+
+        if endpoints.keys() != self.endpoints.keys():
+            logger.info(f"Discovered {len(endpoints)} bots in {self.namespace}")
+        self.endpoints = endpoints
+        self.version = manifest_hash({name: e.url for name, e in endpoints.items()})
+
+    async def run(self) -> None:
+        """Refresh the endpoint map periodically until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except ApiException as e:
+                logger.error(f"Bot discovery failed: {e.reason}")
+            await asyncio.sleep(self.refresh_interval)
+
+
+class RegistryDiscovery:
+    """Load bots from the registry document published by the operator.
+
+    Only the small ``version`` file is read on every poll; the document
+    itself is parsed, and new credentials fetched, only when it changes.
+    """
+
+    def __init__(self, path: str, refresh_interval: float = 5.0) -> None:
+        self.path = Path(path)
+        self.refresh_interval = refresh_interval
+        self.endpoints: dict[str, BotEndpoint] = {}
+        self.version = ""
+
+    def refresh(self) -> None:
+        """Reload the registry if its version changed."""
+        try:
+            version = (self.path / "version").read_text().strip()
+        except FileNotFoundError:
+            return
+        if version == self.version:
+            return
+
+        document = json.loads((self.path / "registry.json").read_text())
+        core_v1 = client.CoreV1Api()
+        endpoints: dict[str, BotEndpoint] = {}
+        for entry in document["bots"]:
+            known = self.endpoints.get(entry["name"])
+            if known is not None and known.url == entry["url"] and known.password is not None:
+                endpoints[entry["name"]] = known
+            else:
+                password = read_bot_password(
+                    core_v1, entry["namespace"], entry["credentialsSecret"]
+                )
+                endpoints[entry["name"]] = BotEndpoint(
+                    entry["name"], entry["namespace"], entry["url"], password
+                )
+
+        logger.info(f"Loaded registry {version} with {len(endpoints)} bots")
+        self.endpoints = endpoints
+        self.version = version
+
+    async def run(self) -> None:
+        """Poll the registry version until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except (OSError, ValueError, ApiException) as e:
+                logger.error(f"Failed to load bot registry: {e}")
+            await asyncio.sleep(self.refresh_interval)
@@ -0,0 +1,208 @@
+"""HTTP server fanning FreqUI requests out to bot APIs.
+
+FreqUI adds each bot with ``https://<host>/bots/<bot>`` as its URL and logs
+in with the viewer credentials; the gateway answers the token login and
+refresh calls itself and serves the API reads from its shared cache.
+"""
+
+import base64
+import binascii
+import hmac
+import logging
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Protocol
+
+import aiohttp
+from aiohttp import web
+
+from freqtrade_operator.gateway.tokens import issue_token, signing_key, verify_token
+from freqtrade_operator.utils.bot_api import BotApiClient, BotEndpoint, BotResponse
+from freqtrade_operator.utils.cache import CoalescingCache
+
+logger = logging.getLogger(__name__)
+
+# Read endpoints served from cache, with their TTL in seconds.
+# Every other GET is still coalesced while in flight, but never cached.
+CACHE_TTLS = {
+    "/api/v1/status": 2.0,
+    "/api/v1/profit": 5.0,
+    "/api/v1/trades": 5.0,
+}
+
+
+class BotDirectory(Protocol):
+    """Source of the bots the gateway may talk to."""
+
+    endpoints: Mapping[str, BotEndpoint]
+    version: str
+
+
+DISCOVERY_KEY = web.AppKey("discovery", BotDirectory)
+CLIENT_KEY = web.AppKey("client", BotApiClient)
+CACHE_KEY = web.AppKey("cache", CoalescingCache)
+PASSWORD_KEY = web.AppKey("password", str | None)
+TOKEN_KEY = web.AppKey("token_key", bytes)
+
+
+def _basic_auth(request: web.Request) -> tuple[str, str] | None:
+    """Return login and password of the request's Basic credentials, if any."""
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "basic":
+        return None
+    try:
+        decoded = base64.b64decode(credentials.strip(), validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+    login, colon, password = decoded.partition(":")
+    return (login, password) if colon else None
+
+
+def _bearer_token(request: web.Request) -> str | None:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return token.strip() if scheme.lower() == "bearer" and token else None
+
+
+def _check_auth(request: web.Request, password: str) -> bool:
+    """Accept the viewer password as Basic auth, or an access token from a login."""
+    token = _bearer_token(request)
+    if token is not None:
+        return verify_token(request.app[TOKEN_KEY], token, "access") is not None
+    auth = _basic_auth(request)
+    return auth is not None and hmac.compare_digest(auth[1], password)
+
+
+def _auth_middleware(
+    password: str,
+) -> Callable[[web.Request, Callable[[web.Request], Awaitable[web.StreamResponse]]], Awaitable]:
+    @web.middleware
+    async def middleware(
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        # The token endpoints check their own credentials
+        exempt = (healthz, token_login, token_refresh)
+        if request.match_info.handler not in exempt and not _check_auth(request, password):
+            raise web.HTTPUnauthorized(headers={"WWW-Authenticate": 'Basic realm="freqtrade"'})
+        return await handler(request)
+
+    return middleware
+
+
+def _endpoints(request: web.Request) -> Mapping[str, BotEndpoint]:
+    return request.app[DISCOVERY_KEY].endpoints
+
+
+async def healthz(request: web.Request) -> web.Response:
+    """Liveness endpoint."""
+    return web.json_response({"status": "healthy"})
+
+
+async def list_bots(request: web.Request) -> web.Response:
+    """List bots currently known to the gateway.
+
+    The registry version is sent as ETag, so clients polling with
+    If-None-Match only download the list when it changed.
+    """
+    etag = f'"{request.app[DISCOVERY_KEY].version}"'
+    if request.headers.get("If-None-Match") == etag:
+        raise web.HTTPNotModified(headers={"ETag": etag})
+    return web.json_response(
+        {"bots": [{"name": name, "url": f"/bots/{name}"} for name in sorted(_endpoints(request))]},
+        headers={"ETag": etag},
+    )
+
+
+def _endpoint(request: web.Request) -> BotEndpoint:
+    endpoint = _endpoints(request).get(request.match_info["bot"])
+    if endpoint is None:
+        raise web.HTTPNotFound(text="Unknown bot")
+    return endpoint
+
+
+async def token_login(request: web.Request) -> web.Response:
+    """Log FreqUI in with the viewer credentials, as the bot API's token login does."""
+    _endpoint(request)
+    password = request.app[PASSWORD_KEY]
+    auth = _basic_auth(request)
+    if password is not None and (auth is None or not hmac.compare_digest(auth[1], password)):
+        raise web.HTTPUnauthorized(headers={"WWW-Authenticate": 'Basic realm="freqtrade"'})
+    username = auth[0] if auth is not None else ""
+    key = request.app[TOKEN_KEY]
+    return web.json_response(
+        {
+            "access_token": issue_token(key, "access", username),
+            "refresh_token": issue_token(key, "refresh", username),
+        }
+    )
+
+
+async def token_refresh(request: web.Request) -> web.Response:
+    """Issue a new access token for a refresh token from :func:`token_login`."""
+    _endpoint(request)
+    key = request.app[TOKEN_KEY]
+    token = _bearer_token(request)
+    username = verify_token(key, token, "refresh") if token is not None else None
+    if username is None:
+        raise web.HTTPUnauthorized(headers={"WWW-Authenticate": 'Bearer realm="freqtrade"'})
+    return web.json_response({"access_token": issue_token(key, "access", username)})
+
+
+async def proxy_bot(request: web.Request) -> web.Response:
+    """Serve a bot API GET, from cache or through a shared upstream call."""
+    endpoint = _endpoint(request)
+    path = f"/api/v1/{request.match_info['tail']}"
+    params = dict(sorted(request.query.items()))
+    key = (endpoint.name, path, tuple(params.items()))
+    client = request.app[CLIENT_KEY]
+
+    try:
+        resp: BotResponse = await request.app[CACHE_KEY].get_or_fetch(
+            key,
+            CACHE_TTLS.get(path, 0.0),
+            lambda: client.get(endpoint, path, params),
+            cacheable=lambda r: r.status == 200,
+        )
+    except (aiohttp.ClientError, TimeoutError) as e:
+        logger.warning(f"Upstream request to {endpoint.name}{path} failed: {e}")
+        raise web.HTTPBadGateway(text=f"Bot {endpoint.name} unreachable")
+
+    return web.Response(status=resp.status, body=resp.body, content_type=resp.content_type)
+
+
+def create_app(
+    discovery: BotDirectory,
+    client: BotApiClient,
+    password: str | None = None,
+    cache: CoalescingCache[BotResponse] | None = None,
+) -> web.Application:
+    """Create the gateway application.
+
+    Args:
+        discovery: Directory mapping bot names to their API endpoints
+        client: Pooled bot API client shared by all requests
+        password: Viewer password, checked as Basic auth and at token login
+            (None disables auth)
+        cache: Response cache, a fresh one is created if omitted
+
+    Returns:
+        Configured aiohttp application
+    """
+    middlewares = [_auth_middleware(password)] if password else []
+    app = web.Application(middlewares=middlewares)
+    app[DISCOVERY_KEY] = discovery
+    app[CLIENT_KEY] = client
+    app[CACHE_KEY] = cache if cache is not None else CoalescingCache()
+    app[PASSWORD_KEY] = password
+    app[TOKEN_KEY] = signing_key(password)
+
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/bots", list_bots)
+    app.router.add_post("/bots/{bot}/api/v1/token/login", token_login)
+    app.router.add_post("/bots/{bot}/api/v1/token/refresh", token_refresh)
+    app.router.add_get("/bots/{bot}/api/v1/{tail:.*}", proxy_bot)
+
+    async def close_client(app: web.Application) -> None:
+        await app[CLIENT_KEY].close()
+
+    app.on_cleanup.append(close_client)
+    return app
@@ -0,0 +1,98 @@
+"""JWT bearer tokens for FreqUI sessions through the gateway.
+
+FreqUI logs in to a bot with ``POST /api/v1/token/login`` and Basic auth,
+then sends the returned access token as ``Authorization: Bearer`` and
+renews it with the refresh token. The gateway answers these calls itself,
+with HS256 tokens signed by a key derived from the viewer password, so
+sessions survive gateway restarts and are revoked by rotating the Secret.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from typing import Literal
+
+TokenType = Literal["access", "refresh"]
+
+# Lifetimes match the bot API's own tokens
+ACCESS_TOKEN_TTL = 15 * 60
+REFRESH_TOKEN_TTL = 30 * 24 * 3600
+
+_HEADER = {"alg": "HS256", "typ": "JWT"}
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def signing_key(password: str | None) -> bytes:
+    """Derive the token signing key from the viewer password.
+
+    Without a password a random key is used, valid until the gateway restarts.
+    """
+    if password is None:
+        return secrets.token_bytes(32)
+    return hmac.digest(password.encode(), b"freqtrade-gateway-jwt", hashlib.sha256)
+
+
+def issue_token(key: bytes, token_type: TokenType, username: str, now: float | None = None) -> str:
+    """Create a signed access or refresh token.
+
+    Args:
+        key: Signing key from :func:`signing_key`
+        token_type: ``access`` or ``refresh``
+        username: Identity stored in the token
+        now: Issue time as a Unix timestamp, the current time if omitted
+
+    Returns:
+        Encoded JWT
+    """
+    issued = int(time.time() if now is None else now)
+    ttl = ACCESS_TOKEN_TTL if token_type == "access" else REFRESH_TOKEN_TTL
+    payload = {
+        "identity": {"u": username},
+        "type": token_type,
+        "iat": issued,
+        "exp": issued + ttl,
+    }
+    signing_input = ".".join(
+        _b64encode(json.dumps(part, separators=(",", ":")).encode()) for part in (_HEADER, payload)
+    )
+    signature = hmac.digest(key, signing_input.encode(), hashlib.sha256)
+    return f"{signing_input}.{_b64encode(signature)}"
+
+
+def verify_token(
+    key: bytes, token: str, token_type: TokenType, now: float | None = None
+) -> str | None:
+    """Check a token's signature, type and expiry.
+
+    Args:
+        key: Signing key from :func:`signing_key`
+        token: Encoded JWT
+        token_type: Type the token must have
+        now: Current time as a Unix timestamp, the current time if omitted
+
+    Returns:
+        The username of a valid token, None otherwise
+    """
+    try:
+        header, payload, signature = token.split(".")
+        expected = hmac.digest(key, f"{header}.{payload}".encode(), hashlib.sha256)
+        if not hmac.compare_digest(_b64decode(signature), expected):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+    if not isinstance(claims, dict) or claims.get("type") != token_type:
+        return None
+    if claims.get("exp", 0) <= (time.time() if now is None else now):
+        return None
+    return str(claims.get("identity", {}).get("u", ""))
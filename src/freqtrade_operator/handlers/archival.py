@@ -0,0 +1,96 @@
+"""Report the results of trade-history archival Jobs on their bots."""
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+import kopf
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability.instrumentation import api_call, api_send, instrumented
+from freqtrade_operator.utils.kube import api_client
+
+logger = logging.getLogger(__name__)
+
+# UIDs of finished Jobs already reported, until the Jobs are deleted
+_reported: set[str] = set()
+
+
+def read_job_summary(job_name: str, namespace: str) -> dict[str, Any]:
+    """Return the summary a Job left as its termination message."""
+    pods = api_call(
+        "list",
+        "pod",
+        client.CoreV1Api(api_client()).list_namespaced_pod,
+        namespace=namespace,
+        label_selector=f"job-name={job_name}",
+    )
+    for pod in pods.items:
+        for container in pod.status.container_statuses or []:
+            terminated = container.state.terminated
+            if terminated is not None and terminated.exit_code == 0 and terminated.message:
+                return json.loads(terminated.message)
+    return {}
+
+
+def job_finished(job_status: dict[str, Any]) -> str | None:
+    """Return ``Complete`` or ``Failed`` once a Job has finished, else None."""
+    for condition in job_status.get("conditions") or []:
+        if condition["type"] in ("Complete", "Failed") and condition["status"] == "True":
+            return condition["type"]
+    return None
+
+
+def _report(job_name: str, namespace: str, bot_name: str, job_status: dict[str, Any]) -> None:
+    """Copy the outcome of an archival Job to the bot status."""
+    if job_finished(job_status) == "Complete":
+        archive = {
+            "lastRun": job_status.get("completionTime"),
+            "lastResult": "Succeeded",
+            **read_job_summary(job_name, namespace),
+        }
+    else:
+        archive = {"lastRun": job_status.get("startTime"), "lastResult": "Failed"}
+
+    api_send(
+        "patch",
+        "freqtradebot/status",
+        client.CustomObjectsApi(api_client()).patch_namespaced_custom_object_status,
+        group="trading.freqtrade.io",
+        version="v1alpha1",
+        namespace=namespace,
+        plural="freqtradebots",
+        name=bot_name,
+        body={"status": {"archive": archive}},
+    )
+    logger.info(f"Archival of {namespace}/{bot_name}: {archive}")
+
+
+@kopf.on.event("batch", "v1", "jobs", labels={"app": "freqtrade-archive"})
+@instrumented("FreqtradeBot", "archive-event")
+async def archive_job_event(
+    event: dict[str, Any],
+    status: dict[str, Any],
+    name: str,
+    namespace: str,
+    labels: dict[str, str],
+    meta: dict[str, Any],
+    **kwargs: object,
+) -> None:
+    """Report each archival Job once it has finished."""
+    uid = meta["uid"]
+    if event["type"] == "DELETED":
+        _reported.discard(uid)
+        return
+    if uid in _reported or job_finished(status) is None:
+        return
+
+    try:
+        await asyncio.to_thread(_report, name, namespace, labels["bot"], dict(status))
+    except ApiException as e:
+        if e.status != 404:
+            logger.error(f"Failed to report archival Job {namespace}/{name}: {e.reason}")
+            return
+    _reported.add(uid)
@@ -0,0 +1,279 @@
+"""FreqtradeBotSet handlers: pair-sharded FreqtradeBots running one strategy."""
+
+import asyncio
+import logging
+from typing import Any
+
+import aiohttp
+import kopf
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.gateway.discovery import read_bot_password
+from freqtrade_operator.handlers.freqtradebot import assign_api_port
+from freqtrade_operator.observability.events import event_sink, record_event
+from freqtrade_operator.observability.instrumentation import api_call, api_send, instrumented
+from freqtrade_operator.resources.botset import (
+    BOTSET_LABEL,
+    TEMPLATE_ANNOTATION,
+    create_shard_bot,
+    get_shard_name,
+)
+from freqtrade_operator.utils.bot_api import BotApiClient, BotEndpoint, get_bot_api_url
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.manifests import merge_patch
+from freqtrade_operator.utils.scope import WATCHED_LABELS
+from freqtrade_operator.utils.sharding import assign_pairs, moved_pairs, shard_count
+
+logger = logging.getLogger(__name__)
+
+# Seconds between retries while pairs wait for their trades to close
+PENDING_RETRY_DELAY = 60
+
+BOT_API = {"group": "trading.freqtrade.io", "version": "v1alpha1", "plural": "freqtradebots"}
+
+
+def _owner_references(name: str, uid: str) -> list[dict[str, Any]]:
+    return [
+        {
+            "apiVersion": "trading.freqtrade.io/v1alpha1",
+            "kind": "FreqtradeBotSet",
+            "name": name,
+            "uid": uid,
+            "controller": True,
+            "blockOwnerDeletion": True,
+        }
+    ]
+
+
+async def _fetch_open_pairs(endpoints: list[BotEndpoint]) -> dict[str, set[str] | None]:
+    """Pairs with open trades per bot, or None for bots that could not be asked."""
+    bot_api = BotApiClient()
+
+    async def fetch(endpoint: BotEndpoint) -> set[str] | None:
+        try:
+            trades = await bot_api.get_json(endpoint, "/api/v1/status")
+        except (aiohttp.ClientError, TimeoutError) as e:
+            logger.warning(
+                f"Cannot read open trades of {endpoint.namespace}/{endpoint.name}: {e!r}"
+            )
+            return None
+        return {trade["pair"] for trade in trades}
+
+    try:
+        results = await asyncio.gather(*(fetch(endpoint) for endpoint in endpoints))
+    finally:
+        await bot_api.close()
+    return {endpoint.name: pairs for endpoint, pairs in zip(endpoints, results, strict=True)}
+
+
+def _open_pairs(
+    namespace: str, current: dict[str, list[str]], bots: set[str]
+) -> dict[str, set[str]]:
+    """Pairs of ``bots`` that have open trades, including pairs they no longer list.
+
+    A bot that cannot be asked keeps all its pairs, since moving a pair it
+    still trades would have two bots trading it.
+    """
+    core_v1 = client.CoreV1Api(api_client())
+    endpoints = [
+        BotEndpoint(
+            bot,
+            namespace,
+            get_bot_api_url(bot, namespace, assign_api_port(bot)),
+            read_bot_password(core_v1, namespace, f"{bot}-api"),
+        )
+        for bot in sorted(bots)
+    ]
+    open_pairs = asyncio.run(_fetch_open_pairs(endpoints))
+    return {bot: set(current[bot]) if pairs is None else pairs for bot, pairs in open_pairs.items()}
+
+
+def _reconcile(
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    meta: dict[str, Any],
+    body: Any,
+) -> dict[str, Any]:
+    """Bring the shards of a set in line with its spec.
+
+    Raises:
+        kopf.TemporaryError: If pairs wait for trades to close, or on API errors
+    """
+    template = dict(spec["template"])
+    if "pairlist" in template:
+        raise kopf.PermanentError("Shards trade fixed pair slices; remove template.pairlist")
+
+    universe = list(dict.fromkeys(spec["pairs"]))
+    count = shard_count(len(universe), spec.get("shards"), spec.get("pairsPerShard"))
+    shards = [get_shard_name(name, i) for i in range(count)]
+
+    custom_api = client.CustomObjectsApi(api_client())
+    try:
+        existing = {
+            item["metadata"]["name"]: item
+            for item in api_call(
+                "list",
+                "freqtradebot",
+                custom_api.list_namespaced_custom_object,
+                namespace=namespace,
+                label_selector=f"{BOTSET_LABEL}={name}",
+                **BOT_API,
+            )["items"]
+        }
+        current = {bot: list(item["spec"].get("pairs", [])) for bot, item in existing.items()}
+
+        # Only bots about to lose pairs or be removed are asked for their open trades
+        plan = assign_pairs(universe, current, shards)
+        sources = set(moved_pairs(current, plan).values()) | (current.keys() - set(shards))
+        pinned = _open_pairs(namespace, current, sources) if sources else {}
+        if any(pinned.values()):
+            plan = assign_pairs(universe, current, shards, pinned)
+        # Pinned pairs still to move once their trades have closed
+        pending = sorted(moved_pairs(plan, assign_pairs(universe, plan, shards)))
+
+        labels = dict(meta.get("labels") or {})
+        owner_references = _owner_references(name, meta["uid"])
+        for bot, pairs in plan.items():
+            index = int(bot.rsplit("-", 1)[1])
+            manifest = create_shard_bot(
+                name, namespace, index, template, pairs, labels, owner_references
+            )
+            previous = existing.get(bot)
+            if previous is None:
+                api_send(
+                    "create",
+                    "freqtradebot",
+                    custom_api.create_namespaced_custom_object,
+                    namespace=namespace,
+                    body=manifest,
+                    **BOT_API,
+                )
+                logger.info(f"Created shard {namespace}/{bot} with {len(pairs)} pairs")
+                continue
+            annotations = previous["metadata"].get("annotations") or {}
+            if (
+                previous["spec"].get("pairs") == pairs
+                and annotations.get(TEMPLATE_ANNOTATION)
+                == manifest["metadata"]["annotations"][TEMPLATE_ANNOTATION]
+            ):
+                continue
+            # Fields dropped from the template are removed from the shard too;
+            # fields the CRD defaults are removed and defaulted again
+            api_send(
+                "patch",
+                "freqtradebot",
+                custom_api.patch_namespaced_custom_object,
+                name=bot,
+                namespace=namespace,
+                body={
+                    "metadata": {
+                        "labels": manifest["metadata"]["labels"],
+                        "annotations": manifest["metadata"]["annotations"],
+                    },
+                    "spec": merge_patch(previous["spec"], manifest["spec"]),
+                },
+                **BOT_API,
+            )
+            logger.info(f"Updated shard {namespace}/{bot} to {len(pairs)} pairs")
+
+        for bot in existing.keys() - plan.keys():
+            try:
+                api_send(
+                    "delete",
+                    "freqtradebot",
+                    custom_api.delete_namespaced_custom_object,
+                    name=bot,
+                    namespace=namespace,
+                    **BOT_API,
+                )
+                logger.info(f"Deleted shard {namespace}/{bot}")
+            except ApiException as e:
+                if e.status != 404:
+                    raise
+
+        status = {
+            "shards": count,
+            "pairs": len(universe),
+            "draining": sorted(plan.keys() - set(shards)),
+            "pendingPairs": pending,
+        }
+        api_send(
+            "patch",
+            "freqtradebotset/status",
+            custom_api.patch_namespaced_custom_object_status,
+            group="trading.freqtrade.io",
+            version="v1alpha1",
+            namespace=namespace,
+            plural="freqtradebotsets",
+            name=name,
+            body={"status": status},
+        )
+    except ApiException as e:
+        logger.error(f"Failed to reconcile shards of {name}: {e}")
+        record_event(body, "ReconcileFailed", str(e.reason), type="Warning")
+        raise kopf.TemporaryError(f"Failed to reconcile shards: {e}", delay=15)
+
+    if pending:
+        record_event(
+            body,
+            "PairsPending",
+            f"{len(pending)} pairs wait for their open trades to close before moving",
+        )
+        raise kopf.TemporaryError(
+            f"{len(pending)} pairs have open trades", delay=PENDING_RETRY_DELAY
+        )
+    if status["draining"]:
+        # Removed shards with open trades only on pairs dropped from the set
+        record_event(
+            body,
+            "ShardsDraining",
+            f"{len(status['draining'])} removed shards wait for their open trades to close",
+        )
+        raise kopf.TemporaryError(
+            f"Removed shards {', '.join(status['draining'])} have open trades",
+            delay=PENDING_RETRY_DELAY,
+        )
+
+    record_event(body, "Sharded", f"{len(universe)} pairs over {count} shards")
+    return status
+
+
+@kopf.on.create("trading.freqtrade.io", "v1alpha1", "freqtradebotsets", labels=WATCHED_LABELS)
+@instrumented("FreqtradeBotSet", "create")
+def create_botset(
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    meta: dict[str, Any],
+    **kwargs: object,
+) -> dict[str, str]:
+    """Create the shards of a FreqtradeBotSet."""
+    logger.info(f"Creating FreqtradeBotSet: {namespace}/{name}")
+    status = _reconcile(spec, name, namespace, meta, kwargs.get("body"))
+    return {"message": f"FreqtradeBotSet {name} created with {status['shards']} shards"}
+
+
+@kopf.on.update("trading.freqtrade.io", "v1alpha1", "freqtradebotsets", labels=WATCHED_LABELS)
+@instrumented("FreqtradeBotSet", "update")
+def update_botset(
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    meta: dict[str, Any],
+    **kwargs: object,
+) -> dict[str, str]:
+    """Rebalance pairs over the shards after a change of universe, count or template."""
+    logger.info(f"Updating FreqtradeBotSet: {namespace}/{name}")
+    status = _reconcile(spec, name, namespace, meta, kwargs.get("body"))
+    return {"message": f"FreqtradeBotSet {name} updated to {status['shards']} shards"}
+
+
+@kopf.on.delete("trading.freqtrade.io", "v1alpha1", "freqtradebotsets", labels=WATCHED_LABELS)
+@instrumented("FreqtradeBotSet", "delete")
+def delete_botset(name: str, namespace: str, **kwargs: object) -> dict[str, str]:
+    """Handle FreqtradeBotSet deletion; shards go with their owner."""
+    logger.info(f"Deleting FreqtradeBotSet: {namespace}/{name}")
+    event_sink.forget(namespace, "FreqtradeBotSet", name)
+    return {"message": f"FreqtradeBotSet {name} deleted"}
@@ -0,0 +1,275 @@
+"""Watch-driven management of the FreqAI training workers shared by bots."""
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+import aiohttp
+import kopf
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.gateway.discovery import read_bot_password
+from freqtrade_operator.handlers.archival import job_finished, read_job_summary
+from freqtrade_operator.handlers.freqtradebot import assign_api_port
+from freqtrade_operator.jobs.training import create_training_cronjob
+from freqtrade_operator.observability.instrumentation import (
+    api_send,
+    instrumented,
+    reconcile_span,
+)
+from freqtrade_operator.resources.configmap import generate_freqtrade_config
+from freqtrade_operator.resources.freqai import (
+    create_models_pvc,
+    create_training_config,
+    create_training_configmap,
+    freqai_enabled,
+    get_training_key,
+    get_training_name,
+)
+from freqtrade_operator.utils.bot_api import BotApiClient, BotEndpoint, get_bot_api_url
+from freqtrade_operator.utils.kube import MERGE_PATCH, api_client
+from freqtrade_operator.utils.manifests import manifest_hash
+from freqtrade_operator.utils.registry import ObjectKey
+from freqtrade_operator.utils.scope import in_scope
+
+logger = logging.getLogger(__name__)
+
+# Delay before reconciling, so the initial listing at startup renders each
+# training worker once for all its bots instead of once per bot
+RECONCILE_DELAY = 1.0
+
+# (namespace, training key) -> names of bots sharing its models
+trained_bots: dict[ObjectKey, set[str]] = {}
+# (namespace, bot) -> training key and spec of the bot
+_bots: dict[ObjectKey, tuple[str, dict[str, Any]]] = {}
+_claims: set[str] = set()
+_applied: dict[ObjectKey, str] = {}
+_pending: dict[ObjectKey, asyncio.TimerHandle] = {}
+_locks: dict[ObjectKey, asyncio.Lock] = {}
+# UIDs of finished training Jobs already handled, until the Jobs are deleted
+_reported: set[str] = set()
+
+
+def _ensure_claim(namespace: str) -> None:
+    """Create the shared model volume of a namespace once.
+
+    The claim is kept when the last FreqAI bot goes, so models survive.
+    """
+    if namespace in _claims:
+        return
+    try:
+        api_send(
+            "create",
+            "persistentvolumeclaim",
+            client.CoreV1Api(api_client()).create_namespaced_persistent_volume_claim,
+            namespace=namespace,
+            body=create_models_pvc(namespace),
+        )
+    except ApiException as e:
+        if e.status != 409:
+            raise
+    _claims.add(namespace)
+
+
+def _render(namespace: str, key: str) -> list[dict[str, Any]]:
+    """Render the ConfigMap and CronJob training the models of one key."""
+    bots = sorted(trained_bots[(namespace, key)])
+    # Bots with one key agree on everything the models depend on
+    representative = bots[0]
+    spec = _bots[(namespace, representative)][1]
+    pairs = sorted({pair for bot in bots for pair in _bots[(namespace, bot)][1].get("pairs", [])})
+    bot_config = generate_freqtrade_config(
+        representative, namespace, spec, assign_api_port(representative), "sqlite://"
+    )
+    config_json = json.dumps(create_training_config(bot_config, spec, pairs), indent=2)
+    return [
+        create_training_configmap(key, namespace, config_json),
+        create_training_cronjob(key, namespace, spec),
+    ]
+
+
+def _reconcile(namespace: str, key: str) -> None:
+    """Create, update or remove the training worker of one training key."""
+    core_v1 = client.CoreV1Api(api_client())
+    batch_v1 = client.BatchV1Api(api_client())
+    name = get_training_name(key)
+
+    if not trained_bots.get((namespace, key)):
+        for resource, delete in (
+            ("cronjob", batch_v1.delete_namespaced_cron_job),
+            ("configmap", core_v1.delete_namespaced_config_map),
+        ):
+            try:
+                api_send("delete", resource, delete, name=name, namespace=namespace)
+            except ApiException as e:
+                if e.status != 404:
+                    raise
+        if _applied.pop((namespace, key), None) is not None:
+            logger.info(f"Deleted unused FreqAI training worker {namespace}/{name}")
+        return
+
+    manifests = _render(namespace, key)
+    digest = manifest_hash(manifests)
+    if _applied.get((namespace, key)) == digest:
+        return
+    _ensure_claim(namespace)
+    configmap, cronjob = manifests
+    for manifest, patch, create in (
+        (configmap, core_v1.patch_namespaced_config_map, core_v1.create_namespaced_config_map),
+        (cronjob, batch_v1.patch_namespaced_cron_job, batch_v1.create_namespaced_cron_job),
+    ):
+        try:
+            api_send(
+                "patch",
+                manifest["kind"].lower(),
+                patch,
+                name=name,
+                namespace=namespace,
+                body=manifest,
+                _content_type=MERGE_PATCH,
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            api_send("create", manifest["kind"].lower(), create, namespace=namespace, body=manifest)
+            if manifest is cronjob:
+                _start_initial_training(namespace, cronjob)
+    _applied[(namespace, key)] = digest
+    logger.info(
+        f"FreqAI training worker {namespace}/{name} trains for "
+        f"{len(trained_bots[(namespace, key)])} bots"
+    )
+
+
+def _start_initial_training(namespace: str, cronjob: dict[str, Any]) -> None:
+    """Run a new training worker right away, as its bots wait for their first models."""
+    template = cronjob["spec"]["jobTemplate"]
+    job = {
+        "apiVersion": "batch/v1",
+        "kind": "Job",
+        "metadata": {
+            "name": f"{cronjob['metadata']['name']}-initial",
+            "namespace": namespace,
+            "labels": template["metadata"]["labels"],
+        },
+        "spec": template["spec"],
+    }
+    try:
+        api_send(
+            "create",
+            "job",
+            client.BatchV1Api(api_client()).create_namespaced_job,
+            namespace=namespace,
+            body=job,
+        )
+    except ApiException as e:
+        if e.status != 409:
+            raise
+
+
+async def _flush(key: ObjectKey) -> None:
+    _pending.pop(key, None)
+    async with _locks.setdefault(key, asyncio.Lock()):
+        try:
+            with reconcile_span("FreqAITraining", "reconcile", *key):
+                await asyncio.to_thread(_reconcile, *key)
+        except ApiException as e:
+            logger.error(f"Failed to reconcile FreqAI training for {key[0]}/{key[1]}: {e.reason}")
+            _schedule_reconcile({key}, delay=15.0)
+
+
+def _schedule_reconcile(keys: set[ObjectKey], delay: float = RECONCILE_DELAY) -> None:
+    loop = asyncio.get_running_loop()
+    for key in keys:
+        if key not in _pending:
+            _pending[key] = loop.call_later(delay, lambda key=key: asyncio.create_task(_flush(key)))
+
+
+@kopf.on.event("trading.freqtrade.io", "v1alpha1", "freqtradebots")
+@instrumented("FreqtradeBot", "freqai-event")
+async def freqai_bot_event(
+    event: dict[str, Any],
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    labels: dict[str, str],
+    **kwargs: object,
+) -> None:
+    """Track which bots share the models of which training key."""
+    current = None
+    if event["type"] != "DELETED" and in_scope(labels) and freqai_enabled(spec):
+        current = (get_training_key(spec), dict(spec))
+
+    previous = _bots.get((namespace, name))
+    if previous == current:
+        return
+
+    affected = set()
+    if previous is not None:
+        trained_bots[(namespace, previous[0])].discard(name)
+        affected.add((namespace, previous[0]))
+        del _bots[(namespace, name)]
+    if current is not None:
+        trained_bots.setdefault((namespace, current[0]), set()).add(name)
+        affected.add((namespace, current[0]))
+        _bots[(namespace, name)] = current
+    _schedule_reconcile(affected)
+
+
+async def _reload_bots(namespace: str, bots: list[str]) -> None:
+    """Have bots reload their config, and with it the newly trained models."""
+    core_v1 = client.CoreV1Api(api_client())
+    endpoints = [
+        BotEndpoint(
+            bot,
+            namespace,
+            get_bot_api_url(bot, namespace, assign_api_port(bot)),
+            await asyncio.to_thread(read_bot_password, core_v1, namespace, f"{bot}-api"),
+        )
+        for bot in bots
+    ]
+    bot_api = BotApiClient()
+    try:
+        results = await asyncio.gather(
+            *(bot_api.post(endpoint, "/api/v1/reload_config") for endpoint in endpoints),
+            return_exceptions=True,
+        )
+    finally:
+        await bot_api.close()
+    for endpoint, result in zip(endpoints, results, strict=True):
+        if isinstance(result, aiohttp.ClientError | TimeoutError):
+            logger.warning(f"Failed to reload {namespace}/{endpoint.name}: {result!r}")
+        elif isinstance(result, BaseException):
+            raise result
+
+
+@kopf.on.event("batch", "v1", "jobs", labels={"app": "freqai-train"})
+@instrumented("FreqtradeBot", "freqai-train-event")
+async def training_job_event(
+    event: dict[str, Any],
+    status: dict[str, Any],
+    name: str,
+    namespace: str,
+    labels: dict[str, str],
+    meta: dict[str, Any],
+    **kwargs: object,
+) -> None:
+    """Reload the bots of a training key once a run has trained new models."""
+    uid = meta["uid"]
+    if event["type"] == "DELETED":
+        _reported.discard(uid)
+        return
+    if uid in _reported or job_finished(status) is None:
+        return
+    _reported.add(uid)
+
+    if job_finished(status) == "Failed":
+        logger.warning(f"FreqAI training Job {namespace}/{name} failed")
+        return
+    summary = await asyncio.to_thread(read_job_summary, name, namespace)
+    bots = sorted(trained_bots.get((namespace, labels["training-key"]), ()))
+    logger.info(f"FreqAI training Job {namespace}/{name}: {summary}")
+    if summary.get("trainedPairs") and bots:
+        await _reload_bots(namespace, bots)
@@ -1,20 +1,53 @@
 """FreqtradeBot resource handlers."""
 
 import logging
-import random
-import string
+import os
+import time
+import zlib
 from typing import Any
 
 import kopf
 from kubernetes import client
 from kubernetes.client.rest import ApiException
 
+from freqtrade_operator.jobs.archival import create_archival_cronjob, get_archival_cronjob_name
+from freqtrade_operator.jobs.migration import (
+    SQLITE_URL,
+    create_migration_job,
+    get_migration_job_name,
+)
+from freqtrade_operator.observability.events import event_sink, record_event
+from freqtrade_operator.observability.instrumentation import (
+    api_call,
+    api_send,
+    instrumented,
+    operator_metrics,
+)
+from freqtrade_operator.observability.rollout import rollouts, traced_rollout
 from freqtrade_operator.resources.configmap import create_configmap
 from freqtrade_operator.resources.database import (
     create_database,
     get_database_connection_string,
 )
-from freqtrade_operator.resources.deployment import create_deployment
+from freqtrade_operator.resources.deployment import (
+    create_data_pvc,
+    create_deployment,
+    create_service,
+)
+from freqtrade_operator.resources.pooler import pooler_enabled
+from freqtrade_operator.resources.producers import (
+    WS_TOKEN_KEY,
+    consumed_producers,
+    get_producer_host,
+    producer_enabled,
+)
+from freqtrade_operator.utils.debounce import MAX_DELAY, WINDOW, Debouncer
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.manifests import manifest_hash
+from freqtrade_operator.utils.rightsizing import applied_resources
+from freqtrade_operator.utils.scope import WATCHED_LABELS
+from freqtrade_operator.utils.secrets import generate_random_secret
+from freqtrade_operator.utils.state import BotRecord, BotStateStore
 
 logger = logging.getLogger(__name__)
 
@@ -22,21 +55,285 @@ logger = logging.getLogger(__name__)
 API_PORT_BASE = 8080
 API_PORT_MAX = 8180
 
+bot_state = BotStateStore()
 
-def generate_random_secret(length: int = 32) -> str:
-    """Generate a random secret string."""
-    return "".join(random.choices(string.ascii_letters + string.digits, k=length))
+# Bursts of edits to one bot are reconciled once, at their latest generation
+update_debouncer = Debouncer(
+    window=float(os.getenv("RECONCILE_DEBOUNCE_WINDOW", WINDOW)),
+    max_delay=float(os.getenv("RECONCILE_MAX_DELAY", MAX_DELAY)),
+)
 
 
 def assign_api_port(name: str) -> int:
     """Assign a unique API port based on bot name hash."""
-    # Simple port assignment based on name hash
-    name_hash = abs(hash(name))
+    # crc32 rather than hash(): str hashes are salted per process, and the
+    # port must stay the same across operator restarts and replicas
+    name_hash = zlib.crc32(name.encode())
     port_offset = name_hash % (API_PORT_MAX - API_PORT_BASE)
     return API_PORT_BASE + port_offset
 
 
-@kopf.on.create("trading.freqtrade.io", "v1alpha1", "freqtradebots")
+def _create_bot_database(
+    name: str, namespace: str, cluster_name: str, owner_references: list[dict[str, Any]]
+) -> None:
+    """Create the CNPG Database of a bot, if it does not exist yet."""
+    custom_api = client.CustomObjectsApi(api_client())
+    try:
+        api_send(
+            "create",
+            "database",
+            custom_api.create_namespaced_custom_object,
+            group="postgresql.cnpg.io",
+            version="v1",
+            namespace=namespace,
+            plural="databases",
+            body=create_database(name, namespace, cluster_name, owner_references),
+        )
+        logger.info(f"Created database {name.replace('-', '_')} for {name}")
+    except ApiException as e:
+        if e.status != 409:
+            raise
+
+
+def _scale_bot(name: str, namespace: str, replicas: int) -> None:
+    apps_v1 = client.AppsV1Api(api_client())
+    api_send(
+        "patch",
+        "deployment",
+        apps_v1.patch_namespaced_deployment_scale,
+        name=name,
+        namespace=namespace,
+        body={"spec": {"replicas": replicas}},
+    )
+
+
+def _reconcile_archival(
+    name: str,
+    namespace: str,
+    spec: dict[str, Any],
+    db_url: str,
+    owner_references: list[dict[str, Any]],
+    body: Any,
+) -> None:
+    """Create or replace the archival CronJob of a bot, or remove it when disabled."""
+    batch_v1 = client.BatchV1Api(api_client())
+    cronjob_name = get_archival_cronjob_name(name)
+    archival_config = spec.get("archival", {})
+
+    if not archival_config.get("enabled", False):
+        try:
+            api_send(
+                "delete",
+                "cronjob",
+                batch_v1.delete_namespaced_cron_job,
+                name=cronjob_name,
+                namespace=namespace,
+            )
+            logger.info(f"Removed archival CronJob for {name}")
+        except ApiException as e:
+            if e.status != 404:
+                raise
+        return
+
+    cluster_name = None
+    if db_url != SQLITE_URL:
+        cluster_name = spec["database"].get("postgresql", {}).get("clusterName", "freqtrade-db")
+    cronjob_dict = create_archival_cronjob(
+        name, namespace, archival_config, db_url, cluster_name, owner_references
+    )
+    kopf.adopt(cronjob_dict, owner=body)
+    try:
+        api_send(
+            "replace",
+            "cronjob",
+            batch_v1.replace_namespaced_cron_job,
+            name=cronjob_name,
+            namespace=namespace,
+            body=cronjob_dict,
+        )
+    except ApiException as e:
+        if e.status != 404:
+            raise
+        api_send(
+            "create",
+            "cronjob",
+            batch_v1.create_namespaced_cron_job,
+            namespace=namespace,
+            body=cronjob_dict,
+        )
+    logger.info(f"Reconciled archival CronJob for {name}")
+
+
+def _migrate_to_postgresql(
+    name: str,
+    namespace: str,
+    cluster_name: str,
+    db_url: str,
+    owner_references: list[dict[str, Any]],
+    status: dict[str, Any],
+    patch: kopf.Patch,
+    body: Any,
+) -> None:
+    """Move a bot's trades from SQLite to its PostgreSQL database.
+
+    Runs as a sequence of kopf retries, so no worker is held while the
+    copy runs. The bot keeps trading until its Database is ready; only then
+    is it stopped and the migration Job started. Returns once the Job has
+    copied and verified every table, or at once if an earlier attempt did;
+    the caller then cuts the bot over.
+
+    Raises:
+        kopf.TemporaryError: While the migration is still in progress
+        kopf.PermanentError: If the copy or its verification failed
+    """
+    migration = dict(status.get("migration") or {})
+    job_name = get_migration_job_name(name)
+    batch_v1 = client.BatchV1Api(api_client())
+    custom_api = client.CustomObjectsApi(api_client())
+
+    if migration.get("phase") == "Completed":
+        # A retry after the copy, e.g. when a later step of the handler failed
+        return
+    if migration.get("phase") == "Failed":
+        # A new attempt: drop the failed Job so it can be created again
+        try:
+            api_send(
+                "delete",
+                "job",
+                batch_v1.delete_namespaced_job,
+                name=job_name,
+                namespace=namespace,
+                propagation_policy="Background",
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise
+        migration = {}
+
+    if "pausedAt" not in migration:
+        _create_bot_database(name, namespace, cluster_name, owner_references)
+        database = api_call(
+            "get",
+            "database",
+            custom_api.get_namespaced_custom_object,
+            group="postgresql.cnpg.io",
+            version="v1",
+            namespace=namespace,
+            plural="databases",
+            name=f"{name}-db",
+        )
+        if not database.get("status", {}).get("applied"):
+            patch.status["migration"] = {"phase": "WaitingForDatabase", "job": job_name}
+            raise kopf.TemporaryError(f"Waiting for database of {name}", delay=10)
+
+        # Trading pauses from here until the cut-over
+        _scale_bot(name, namespace, 0)
+        migration = {"phase": "Copying", "job": job_name, "pausedAt": time.time()}
+        patch.status["migration"] = migration
+        record_event(body, "MigrationStarted", "Stopped to migrate trades to PostgreSQL")
+
+    job = create_migration_job(name, namespace, cluster_name, db_url, owner_references)
+    try:
+        api_send("create", "job", batch_v1.create_namespaced_job, namespace=namespace, body=job)
+    except ApiException as e:
+        if e.status != 409:
+            raise
+
+    job_status = (
+        api_call(
+            "get", "job", batch_v1.read_namespaced_job_status, name=job_name, namespace=namespace
+        ).status
+        or client.V1JobStatus()
+    )
+    paused = time.time() - migration["pausedAt"]
+    if job_status.failed:
+        _scale_bot(name, namespace, 1)
+        patch.status["migration"] = {**migration, "phase": "Failed"}
+        record_event(
+            body, "MigrationFailed", f"Restarted on SQLite; see Job {job_name}", type="Warning"
+        )
+        raise kopf.PermanentError(
+            f"Migration of {name} failed, bot restarted on SQLite; see Job {job_name}"
+        )
+    if not job_status.succeeded:
+        raise kopf.TemporaryError(f"Migrating {name}, paused for {paused:.0f}s", delay=5)
+
+    patch.status["migration"] = {
+        "phase": "Completed",
+        "job": job_name,
+        "pausedSeconds": round(paused),
+    }
+    record_event(body, "Migrated", f"Trades copied and verified; paused {paused:.0f}s")
+
+
+def _resolve_producers(
+    name: str, namespace: str, spec: dict[str, Any], body: Any
+) -> dict[str, tuple[str, int]]:
+    """Look up Service host and API port of every producer a bot consumes from.
+
+    Raises:
+        kopf.TemporaryError: If a producer does not exist (yet) or is not a producer
+    """
+    producers: dict[str, tuple[str, int]] = {}
+    core_v1 = client.CoreV1Api(api_client())
+    custom_api = client.CustomObjectsApi(api_client())
+    for producer in consumed_producers(spec):
+        if producer == name:
+            raise kopf.PermanentError(f"{name} cannot consume from itself")
+        try:
+            producer_bot = api_call(
+                "get",
+                "freqtradebot",
+                custom_api.get_namespaced_custom_object,
+                group="trading.freqtrade.io",
+                version="v1alpha1",
+                namespace=namespace,
+                plural="freqtradebots",
+                name=producer,
+            )
+            service = api_call(
+                "get",
+                "service",
+                core_v1.read_namespaced_service,
+                name=producer,
+                namespace=namespace,
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            producer_bot = service = None
+        port = None
+        if service is not None:
+            port = next((p.port for p in service.spec.ports or [] if p.name == "api"), None)
+        if producer_bot is None or port is None or not producer_enabled(producer_bot["spec"]):
+            record_event(body, "ProducerPending", f"Waiting for producer {producer}", "Warning")
+            raise kopf.TemporaryError(f"Producer {producer} of {name} is not ready", delay=15)
+        producers[producer] = (get_producer_host(producer, namespace), port)
+    return producers
+
+
+def _ensure_ws_token(name: str, namespace: str) -> None:
+    """Add a websocket token to the API secret of a bot created without one."""
+    core_v1 = client.CoreV1Api(api_client())
+    secret = api_call(
+        "get", "secret", core_v1.read_namespaced_secret, name=f"{name}-api", namespace=namespace
+    )
+    if WS_TOKEN_KEY in (secret.data or {}):
+        return
+    api_send(
+        "patch",
+        "secret",
+        core_v1.patch_namespaced_secret,
+        name=f"{name}-api",
+        namespace=namespace,
+        body={"stringData": {WS_TOKEN_KEY: generate_random_secret(32)}},
+    )
+    logger.info(f"Added websocket token to API secret of {name}")
+
+
+@kopf.on.create("trading.freqtrade.io", "v1alpha1", "freqtradebots", labels=WATCHED_LABELS)
+@traced_rollout
+@instrumented("FreqtradeBot", "create")
 def create_freqtradebot(
     spec: dict[str, Any],
     name: str,
@@ -53,8 +350,8 @@ def create_freqtradebot(
         return {"message": "Operator dry-run mode - validation only"}
 
     # Create Kubernetes API clients
-    core_v1 = client.CoreV1Api()
-    apps_v1 = client.AppsV1Api()
+    core_v1 = client.CoreV1Api(api_client())
+    apps_v1 = client.AppsV1Api(api_client())
 
     # Owner reference for garbage collection
     owner_references = [
@@ -68,6 +365,9 @@ def create_freqtradebot(
         }
     ]
 
+    # Consumers need their producers' Services before anything is created
+    producers = _resolve_producers(name, namespace, spec, kwargs.get("body"))
+
     try:
         # 1. Create API server secret
         api_secret_dict = {
@@ -80,10 +380,17 @@ def create_freqtradebot(
             "stringData": {
                 "password": generate_random_secret(16),
                 "jwt-secret": generate_random_secret(32),
+                WS_TOKEN_KEY: generate_random_secret(32),
             },
         }
         kopf.adopt(api_secret_dict, owner=kwargs.get("body"))
-        core_v1.create_namespaced_secret(namespace=namespace, body=api_secret_dict)
+        api_send(
+            "create",
+            "secret",
+            core_v1.create_namespaced_secret,
+            namespace=namespace,
+            body=api_secret_dict,
+        )
         logger.info(f"Created API secret for {name}")
 
         # 2. Configure database
@@ -96,55 +403,40 @@ def create_freqtradebot(
             cluster_name = pg_config.get("clusterName", "freqtrade-db")
             database_name = name.replace("-", "_")
 
-            db_resource = create_database(name, namespace, cluster_name, owner_references)
-            custom_api = client.CustomObjectsApi()
-            custom_api.create_namespaced_custom_object(
-                group="postgresql.cnpg.io",
-                version="v1",
-                namespace=namespace,
-                plural="databases",
-                body=db_resource,
+            _create_bot_database(name, namespace, cluster_name, owner_references)
+            db_url = get_database_connection_string(
+                cluster_name, namespace, database_name, pooled=pooler_enabled(db_config)
             )
-            logger.info(f"Created database {database_name} for {name}")
-            db_url = get_database_connection_string(cluster_name, namespace, database_name)
         else:
-            db_url = "sqlite:////freqtrade/user_data/tradesv3.sqlite"
+            db_url = SQLITE_URL
             logger.info(f"Using SQLite database for {name}")
 
         # 3. Create ConfigMap
 
-        configmap_dict = create_configmap(name, namespace, spec, api_port, db_url, owner_references)
+        configmap_dict = create_configmap(
+            name, namespace, spec, api_port, db_url, owner_references, producers
+        )
         kopf.adopt(configmap_dict, owner=kwargs.get("body"))
 
-        core_v1.create_namespaced_config_map(
+        api_send(
+            "create",
+            "configmap",
+            core_v1.create_namespaced_config_map,
             namespace=namespace,
             body=configmap_dict,
         )
         logger.info(f"Created ConfigMap for {name}")
 
         # 4. Create PVC for user data persistence
-        storage_config = spec.get("storage", {})
-        pvc_dict = {
-            "apiVersion": "v1",
-            "kind": "PersistentVolumeClaim",
-            "metadata": {
-                "name": f"{name}-data",
-                "namespace": namespace,
-                "labels": {"app": "freqtrade", "bot": name},
-            },
-            "spec": {
-                "accessModes": ["ReadWriteOnce"],
-                "resources": {
-                    "requests": {
-                        "storage": storage_config.get("size", "1Gi"),
-                    }
-                },
-            },
-        }
-        if "storageClassName" in storage_config:
-            pvc_dict["spec"]["storageClassName"] = storage_config["storageClassName"]
+        pvc_dict = create_data_pvc(name, namespace, spec)
         kopf.adopt(pvc_dict, owner=kwargs.get("body"))
-        core_v1.create_namespaced_persistent_volume_claim(namespace=namespace, body=pvc_dict)
+        api_send(
+            "create",
+            "persistentvolumeclaim",
+            core_v1.create_namespaced_persistent_volume_claim,
+            namespace=namespace,
+            body=pvc_dict,
+        )
         logger.info(f"Created PVC for {name}")
 
         # 5. Create Deployment using kopf.adopt for owner references
@@ -154,38 +446,48 @@ def create_freqtradebot(
         kopf.adopt(deployment_dict, owner=kwargs.get("body"))
 
         # Create deployment using CustomObjectsApi to avoid object conversion issues
-        apps_v1.create_namespaced_deployment(
+        api_send(
+            "create",
+            "deployment",
+            apps_v1.create_namespaced_deployment,
             namespace=namespace,
             body=deployment_dict,
         )
+        rollouts.replaced(
+            namespace, name, manifest_hash(deployment_dict["spec"]["template"]), created=True
+        )
         logger.info(f"Created Deployment for {name}")
 
         # 6. Create Service
-        service_dict = {
-            "apiVersion": "v1",
-            "kind": "Service",
-            "metadata": {
-                "name": name,
-                "namespace": namespace,
-                "labels": {"app": "freqtrade", "bot": name},
-            },
-            "spec": {
-                "selector": {"app": "freqtrade", "bot": name},
-                "ports": [
-                    {
-                        "name": "api",
-                        "port": api_port,
-                        "targetPort": api_port,
-                        "protocol": "TCP",
-                    }
-                ],
-                "type": "ClusterIP",
-            },
-        }
+        service_dict = create_service(name, namespace, api_port)
         kopf.adopt(service_dict, owner=kwargs.get("body"))
-        core_v1.create_namespaced_service(namespace=namespace, body=service_dict)
+        api_send(
+            "create",
+            "service",
+            core_v1.create_namespaced_service,
+            namespace=namespace,
+            body=service_dict,
+        )
         logger.info(f"Created Service for {name}")
 
+        # 7. Schedule trade-history archival
+        if spec.get("archival", {}).get("enabled", False):
+            _reconcile_archival(name, namespace, spec, db_url, owner_references, kwargs.get("body"))
+        operator_metrics()["bot_created"].add(1, {"namespace": namespace})
+
+        bot_state.put(
+            namespace,
+            name,
+            BotRecord(
+                api_port=api_port,
+                spec_digest=manifest_hash(dict(spec)),
+                config_hash=manifest_hash(configmap_dict),
+                deployment_hash=manifest_hash(deployment_dict),
+                status="Created",
+            ),
+        )
+
+        record_event(kwargs.get("body"), "Created", f"Bot created with API port {api_port}")
         return {
             "message": f"FreqtradeBot {name} created successfully",
             "apiPort": str(api_port),
@@ -193,10 +495,13 @@ def create_freqtradebot(
 
     except ApiException as e:
         logger.error(f"Failed to create resources for {name}: {e}")
+        record_event(kwargs.get("body"), "CreateFailed", str(e.reason), type="Warning")
         raise kopf.PermanentError(f"Failed to create bot: {e}")
 
 
-@kopf.on.update("trading.freqtrade.io", "v1alpha1", "freqtradebots")
+@kopf.on.update("trading.freqtrade.io", "v1alpha1", "freqtradebots", labels=WATCHED_LABELS)
+@traced_rollout
+@instrumented("FreqtradeBot", "update")
 def update_freqtradebot(
     spec: dict[str, Any],
     name: str,
@@ -204,13 +509,24 @@ def update_freqtradebot(
     meta: dict[str, Any],
     old: dict[str, Any],
     new: dict[str, Any],
+    status: dict[str, Any],
+    patch: kopf.Patch,
     **kwargs: object,
 ) -> dict[str, str]:
-    """Handle FreqtradeBot updates by reconciling ConfigMap and Deployment."""
+    """Handle FreqtradeBot updates by reconciling ConfigMap and Deployment.
+
+    Switching a running bot from SQLite to PostgreSQL migrates its trades
+    first, then cuts it over to the new database.
+    """
+    burst = update_debouncer.settle(namespace, name, meta.get("generation", 0))
+    if burst is not None:
+        m = operator_metrics()
+        m["reconcile_coalesced"].add(burst.edits - 1, {"kind": "FreqtradeBot"})
+        m["reconcile_debounce"].record(time.monotonic() - burst.first, {"kind": "FreqtradeBot"})
     logger.info(f"Updating FreqtradeBot: {namespace}/{name}")
 
-    core_v1 = client.CoreV1Api()
-    apps_v1 = client.AppsV1Api()
+    core_v1 = client.CoreV1Api(api_client())
+    apps_v1 = client.AppsV1Api(api_client())
 
     owner_references = [
         {
@@ -231,39 +547,118 @@ def update_freqtradebot(
         pg_config = db_config.get("postgresql", {})
         cluster_name = pg_config.get("clusterName", "freqtrade-db")
         database_name = name.replace("-", "_")
-        db_url = get_database_connection_string(cluster_name, namespace, database_name)
+        db_url = get_database_connection_string(
+            cluster_name, namespace, database_name, pooled=pooler_enabled(db_config)
+        )
     else:
-        db_url = "sqlite:////freqtrade/user_data/tradesv3.sqlite"
-
+        db_url = SQLITE_URL
+
+    record = bot_state.get(namespace, name)
+    old_db_type = old.get("spec", {}).get("database", {}).get("type", "sqlite")
+    if db_type == "postgresql" and old_db_type == "sqlite":
+        try:
+            _migrate_to_postgresql(
+                name,
+                namespace,
+                cluster_name,
+                get_database_connection_string(cluster_name, namespace, database_name),
+                owner_references,
+                status,
+                patch,
+                kwargs.get("body"),
+            )
+        except ApiException as e:
+            logger.error(f"Failed to migrate database of {name}: {e}")
+            raise kopf.TemporaryError(f"Failed to migrate database: {e}", delay=15)
+        # The bot is stopped; replace both children to start it on PostgreSQL
+        record = None
+    elif db_type == "postgresql" and status.get("migration", {}).get("phase") == "Failed":
+        # Its trades are still in SQLite, so keep the bot there
+        db_url = SQLITE_URL
+    producers = _resolve_producers(name, namespace, spec, kwargs.get("body"))
     try:
-        # Reconcile ConfigMap
-        configmap_dict = create_configmap(name, namespace, spec, api_port, db_url, owner_references)
-        kopf.adopt(configmap_dict, owner=kwargs.get("body"))
-        core_v1.replace_namespaced_config_map(
-            name=f"{name}-config",
-            namespace=namespace,
-            body=configmap_dict,
+        if producer_enabled(spec) and not producer_enabled(old.get("spec", {})):
+            _ensure_ws_token(name, namespace)
+
+        # Reconcile ConfigMap, unless it is unchanged since the last reconcile
+        configmap_dict = create_configmap(
+            name, namespace, spec, api_port, db_url, owner_references, producers
         )
-        logger.info(f"Updated ConfigMap for {name}")
+        kopf.adopt(configmap_dict, owner=kwargs.get("body"))
+        config_hash = manifest_hash(configmap_dict)
+        if record is None or record.config_hash != config_hash:
+            api_send(
+                "replace",
+                "configmap",
+                core_v1.replace_namespaced_config_map,
+                name=f"{name}-config",
+                namespace=namespace,
+                body=configmap_dict,
+            )
+            logger.info(f"Updated ConfigMap for {name}")
 
         # Reconcile Deployment
         deployment_dict = create_deployment(name, namespace, spec, api_port, owner_references)
         kopf.adopt(deployment_dict, owner=kwargs.get("body"))
-        apps_v1.replace_namespaced_deployment(
-            name=name,
-            namespace=namespace,
-            body=deployment_dict,
-        )
-        logger.info(f"Updated Deployment for {name}")
+        deployment_hash = manifest_hash(deployment_dict)
+        if record is None or record.deployment_hash != deployment_hash:
+            # Recommended resources only ride along with a rollout that happens anyway;
+            # the record keeps the hash of the spec's own manifest, so a new
+            # recommendation alone never replaces the Deployment
+            recommended = applied_resources(spec, status)
+            if recommended is not None:
+                deployment_dict = create_deployment(
+                    name, namespace, {**spec, "resources": recommended}, api_port, owner_references
+                )
+                kopf.adopt(deployment_dict, owner=kwargs.get("body"))
+            api_send(
+                "replace",
+                "deployment",
+                apps_v1.replace_namespaced_deployment,
+                name=name,
+                namespace=namespace,
+                body=deployment_dict,
+            )
+            rollouts.replaced(namespace, name, manifest_hash(deployment_dict["spec"]["template"]))
+            logger.info(f"Updated Deployment for {name}")
+            if recommended is not None:
+                patch.status["rightsizing"] = {"applied": recommended}
+                record_event(
+                    kwargs.get("body"),
+                    "Rightsized",
+                    f"Applied requests {recommended['requests']} "
+                    f"and limits {recommended['limits']}",
+                )
+
+        # Reconcile the archival CronJob when its settings or the database change
+        old_spec = old.get("spec", {})
+        if any(spec.get(field) != old_spec.get(field) for field in ("archival", "database")):
+            _reconcile_archival(name, namespace, spec, db_url, owner_references, kwargs.get("body"))
 
     except ApiException as e:
         logger.error(f"Failed to update resources for {name}: {e}")
+        record_event(kwargs.get("body"), "UpdateFailed", str(e.reason), type="Warning")
+        if record is not None:
+            record.status = "UpdateFailed"
         raise kopf.TemporaryError(f"Failed to update bot: {e}", delay=15)
 
+    bot_state.put(
+        namespace,
+        name,
+        BotRecord(
+            api_port=api_port,
+            spec_digest=manifest_hash(dict(spec)),
+            config_hash=config_hash,
+            deployment_hash=deployment_hash,
+            status="Updated",
+        ),
+    )
+    record_event(kwargs.get("body"), "Updated", "Configuration and Deployment reconciled")
     return {"message": f"FreqtradeBot {name} updated"}
 
 
-@kopf.on.delete("trading.freqtrade.io", "v1alpha1", "freqtradebots")
+@kopf.on.delete("trading.freqtrade.io", "v1alpha1", "freqtradebots", labels=WATCHED_LABELS)
+@instrumented("FreqtradeBot", "delete")
 def delete_freqtradebot(
     name: str,
     namespace: str,
@@ -274,6 +669,11 @@ def delete_freqtradebot(
 
     # Resources will be automatically deleted via owner references
     # We can add cleanup logic here if needed
+    bot_state.remove(namespace, name)
+    update_debouncer.forget(namespace, name)
+    rollouts.forget(namespace, name)
+    event_sink.forget(namespace, "FreqtradeBot", name)
+    operator_metrics()["bot_deleted"].add(1, {"namespace": namespace})
 
     return {"message": f"FreqtradeBot {name} deleted"}
 
@@ -283,7 +683,9 @@ def delete_freqtradebot(
     "v1alpha1",
     "freqtradebots",
     field="status.phase",
+    labels=WATCHED_LABELS,
 )
+@instrumented("FreqtradeBot", "status")
 def status_changed(
     old: str,
     new: str,
@@ -0,0 +1,148 @@
+"""Watch-driven management of the market-data proxies shared by bots."""
+
+import asyncio
+import logging
+from typing import Any
+
+import kopf
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability.instrumentation import (
+    api_send,
+    instrumented,
+    reconcile_span,
+)
+from freqtrade_operator.resources.marketdata import (
+    create_market_data_proxy,
+    get_market_data_proxy_name,
+    market_data_proxy_enabled,
+)
+from freqtrade_operator.utils.kube import MERGE_PATCH, api_client
+from freqtrade_operator.utils.manifests import manifest_hash
+from freqtrade_operator.utils.registry import ObjectKey
+from freqtrade_operator.utils.scope import in_scope
+
+logger = logging.getLogger(__name__)
+
+# Delay before reconciling, so the initial listing at startup creates each
+# proxy once instead of once per bot
+RECONCILE_DELAY = 1.0
+
+# (namespace, exchange) -> names of bots using its proxy
+proxied_bots: dict[ObjectKey, set[str]] = {}
+_exchanges: dict[ObjectKey, ObjectKey] = {}
+_applied: dict[ObjectKey, str] = {}
+_pending: dict[ObjectKey, asyncio.TimerHandle] = {}
+_locks: dict[ObjectKey, asyncio.Lock] = {}
+
+# Kind -> (API class, method suffix)
+PROXY_APIS: dict[str, tuple[type, str]] = {
+    "Deployment": (client.AppsV1Api, "namespaced_deployment"),
+    "Service": (client.CoreV1Api, "namespaced_service"),
+}
+
+
+def _call(kind: str, verb: str, **kwargs: Any) -> None:
+    api_class, suffix = PROXY_APIS[kind]
+    api_send(verb, kind.lower(), getattr(api_class(api_client()), f"{verb}_{suffix}"), **kwargs)
+
+
+def _reconcile(namespace: str, exchange: str) -> None:
+    """Create or remove the proxy of one exchange."""
+    key = (namespace, exchange)
+
+    if not proxied_bots.get(key):
+        for kind in PROXY_APIS:
+            try:
+                _call(
+                    kind,
+                    "delete",
+                    name=get_market_data_proxy_name(exchange),
+                    namespace=namespace,
+                )
+            except ApiException as e:
+                if e.status != 404:
+                    raise
+        if _applied.pop(key, None) is not None:
+            logger.info(f"Deleted unused market-data proxy for {namespace}/{exchange}")
+        return
+
+    manifests = create_market_data_proxy(exchange, namespace)
+    digest = manifest_hash(manifests)
+    if _applied.get(key) == digest:
+        return
+    for manifest in manifests:
+        kind = manifest["kind"]
+        try:
+            _call(
+                kind,
+                "patch",
+                name=manifest["metadata"]["name"],
+                namespace=namespace,
+                body=manifest,
+                _content_type=MERGE_PATCH,
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            _call(kind, "create", namespace=namespace, body=manifest)
+    _applied[key] = digest
+    logger.info(
+        f"Market-data proxy for {namespace}/{exchange} serves {len(proxied_bots[key])} bots"
+    )
+
+
+async def _flush(key: ObjectKey) -> None:
+    _pending.pop(key, None)
+    async with _locks.setdefault(key, asyncio.Lock()):
+        try:
+            with reconcile_span("MarketDataProxy", "reconcile", *key):
+                await asyncio.to_thread(_reconcile, *key)
+        except ApiException as e:
+            logger.error(f"Failed to reconcile market-data proxy for {key[0]}/{key[1]}: {e.reason}")
+            _schedule_reconcile({key}, delay=15.0)
+
+
+def _schedule_reconcile(keys: set[ObjectKey], delay: float = RECONCILE_DELAY) -> None:
+    loop = asyncio.get_running_loop()
+    for key in keys:
+        if key not in _pending:
+            _pending[key] = loop.call_later(delay, lambda key=key: asyncio.create_task(_flush(key)))
+
+
+@kopf.on.event("trading.freqtrade.io", "v1alpha1", "freqtradebots")
+@instrumented("FreqtradeBot", "market-data-event")
+async def market_data_bot_event(
+    event: dict[str, Any],
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    labels: dict[str, str],
+    **kwargs: object,
+) -> None:
+    """Track which bots use the market-data proxy of which exchange."""
+    exchange = None
+    exchange_config = spec.get("exchange", {})
+    if (
+        event["type"] != "DELETED"
+        and in_scope(labels)
+        and exchange_config.get("name")
+        and market_data_proxy_enabled(exchange_config)
+    ):
+        exchange = (namespace, exchange_config["name"])
+
+    previous = _exchanges.get((namespace, name))
+    if previous == exchange:
+        return
+
+    affected = set()
+    if previous is not None:
+        proxied_bots[previous].discard(name)
+        affected.add(previous)
+        del _exchanges[(namespace, name)]
+    if exchange is not None:
+        proxied_bots.setdefault(exchange, set()).add(name)
+        affected.add(exchange)
+        _exchanges[(namespace, name)] = exchange
+    _schedule_reconcile(affected)
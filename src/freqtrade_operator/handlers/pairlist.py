@@ -0,0 +1,279 @@
+"""FreqtradePairlist handlers: rank pairs once per period and publish them to bots."""
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import aiohttp
+import kopf
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability.events import event_sink, record_event
+from freqtrade_operator.observability.instrumentation import (
+    api_send,
+    instrumented,
+    reconcile_span,
+)
+from freqtrade_operator.pairlist.ranking import DEFAULT_REFRESH_PERIOD, filter_set_key, rank_pairs
+from freqtrade_operator.pairlist.tickers import fetch_tickers
+from freqtrade_operator.resources.pairlist import create_pairlist_configmap, create_pairlist_server
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.manifests import manifest_hash
+from freqtrade_operator.utils.registry import ObjectKey
+from freqtrade_operator.utils.scope import WATCHED_LABELS, in_scope
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for pairlists due for a refresh
+REFRESH_TICK = float(os.getenv("PAIRLIST_REFRESH_TICK", "30"))
+
+
+@dataclass(slots=True)
+class TrackedPairlist:
+    """A FreqtradePairlist handled by this operator and its last publication."""
+
+    uid: str
+    spec: dict[str, Any]
+    refreshed_at: float = float("-inf")
+    version: str = ""
+
+    @property
+    def refresh_period(self) -> int:
+        """Seconds between two rankings."""
+        return int(self.spec.get("refreshPeriod", DEFAULT_REFRESH_PERIOD))
+
+
+pairlists: dict[ObjectKey, TrackedPairlist] = {}
+_task: asyncio.Task[None] | None = None
+
+
+def _owner_references(name: str, uid: str) -> list[dict[str, Any]]:
+    return [
+        {
+            "apiVersion": "trading.freqtrade.io/v1alpha1",
+            "kind": "FreqtradePairlist",
+            "name": name,
+            "uid": uid,
+            "controller": True,
+            "blockOwnerDeletion": True,
+        }
+    ]
+
+
+def _publish(key: ObjectKey, tracked: TrackedPairlist, pairs: list[str]) -> bool:
+    """Write the ConfigMap and status of one pairlist if its pairs changed.
+
+    Returns:
+        Whether anything was written
+    """
+    version = manifest_hash({"pairs": pairs, "refresh_period": tracked.refresh_period})
+    if tracked.version == version:
+        return False
+
+    namespace, name = key
+    configmap_dict = create_pairlist_configmap(
+        name,
+        namespace,
+        pairs,
+        version,
+        tracked.refresh_period,
+        _owner_references(name, tracked.uid),
+    )
+    core_v1 = client.CoreV1Api(api_client())
+    try:
+        api_send(
+            "patch",
+            "configmap",
+            core_v1.patch_namespaced_config_map,
+            name=f"{name}-pairlist",
+            namespace=namespace,
+            body={"data": configmap_dict["data"]},
+        )
+    except ApiException as e:
+        if e.status != 404:
+            raise
+        api_send(
+            "create",
+            "configmap",
+            core_v1.create_namespaced_config_map,
+            namespace=namespace,
+            body=configmap_dict,
+        )
+
+    api_send(
+        "patch",
+        "freqtradepairlist/status",
+        client.CustomObjectsApi(api_client()).patch_namespaced_custom_object_status,
+        group="trading.freqtrade.io",
+        version="v1alpha1",
+        namespace=namespace,
+        plural="freqtradepairlists",
+        name=name,
+        body={
+            "status": {
+                "pairs": len(pairs),
+                "version": version,
+                "updatedAt": datetime.now(UTC).isoformat(),
+            }
+        },
+    )
+    tracked.version = version
+    logger.info(f"Published pairlist {version} with {len(pairs)} pairs for {namespace}/{name}")
+    return True
+
+
+async def refresh(now: float | None = None) -> int:
+    """Recompute and publish every pairlist whose refresh period has passed.
+
+    Tickers are downloaded once per exchange, and pairlists with the same
+    exchange and filters share one ranking.
+
+    Args:
+        now: Monotonic time, defaults to the current one
+
+    Returns:
+        Number of rankings computed
+    """
+    now = time.monotonic() if now is None else now
+    by_exchange: dict[str, list[ObjectKey]] = {}
+    for key, tracked in pairlists.items():
+        if now - tracked.refreshed_at >= tracked.refresh_period:
+            by_exchange.setdefault(tracked.spec["exchange"], []).append(key)
+    if not by_exchange:
+        return 0
+
+    computed = 0
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+        for exchange, keys in by_exchange.items():
+            try:
+                tickers = await fetch_tickers(session, exchange)
+            except (aiohttp.ClientError, TimeoutError, KeyError, ValueError) as e:
+                logger.warning(f"Failed to download {exchange} tickers: {e!r}")
+                continue
+
+            rankings: dict[str, list[str]] = {}
+            for key in keys:
+                tracked = pairlists.get(key)
+                if tracked is None:
+                    continue
+                filters = filter_set_key(tracked.spec)
+                if filters not in rankings:
+                    rankings[filters] = rank_pairs(tickers, tracked.spec)
+                    computed += 1
+                try:
+                    with reconcile_span("FreqtradePairlist", "publish", *key):
+                        await asyncio.to_thread(_publish, key, tracked, rankings[filters])
+                except ApiException as e:
+                    # Retried at the next tick
+                    logger.error(f"Failed to publish pairlist {key[0]}/{key[1]}: {e.reason}")
+                    continue
+                tracked.refreshed_at = now
+    return computed
+
+
+async def run(interval: float) -> None:
+    """Refresh due pairlists every ``interval`` seconds."""
+    while True:
+        try:
+            await refresh()
+        except Exception as e:
+            logger.warning(f"Pairlist refresh failed: {e!r}")
+        await asyncio.sleep(interval)
+
+
+@kopf.on.event("trading.freqtrade.io", "v1alpha1", "freqtradepairlists")
+@instrumented("FreqtradePairlist", "event")
+async def pairlist_event(
+    event: dict[str, Any],
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    meta: dict[str, Any],
+    labels: dict[str, str],
+    status: dict[str, Any],
+    **kwargs: object,
+) -> None:
+    """Track pairlists; a changed spec is recomputed at the next tick."""
+    key = (namespace, name)
+    if event["type"] == "DELETED" or not in_scope(labels):
+        pairlists.pop(key, None)
+        return
+
+    tracked = pairlists.get(key)
+    if tracked is None:
+        # After a restart, what is already published is not written again
+        pairlists[key] = TrackedPairlist(meta["uid"], dict(spec), version=status.get("version", ""))
+    elif tracked.spec != dict(spec):
+        tracked.spec = dict(spec)
+        tracked.refreshed_at = float("-inf")
+
+
+@kopf.on.create("trading.freqtrade.io", "v1alpha1", "freqtradepairlists", labels=WATCHED_LABELS)
+@instrumented("FreqtradePairlist", "create")
+def create_pairlist(
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    meta: dict[str, Any],
+    **kwargs: object,
+) -> dict[str, str]:
+    """Create the server answering the RemotePairList requests of bots."""
+    logger.info(f"Creating FreqtradePairlist: {namespace}/{name}")
+
+    body = kwargs.get("body")
+    core_v1 = client.CoreV1Api(api_client())
+    apps_v1 = client.AppsV1Api(api_client())
+    try:
+        for manifest in create_pairlist_server(
+            name, namespace, _owner_references(name, meta["uid"])
+        ):
+            create = (
+                apps_v1.create_namespaced_deployment
+                if manifest["kind"] == "Deployment"
+                else core_v1.create_namespaced_service
+            )
+            try:
+                api_send(
+                    "create", manifest["kind"].lower(), create, namespace=namespace, body=manifest
+                )
+            except ApiException as e:
+                if e.status != 409:
+                    raise
+    except ApiException as e:
+        logger.error(f"Failed to create resources for {name}: {e}")
+        record_event(body, "CreateFailed", str(e.reason), type="Warning")
+        raise kopf.TemporaryError(f"Failed to create pairlist server: {e}", delay=15)
+
+    record_event(body, "Created", f"Ranking {spec['stakeCurrency']} pairs on {spec['exchange']}")
+    return {"message": f"FreqtradePairlist {name} created"}
+
+
+@kopf.on.delete("trading.freqtrade.io", "v1alpha1", "freqtradepairlists", labels=WATCHED_LABELS)
+@instrumented("FreqtradePairlist", "delete")
+def delete_pairlist(name: str, namespace: str, **kwargs: object) -> dict[str, str]:
+    """Handle FreqtradePairlist deletion; children go with their owner."""
+    logger.info(f"Deleting FreqtradePairlist: {namespace}/{name}")
+    event_sink.forget(namespace, "FreqtradePairlist", name)
+    return {"message": f"FreqtradePairlist {name} deleted"}
+
+
+@kopf.on.startup()
+async def start_pairlist_refresh(**_: object) -> None:
+    """Start refreshing pairlists."""
+    global _task
+    _task = asyncio.create_task(run(REFRESH_TICK))
+
+
+@kopf.on.cleanup()
+async def stop_pairlist_refresh(**_: object) -> None:
+    """Stop refreshing pairlists."""
+    if _task is not None:
+        _task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _task
@@ -0,0 +1,139 @@
+"""Watch-driven management of the PgBouncer Poolers shared by bots."""
+
+import asyncio
+import logging
+from typing import Any
+
+import kopf
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability.instrumentation import (
+    api_send,
+    instrumented,
+    reconcile_span,
+)
+from freqtrade_operator.resources.pooler import create_pooler, get_pooler_name, pooler_enabled
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.manifests import manifest_hash
+from freqtrade_operator.utils.registry import ObjectKey
+from freqtrade_operator.utils.scope import in_scope
+
+logger = logging.getLogger(__name__)
+
+# Delay before reconciling, so a burst of bot events (such as the initial
+# listing at startup) sizes each pooler once for the final bot count
+RECONCILE_DELAY = 1.0
+
+# (namespace, cluster) -> names of bots routed through its pooler
+pooled_bots: dict[ObjectKey, set[str]] = {}
+_clusters: dict[ObjectKey, ObjectKey] = {}
+_applied: dict[ObjectKey, str] = {}
+_pending: dict[ObjectKey, asyncio.TimerHandle] = {}
+_locks: dict[ObjectKey, asyncio.Lock] = {}
+
+
+def _reconcile(namespace: str, cluster_name: str) -> None:
+    """Create, resize or remove the pooler of one cluster."""
+    key = (namespace, cluster_name)
+    bots = len(pooled_bots.get(key, ()))
+    custom_api = client.CustomObjectsApi(api_client())
+    resource = {
+        "group": "postgresql.cnpg.io",
+        "version": "v1",
+        "namespace": namespace,
+        "plural": "poolers",
+    }
+
+    if bots == 0:
+        try:
+            api_send(
+                "delete",
+                "pooler",
+                custom_api.delete_namespaced_custom_object,
+                name=get_pooler_name(cluster_name),
+                **resource,
+            )
+            logger.info(f"Deleted unused pooler for {namespace}/{cluster_name}")
+        except ApiException as e:
+            if e.status != 404:
+                raise
+        _applied.pop(key, None)
+        return
+
+    pooler = create_pooler(cluster_name, namespace, bots)
+    digest = manifest_hash(pooler)
+    if _applied.get(key) == digest:
+        return
+    try:
+        api_send(
+            "patch",
+            "pooler",
+            custom_api.patch_namespaced_custom_object,
+            name=pooler["metadata"]["name"],
+            body=pooler,
+            **resource,
+        )
+    except ApiException as e:
+        if e.status != 404:
+            raise
+        api_send(
+            "create", "pooler", custom_api.create_namespaced_custom_object, body=pooler, **resource
+        )
+    _applied[key] = digest
+    logger.info(
+        f"Pooler for {namespace}/{cluster_name} sized for {bots} bots: "
+        f"{pooler['spec']['pgbouncer']['parameters']}"
+    )
+
+
+async def _flush(key: ObjectKey) -> None:
+    _pending.pop(key, None)
+    async with _locks.setdefault(key, asyncio.Lock()):
+        try:
+            with reconcile_span("Pooler", "reconcile", *key):
+                await asyncio.to_thread(_reconcile, *key)
+        except ApiException as e:
+            logger.error(f"Failed to reconcile pooler for {key[0]}/{key[1]}: {e.reason}")
+            _schedule_reconcile({key}, delay=15.0)
+
+
+def _schedule_reconcile(keys: set[ObjectKey], delay: float = RECONCILE_DELAY) -> None:
+    loop = asyncio.get_running_loop()
+    for key in keys:
+        if key not in _pending:
+            _pending[key] = loop.call_later(delay, lambda key=key: asyncio.create_task(_flush(key)))
+
+
+@kopf.on.event("trading.freqtrade.io", "v1alpha1", "freqtradebots")
+@instrumented("FreqtradeBot", "pooler-event")
+async def pooler_bot_event(
+    event: dict[str, Any],
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    labels: dict[str, str],
+    **kwargs: object,
+) -> None:
+    """Track which bots use the pooler of which cluster."""
+    cluster = None
+    db_config = spec.get("database", {})
+    if event["type"] != "DELETED" and in_scope(labels) and pooler_enabled(db_config):
+        cluster = (namespace, db_config.get("postgresql", {}).get("clusterName", "freqtrade-db"))
+
+    previous = _clusters.get((namespace, name))
+    if previous == cluster:
+        return
+
+    affected = set()
+    if previous is not None:
+        pooled_bots[previous].discard(name)
+        if not pooled_bots[previous]:
+            del pooled_bots[previous]
+        affected.add(previous)
+        del _clusters[(namespace, name)]
+    if cluster is not None:
+        pooled_bots.setdefault(cluster, set()).add(name)
+        affected.add(cluster)
+        _clusters[(namespace, name)] = cluster
+    _schedule_reconcile(affected)
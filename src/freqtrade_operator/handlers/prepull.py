@@ -0,0 +1,134 @@
+"""Watch-driven management of the DaemonSet pre-pulling bot images."""
+
+import asyncio
+import logging
+from typing import Any
+
+import kopf
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability.instrumentation import (
+    api_send,
+    instrumented,
+    reconcile_span,
+)
+from freqtrade_operator.resources.prepull import (
+    PREPULL_NAME,
+    PREPULL_NAMESPACE,
+    bot_images,
+    create_prepull_daemonset,
+)
+from freqtrade_operator.utils.kube import MERGE_PATCH, api_client
+from freqtrade_operator.utils.manifests import manifest_hash
+from freqtrade_operator.utils.registry import ObjectKey
+from freqtrade_operator.utils.scope import in_scope
+
+logger = logging.getLogger(__name__)
+
+# Delay before reconciling, so the initial listing at startup renders the
+# DaemonSet once instead of once per bot
+RECONCILE_DELAY = 1.0
+
+# (namespace, bot) -> images its pod starts
+_images: dict[ObjectKey, frozenset[str]] = {}
+_applied: str | None = None
+_pending: asyncio.TimerHandle | None = None
+_lock = asyncio.Lock()
+
+
+def _reconcile(namespace: str) -> None:
+    """Create, update or remove the DaemonSet for the images bots use now."""
+    global _applied
+    apps_v1 = client.AppsV1Api(api_client())
+    images = set().union(*_images.values())
+
+    if not images:
+        try:
+            api_send(
+                "delete",
+                "daemonset",
+                apps_v1.delete_namespaced_daemon_set,
+                name=PREPULL_NAME,
+                namespace=namespace,
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise
+        if _applied is not None:
+            logger.info("Deleted the image pre-pull DaemonSet, no bots are left")
+        _applied = None
+        return
+
+    daemonset = create_prepull_daemonset(namespace, images)
+    digest = manifest_hash(daemonset)
+    if _applied == digest:
+        return
+    try:
+        api_send(
+            "patch",
+            "daemonset",
+            apps_v1.patch_namespaced_daemon_set,
+            name=PREPULL_NAME,
+            namespace=namespace,
+            body=daemonset,
+            _content_type=MERGE_PATCH,
+        )
+    except ApiException as e:
+        if e.status != 404:
+            raise
+        api_send(
+            "create",
+            "daemonset",
+            apps_v1.create_namespaced_daemon_set,
+            namespace=namespace,
+            body=daemonset,
+        )
+    _applied = digest
+    logger.info(f"Pre-pulling {', '.join(sorted(images))} on every node")
+
+
+async def _flush(namespace: str) -> None:
+    global _pending
+    _pending = None
+    async with _lock:
+        try:
+            with reconcile_span("ImagePrepull", "reconcile", namespace, PREPULL_NAME):
+                await asyncio.to_thread(_reconcile, namespace)
+        except ApiException as e:
+            logger.error(f"Failed to reconcile the image pre-pull DaemonSet: {e.reason}")
+            _schedule_reconcile(namespace, delay=15.0)
+
+
+def _schedule_reconcile(namespace: str, delay: float = RECONCILE_DELAY) -> None:
+    global _pending
+    if _pending is None:
+        _pending = asyncio.get_running_loop().call_later(
+            delay, lambda: asyncio.create_task(_flush(namespace))
+        )
+
+
+@kopf.on.event("trading.freqtrade.io", "v1alpha1", "freqtradebots")
+@instrumented("FreqtradeBot", "prepull-event")
+async def prepull_bot_event(
+    event: dict[str, Any],
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    labels: dict[str, str],
+    **kwargs: object,
+) -> None:
+    """Track the images of all bots, when ``IMAGE_PREPULL_NAMESPACE`` is set."""
+    if not PREPULL_NAMESPACE:
+        return
+    key = (namespace, name)
+    images = None
+    if event["type"] != "DELETED" and in_scope(labels):
+        images = bot_images(spec)
+    if _images.get(key) == images:
+        return
+    if images is None:
+        del _images[key]
+    else:
+        _images[key] = images
+    _schedule_reconcile(PREPULL_NAMESPACE)
@@ -0,0 +1,181 @@
+"""Watch-driven bot registry handlers for FreqtradeWebservers."""
+
+import asyncio
+import logging
+from typing import Any
+
+import kopf
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.handlers.freqtradebot import assign_api_port
+from freqtrade_operator.observability.instrumentation import (
+    api_send,
+    instrumented,
+    operator_metrics,
+    reconcile_span,
+)
+from freqtrade_operator.resources.registry import (
+    create_registry_configmap,
+    create_registry_entry,
+)
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.registry import BotRegistry, ObjectKey, WebserverScope
+from freqtrade_operator.utils.scope import in_scope
+
+logger = logging.getLogger(__name__)
+
+# Delay before publishing, so bursts (such as the initial listing at
+# startup) result in one write per webserver instead of one per bot
+PUBLISH_DELAY = 1.0
+
+registry = BotRegistry()
+_published: dict[ObjectKey, str] = {}
+_pending: dict[ObjectKey, asyncio.TimerHandle] = {}
+_locks: dict[ObjectKey, asyncio.Lock] = {}
+
+
+def _render(namespace: str, name: str) -> tuple[str, dict[str, Any], list[str]] | None:
+    """Build the registry ConfigMap of one webserver, or None if it is unchanged.
+
+    Runs on the event loop: the watch handlers mutate the registry there, so
+    it must not be iterated from a worker thread.
+    """
+    scope = registry.scope(namespace, name)
+    if scope is None:
+        return None
+    document = registry.document(namespace, name)
+    if _published.get((namespace, name)) == document["version"]:
+        return None
+
+    owner_references = [
+        {
+            "apiVersion": "trading.freqtrade.io/v1alpha1",
+            "kind": "FreqtradeWebserver",
+            "name": name,
+            "uid": scope.uid,
+            "controller": True,
+            "blockOwnerDeletion": True,
+        }
+    ]
+    configmap_dict = create_registry_configmap(name, namespace, document, owner_references)
+    return document["version"], configmap_dict, [bot["name"] for bot in document["bots"]]
+
+
+def _publish(namespace: str, name: str, configmap_dict: dict[str, Any], bots: list[str]) -> None:
+    """Write a rendered registry ConfigMap and the webserver's status."""
+    core_v1 = client.CoreV1Api(api_client())
+    try:
+        api_send(
+            "patch",
+            "configmap",
+            core_v1.patch_namespaced_config_map,
+            name=f"{name}-registry",
+            namespace=namespace,
+            body={
+                "metadata": {"annotations": configmap_dict["metadata"]["annotations"]},
+                "data": configmap_dict["data"],
+            },
+        )
+    except ApiException as e:
+        if e.status != 404:
+            raise
+        api_send(
+            "create",
+            "configmap",
+            core_v1.create_namespaced_config_map,
+            namespace=namespace,
+            body=configmap_dict,
+        )
+
+    api_send(
+        "patch",
+        "freqtradewebserver/status",
+        client.CustomObjectsApi(api_client()).patch_namespaced_custom_object_status,
+        group="trading.freqtrade.io",
+        version="v1alpha1",
+        namespace=namespace,
+        plural="freqtradewebservers",
+        name=name,
+        body={"status": {"registeredBots": bots}},
+    )
+
+
+async def _flush(key: ObjectKey) -> None:
+    _pending.pop(key, None)
+    async with _locks.setdefault(key, asyncio.Lock()):
+        rendered = _render(*key)
+        if rendered is None:
+            return
+        version, configmap_dict, bots = rendered
+        try:
+            with reconcile_span("FreqtradeWebserver", "publish-registry", *key):
+                await asyncio.to_thread(_publish, *key, configmap_dict, bots)
+        except ApiException as e:
+            logger.error(f"Failed to publish registry for {key[0]}/{key[1]}: {e.reason}")
+            _schedule_publish({key}, delay=15.0)
+            return
+        except Exception:
+            logger.exception(f"Failed to publish registry for {key[0]}/{key[1]}")
+            _schedule_publish({key}, delay=15.0)
+            return
+        _published[key] = version
+        logger.info(f"Published registry {version} with {len(bots)} bots for {key[0]}/{key[1]}")
+
+
+def _schedule_publish(keys: set[ObjectKey], delay: float = PUBLISH_DELAY) -> None:
+    loop = asyncio.get_running_loop()
+    for key in keys:
+        if key not in _pending:
+            _pending[key] = loop.call_later(delay, lambda key=key: asyncio.create_task(_flush(key)))
+
+
+@kopf.on.event("trading.freqtrade.io", "v1alpha1", "freqtradebots")
+@instrumented("FreqtradeBot", "registry-event")
+async def registry_bot_event(
+    event: dict[str, Any],
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    labels: dict[str, str],
+    **kwargs: object,
+) -> None:
+    """Apply a single FreqtradeBot add, update or delete to the registry."""
+    known = registry.has_bot(namespace, name)
+    # A bot relabelled out of scope is dropped like a deleted one
+    if event["type"] == "DELETED" or not in_scope(labels):
+        affected = registry.remove_bot(namespace, name)
+        if known:
+            operator_metrics()["active_bots"].add(-1)
+    else:
+        entry = create_registry_entry(name, namespace, dict(spec), assign_api_port(name))
+        affected = registry.upsert_bot(namespace, name, dict(labels), entry)
+        if not known:
+            operator_metrics()["active_bots"].add(1)
+    _schedule_publish(affected)
+
+
+@kopf.on.event("trading.freqtrade.io", "v1alpha1", "freqtradewebservers")
+@instrumented("FreqtradeWebserver", "registry-event")
+async def registry_webserver_event(
+    event: dict[str, Any],
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    meta: dict[str, Any],
+    labels: dict[str, str],
+    **kwargs: object,
+) -> None:
+    """Track which bots each FreqtradeWebserver serves."""
+    if event["type"] == "DELETED" or not in_scope(labels):
+        registry.remove_webserver(namespace, name)
+        _published.pop((namespace, name), None)
+        _locks.pop((namespace, name), None)
+        return
+
+    scope = WebserverScope(
+        uid=meta["uid"],
+        match_labels=dict(spec.get("botSelector", {}).get("matchLabels", {})),
+    )
+    if registry.upsert_webserver(namespace, name, scope):
+        _schedule_publish({(namespace, name)})
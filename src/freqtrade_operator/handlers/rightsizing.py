@@ -0,0 +1,200 @@
+"""Collect bot pod usage from the metrics API and publish right-sizing recommendations."""
+
+import asyncio
+import contextlib
+import logging
+import os
+from datetime import UTC, datetime
+from typing import Any
+
+import kopf
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability.instrumentation import (
+    api_call,
+    api_send,
+    instrumented,
+    reconcile_span,
+)
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.registry import ObjectKey
+from freqtrade_operator.utils.rightsizing import (
+    INTERVAL,
+    SAMPLES,
+    UsageHistory,
+    cpu_millicores,
+    differs,
+    memory_mib,
+)
+from freqtrade_operator.utils.scope import in_scope, watch_namespaces
+
+logger = logging.getLogger(__name__)
+
+# Seconds between samples; 0 disables the recommender
+SAMPLE_INTERVAL = float(os.getenv("RIGHTSIZING_INTERVAL", INTERVAL))
+
+history = UsageHistory(int(os.getenv("RIGHTSIZING_SAMPLES", SAMPLES)))
+# Bots handled by this operator, with the recommendation last published to their status
+_bots: dict[ObjectKey, dict[str, Any] | None] = {}
+_task: asyncio.Task[None] | None = None
+
+
+def _list_pod_metrics() -> list[dict[str, Any]]:
+    """List the metrics of all bot pods in the watched namespaces."""
+    custom_api = client.CustomObjectsApi(api_client())
+    namespaces = watch_namespaces()
+    # Namespace patterns cannot be listed; list everything and keep known bots
+    if not namespaces or any(c in "".join(namespaces) for c in "*?[!"):
+        return api_call(
+            "list",
+            "podmetrics",
+            custom_api.list_cluster_custom_object,
+            "metrics.k8s.io",
+            "v1beta1",
+            "pods",
+            label_selector="app=freqtrade",
+        )["items"]
+    items = []
+    for namespace in namespaces:
+        items.extend(
+            api_call(
+                "list",
+                "podmetrics",
+                custom_api.list_namespaced_custom_object,
+                "metrics.k8s.io",
+                "v1beta1",
+                namespace,
+                "pods",
+                label_selector="app=freqtrade",
+            )["items"]
+        )
+    return items
+
+
+def sample() -> dict[ObjectKey, tuple[int, int]]:
+    """Add one usage sample per running bot to the history.
+
+    Returns:
+        CPU millicores and memory MiB per sampled bot; the highest of its
+        pods while a rollout runs two
+    """
+    usage: dict[ObjectKey, tuple[int, int]] = {}
+    for item in _list_pod_metrics():
+        metadata = item["metadata"]
+        key = (metadata["namespace"], metadata.get("labels", {}).get("bot", ""))
+        if key not in _bots:
+            continue
+        for container in item.get("containers", []):
+            if container["name"] != "freqtrade":
+                continue
+            cpu = cpu_millicores(container["usage"]["cpu"])
+            memory = memory_mib(container["usage"]["memory"])
+            previous = usage.get(key, (0, 0))
+            usage[key] = (max(previous[0], cpu), max(previous[1], memory))
+    history.add_round(usage)
+    return usage
+
+
+def publish(keys: list[ObjectKey]) -> int:
+    """Publish the recommendations of bots that moved beyond the tolerance.
+
+    Args:
+        keys: Bots to consider
+
+    Returns:
+        Number of status patches sent
+    """
+    custom_api = client.CustomObjectsApi(api_client())
+    patched = 0
+    for key in keys:
+        recommended = history.recommend(key)
+        if recommended is None or not differs(recommended, _bots.get(key)):
+            continue
+        namespace, name = key
+        try:
+            api_send(
+                "patch",
+                "freqtradebot/status",
+                custom_api.patch_namespaced_custom_object_status,
+                group="trading.freqtrade.io",
+                version="v1alpha1",
+                namespace=namespace,
+                plural="freqtradebots",
+                name=name,
+                body={
+                    "status": {
+                        "rightsizing": {
+                            "recommended": recommended,
+                            "samples": history.size(key),
+                            "updatedAt": datetime.now(UTC).isoformat(),
+                        }
+                    }
+                },
+            )
+        except ApiException as e:
+            if e.status == 404:
+                _bots.pop(key, None)
+                history.forget(key)
+                continue
+            logger.warning(f"Failed to publish recommendation for {namespace}/{name}: {e.reason}")
+            continue
+        if key in _bots:
+            _bots[key] = recommended
+        patched += 1
+    return patched
+
+
+def _collect() -> None:
+    patched = publish(list(sample()))
+    if patched:
+        logger.info(f"Published resource recommendations for {patched} bots")
+
+
+async def run(interval: float) -> None:
+    """Sample usage and publish recommendations every ``interval`` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            with reconcile_span("FreqtradeBot", "rightsizing", "", ""):
+                await asyncio.to_thread(_collect)
+        except Exception as e:
+            # Without metrics-server there is nothing to sample; keep trying
+            logger.warning(f"Failed to collect pod usage: {e}")
+
+
+@kopf.on.event("trading.freqtrade.io", "v1alpha1", "freqtradebots")
+@instrumented("FreqtradeBot", "rightsizing-event")
+async def rightsizing_bot_event(
+    event: dict[str, Any],
+    name: str,
+    namespace: str,
+    labels: dict[str, str],
+    status: dict[str, Any],
+    **kwargs: object,
+) -> None:
+    """Track which bots to sample."""
+    key = (namespace, name)
+    # A bot relabelled out of scope is dropped like a deleted one
+    if event["type"] == "DELETED" or not in_scope(labels):
+        _bots.pop(key, None)
+        history.forget(key)
+    elif key not in _bots:
+        _bots[key] = status.get("rightsizing", {}).get("recommended")
+
+
+@kopf.on.startup()
+async def start_recommender(**_: object) -> None:
+    """Start sampling bot usage, unless ``RIGHTSIZING_INTERVAL`` is 0."""
+    global _task
+    if SAMPLE_INTERVAL > 0:
+        _task = asyncio.create_task(run(SAMPLE_INTERVAL))
+
+
+@kopf.on.cleanup()
+async def stop_recommender(**_: object) -> None:
+    """Stop sampling."""
+    if _task is not None:
+        _task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _task
@@ -0,0 +1,109 @@
+"""Report how long bot pods take from scheduling until they can trade."""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
+import kopf
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability.instrumentation import (
+    api_send,
+    instrumented,
+    operator_metrics,
+)
+from freqtrade_operator.observability.rollout import condition_time, rollouts
+from freqtrade_operator.utils.kube import api_client
+
+logger = logging.getLogger(__name__)
+
+# UIDs of pods whose startup was already reported, until the pods are deleted
+_reported: set[str] = set()
+# Pods ready before the operator started are reported again, but not measured
+_STARTED = datetime.now(UTC)
+
+
+def startup_report(pod_name: str, status: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the startup timings of a bot pod once it is ready, else None.
+
+    Ready is taken as trading: the readiness probe only passes once the
+    freqtrade API answers, which happens after the exchange is loaded.
+    """
+    scheduled = condition_time(status, "PodScheduled")
+    ready = condition_time(status, "Ready")
+    if scheduled is None or ready is None:
+        return None
+    initialized = condition_time(status, "Initialized") or scheduled
+    restarts = sum(
+        container.get("restartCount", 0)
+        for container in status.get("containerStatuses") or []
+        if container["name"] == "freqtrade"
+    )
+    return {
+        "pod": pod_name,
+        "scheduledAt": scheduled.isoformat().replace("+00:00", "Z"),
+        "readyAt": ready.isoformat().replace("+00:00", "Z"),
+        "initSeconds": int((initialized - scheduled).total_seconds()),
+        "seconds": int((ready - scheduled).total_seconds()),
+        "restarts": restarts,
+    }
+
+
+def _report(namespace: str, bot_name: str, status: dict[str, Any]) -> None:
+    api_send(
+        "patch",
+        "freqtradebot/status",
+        client.CustomObjectsApi(api_client()).patch_namespaced_custom_object_status,
+        group="trading.freqtrade.io",
+        version="v1alpha1",
+        namespace=namespace,
+        plural="freqtradebots",
+        name=bot_name,
+        body={"status": status},
+    )
+
+
+@kopf.on.event("", "v1", "pods", labels={"app": "freqtrade", "bot": kopf.PRESENT})
+@instrumented("FreqtradeBot", "startup-event")
+async def bot_pod_event(
+    event: dict[str, Any],
+    status: dict[str, Any],
+    name: str,
+    namespace: str,
+    labels: dict[str, str],
+    meta: dict[str, Any],
+    **kwargs: object,
+) -> None:
+    """Report the startup of each bot pod once it first becomes ready.
+
+    The first ready pod after a rollout replaced the Deployment also ends
+    the rollout's trace.
+    """
+    uid = meta["uid"]
+    if event["type"] == "DELETED":
+        _reported.discard(uid)
+        return
+    if uid in _reported:
+        return
+    startup = startup_report(name, dict(status))
+    if startup is None:
+        return
+
+    bot_name = labels["bot"]
+    report = {"startup": startup}
+    rollout = rollouts.pod_ready(namespace, bot_name, name, dict(meta), dict(status))
+    if rollout is not None:
+        report["rollout"] = rollout
+    try:
+        await asyncio.to_thread(_report, namespace, bot_name, report)
+    except ApiException as e:
+        if e.status != 404:
+            logger.error(f"Failed to report startup of pod {namespace}/{name}: {e.reason}")
+            return
+    _reported.add(uid)
+    if datetime.fromisoformat(startup["readyAt"]) < _STARTED:
+        return
+    operator_metrics()["bot_startup"].record(startup["seconds"], {"namespace": namespace})
+    logger.info(f"Bot {namespace}/{bot_name} ready {startup['seconds']}s after scheduling")
@@ -0,0 +1,174 @@
+"""Scrape the bots' REST APIs and export fleet trading metrics."""
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import aiohttp
+import kopf
+from kubernetes import client
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from freqtrade_operator.gateway.discovery import read_bot_password
+from freqtrade_operator.handlers.freqtradebot import assign_api_port
+from freqtrade_operator.observability.instrumentation import (
+    instrumented,
+    operator_metrics,
+    reconcile_span,
+)
+from freqtrade_operator.utils.bot_api import BotApiClient, BotEndpoint, get_bot_api_url
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.registry import ObjectKey
+from freqtrade_operator.utils.scope import in_scope
+from freqtrade_operator.utils.telemetry import (
+    GAUGES,
+    INTERVAL,
+    MAX_BOTS,
+    MAX_NAMESPACES,
+    REFRESH,
+    BotReading,
+    FleetTelemetry,
+    parse_reading,
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds between scrapes; 0 disables the exporter
+SCRAPE_INTERVAL = float(os.getenv("TELEMETRY_INTERVAL", INTERVAL))
+# Bots scraped at once; each takes up to four pooled connections
+CONCURRENCY = int(os.getenv("TELEMETRY_CONCURRENCY", "25"))
+
+telemetry = FleetTelemetry(
+    max_namespaces=int(os.getenv("TELEMETRY_MAX_NAMESPACES", MAX_NAMESPACES)),
+    max_bots=int(os.getenv("TELEMETRY_MAX_BOTS", MAX_BOTS)),
+    refresh=float(os.getenv("TELEMETRY_REFRESH", REFRESH)),
+)
+# Bots to scrape, with the API password once it was read
+_bots: dict[ObjectKey, str | None] = {}
+_task: asyncio.Task[None] | None = None
+
+_PATHS = ("/api/v1/profit", "/api/v1/count", "/api/v1/balance", "/api/v1/health")
+
+
+async def _scrape_bot(bot_api: BotApiClient, key: ObjectKey) -> BotReading | None:
+    namespace, name = key
+    if _bots.get(key) is None:
+        core_v1 = client.CoreV1Api(api_client())
+        password = await asyncio.to_thread(read_bot_password, core_v1, namespace, f"{name}-api")
+        if password is None or key not in _bots:
+            return None
+        _bots[key] = password
+    endpoint = BotEndpoint(
+        name, namespace, get_bot_api_url(name, namespace, assign_api_port(name)), _bots[key]
+    )
+    try:
+        bodies = await asyncio.gather(*(bot_api.get_json(endpoint, path) for path in _PATHS))
+    except aiohttp.ClientResponseError as e:
+        if e.status == 401 and key in _bots:
+            # The Secret was recreated with the bot; read it again next time
+            _bots[key] = None
+        raise
+    return parse_reading(*bodies, now=time.time())
+
+
+async def scrape(bot_api: BotApiClient) -> dict[ObjectKey, BotReading]:
+    """Read all tracked bots, ``CONCURRENCY`` at a time.
+
+    Returns:
+        Readings of the bots that answered
+    """
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    readings: dict[ObjectKey, BotReading] = {}
+    failed = 0
+
+    async def read(key: ObjectKey) -> None:
+        nonlocal failed
+        async with semaphore:
+            try:
+                reading = await _scrape_bot(bot_api, key)
+            except (aiohttp.ClientError, TimeoutError, KeyError, TypeError, ValueError) as e:
+                logger.debug(f"Cannot scrape {key[0]}/{key[1]}: {e!r}")
+                failed += 1
+                return
+        if reading is not None:
+            readings[key] = reading
+
+    await asyncio.gather(*(read(key) for key in list(_bots)))
+    if failed:
+        operator_metrics()["telemetry_scrape_errors"].add(failed)
+    return readings
+
+
+def _callback(field: str) -> Callable[[CallbackOptions], Iterable[Observation]]:
+    def observe(options: CallbackOptions) -> Iterable[Observation]:
+        return [Observation(value, attributes) for value, attributes in telemetry.observe(field)]
+
+    return observe
+
+
+def register_gauges(meter: metrics.Meter) -> None:
+    """Create the fleet gauges, observed from the latest scrape."""
+    for field, (name, description, unit) in GAUGES.items():
+        meter.create_observable_gauge(
+            name, callbacks=[_callback(field)], description=description, unit=unit
+        )
+
+
+async def run(interval: float) -> None:
+    """Scrape every bot every ``interval`` seconds over one pooled client."""
+    bot_api = BotApiClient(limit=CONCURRENCY * len(_PATHS), timeout=min(10.0, interval / 2))
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                with reconcile_span("FreqtradeBot", "telemetry", "", ""):
+                    readings = await scrape(bot_api)
+                    telemetry.update(list(_bots), readings)
+            except Exception as e:
+                logger.warning(f"Failed to scrape bot telemetry: {e}")
+                continue
+            logger.debug(f"Scraped {len(readings)} of {len(_bots)} bots")
+    finally:
+        await bot_api.close()
+
+
+@kopf.on.event("trading.freqtrade.io", "v1alpha1", "freqtradebots")
+@instrumented("FreqtradeBot", "telemetry-event")
+async def telemetry_bot_event(
+    event: dict[str, Any],
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    labels: dict[str, str],
+    **kwargs: object,
+) -> None:
+    """Track which bots to scrape."""
+    key = (namespace, name)
+    # Bots in operator dry-run mode have no pod to ask
+    if event["type"] == "DELETED" or not in_scope(labels) or spec.get("dryRun", False):
+        _bots.pop(key, None)
+    elif key not in _bots:
+        _bots[key] = None
+
+
+@kopf.on.startup()
+async def start_telemetry(**_: object) -> None:
+    """Start scraping bots, unless metrics are not exported or ``TELEMETRY_INTERVAL`` is 0."""
+    global _task
+    if SCRAPE_INTERVAL > 0 and os.getenv("OTLP_ENDPOINT"):
+        register_gauges(metrics.get_meter("freqtrade_operator"))
+        _task = asyncio.create_task(run(SCRAPE_INTERVAL))
+
+
+@kopf.on.cleanup()
+async def stop_telemetry(**_: object) -> None:
+    """Stop scraping."""
+    if _task is not None:
+        _task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _task
@@ -5,11 +5,139 @@ from typing import Any
 
 import kopf
 from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability.events import event_sink, record_event
+from freqtrade_operator.observability.instrumentation import api_send, instrumented
+from freqtrade_operator.resources.gateway import (
+    create_gateway_deployment,
+    create_gateway_rbac,
+    create_gateway_service,
+    gateway_enabled,
+)
+from freqtrade_operator.resources.webserver import (
+    create_frequi_deployment,
+    create_frequi_ingress,
+    create_frequi_service,
+    get_webserver_url,
+)
+from freqtrade_operator.utils.kube import MERGE_PATCH, api_client
+from freqtrade_operator.utils.manifests import manifest_hash, merge_patch
+from freqtrade_operator.utils.scope import WATCHED_LABELS
+from freqtrade_operator.utils.secrets import generate_random_secret
 
 logger = logging.getLogger(__name__)
 
+# API class and method suffix for every child kind a webserver owns
+CHILD_APIS: dict[str, tuple[type, str]] = {
+    "ServiceAccount": (client.CoreV1Api, "namespaced_service_account"),
+    "Role": (client.RbacAuthorizationV1Api, "namespaced_role"),
+    "RoleBinding": (client.RbacAuthorizationV1Api, "namespaced_role_binding"),
+    "Deployment": (client.AppsV1Api, "namespaced_deployment"),
+    "Service": (client.CoreV1Api, "namespaced_service"),
+    "Ingress": (client.NetworkingV1Api, "namespaced_ingress"),
+}
+
+
+def render_children(
+    name: str,
+    namespace: str,
+    spec: dict[str, Any],
+    meta: dict[str, Any],
+    body: Any,
+) -> dict[str, dict[str, Any]]:
+    """Render all child manifests of a webserver, keyed by ``Kind/name``.
+
+    The order of the result is the order in which children are created.
+    """
+    owner_references = [
+        {
+            "apiVersion": "trading.freqtrade.io/v1alpha1",
+            "kind": "FreqtradeWebserver",
+            "name": name,
+            "uid": meta["uid"],
+            "controller": True,
+            "blockOwnerDeletion": True,
+        }
+    ]
+    manifests = []
+    if gateway_enabled(spec):
+        manifests.extend(create_gateway_rbac(name, namespace, owner_references))
+    manifests.append(create_frequi_deployment(name, namespace, spec, owner_references))
+    manifests.append(create_frequi_service(name, namespace, owner_references))
+    if gateway_enabled(spec):
+        manifests.append(create_gateway_deployment(name, namespace, spec, owner_references))
+        manifests.append(create_gateway_service(name, namespace, owner_references))
+    manifests.append(create_frequi_ingress(name, namespace, spec, owner_references))
+
+    children = {}
+    for manifest in manifests:
+        kopf.adopt(manifest, owner=body)
+        children[f"{manifest['kind']}/{manifest['metadata']['name']}"] = manifest
+    return children
+
+
+def _call_child_api(kind: str, verb: str, **kwargs: Any) -> None:
+    """Perform ``verb`` on a child kind through the instrumented API wrapper."""
+    api_class, suffix = CHILD_APIS[kind]
+    api_send(verb, kind.lower(), getattr(api_class(api_client()), f"{verb}_{suffix}"), **kwargs)
 
-@kopf.on.create("trading.freqtrade.io", "v1alpha1", "freqtradewebservers")
+
+def _ensure_gateway_secret(name: str, namespace: str, spec: dict[str, Any], body: Any) -> None:
+    """Create the viewer credentials of the gateway unless they already exist."""
+    if not gateway_enabled(spec) or not spec.get("authentication", {}).get("enabled", True):
+        return
+
+    gateway_secret_dict = {
+        "apiVersion": "v1",
+        "kind": "Secret",
+        "metadata": {
+            "name": f"{name}-gateway",
+            "namespace": namespace,
+        },
+        "stringData": {
+            "username": "freqtrade",
+            "password": generate_random_secret(16),
+        },
+    }
+    kopf.adopt(gateway_secret_dict, owner=body)
+    try:
+        api_send(
+            "create",
+            "secret",
+            client.CoreV1Api(api_client()).create_namespaced_secret,
+            namespace=namespace,
+            body=gateway_secret_dict,
+        )
+        logger.info(f"Created gateway secret for {name}")
+    except ApiException as e:
+        if e.status != 409:
+            raise
+
+
+def _patch_or_create(manifest: dict[str, Any], patch_body: dict[str, Any], namespace: str) -> None:
+    """Merge-patch a child in place, creating it if it does not exist."""
+    kind = manifest["kind"]
+    key = f"{kind}/{manifest['metadata']['name']}"
+    try:
+        _call_child_api(
+            kind,
+            "patch",
+            name=manifest["metadata"]["name"],
+            namespace=namespace,
+            body=patch_body,
+            _content_type=MERGE_PATCH,
+        )
+        logger.info(f"Patched {key}")
+    except ApiException as e:
+        if e.status != 404:
+            raise
+        _call_child_api(kind, "create", namespace=namespace, body=manifest)
+        logger.info(f"Created {key}")
+
+
+@kopf.on.create("trading.freqtrade.io", "v1alpha1", "freqtradewebservers", labels=WATCHED_LABELS)
+@instrumented("FreqtradeWebserver", "create")
 def create_webserver(
     spec: dict[str, Any],
     name: str,
@@ -20,146 +148,86 @@ def create_webserver(
     """Handle FreqtradeWebserver creation."""
     logger.info(f"Creating FreqtradeWebserver: {namespace}/{name}")
 
-    apps_v1 = client.AppsV1Api()
-    core_v1 = client.CoreV1Api()
-    networking_v1 = client.NetworkingV1Api()
+    body = kwargs.get("body")
+    children = render_children(name, namespace, spec, meta, body)
 
-    ingress_spec = spec["ingress"]
+    try:
+        _ensure_gateway_secret(name, namespace, spec, body)
 
-    # Create deployment for FreqUI
-    deployment = client.V1Deployment(
-        metadata=client.V1ObjectMeta(
-            name=f"{name}-frequi",
-            namespace=namespace,
-            owner_references=[
-                client.V1OwnerReference(
-                    api_version="trading.freqtrade.io/v1alpha1",
-                    kind="FreqtradeWebserver",
-                    name=name,
-                    uid=meta["uid"],
-                    controller=True,
-                    block_owner_deletion=True,
-                )
-            ],
-        ),
-        spec=client.V1DeploymentSpec(
-            replicas=1,
-            selector=client.V1LabelSelector(
-                match_labels={"app": "freqtrade-webserver", "instance": name}
-            ),
-            template=client.V1PodTemplateSpec(
-                metadata=client.V1ObjectMeta(
-                    labels={"app": "freqtrade-webserver", "instance": name}
-                ),
-                spec=client.V1PodSpec(
-                    containers=[
-                        client.V1Container(
-                            name="frequi",
-                            image="freqtradeorg/freqtrade:stable_freqaiui",
-                            ports=[
-                                client.V1ContainerPort(
-                                    container_port=80,
-                                    name="http",
-                                )
-                            ],
-                            resources=spec.get("resources", {}),
-                        )
-                    ]
-                ),
-            ),
-        ),
-    )
-    apps_v1.create_namespaced_deployment(namespace, deployment)
-    logger.info(f"Created FreqUI deployment for {name}")
-
-    # Create service
-    service = client.V1Service(
-        metadata=client.V1ObjectMeta(
-            name=name,
-            namespace=namespace,
-            owner_references=[
-                client.V1OwnerReference(
-                    api_version="trading.freqtrade.io/v1alpha1",
-                    kind="FreqtradeWebserver",
-                    name=name,
-                    uid=meta["uid"],
-                    controller=True,
-                    block_owner_deletion=True,
-                )
-            ],
-        ),
-        spec=client.V1ServiceSpec(
-            selector={"app": "freqtrade-webserver", "instance": name},
-            ports=[
-                client.V1ServicePort(
-                    name="http",
-                    port=80,
-                    target_port=80,
-                )
-            ],
-        ),
-    )
-    core_v1.create_namespaced_service(namespace, service)
-    logger.info(f"Created service for {name}")
-
-    # Create ingress
-    ingress = client.V1Ingress(
-        metadata=client.V1ObjectMeta(
-            name=name,
-            namespace=namespace,
-            annotations=ingress_spec.get("annotations", {}),
-            owner_references=[
-                client.V1OwnerReference(
-                    api_version="trading.freqtrade.io/v1alpha1",
-                    kind="FreqtradeWebserver",
-                    name=name,
-                    uid=meta["uid"],
-                    controller=True,
-                    block_owner_deletion=True,
-                )
-            ],
-        ),
-        spec=client.V1IngressSpec(
-            rules=[
-                client.V1IngressRule(
-                    host=ingress_spec["host"],
-                    http=client.V1HTTPIngressRuleValue(
-                        paths=[
-                            client.V1HTTPIngressPath(
-                                path="/",
-                                path_type="Prefix",
-                                backend=client.V1IngressBackend(
-                                    service=client.V1IngressServiceBackend(
-                                        name=name,
-                                        port=client.V1ServiceBackendPort(number=80),
-                                    )
-                                ),
-                            )
-                        ]
-                    ),
-                )
-            ],
-            tls=[
-                client.V1IngressTLS(
-                    hosts=[ingress_spec["host"]],
-                    secret_name=ingress_spec.get("tlsSecretName", f"{name}-tls"),
+        for manifest in children.values():
+            kind = manifest["kind"]
+            _call_child_api(kind, "create", namespace=namespace, body=manifest)
+            logger.info(f"Created {kind} {manifest['metadata']['name']}")
+    except ApiException as e:
+        logger.error(f"Failed to create resources for {name}: {e}")
+        record_event(body, "CreateFailed", str(e.reason), type="Warning")
+        raise kopf.PermanentError(f"Failed to create webserver: {e}")
+
+    record_event(body, "Created", f"Serving {get_webserver_url(spec)}")
+    return {"message": f"FreqtradeWebserver {name} created", "url": get_webserver_url(spec)}
+
+
+@kopf.on.update("trading.freqtrade.io", "v1alpha1", "freqtradewebservers", labels=WATCHED_LABELS)
+@instrumented("FreqtradeWebserver", "update")
+def update_webserver(
+    spec: dict[str, Any],
+    name: str,
+    namespace: str,
+    meta: dict[str, Any],
+    old: dict[str, Any],
+    new: dict[str, Any],
+    **kwargs: object,
+) -> dict[str, str]:
+    """Handle FreqtradeWebserver updates by patching changed children in place.
+
+    Children are rendered from both the previous and the current spec; only
+    those whose digest differs are patched, with a merge patch holding just
+    the changed fields. Nothing running is recreated, so FreqUI stays up.
+    """
+    logger.info(f"Updating FreqtradeWebserver: {namespace}/{name}")
+
+    body = kwargs.get("body")
+    old_children = render_children(name, namespace, old.get("spec", {}), meta, body)
+    new_children = render_children(name, namespace, spec, meta, body)
+
+    try:
+        _ensure_gateway_secret(name, namespace, spec, body)
+
+        for key, manifest in new_children.items():
+            previous = old_children.get(key)
+            if previous is not None and manifest_hash(previous) == manifest_hash(manifest):
+                logger.debug(f"{key} unchanged, skipping")
+                continue
+            # Children new to this spec are patched whole, so a leftover from
+            # an earlier partial attempt is taken over instead of conflicting
+            patch_body = merge_patch(previous, manifest) if previous is not None else manifest
+            _patch_or_create(manifest, patch_body, namespace)
+
+        for key in old_children.keys() - new_children.keys():
+            manifest = old_children[key]
+            try:
+                _call_child_api(
+                    manifest["kind"],
+                    "delete",
+                    name=manifest["metadata"]["name"],
+                    namespace=namespace,
                 )
-            ]
-            if ingress_spec.get("tls", True)
-            else None,
-        ),
-    )
-    networking_v1.create_namespaced_ingress(namespace, ingress)
-    logger.info(f"Created ingress for {name}")
+                logger.info(f"Deleted {key}")
+            except ApiException as e:
+                if e.status != 404:
+                    raise
 
-    # Build URL
-    protocol = "https" if ingress_spec.get("tls", True) else "http"
-    url = f"{protocol}://{ingress_spec['host']}"
+    except ApiException as e:
+        logger.error(f"Failed to update resources for {name}: {e}")
+        record_event(body, "UpdateFailed", str(e.reason), type="Warning")
+        raise kopf.TemporaryError(f"Failed to update webserver: {e}", delay=15)
 
-    return {"message": f"FreqtradeWebserver {name} created", "url": url}
+    record_event(body, "Updated", f"Serving {get_webserver_url(spec)}")
+    return {"message": f"FreqtradeWebserver {name} updated", "url": get_webserver_url(spec)}
 
 
-@kopf.on.delete("trading.freqtrade.io", "v1alpha1", "freqtradewebservers")
+@kopf.on.delete("trading.freqtrade.io", "v1alpha1", "freqtradewebservers", labels=WATCHED_LABELS)
+@instrumented("FreqtradeWebserver", "delete")
 def delete_webserver(
     name: str,
     namespace: str,
@@ -167,4 +235,5 @@ def delete_webserver(
 ) -> dict[str, str]:
     """Handle FreqtradeWebserver deletion."""
     logger.info(f"Deleting FreqtradeWebserver: {namespace}/{name}")
+    event_sink.forget(namespace, "FreqtradeWebserver", name)
     return {"message": f"FreqtradeWebserver {name} deleted"}
@@ -0,0 +1,184 @@
+"""Trade-history archival CronJob creation utilities."""
+
+from typing import Any
+
+from freqtrade_operator.resources.database import create_database_env
+from freqtrade_operator.resources.deployment import FREQTRADE_IMAGE
+
+ARCHIVE_DIR = "/freqtrade/user_data/archive"
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_SCHEDULE = "30 3 * * *"
+
+# Closed trades past the cutoff. Freqtrade stores naive UTC datetimes, which
+# compare correctly as strings against a cutoff in CUTOFF_FORMAT in both
+# SQLite and PostgreSQL
+ARCHIVABLE_TRADES = "SELECT id FROM trades WHERE NOT is_open AND close_date < :cutoff"
+CUTOFF_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Moves closed trades older than the retention window, with their orders and
+# custom data, into zstd-compressed Parquet files, then compacts the database.
+# Files are written before the rows are deleted, in the same transaction, so
+# a failed run never loses trades. The summary is the
+# container's termination message, which the operator copies to the bot status.
+ARCHIVE_SCRIPT = (
+    f"ARCHIVABLE_TRADES = {ARCHIVABLE_TRADES!r}\nCUTOFF_FORMAT = {CUTOFF_FORMAT!r}\n"
+    + """
+import json, os, time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import create_engine, inspect, text
+
+engine = create_engine(os.environ["DB_URL"])
+archive = Path(os.environ["ARCHIVE_DIR"])
+archive.mkdir(parents=True, exist_ok=True)
+days = int(os.environ["RETENTION_DAYS"])
+cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime(CUTOFF_FORMAT)
+stamp = time.strftime("%Y%m%dT%H%M%S")
+old = ARCHIVABLE_TRADES
+children = [t for t in ("orders", "trade_custom_data") if inspect(engine).has_table(t)]
+
+archived = {}
+with engine.begin() as conn:
+    for table in (*children, "trades"):
+        column = "id" if table == "trades" else "ft_trade_id"
+        where = f"WHERE {column} IN ({old})"
+        rows = pd.read_sql(text(f"SELECT * FROM {table} {where}"), conn, params={"cutoff": cutoff})
+        if len(rows):
+            rows.to_parquet(archive / f"{table}-{stamp}.parquet", compression="zstd")
+        archived[table] = len(rows)
+    for table in (*children, "trades"):
+        column = "id" if table == "trades" else "ft_trade_id"
+        conn.execute(text(f"DELETE FROM {table} WHERE {column} IN ({old})"), {"cutoff": cutoff})
+    hot = conn.execute(text("SELECT count(*) FROM trades")).scalar()
+
+if archived["trades"]:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM" if engine.dialect.name == "sqlite" else "VACUUM ANALYZE"))
+
+summary = {
+    "archivedTrades": archived["trades"],
+    "archivedOrders": archived.get("orders", 0),
+    "hotTrades": hot,
+    "archiveBytes": sum(f.stat().st_size for f in archive.glob("*.parquet")),
+}
+print(json.dumps(summary))
+Path("/dev/termination-log").write_text(json.dumps(summary))
+"""
+)
+
+
+def get_archival_cronjob_name(bot_name: str) -> str:
+    """Return the name of a bot's archival CronJob."""
+    return f"{bot_name}-archive"
+
+
+def create_archival_cronjob(
+    bot_name: str,
+    namespace: str,
+    archival_config: dict[str, Any],
+    db_url: str,
+    cluster_name: str | None,
+    owner_references: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create a CronJob archiving a bot's old closed trades.
+
+    Archives are written to the bot's data volume. The volume is
+    ReadWriteOnce, so the Job pod is scheduled next to the running bot.
+
+    Args:
+        bot_name: FreqtradeBot instance name
+        namespace: Namespace
+        archival_config: ``spec.archival`` of the bot
+        db_url: Bot database connection string
+        cluster_name: CNPG cluster name, or None for SQLite
+        owner_references: Owner references
+
+    Returns:
+        CronJob resource dict
+    """
+    labels = {"app": "freqtrade-archive", "bot": bot_name}
+    retention_days = archival_config.get("retentionDays", DEFAULT_RETENTION_DAYS)
+
+    return {
+        "apiVersion": "batch/v1",
+        "kind": "CronJob",
+        "metadata": {
+            "name": get_archival_cronjob_name(bot_name),
+            "namespace": namespace,
+            "labels": labels,
+            "ownerReferences": owner_references,
+        },
+        "spec": {
+            "schedule": archival_config.get("schedule", DEFAULT_SCHEDULE),
+            "concurrencyPolicy": "Forbid",
+            "successfulJobsHistoryLimit": 1,
+            "failedJobsHistoryLimit": 1,
+            "jobTemplate": {
+                "metadata": {"labels": labels},
+                "spec": {
+                    "backoffLimit": 1,
+                    "ttlSecondsAfterFinished": 86400,
+                    "template": {
+                        "metadata": {"labels": labels},
+                        "spec": {
+                            "restartPolicy": "Never",
+                            "affinity": {
+                                "podAffinity": {
+                                    "requiredDuringSchedulingIgnoredDuringExecution": [
+                                        {
+                                            "labelSelector": {
+                                                "matchLabels": {"app": "freqtrade", "bot": bot_name}
+                                            },
+                                            "topologyKey": "kubernetes.io/hostname",
+                                        }
+                                    ]
+                                }
+                            },
+                            "containers": [
+                                {
+                                    "name": "archive",
+                                    "image": FREQTRADE_IMAGE,
+                                    "command": ["python", "-c", ARCHIVE_SCRIPT],
+                                    "env": [
+                                        *create_database_env(db_url, cluster_name),
+                                        {"name": "ARCHIVE_DIR", "value": ARCHIVE_DIR},
+                                        {"name": "RETENTION_DAYS", "value": str(retention_days)},
+                                    ],
+                                    "volumeMounts": [
+                                        {
+                                            "name": "data",
+                                            "mountPath": "/freqtrade/user_data",
+                                        },
+                                    ],
+                                    "resources": {
+                                        "requests": {
+                                            "cpu": "100m",
+                                            "memory": "256Mi",
+                                        },
+                                        "limits": {
+                                            "memory": "1Gi",
+                                        },
+                                    },
+                                }
+                            ],
+                            "volumes": [
+                                {
+                                    "name": "data",
+                                    "persistentVolumeClaim": {
+                                        "claimName": f"{bot_name}-data",
+                                    },
+                                },
+                            ],
+                            "securityContext": {
+                                "fsGroup": 1000,
+                                "runAsNonRoot": True,
+                                "runAsUser": 1000,
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    }
@@ -2,6 +2,8 @@
 
 from typing import Any
 
+from freqtrade_operator.resources.deployment import FREQTRADE_IMAGE
+
 
 def create_backtest_job(
     name: str,
@@ -50,7 +52,7 @@ def create_backtest_job(
                     "containers": [
                         {
                             "name": "backtest",
-                            "image": "freqtradeorg/freqtrade:stable",
+                            "image": FREQTRADE_IMAGE,
                             "command": ["freqtrade"],
                             "args": [
                                 "backtesting",
@@ -0,0 +1,141 @@
+"""SQLite to PostgreSQL migration job creation utilities."""
+
+from typing import Any
+
+from freqtrade_operator.resources.database import create_database_env
+from freqtrade_operator.resources.deployment import FREQTRADE_IMAGE
+
+SQLITE_URL = "sqlite:////freqtrade/user_data/tradesv3.sqlite"
+
+# Compares row counts and highest ids per table; a non-zero exit fails the Job
+VERIFY_SCRIPT = """
+import os, sys
+from sqlalchemy import create_engine, text
+
+source = create_engine(os.environ["DB_URL_FROM"])
+target = create_engine(os.environ["DB_URL"])
+mismatched = []
+for table in ("trades", "orders", "pairlocks"):
+    query = text(f"SELECT count(*), coalesce(max(id), 0) FROM {table}")
+    with source.connect() as src, target.connect() as dst:
+        expected, copied = tuple(src.execute(query).one()), tuple(dst.execute(query).one())
+    print(f"{table}: source={expected} target={copied}")
+    if expected != copied:
+        mismatched.append(table)
+sys.exit(f"Mismatched tables: {mismatched}" if mismatched else 0)
+"""
+
+
+def get_migration_job_name(bot_name: str) -> str:
+    """Return the name of a bot's database migration Job."""
+    return f"{bot_name}-migrate-db"
+
+
+def create_migration_job(
+    bot_name: str,
+    namespace: str,
+    cluster_name: str,
+    db_url: str,
+    owner_references: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create a Kubernetes Job copying a bot's SQLite database to PostgreSQL.
+
+    ``freqtrade convert-db`` copies trades, orders and pair locks from the
+    bot's data volume, then a second container checks that every table
+    arrived complete. The bot must be stopped while the Job runs, since the
+    volume is ReadWriteOnce and the copy has to be consistent.
+
+    Args:
+        bot_name: FreqtradeBot instance name
+        namespace: Namespace
+        cluster_name: CNPG cluster name
+        db_url: Target connection string, with a ``${DB_PASSWORD}`` placeholder
+        owner_references: Owner references
+
+    Returns:
+        Job resource dict
+    """
+    labels = {"app": "freqtrade-migration", "bot": bot_name}
+    env = [
+        {"name": "DB_URL_FROM", "value": SQLITE_URL},
+        *create_database_env(db_url, cluster_name),
+    ]
+    volume_mounts = [
+        {
+            "name": "config",
+            "mountPath": "/config",
+        },
+        {
+            "name": "data",
+            "mountPath": "/freqtrade/user_data",
+        },
+    ]
+
+    return {
+        "apiVersion": "batch/v1",
+        "kind": "Job",
+        "metadata": {
+            "name": get_migration_job_name(bot_name),
+            "namespace": namespace,
+            "labels": labels,
+            "ownerReferences": owner_references,
+        },
+        "spec": {
+            # A failed copy leaves rows behind, so it is not retried blindly
+            "backoffLimit": 0,
+            "activeDeadlineSeconds": 1800,
+            "ttlSecondsAfterFinished": 86400,
+            "template": {
+                "metadata": {"labels": labels},
+                "spec": {
+                    "restartPolicy": "Never",
+                    "initContainers": [
+                        {
+                            "name": "convert-db",
+                            "image": FREQTRADE_IMAGE,
+                            "command": ["freqtrade"],
+                            "args": [
+                                "convert-db",
+                                "--config",
+                                "/config/config.json",
+                                "--db-url-from",
+                                "$(DB_URL_FROM)",
+                                "--db-url",
+                                "$(DB_URL)",
+                            ],
+                            "env": env,
+                            "volumeMounts": volume_mounts,
+                        }
+                    ],
+                    "containers": [
+                        {
+                            "name": "verify",
+                            "image": FREQTRADE_IMAGE,
+                            "command": ["python", "-c", VERIFY_SCRIPT],
+                            "env": env,
+                            "volumeMounts": volume_mounts,
+                        }
+                    ],
+                    "volumes": [
+                        {
+                            "name": "config",
+                            "configMap": {
+                                "name": f"{bot_name}-config",
+                            },
+                        },
+                        {
+                            "name": "data",
+                            "persistentVolumeClaim": {
+                                "claimName": f"{bot_name}-data",
+                            },
+                        },
+                    ],
+                    "securityContext": {
+                        "fsGroup": 1000,
+                        "runAsNonRoot": True,
+                        "runAsUser": 1000,
+                    },
+                },
+            },
+        },
+    }
@@ -0,0 +1,164 @@
+"""FreqAI training CronJobs shared by the bots of one training key."""
+
+import os
+import zlib
+from typing import Any
+
+from freqtrade_operator.resources.freqai import FREQAI_IMAGE, MODELS_CLAIM, get_training_name
+from freqtrade_operator.utils.git_sync import create_git_sync_container, create_ssh_key_volume
+
+TRAINING_CPU = os.getenv("FREQAI_TRAINING_CPU", "2")
+TRAINING_MEMORY = os.getenv("FREQAI_TRAINING_MEMORY", "4Gi")
+
+# Trains every pair whose model is older than live_retrain_hours, the way a
+# bot's FreqAI training thread does, then exits. Models and the pair
+# dictionary are written to the shared identifier folder that bots load from.
+# The summary is the container's termination message.
+TRAIN_SCRIPT = """
+import json, logging, os
+from pathlib import Path
+
+from freqtrade.configuration import Configuration
+from freqtrade.data.dataprovider import DataProvider
+from freqtrade.enums import RunMode
+from freqtrade.freqai.data_kitchen import FreqaiDataKitchen
+from freqtrade.resolvers import ExchangeResolver, StrategyResolver
+
+logging.basicConfig(level=logging.INFO)
+config = Configuration.from_files([os.environ["CONFIG_FILE"]])
+config["runmode"] = RunMode.DRY_RUN
+exchange = ExchangeResolver.load_exchange(config, validate=False)
+strategy = StrategyResolver.load_strategy(config)
+strategy.dp = DataProvider(config, exchange)
+# Loads the FreqAI model class and downloads the training data
+strategy.load_freqAI_model()
+freqai = strategy.freqai
+freqai.live = True
+freqai.data_provider = strategy.dp
+freqai.can_short = strategy.can_short
+
+trained, fresh, failed = [], [], []
+for pair in config["exchange"]["pair_whitelist"]:
+    freqai.dd.set_pair_dict_info({"pair": pair})
+    _, trained_timestamp = freqai.dd.get_pair_dict_info(pair)
+    dk = FreqaiDataKitchen(config, True, pair)
+    retrain, train_range, load_range = dk.check_if_new_training_required(trained_timestamp)
+    if not retrain:
+        fresh.append(pair)
+        continue
+    if not freqai.dd.historic_data:
+        freqai.dd.load_all_pair_histories(load_range, dk)
+    dk.set_paths(pair, train_range.stopts)
+    try:
+        freqai.extract_data_and_train_model(train_range, pair, strategy, dk, load_range)
+        trained.append(pair)
+    except Exception:
+        logging.exception(f"Training {pair} failed")
+        failed.append(pair)
+freqai.dd.save_drawer_to_disk()
+
+summary = {"trainedPairs": len(trained), "freshPairs": len(fresh), "failedPairs": len(failed)}
+print(json.dumps(summary))
+Path("/dev/termination-log").write_text(json.dumps(summary))
+"""
+
+
+def create_training_cronjob(key: str, namespace: str, spec: dict[str, Any]) -> dict[str, Any]:
+    """Create the CronJob training the models of one training key.
+
+    It runs hourly, at a minute spread by key, and only trains pairs whose
+    models are due, so retraining follows ``retrainHours``. A strategy from
+    git is fetched once with git-sync before training.
+
+    Args:
+        key: Training key
+        namespace: Namespace
+        spec: Spec of one of the bots sharing the models
+
+    Returns:
+        CronJob resource dict
+    """
+    labels = {"app": "freqai-train", "training-key": key}
+    strategy = spec["strategies"][0]
+    init_containers = []
+    volumes: list[dict[str, Any]] = [
+        {"name": "config", "configMap": {"name": get_training_name(key)}},
+        {"name": "models", "persistentVolumeClaim": {"claimName": MODELS_CLAIM}},
+        {"name": "strategies", "emptyDir": {}},
+    ]
+    if "gitRepository" in strategy:
+        init_containers.append(
+            create_git_sync_container(strategy, volume_name="strategies", one_time=True)
+        )
+        ssh_key_secret = strategy["gitRepository"].get("sshKeySecret")
+        if ssh_key_secret:
+            volumes.append(create_ssh_key_volume(ssh_key_secret))
+
+    return {
+        "apiVersion": "batch/v1",
+        "kind": "CronJob",
+        "metadata": {
+            "name": get_training_name(key),
+            "namespace": namespace,
+            "labels": labels,
+        },
+        "spec": {
+            "schedule": f"{zlib.crc32(key.encode()) % 60} * * * *",
+            "concurrencyPolicy": "Forbid",
+            "successfulJobsHistoryLimit": 1,
+            "failedJobsHistoryLimit": 1,
+            "jobTemplate": {
+                "metadata": {"labels": labels},
+                "spec": {
+                    "backoffLimit": 1,
+                    "ttlSecondsAfterFinished": 3600,
+                    "template": {
+                        "metadata": {"labels": labels},
+                        "spec": {
+                            "restartPolicy": "Never",
+                            "initContainers": init_containers,
+                            "containers": [
+                                {
+                                    "name": "train",
+                                    "image": FREQAI_IMAGE,
+                                    "command": ["python", "-c", TRAIN_SCRIPT],
+                                    "env": [
+                                        {"name": "CONFIG_FILE", "value": "/config/config.json"},
+                                    ],
+                                    "volumeMounts": [
+                                        {"name": "config", "mountPath": "/config"},
+                                        {"name": "strategies", "mountPath": "/strategies"},
+                                        {
+                                            "name": "models",
+                                            "mountPath": "/freqtrade/user_data/models",
+                                            "subPath": "models",
+                                        },
+                                        # Candles are kept between runs, so each
+                                        # run only downloads what is new
+                                        {
+                                            "name": "models",
+                                            "mountPath": "/freqtrade/user_data/data",
+                                            "subPath": "data",
+                                        },
+                                    ],
+                                    "resources": {
+                                        "requests": {
+                                            "cpu": TRAINING_CPU,
+                                            "memory": TRAINING_MEMORY,
+                                        },
+                                        "limits": {"memory": TRAINING_MEMORY},
+                                    },
+                                }
+                            ],
+                            "volumes": volumes,
+                            "securityContext": {
+                                "fsGroup": 1000,
+                                "runAsNonRoot": True,
+                                "runAsUser": 1000,
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    }
@@ -1,12 +1,24 @@
 """Main entry point for the Freqtrade Kubernetes Operator."""
 
+import asyncio
+import contextlib
 import logging
 import os
 
 import kopf
+from aiohttp import web
 from kubernetes import config
 
-from freqtrade_operator.observability.otel import create_operator_metrics, setup_opentelemetry
+from freqtrade_operator.observability.events import event_sink
+from freqtrade_operator.observability.instrumentation import operator_metrics
+from freqtrade_operator.observability.otel import setup_opentelemetry
+from freqtrade_operator.observability.profiler import PROFILER_PORT, start_profiler
+from freqtrade_operator.utils.scope import (
+    LABEL_FILTER,
+    format_label_selector,
+    select_on_server,
+    watch_namespaces,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -29,26 +41,63 @@ tracer, meter = setup_opentelemetry(
     service_name="freqtrade-operator",
     otlp_endpoint=otlp_endpoint,
 )
-metrics = create_operator_metrics(meter)
+metrics = operator_metrics()
+profiler_runner: web.AppRunner | None = None
+event_task: asyncio.Task[None] | None = None
 
 
 @kopf.on.startup()
 def configure(settings: kopf.OperatorSettings, **_: object) -> None:
     """Configure operator settings on startup."""
     settings.persistence.finalizer = "freqtrade-operator/finalizer"
-    settings.posting.level = logging.INFO
+    # Handlers post aggregated Events through the event sink instead of
+    # kopf turning every log line of a handled object into an Event
+    settings.posting.enabled = False
 
-    # Watch all namespaces by default
-    namespace = os.getenv("WATCH_NAMESPACE")
-    if namespace:
-        settings.watching.client_timeout = 600
-        logger.info(f"Watching namespace: {namespace}")
+    namespaces = watch_namespaces()
+    if namespaces:
+        logger.info(f"Watching namespaces: {', '.join(namespaces)}")
     else:
         logger.info("Watching all namespaces")
+    if select_on_server(settings):
+        logger.info(f"Watching only objects labelled {format_label_selector(LABEL_FILTER)}")
 
     logger.info("Freqtrade Operator started successfully")
 
 
+@kopf.on.startup()
+async def start_event_sink(**_: object) -> None:
+    """Start posting the Events recorded by handlers."""
+    global event_task
+    event_task = asyncio.create_task(event_sink.run())
+
+
+@kopf.on.cleanup()
+async def stop_event_sink(**_: object) -> None:
+    """Post what is left and stop the event sink."""
+    if event_task is not None:
+        event_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await event_task
+
+
+@kopf.on.startup()
+async def start_profiler_endpoint(**_: object) -> None:
+    """Serve the sampling profiler when a PROFILER_TOKEN is configured."""
+    global profiler_runner
+    token = os.getenv("PROFILER_TOKEN")
+    if not token:
+        return
+    profiler_runner = await start_profiler(token, int(os.getenv("PROFILER_PORT", PROFILER_PORT)))
+
+
+@kopf.on.cleanup()
+async def stop_profiler_endpoint(**_: object) -> None:
+    """Stop the profiler server."""
+    if profiler_runner is not None:
+        await profiler_runner.cleanup()
+
+
 @kopf.on.probe(id="health")
 def health_check(**_: object) -> dict[str, str]:
     """Health check endpoint for liveness probe."""
@@ -57,6 +106,20 @@ def health_check(**_: object) -> dict[str, str]:
 
 # Import handlers to register them with Kopf
 # These imports must come after the kopf setup above
-from freqtrade_operator.handlers import freqtradebot, webserver  # noqa: E402, F401
+from freqtrade_operator.handlers import (  # noqa: E402, F401
+    archival,
+    botset,
+    freqai,
+    freqtradebot,
+    marketdata,
+    pairlist,
+    pooler,
+    prepull,
+    registry,
+    rightsizing,
+    startup,
+    telemetry,
+    webserver,
+)
 
 logger.info("All handlers registered")
@@ -0,0 +1 @@
+"""Caching proxy for public exchange market data shared by bots."""
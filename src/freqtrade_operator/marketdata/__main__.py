@@ -0,0 +1,36 @@
+"""Entry point for the proxy: ``python -m freqtrade_operator.marketdata``."""
+
+import asyncio
+import logging
+import os
+
+from aiohttp import web
+
+from freqtrade_operator.marketdata.routes import EXCHANGES
+from freqtrade_operator.marketdata.server import UpstreamClient, create_app
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    """Serve the market-data proxy for one exchange until cancelled."""
+    exchange = os.environ["MARKETDATA_EXCHANGE"]
+    port = int(os.getenv("MARKETDATA_PORT", "8080"))
+
+    runner = web.AppRunner(create_app(EXCHANGES[exchange], UpstreamClient()))
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    logger.info(f"Market-data proxy for {exchange} listening on :{port}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
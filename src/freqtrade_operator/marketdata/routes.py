@@ -0,0 +1,245 @@
+"""Public market-data endpoints of supported exchanges and their cache TTLs.
+
+Bots reach the proxy through ccxt's ``proxyUrl``, so every request names
+the full exchange URL. Only GETs to the routes listed here are cached;
+anything carrying credentials or a signature is private and passed
+through untouched.
+"""
+
+import re
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+# Exchange metadata changes rarely; freqtrade reloads markets hourly
+MARKETS_TTL = 600.0
+TICKER_TTL = 2.0
+ORDERBOOK_TTL = 1.0
+# Candles of unknown or calendar length (months) are cached this long
+OHLCV_FALLBACK_TTL = 5.0
+# Responses fetched just after a candle closes may not contain it yet,
+# so they are only kept until the exchange has settled
+CANDLE_SETTLE = 2.0
+
+# Exchanges align weekly candles to Monday; the epoch was a Thursday
+WEEK_OFFSET = 4 * 86400
+
+# Headers and query parameters that mark a request as authenticated
+CREDENTIAL_HEADERS = frozenset(
+    {
+        "authorization",
+        "x-mbx-apikey",
+        "x-bapi-api-key",
+        "ok-access-key",
+        "api-key",
+        "kc-api-key",
+        "key",
+    }
+)
+SIGNATURE_PARAMS = frozenset({"signature", "sign", "apikey", "api_key", "timestamp", "nonce"})
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    """A cacheable public endpoint."""
+
+    kind: str
+    timeframe_param: str | None = None
+    default_timeframe: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ExchangeRoutes:
+    """Hosts a proxy may reach for one exchange and its public routes."""
+
+    hosts: frozenset[str]
+    routes: Mapping[str, Route]
+
+
+MARKETS = Route("markets")
+TICKER = Route("ticker")
+ORDERBOOK = Route("orderbook")
+
+EXCHANGES: dict[str, ExchangeRoutes] = {
+    "binance": ExchangeRoutes(
+        hosts=frozenset({"api.binance.com", "fapi.binance.com", "dapi.binance.com"}),
+        routes={
+            "/api/v3/exchangeInfo": MARKETS,
+            "/fapi/v1/exchangeInfo": MARKETS,
+            "/dapi/v1/exchangeInfo": MARKETS,
+            "/api/v3/ticker/24hr": TICKER,
+            "/api/v3/ticker/bookTicker": TICKER,
+            "/fapi/v1/ticker/24hr": TICKER,
+            "/fapi/v1/ticker/bookTicker": TICKER,
+            "/fapi/v1/premiumIndex": TICKER,
+            "/api/v3/depth": ORDERBOOK,
+            "/fapi/v1/depth": ORDERBOOK,
+            "/api/v3/klines": Route("ohlcv", "interval"),
+            "/fapi/v1/klines": Route("ohlcv", "interval"),
+            "/fapi/v1/markPriceKlines": Route("ohlcv", "interval"),
+        },
+    ),
+    "bybit": ExchangeRoutes(
+        hosts=frozenset({"api.bybit.com"}),
+        routes={
+            "/v5/market/instruments-info": MARKETS,
+            "/v5/market/tickers": TICKER,
+            "/v5/market/orderbook": ORDERBOOK,
+            "/v5/market/kline": Route("ohlcv", "interval"),
+            "/v5/market/mark-price-kline": Route("ohlcv", "interval"),
+        },
+    ),
+    "okx": ExchangeRoutes(
+        hosts=frozenset({"www.okx.com", "aws.okx.com"}),
+        routes={
+            "/api/v5/public/instruments": MARKETS,
+            "/api/v5/market/tickers": TICKER,
+            "/api/v5/market/ticker": TICKER,
+            "/api/v5/market/books": ORDERBOOK,
+            "/api/v5/market/candles": Route("ohlcv", "bar", "1m"),
+            "/api/v5/market/history-candles": Route("ohlcv", "bar", "1m"),
+        },
+    ),
+    "kraken": ExchangeRoutes(
+        hosts=frozenset({"api.kraken.com"}),
+        routes={
+            "/0/public/Assets": MARKETS,
+            "/0/public/AssetPairs": MARKETS,
+            "/0/public/Ticker": TICKER,
+            "/0/public/Depth": ORDERBOOK,
+            "/0/public/OHLC": Route("ohlcv", "interval", "1"),
+        },
+    ),
+    "kucoin": ExchangeRoutes(
+        hosts=frozenset({"api.kucoin.com"}),
+        routes={
+            "/api/v1/currencies": MARKETS,
+            "/api/v2/symbols": MARKETS,
+            "/api/v1/market/allTickers": TICKER,
+            "/api/v1/market/orderbook/level2_20": ORDERBOOK,
+            "/api/v1/market/orderbook/level2_100": ORDERBOOK,
+            "/api/v1/market/candles": Route("ohlcv", "type"),
+        },
+    ),
+    "gateio": ExchangeRoutes(
+        hosts=frozenset({"api.gateio.ws"}),
+        routes={
+            "/api/v4/spot/currencies": MARKETS,
+            "/api/v4/spot/currency_pairs": MARKETS,
+            "/api/v4/spot/tickers": TICKER,
+            "/api/v4/spot/order_book": ORDERBOOK,
+            "/api/v4/spot/candlesticks": Route("ohlcv", "interval", "30m"),
+        },
+    ),
+}
+
+_TIMEFRAME = re.compile(r"^(\d*)([A-Za-z]*)$")
+_UNITS: dict[str, int | None] = {
+    "": 60,
+    "m": 60,
+    "min": 60,
+    "h": 3600,
+    "H": 3600,
+    "hour": 3600,
+    "d": 86400,
+    "D": 86400,
+    "day": 86400,
+    "w": 604800,
+    "W": 604800,
+    "week": 604800,
+    "M": None,
+    "mon": None,
+    "month": None,
+}
+
+
+def parse_timeframe(value: str) -> int | None:
+    """Return the length of a candle timeframe in seconds.
+
+    Understands the spellings exchanges use in their candle endpoints:
+    ``5m``, ``1H``, ``1Dutc``, ``4hour``, ``15min``, ``D`` and bare
+    minute counts such as ``60``.
+
+    Args:
+        value: Timeframe as sent to the exchange
+
+    Returns:
+        Seconds per candle, or None for calendar months and unknown values
+    """
+    value = value.strip().removesuffix("utc")
+    match = _TIMEFRAME.match(value)
+    if match is None or match.group(0) == "":
+        return None
+    count, unit = match.groups()
+    if unit not in _UNITS:
+        return None
+    seconds = _UNITS[unit]
+    if seconds is None:
+        return None
+    return (int(count) if count else 1) * seconds
+
+
+def candle_ttl(timeframe: int, now: float | None = None, settle: float = CANDLE_SETTLE) -> float:
+    """Seconds a candle response stays valid: until the current candle closes.
+
+    Every bot asking for the same pair and timeframe within one candle gets
+    the same response, and the first request after a close goes upstream.
+
+    Args:
+        timeframe: Candle length in seconds
+        now: Current UNIX time, defaults to the wall clock
+        settle: Seconds after a close during which responses are kept only
+            until the close has settled
+
+    Returns:
+        TTL in seconds
+    """
+    now = time.time() if now is None else now
+    offset = WEEK_OFFSET if timeframe % 604800 == 0 else 0
+    elapsed = (now - offset) % timeframe
+    if elapsed < settle:
+        return settle - elapsed
+    return timeframe - elapsed
+
+
+def is_private(method: str, headers: Mapping[str, str], query: Mapping[str, str]) -> bool:
+    """Whether a request may carry account data and must not be shared."""
+    if method != "GET":
+        return True
+    if any(header.lower() in CREDENTIAL_HEADERS for header in headers):
+        return True
+    return any(param.lower() in SIGNATURE_PARAMS for param in query)
+
+
+def cache_ttl(
+    exchange: ExchangeRoutes,
+    path: str,
+    query: Mapping[str, str],
+    now: float | None = None,
+) -> float:
+    """Return how long a public response may be cached.
+
+    Args:
+        exchange: Routes of the proxied exchange
+        path: Request path on the exchange host
+        query: Query parameters
+        now: Current UNIX time, defaults to the wall clock
+
+    Returns:
+        TTL in seconds; 0 means the request is only coalesced while in flight
+    """
+    route = exchange.routes.get(path)
+    if route is None:
+        return 0.0
+    if route.kind == "markets":
+        return MARKETS_TTL
+    if route.kind == "ticker":
+        return TICKER_TTL
+    if route.kind == "orderbook":
+        return ORDERBOOK_TTL
+
+    value = query.get(route.timeframe_param or "", route.default_timeframe)
+    timeframe = parse_timeframe(value) if value else None
+    if timeframe is None:
+        return OHLCV_FALLBACK_TTL
+    return candle_ttl(timeframe, now)
@@ -0,0 +1,188 @@
+"""HTTP proxy sharing public exchange responses between bots.
+
+ccxt prefixes every request URL with its ``proxyUrl``, so a request for
+``/https://api.binance.com/api/v3/klines?...`` is forwarded to that URL.
+Public GETs are coalesced while in flight and cached per route; private
+requests go straight upstream.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import aiohttp
+from aiohttp import web
+from multidict import CIMultiDict
+from yarl import URL
+
+from freqtrade_operator.marketdata.routes import ExchangeRoutes, cache_ttl, is_private
+from freqtrade_operator.utils.cache import CoalescingCache
+
+logger = logging.getLogger(__name__)
+
+# Headers describing the connection to the proxy, not the proxied request
+HOP_BY_HOP = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+        "content-length",
+        "content-encoding",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class UpstreamResponse:
+    """Response from the exchange, as returned to bots."""
+
+    status: int
+    body: bytes
+    headers: tuple[tuple[str, str], ...]
+
+
+class UpstreamClient:
+    """Pooled client for the exchange hosts."""
+
+    def __init__(self, limit: int = 64, timeout: float = 30.0) -> None:
+        self.limit = limit
+        self.timeout = timeout
+        self._session: aiohttp.ClientSession | None = None
+
+    async def start(self) -> None:
+        """Open the underlying connection pool."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def request(
+        self,
+        method: str,
+        url: URL,
+        headers: CIMultiDict[str],
+        body: bytes | None = None,
+    ) -> UpstreamResponse:
+        """Forward one request to the exchange.
+
+        Args:
+            method: HTTP method
+            url: Full exchange URL, already encoded
+            headers: Request headers without hop-by-hop headers
+            body: Request body
+
+        Returns:
+            Status, body and end-to-end response headers
+        """
+        await self.start()
+        assert self._session is not None
+        async with self._session.request(method, url, headers=headers, data=body) as resp:
+            payload = await resp.read()
+            return UpstreamResponse(
+                resp.status,
+                payload,
+                tuple((k, v) for k, v in resp.headers.items() if k.lower() not in HOP_BY_HOP),
+            )
+
+
+EXCHANGE_KEY = web.AppKey("exchange", ExchangeRoutes)
+CLIENT_KEY = web.AppKey("client", UpstreamClient)
+CACHE_KEY = web.AppKey("cache", CoalescingCache)
+STATS_KEY = web.AppKey("stats", dict)
+
+
+def _forward_headers(request: web.Request) -> CIMultiDict[str]:
+    return CIMultiDict((k, v) for k, v in request.headers.items() if k.lower() not in HOP_BY_HOP)
+
+
+async def healthz(request: web.Request) -> web.Response:
+    """Liveness endpoint."""
+    return web.json_response({"status": "healthy"})
+
+
+async def stats(request: web.Request) -> web.Response:
+    """Report how many requests were served from cache or shared."""
+    cache = request.app[CACHE_KEY]
+    return web.json_response(
+        {
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "coalesced": cache.coalesced,
+            **request.app[STATS_KEY],
+        }
+    )
+
+
+async def proxy(request: web.Request) -> web.Response:
+    """Forward a request to the exchange, sharing public responses."""
+    # raw_path keeps the upstream URL exactly as ccxt encoded and signed it
+    target = URL(request.raw_path[1:], encoded=True)
+    exchange = request.app[EXCHANGE_KEY]
+    if target.scheme not in ("http", "https") or target.host not in exchange.hosts:
+        raise web.HTTPForbidden(text="Upstream host not allowed")
+
+    client = request.app[CLIENT_KEY]
+    headers = _forward_headers(request)
+    try:
+        if is_private(request.method, request.headers, target.query):
+            request.app[STATS_KEY]["passed_through"] += 1
+            resp = await client.request(
+                request.method, target, headers, await request.read() or None
+            )
+        else:
+            params = tuple(sorted(target.query.items()))
+            resp = await request.app[CACHE_KEY].get_or_fetch(
+                (target.host, target.path, params),
+                cache_ttl(exchange, target.path, target.query),
+                lambda: client.request("GET", target, headers),
+                cacheable=lambda r: r.status == 200,
+            )
+    except (aiohttp.ClientError, TimeoutError) as e:
+        logger.warning(f"Upstream request to {target.host}{target.path} failed: {e}")
+        raise web.HTTPBadGateway(text=f"{target.host} unreachable")
+
+    return web.Response(status=resp.status, body=resp.body, headers=CIMultiDict(resp.headers))
+
+
+def create_app(
+    exchange: ExchangeRoutes,
+    client: UpstreamClient,
+    cache: CoalescingCache[UpstreamResponse] | None = None,
+) -> web.Application:
+    """Create the market-data proxy application.
+
+    Args:
+        exchange: Hosts and public routes of the proxied exchange
+        client: Pooled upstream client shared by all requests
+        cache: Response cache, a fresh one is created if omitted
+
+    Returns:
+        Configured aiohttp application
+    """
+    app = web.Application()
+    app[EXCHANGE_KEY] = exchange
+    app[CLIENT_KEY] = client
+    app[CACHE_KEY] = cache if cache is not None else CoalescingCache()
+    app[STATS_KEY] = {"passed_through": 0}
+
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/stats", stats)
+    app.router.add_route("*", "/{target:.+}", proxy)
+
+    async def close_client(app: web.Application) -> None:
+        await app[CLIENT_KEY].close()
+
+    app.on_cleanup.append(close_client)
+    return app
@@ -0,0 +1,218 @@
+"""Aggregated, rate-limited Kubernetes Events for reconciled objects.
+
+kopf's own posting turns every log line of a handled object into an Event.
+Handlers instead record an Event per state change here. Repeats of one
+reason on one object become a single Event with a count. Each object
+gets at most one post per interval, and with the default ``transitions``
+mode a Normal Event whose reason matches the previous one is only logged.
+Every recorded Event is still logged and added to the current span.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from opentelemetry import trace
+
+from freqtrade_operator.observability.instrumentation import api_call, api_send
+from freqtrade_operator.utils.kube import api_client
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5.0
+MIN_INTERVAL = 30.0
+# Kubernetes drops Events after an hour by default; stop counting into them then
+EVENT_TTL = 3600.0
+
+ObjectId = tuple[str, str, str]  # namespace, kind, name
+EventKey = tuple[str, str, str, str]  # namespace, kind, name, reason
+
+
+@dataclass(slots=True)
+class _Pending:
+    involved: dict[str, str]
+    type: str
+    message: str
+    count: int
+    first: datetime
+    last: datetime
+
+
+@dataclass(slots=True)
+class _Posted:
+    name: str
+    count: int
+    at: float
+
+
+class EventSink:
+    """Buffer, aggregate and post Events for the objects handled by the operator."""
+
+    def __init__(self, transitions_only: bool = True, min_interval: float = MIN_INTERVAL) -> None:
+        self.transitions_only = transitions_only
+        self.min_interval = min_interval
+        self.running = False
+        self._lock = threading.Lock()
+        self._pending: dict[EventKey, _Pending] = {}
+        self._posted: dict[EventKey, _Posted] = {}
+        self._last_reason: dict[ObjectId, str] = {}
+        self._next_post: dict[ObjectId, float] = {}
+
+    def record(self, body: Any, reason: str, message: str, type: str = "Normal") -> None:
+        """Record an Event for an object.
+
+        Args:
+            body: The object, as passed to kopf handlers
+            reason: Short CamelCase reason, e.g. ``Created``
+            message: Human-readable detail
+            type: ``Normal`` or ``Warning``
+        """
+        metadata = body["metadata"]
+        obj: ObjectId = (metadata["namespace"], body["kind"], metadata["name"])
+        log = logger.warning if type == "Warning" else logger.info
+        log(f"{obj[1]} {obj[0]}/{obj[2]}: {reason}: {message}")
+        trace.get_current_span().add_event(reason, {"message": message, "type": type})
+        if not self.running:
+            return
+
+        key: EventKey = (*obj, reason)
+        now = datetime.now(UTC)
+        with self._lock:
+            previous = self._last_reason.get(obj)
+            self._last_reason[obj] = sys.intern(reason)
+            if self.transitions_only and type == "Normal" and previous == reason:
+                return
+            pending = self._pending.get(key)
+            if pending is not None:
+                pending.count += 1
+                pending.message = message
+                pending.last = now
+                return
+            self._pending[key] = _Pending(
+                involved={
+                    "apiVersion": body["apiVersion"],
+                    "kind": body["kind"],
+                    "name": metadata["name"],
+                    "namespace": metadata["namespace"],
+                    "uid": metadata["uid"],
+                },
+                type=type,
+                message=message,
+                count=1,
+                first=now,
+                last=now,
+            )
+
+    def forget(self, namespace: str, kind: str, name: str) -> None:
+        """Drop the transition state of a deleted object; pending Events are still posted."""
+        with self._lock:
+            self._last_reason.pop((namespace, kind, name), None)
+
+    def _due(self) -> list[tuple[EventKey, _Pending]]:
+        """Take the pending Events of objects whose rate limit allows a post."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for key, pending in list(self._pending.items()):
+                obj = key[:3]
+                if self._next_post.get(obj, 0.0) <= now:
+                    due.append((key, pending))
+                    del self._pending[key]
+            for key, _ in due:
+                self._next_post[key[:3]] = now + self.min_interval
+            # Forget objects that have been quiet for longer than an Event lives
+            for key, posted in list(self._posted.items()):
+                if now - posted.at > EVENT_TTL:
+                    del self._posted[key]
+            for obj, at in list(self._next_post.items()):
+                if now - at > EVENT_TTL:
+                    del self._next_post[obj]
+        return due
+
+    def flush(self) -> None:
+        """Post every pending Event that its object's rate limit allows."""
+        core_v1 = client.CoreV1Api(api_client())
+        for key, pending in self._due():
+            namespace = key[0]
+            posted = self._posted.get(key)
+            try:
+                if posted is not None:
+                    count = posted.count + pending.count
+                    api_send(
+                        "patch",
+                        "event",
+                        core_v1.patch_namespaced_event,
+                        name=posted.name,
+                        namespace=namespace,
+                        body={
+                            "count": count,
+                            "message": pending.message,
+                            "lastTimestamp": pending.last,
+                        },
+                    )
+                    self._posted[key] = _Posted(posted.name, count, time.monotonic())
+                    continue
+            except ApiException as e:
+                if e.status != 404:
+                    logger.warning(f"Failed to update event {posted.name}: {e.reason}")
+                    continue
+            try:
+                event = api_call(
+                    "create",
+                    "event",
+                    core_v1.create_namespaced_event,
+                    namespace=namespace,
+                    body={
+                        "apiVersion": "v1",
+                        "kind": "Event",
+                        "metadata": {
+                            "generateName": f"{key[2]}.",
+                            "namespace": namespace,
+                        },
+                        "involvedObject": pending.involved,
+                        "reason": key[3],
+                        "message": pending.message,
+                        "type": pending.type,
+                        "count": pending.count,
+                        "firstTimestamp": pending.first,
+                        "lastTimestamp": pending.last,
+                        "source": {"component": "freqtrade-operator"},
+                        "reportingComponent": "freqtrade-operator",
+                    },
+                )
+            except ApiException as e:
+                logger.warning(
+                    f"Failed to post event {key[3]} for {namespace}/{key[2]}: {e.reason}"
+                )
+                continue
+            self._posted[key] = _Posted(event.metadata.name, pending.count, time.monotonic())
+
+    async def run(self, interval: float = FLUSH_INTERVAL) -> None:
+        """Flush pending Events every ``interval`` seconds until cancelled."""
+        self.running = True
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await asyncio.to_thread(self.flush)
+        finally:
+            self.running = False
+            await asyncio.to_thread(self.flush)
+
+
+event_sink = EventSink(
+    transitions_only=os.getenv("EVENTS_MODE", "transitions") != "all",
+    min_interval=float(os.getenv("EVENTS_MIN_INTERVAL", MIN_INTERVAL)),
+)
+
+
+def record_event(body: Any, reason: str, message: str, type: str = "Normal") -> None:
+    """Record an Event for an object with the operator's sink; see :meth:`EventSink.record`."""
+    event_sink.record(body, reason, message, type)
@@ -0,0 +1,178 @@
+"""Tracing and metrics helpers for handlers and Kubernetes API calls."""
+
+import asyncio
+import contextlib
+import functools
+import time
+from collections.abc import Callable, Iterator
+from typing import Any, TypeVar
+
+from kubernetes.client.rest import ApiException
+from opentelemetry import metrics, trace
+from opentelemetry.trace import Status, StatusCode
+
+from freqtrade_operator.observability.otel import create_operator_metrics
+from freqtrade_operator.utils.debounce import Debounced
+
+T = TypeVar("T")
+F = TypeVar("F", bound=Callable[..., Any])
+
+# The API returns proxies that bind to the real providers once
+# setup_opentelemetry() has installed them, so these are safe at import time
+tracer = trace.get_tracer("freqtrade_operator")
+_metrics: dict[str, Any] | None = None
+
+
+def operator_metrics() -> dict[str, Any]:
+    """Return the operator's metric instruments, creating them once."""
+    global _metrics
+    if _metrics is None:
+        _metrics = create_operator_metrics(metrics.get_meter("freqtrade_operator"))
+    return _metrics
+
+
+def api_call(verb: str, resource: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Invoke a Kubernetes API call inside a span, recording latency and errors.
+
+    Args:
+        verb: API verb (create, replace, patch, delete, get, list)
+        resource: Resource kind, lower case
+        fn: Bound API client method
+        *args: Positional arguments for ``fn``
+        **kwargs: Keyword arguments for ``fn``
+
+    Returns:
+        Whatever ``fn`` returns
+    """
+    m = operator_metrics()
+    attributes = {"verb": verb, "resource": resource}
+    body = kwargs.get("body")
+    name = kwargs.get("name") or (
+        body.get("metadata", {}).get("name", "") if isinstance(body, dict) else ""
+    )
+    span_attributes = {
+        **attributes,
+        "k8s.namespace": str(kwargs.get("namespace", "")),
+        "k8s.name": str(name),
+    }
+
+    with tracer.start_as_current_span(
+        f"k8s {verb} {resource}",
+        attributes=span_attributes,
+        record_exception=False,
+        set_status_on_exception=False,
+    ) as span:
+        m["api_requests_inflight"].add(1, attributes)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except ApiException as e:
+            reason = e.reason or "Unknown"
+            m["api_errors"].add(1, {**attributes, "reason": reason, "status": e.status or 0})
+            span.set_attribute("http.status_code", e.status or 0)
+            span.set_status(Status(StatusCode.ERROR, reason))
+            raise
+        finally:
+            m["api_request_duration"].record(time.perf_counter() - start, attributes)
+            m["api_requests_inflight"].add(-1, attributes)
+
+
+def api_send(verb: str, resource: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """Like :func:`api_call`, for calls whose response body is not used.
+
+    The response is not deserialised into client models, which is most of
+    the cost of writing large objects such as Deployments; it is only
+    drained so the connection goes back to the pool.
+
+    Args:
+        verb: API verb (create, replace, patch, delete)
+        resource: Resource kind, lower case
+        fn: Bound API client method
+        *args: Positional arguments for ``fn``
+        **kwargs: Keyword arguments for ``fn``
+    """
+
+    def send(*args: Any, **kwargs: Any) -> None:
+        response = fn(*args, _preload_content=False, **kwargs)
+        response.drain_conn()
+        response.release_conn()
+
+    api_call(verb, resource, send, *args, **kwargs)
+
+
+def _error_reason(error: BaseException) -> str:
+    if isinstance(error, ApiException) and error.reason:
+        return str(error.reason)
+    cause = error.__cause__ or error.__context__
+    if isinstance(cause, ApiException) and cause.reason:
+        return str(cause.reason)
+    return type(error).__name__
+
+
+@contextlib.contextmanager
+def reconcile_span(kind: str, action: str, namespace: str, name: str) -> Iterator[None]:
+    """Record one handler invocation as a span plus duration and error metrics.
+
+    Args:
+        kind: Resource kind handled, e.g. ``FreqtradeBot``
+        action: Handler action, e.g. ``create``
+        namespace: Namespace of the handled object
+        name: Name of the handled object
+    """
+    m = operator_metrics()
+    attributes = {"kind": kind, "action": action}
+    with tracer.start_as_current_span(
+        f"reconcile {kind} {action}",
+        attributes={**attributes, "k8s.namespace": namespace, "k8s.name": name},
+    ):
+        m["reconciliations_inflight"].add(1, attributes)
+        started = time.perf_counter()
+        outcome = "success"
+        try:
+            yield
+        except Debounced:
+            outcome = "debounced"
+            raise
+        except BaseException as e:
+            outcome = "error"
+            m["bot_errors"].add(1, {**attributes, "reason": _error_reason(e)})
+            raise
+        finally:
+            m["reconciliation_duration"].record(
+                time.perf_counter() - started, {**attributes, "outcome": outcome}
+            )
+            m["reconciliations_inflight"].add(-1, attributes)
+
+
+def instrumented(kind: str, action: str) -> Callable[[F], F]:
+    """Wrap a kopf handler in :func:`reconcile_span`.
+
+    Apply below the ``@kopf.on...`` decorator so kopf registers the wrapper.
+
+    Args:
+        kind: Resource kind handled, e.g. ``FreqtradeBot``
+        action: Handler action, e.g. ``create``
+    """
+
+    def decorator(fn: F) -> F:
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with reconcile_span(
+                    kind, action, str(kwargs.get("namespace", "")), str(kwargs.get("name", ""))
+                ):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with reconcile_span(
+                kind, action, str(kwargs.get("namespace", "")), str(kwargs.get("name", ""))
+            ):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -95,9 +95,54 @@ def create_operator_metrics(meter: metrics.Meter) -> dict[str, metrics.Instrumen
             description="Duration of reconciliation loop",
             unit="s",
         ),
+        "reconcile_coalesced": meter.create_counter(
+            name="freqtrade_reconcile_coalesced_edits_total",
+            description="Spec edits folded into a later reconcile of the same object",
+            unit="1",
+        ),
+        "reconcile_debounce": meter.create_histogram(
+            name="freqtrade_reconcile_debounce_seconds",
+            description="Time from the first edit of a burst to its reconcile",
+            unit="s",
+        ),
+        "bot_startup": meter.create_histogram(
+            name="freqtrade_bot_startup_seconds",
+            description="Time from scheduling a bot pod until it is ready to trade",
+            unit="s",
+        ),
+        "bot_rollout": meter.create_histogram(
+            name="freqtrade_bot_rollout_seconds",
+            description="Time from a FreqtradeBot spec change until it is ready, by stage",
+            unit="s",
+        ),
+        "telemetry_scrape_errors": meter.create_counter(
+            name="freqtrade_bot_telemetry_scrape_errors_total",
+            description="Bots whose API could not be read by the telemetry exporter",
+            unit="1",
+        ),
         "active_bots": meter.create_up_down_counter(
             name="freqtrade_active_bots",
             description="Number of active trading bots",
             unit="1",
         ),
+        "reconciliations_inflight": meter.create_up_down_counter(
+            name="freqtrade_reconciliations_inflight",
+            description="Number of handler invocations currently running",
+            unit="1",
+        ),
+        "api_request_duration": meter.create_histogram(
+            name="freqtrade_operator_api_request_duration_seconds",
+            description="Latency of Kubernetes API calls by verb and resource",
+            unit="s",
+        ),
+        "api_errors": meter.create_counter(
+            name="freqtrade_operator_api_errors_total",
+            description="Failed Kubernetes API calls by verb, resource and reason",
+            unit="1",
+        ),
+        "api_requests_inflight": meter.create_up_down_counter(
+            name="freqtrade_operator_api_requests_inflight",
+            description="Number of Kubernetes API calls currently in flight",
+            unit="1",
+        ),
     }
@@ -0,0 +1,197 @@
+"""On-demand sampling profiler for the running operator.
+
+Serves ``GET /debug/profile`` on a separate port. Each request samples the
+stacks of all threads for a bounded number of seconds from a background
+thread, so the event loop keeps running while it is profiled, and returns
+the samples in collapsed-stack format (one ``frame;frame;frame count``
+line per unique stack, as consumed by ``flamegraph.pl`` or speedscope)
+together with the largest live allocations made while it ran.
+"""
+
+import asyncio
+import hmac
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import FrameType
+from typing import Any
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+PROFILER_PORT = 8081
+DEFAULT_SECONDS = 10.0
+MAX_SECONDS = 60.0
+DEFAULT_INTERVAL = 0.01
+MIN_INTERVAL = 0.005
+MAX_TOP = 100
+
+LOCK_KEY = web.AppKey("lock", asyncio.Lock)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    # Semicolons separate frames in collapsed output
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def sample_stacks(seconds: float, interval: float) -> Counter[str]:
+    """Sample the stacks of all other threads.
+
+    Args:
+        seconds: How long to sample for
+        interval: Delay between samples
+
+    Returns:
+        Counter of collapsed stacks (root first, prefixed with the thread name)
+    """
+    me = threading.get_ident()
+    stacks: Counter[str] = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            labels = []
+            current: FrameType | None = frame
+            while current is not None:
+                labels.append(_frame_label(current))
+                current = current.f_back
+            labels.append(names.get(ident, str(ident)).replace(";", ":"))
+            stacks[";".join(reversed(labels))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, limit: int) -> list[dict[str, Any]]:
+    """Summarise a tracemalloc snapshot by allocating source line.
+
+    Args:
+        snapshot: Snapshot taken while tracing
+        limit: Number of entries to return
+
+    Returns:
+        List of ``{"location", "sizeBytes", "count"}`` dicts, largest first
+    """
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "sizeBytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def profile(seconds: float, interval: float, top: int) -> dict[str, Any]:
+    """Run one profile, tracing allocations for its duration if not already on.
+
+    Args:
+        seconds: How long to sample for
+        interval: Delay between stack samples
+        top: Number of allocation sites to report
+
+    Returns:
+        Dict with ``collapsed`` stacks, ``samples`` count and ``memory`` entries
+    """
+    # Only track the allocating frame to keep tracing overhead low
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(1)
+    try:
+        stacks = sample_stacks(seconds, interval)
+        snapshot = tracemalloc.take_snapshot()
+        traced_current, traced_peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    return {
+        "seconds": seconds,
+        "interval": interval,
+        "samples": sum(stacks.values()),
+        "collapsed": "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()),
+        "memory": {
+            "tracedBytes": traced_current,
+            "peakBytes": traced_peak,
+            "top": top_allocations(snapshot, top),
+        },
+    }
+
+
+def _bounded(request: web.Request, key: str, default: float, low: float, high: float) -> float:
+    try:
+        value = float(request.query.get(key, default))
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"{key} must be a number") from None
+    return min(max(value, low), high)
+
+
+async def handle_profile(request: web.Request) -> web.StreamResponse:
+    """Profile the process; ``?format=collapsed`` returns only the stacks."""
+    seconds = _bounded(request, "seconds", DEFAULT_SECONDS, 0.1, MAX_SECONDS)
+    interval = _bounded(request, "interval", DEFAULT_INTERVAL, MIN_INTERVAL, 1.0)
+    top = int(_bounded(request, "top", 25, 1, MAX_TOP))
+
+    # One profile at a time, so concurrent requests cannot stack up overhead
+    lock = request.app[LOCK_KEY]
+    if lock.locked():
+        raise web.HTTPConflict(text="A profile is already running")
+    async with lock:
+        logger.info(f"Profiling for {seconds}s at {interval}s intervals")
+        result = await asyncio.to_thread(profile, seconds, interval, top)
+
+    if request.query.get("format") == "collapsed":
+        return web.Response(text=result["collapsed"], content_type="text/plain")
+    return web.json_response(result)
+
+
+def create_app(token: str) -> web.Application:
+    """Create the profiler application.
+
+    Args:
+        token: Bearer token required on every request
+
+    Returns:
+        aiohttp application
+    """
+
+    @web.middleware
+    async def bearer_auth(request: web.Request, handler: Any) -> web.StreamResponse:
+        header = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+            raise web.HTTPUnauthorized(headers={"WWW-Authenticate": "Bearer"})
+        return await handler(request)
+
+    app = web.Application(middlewares=[bearer_auth])
+    app[LOCK_KEY] = asyncio.Lock()
+    app.router.add_get("/debug/profile", handle_profile)
+    return app
+
+
+async def start_profiler(token: str, port: int = PROFILER_PORT) -> web.AppRunner:
+    """Serve the profiler on ``port`` until the returned runner is cleaned up.
+
+    Args:
+        token: Bearer token required on every request
+        port: Port to listen on
+
+    Returns:
+        Runner to clean up on shutdown
+    """
+    runner = web.AppRunner(create_app(token), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    logger.info(f"Profiler listening on :{port}")
+    return runner
@@ -0,0 +1,323 @@
+"""Traces of FreqtradeBot rollouts, from a spec change until the bot is ready.
+
+A rollout starts when the create or update handler first runs for a new
+generation of a bot. Its root span parents every attempt to reconcile that
+generation, including attempts held back by debouncing, together with
+their Kubernetes API calls. If the handler replaced the Deployment, the
+rollout ends when the first pod created after that becomes Ready. Its
+later stages are rebuilt from the pod's conditions and container start
+times. Otherwise, or if the replace kept the pod template and so started
+no pod, the rollout ends with the reconcile. A rollout fails with a
+permanent handler error, and expires if no pod becomes Ready within
+``ROLLOUT_TIMEOUT``. Rollouts that are still pending are lost when the
+operator restarts.
+"""
+
+import functools
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, TypeVar
+
+import kopf
+from opentelemetry import trace
+from opentelemetry.trace import Span, Status, StatusCode
+
+from freqtrade_operator.observability.instrumentation import operator_metrics, tracer
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+ObjectKey = tuple[str, str]  # namespace, name
+
+# In order; each stage ends where the next one starts
+STAGES = ("wait", "apply", "create", "schedule", "init", "pull", "start")
+
+# Seconds a rollout waits for a ready pod after its reconcile
+ROLLOUT_TIMEOUT = 3600.0
+
+
+def _timestamp(value: str | None) -> float | None:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def _isoformat(timestamp: float) -> str:
+    return (
+        datetime.fromtimestamp(timestamp, UTC).isoformat(timespec="seconds").replace("+00:00", "Z")
+    )
+
+
+def condition_time(status: dict[str, Any], kind: str) -> datetime | None:
+    """Return when a pod condition last became True, or None if it is not."""
+    for condition in status.get("conditions") or []:
+        if condition["type"] == kind and condition["status"] == "True":
+            return datetime.fromisoformat(condition["lastTransitionTime"])
+    return None
+
+
+def _first_start(status: dict[str, Any], container: str) -> float | None:
+    """Return the first start of a container, looking past its restarts."""
+    for container_status in status.get("containerStatuses") or []:
+        if container_status["name"] != container:
+            continue
+        starts = [
+            _timestamp((state.get(phase) or {}).get("startedAt"))
+            for state in (container_status.get("lastState") or {}, container_status["state"])
+            for phase in ("running", "terminated")
+        ]
+        return min((start for start in starts if start is not None), default=None)
+    return None
+
+
+def pod_stages(meta: dict[str, Any], status: dict[str, Any]) -> list[tuple[str, float]]:
+    """Return when each pod stage of a rollout ended.
+
+    ``create`` ends when the Deployment controller has created the pod,
+    which includes stopping the old pod first. ``init`` covers the init
+    containers and their image pulls, ``pull`` the freqtrade image pull and
+    container creation, and ``start`` the time until the freqtrade API first
+    answers the readiness probe.
+    """
+
+    def condition(kind: str) -> float | None:
+        at = condition_time(status, kind)
+        return at.timestamp() if at is not None else None
+
+    scheduled = condition("PodScheduled")
+    initialized = condition("Initialized")
+    ready = condition("Ready")
+    return [
+        ("create", _timestamp(meta["creationTimestamp"]) or 0.0),
+        ("schedule", scheduled or 0.0),
+        ("init", initialized or 0.0),
+        ("pull", _first_start(status, "freqtrade") or 0.0),
+        ("start", ready or 0.0),
+    ]
+
+
+@dataclass(slots=True)
+class _Rollout:
+    generation: int
+    span: Span
+    seen: float
+    invoked: float
+    applied: float | None = None
+    # When the Deployment was replaced, if it was
+    replaced: float | None = None
+
+
+class RolloutTracker:
+    """Keep the open rollout of each bot until its pod is ready."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[ObjectKey, _Rollout] = {}
+        self._done: dict[ObjectKey, int] = {}
+        # Hash of the pod template last written to each bot's Deployment
+        self._templates: dict[ObjectKey, str] = {}
+
+    def begin(self, namespace: str, name: str, generation: int) -> _Rollout | None:
+        """Open or continue the rollout of a bot's generation.
+
+        Returns:
+            The rollout, or None if this generation was already applied
+        """
+        key = (namespace, name)
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            rollout = self._pending.get(key)
+            if rollout is not None and rollout.applied is not None:
+                if rollout.generation == generation:
+                    return None
+                self._end(rollout, "superseded")
+                rollout = None
+            if rollout is None:
+                if self._done.get(key) == generation:
+                    return None
+                span = tracer.start_span(
+                    "rollout FreqtradeBot",
+                    start_time=int(now * 1e9),
+                    attributes={"k8s.namespace": namespace, "k8s.name": name},
+                )
+                rollout = self._pending[key] = _Rollout(generation, span, seen=now, invoked=now)
+            rollout.generation = generation
+            rollout.span.set_attribute("freqtrade.generation", generation)
+            rollout.invoked = now
+            return rollout
+
+    def replaced(self, namespace: str, name: str, template: str, created: bool = False) -> None:
+        """Note that the running attempt wrote the bot's Deployment.
+
+        Args:
+            namespace: Namespace of the bot
+            name: Name of the bot
+            template: Hash of the pod template written; a replace keeping the
+                previous template starts no pod, so there is none to wait for
+            created: The Deployment was created rather than replaced
+        """
+        key = (namespace, name)
+        with self._lock:
+            previous = self._templates.get(key)
+            self._templates[key] = template
+            rollout = self._pending.get(key)
+            if rollout is not None and (created or template != previous):
+                rollout.replaced = time.time()
+
+    def applied(self, namespace: str, name: str) -> dict[str, Any] | None:
+        """Close the reconcile of a rollout.
+
+        Returns:
+            The report of the rollout if it ends here, because no new pod
+            was started
+        """
+        key = (namespace, name)
+        with self._lock:
+            rollout = self._pending.get(key)
+            if rollout is None:
+                return None
+            rollout.applied = time.time()
+            if rollout.replaced is not None:
+                return None
+            del self._pending[key]
+            self._done[key] = rollout.generation
+        return self._finish(namespace, rollout, [], None)
+
+    def failed(self, namespace: str, name: str, error: BaseException) -> None:
+        """End a bot's rollout after its handler failed permanently."""
+        key = (namespace, name)
+        with self._lock:
+            rollout = self._pending.pop(key, None)
+            if rollout is None:
+                return
+            self._done[key] = rollout.generation
+            rollout.span.set_status(Status(StatusCode.ERROR, str(error)))
+            self._end(rollout, "failed")
+
+    def pod_ready(
+        self, namespace: str, name: str, pod: str, meta: dict[str, Any], status: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """End a bot's rollout if ``pod`` is the first ready pod it started.
+
+        Returns:
+            The report of the rollout, or None if none was waiting on the pod
+        """
+        key = (namespace, name)
+        created = _timestamp(meta.get("creationTimestamp")) or 0.0
+        with self._lock:
+            self._expire(time.time())
+            rollout = self._pending.get(key)
+            if rollout is None or rollout.replaced is None:
+                return None
+            # Timestamps of pods have whole seconds
+            if created < int(rollout.replaced):
+                return None
+            if rollout.applied is None:
+                # Ready before the handler returned
+                rollout.applied = rollout.replaced
+            del self._pending[key]
+            self._done[key] = rollout.generation
+        return self._finish(namespace, rollout, pod_stages(meta, status), pod)
+
+    def forget(self, namespace: str, name: str) -> None:
+        """Drop the rollout of a deleted bot."""
+        with self._lock:
+            rollout = self._pending.pop((namespace, name), None)
+            self._done.pop((namespace, name), None)
+            self._templates.pop((namespace, name), None)
+            if rollout is not None:
+                self._end(rollout, "deleted")
+
+    def _expire(self, now: float) -> None:
+        """End the rollouts still waiting for a pod ``ROLLOUT_TIMEOUT`` after their reconcile.
+
+        Must be called with the lock held.
+        """
+        for key, rollout in list(self._pending.items()):
+            if rollout.applied is not None and now - rollout.applied > ROLLOUT_TIMEOUT:
+                del self._pending[key]
+                self._done[key] = rollout.generation
+                self._end(rollout, "expired")
+
+    @staticmethod
+    def _end(rollout: _Rollout, outcome: str) -> None:
+        """End the span of a rollout that did not reach a ready pod."""
+        rollout.span.set_attribute("freqtrade.rollout.outcome", outcome)
+        rollout.span.end()
+
+    def _finish(
+        self,
+        namespace: str,
+        rollout: _Rollout,
+        pod_ends: list[tuple[str, float]],
+        pod: str | None,
+    ) -> dict[str, Any]:
+        """Record the stages of a finished rollout as spans and metrics."""
+        m = operator_metrics()
+        parent = trace.set_span_in_context(rollout.span)
+        ends = [("wait", rollout.invoked), ("apply", rollout.applied or rollout.invoked)]
+        start = rollout.seen
+        stages: dict[str, float] = {}
+        for stage, end in ends + pod_ends:
+            # Pod timestamps are rounded down to the second
+            end = max(end, start)
+            span = tracer.start_span(
+                f"rollout {stage}", context=parent, start_time=int(start * 1e9)
+            )
+            span.end(end_time=int(end * 1e9))
+            stages[stage] = round(end - start, 1)
+            m["bot_rollout"].record(end - start, {"namespace": namespace, "stage": stage})
+            start = end
+
+        seconds = start - rollout.seen
+        m["bot_rollout"].record(seconds, {"namespace": namespace, "stage": "total"})
+        rollout.span.set_attribute("freqtrade.rollout.outcome", "ready" if pod else "applied")
+        if pod is not None:
+            rollout.span.set_attribute("k8s.pod.name", pod)
+        rollout.span.set_status(Status(StatusCode.OK))
+        rollout.span.end(end_time=int(start * 1e9))
+
+        report: dict[str, Any] = {
+            "generation": rollout.generation,
+            "startedAt": _isoformat(rollout.seen),
+            "readyAt": _isoformat(start),
+            "seconds": round(seconds, 1),
+            "stages": stages,
+        }
+        if pod is not None:
+            report["pod"] = pod
+        return report
+
+
+rollouts = RolloutTracker()
+
+
+def traced_rollout(fn: F) -> F:
+    """Run a FreqtradeBot create or update handler inside the bot's rollout.
+
+    Apply between the ``@kopf.on...`` decorator and ``@instrumented``, so the
+    span of each attempt is a child of the rollout. A rollout that ends with
+    the reconcile is written to ``status.rollout`` through kopf's patch.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        namespace, name = str(kwargs["namespace"]), str(kwargs["name"])
+        rollout = rollouts.begin(namespace, name, kwargs["meta"].get("generation", 0))
+        if rollout is None:
+            return fn(*args, **kwargs)
+        with trace.use_span(
+            rollout.span, end_on_exit=False, record_exception=False, set_status_on_exception=False
+        ):
+            try:
+                result = fn(*args, **kwargs)
+            except kopf.PermanentError as e:
+                rollouts.failed(namespace, name, e)
+                raise
+        report = rollouts.applied(namespace, name)
+        if report is not None:
+            kwargs["patch"].status["rollout"] = report
+        return result
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1 @@
+"""Shared pairlists computed by the operator and served to bots' RemotePairList."""
@@ -0,0 +1,39 @@
+"""Entry point for the pairlist server: ``python -m freqtrade_operator.pairlist``."""
+
+import asyncio
+import logging
+import os
+
+from aiohttp import web
+
+from freqtrade_operator.pairlist.server import PairlistDocument, create_app
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    """Serve the mounted pairlist until cancelled."""
+    port = int(os.getenv("PAIRLIST_PORT", "8000"))
+
+    document = PairlistDocument(os.environ["PAIRLIST_PATH"])
+    await asyncio.to_thread(document.refresh)
+    refresh_task = asyncio.create_task(document.run())
+
+    runner = web.AppRunner(create_app(document))
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    logger.info(f"Pairlist server listening on :{port}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        refresh_task.cancel()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
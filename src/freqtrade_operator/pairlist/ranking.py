@@ -0,0 +1,57 @@
+"""Volume ranking with price, spread and blacklist filters, like VolumePairList."""
+
+import re
+from typing import Any
+
+from freqtrade_operator.pairlist.tickers import Ticker
+from freqtrade_operator.utils.manifests import manifest_hash
+
+DEFAULT_NUMBER_ASSETS = 30
+DEFAULT_REFRESH_PERIOD = 1800
+
+# Spec fields deciding the result; pairlists agreeing on all of them share one ranking
+FILTER_FIELDS = ("exchange", "stakeCurrency", "numberAssets", "minValue", "filters")
+
+
+def filter_set_key(spec: dict[str, Any]) -> str:
+    """Digest of the fields of a FreqtradePairlist spec that decide its pairs."""
+    return manifest_hash({field: spec.get(field) for field in FILTER_FIELDS})
+
+
+def rank_pairs(tickers: list[Ticker], spec: dict[str, Any]) -> list[str]:
+    """Rank the pairs of an exchange by 24h quote volume.
+
+    Args:
+        tickers: Tickers of the exchange
+        spec: FreqtradePairlist spec
+
+    Returns:
+        Pairs in ``BASE/QUOTE`` notation, highest volume first
+    """
+    filters = spec.get("filters", {})
+    min_price = filters.get("minPrice")
+    max_price = filters.get("maxPrice")
+    max_spread = filters.get("maxSpreadRatio")
+    blacklist = [re.compile(pattern) for pattern in filters.get("blacklist", [])]
+    min_value = float(spec.get("minValue", 0))
+
+    candidates = []
+    for ticker in tickers:
+        if ticker.quote != spec["stakeCurrency"] or ticker.quote_volume < min_value:
+            continue
+        if ticker.last <= 0:
+            continue
+        if min_price is not None and ticker.last < float(min_price):
+            continue
+        if max_price is not None and ticker.last > float(max_price):
+            continue
+        if max_spread is not None and (
+            ticker.ask <= 0 or 1 - ticker.bid / ticker.ask > float(max_spread)
+        ):
+            continue
+        if any(pattern.fullmatch(ticker.pair) for pattern in blacklist):
+            continue
+        candidates.append(ticker)
+
+    candidates.sort(key=lambda t: (-t.quote_volume, t.pair))
+    return [t.pair for t in candidates[: int(spec.get("numberAssets", DEFAULT_NUMBER_ASSETS))]]
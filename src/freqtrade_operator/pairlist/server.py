@@ -0,0 +1,82 @@
+"""HTTP server answering RemotePairList requests from a published pairlist."""
+
+import asyncio
+import logging
+from pathlib import Path
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Clients may reuse a response this long without asking again
+MAX_AGE = 60
+
+
+class PairlistDocument:
+    """The pairlist published by the operator, as mounted from its ConfigMap.
+
+    Only the small ``version`` file is read on every poll; the document is
+    re-read only when the version changes and is kept in memory as bytes.
+    """
+
+    def __init__(self, path: str, refresh_interval: float = 5.0) -> None:
+        self.path = Path(path)
+        self.refresh_interval = refresh_interval
+        self.version = ""
+        self.body = b""
+
+    def refresh(self) -> None:
+        """Reload the document if its version changed."""
+        try:
+            version = (self.path / "version").read_text().strip()
+        except FileNotFoundError:
+            return
+        if not version or version == self.version:
+            return
+        self.body = (self.path / "pairlist.json").read_bytes()
+        self.version = version
+        logger.info(f"Loaded pairlist {version}")
+
+    async def run(self) -> None:
+        """Poll the version until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except OSError as e:
+                logger.error(f"Failed to load pairlist: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+
+DOCUMENT_KEY = web.AppKey("document", PairlistDocument)
+
+
+async def healthz(request: web.Request) -> web.Response:
+    """Liveness endpoint."""
+    return web.json_response({"status": "healthy"})
+
+
+async def pairlist(request: web.Request) -> web.Response:
+    """Serve the pairlist, or 304 when the client's ETag is current."""
+    document = request.app[DOCUMENT_KEY]
+    if not document.version:
+        raise web.HTTPServiceUnavailable(text="Pairlist not computed yet")
+    headers = {"ETag": f'"{document.version}"', "Cache-Control": f"max-age={MAX_AGE}"}
+    if request.headers.get("If-None-Match") == headers["ETag"]:
+        raise web.HTTPNotModified(headers=headers)
+    return web.Response(body=document.body, content_type="application/json", headers=headers)
+
+
+def create_app(document: PairlistDocument) -> web.Application:
+    """Create the pairlist server application.
+
+    Args:
+        document: Published pairlist to serve
+
+    Returns:
+        Configured aiohttp application
+    """
+    app = web.Application()
+    app[DOCUMENT_KEY] = document
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/pairlist", pairlist)
+    return app
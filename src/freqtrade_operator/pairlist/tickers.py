@@ -0,0 +1,107 @@
+"""24h tickers of whole exchanges, normalized for ranking.
+
+Each supported exchange is read with two public calls, its market list
+and all 24h tickers, so one download covers every pairlist on it.
+"""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import aiohttp
+
+EXCHANGE_URLS = {
+    "binance": "https://api.binance.com",
+    "bybit": "https://api.bybit.com",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Ticker:
+    """24h statistics of one spot pair."""
+
+    pair: str
+    quote: str
+    last: float
+    quote_volume: float
+    bid: float
+    ask: float
+
+
+async def _get_json(session: aiohttp.ClientSession, url: str) -> Any:
+    async with session.get(url) as resp:
+        resp.raise_for_status()
+        return await resp.json()
+
+
+async def _binance(session: aiohttp.ClientSession, base_url: str) -> list[Ticker]:
+    info = await _get_json(session, f"{base_url}/api/v3/exchangeInfo")
+    markets = {
+        s["symbol"]: (s["baseAsset"], s["quoteAsset"])
+        for s in info["symbols"]
+        if s.get("status") == "TRADING"
+    }
+    tickers = []
+    for t in await _get_json(session, f"{base_url}/api/v3/ticker/24hr"):
+        market = markets.get(t["symbol"])
+        if market is None:
+            continue
+        tickers.append(
+            Ticker(
+                f"{market[0]}/{market[1]}",
+                market[1],
+                float(t["lastPrice"]),
+                float(t["quoteVolume"]),
+                float(t["bidPrice"]),
+                float(t["askPrice"]),
+            )
+        )
+    return tickers
+
+
+async def _bybit(session: aiohttp.ClientSession, base_url: str) -> list[Ticker]:
+    info = await _get_json(session, f"{base_url}/v5/market/instruments-info?category=spot")
+    markets = {
+        s["symbol"]: (s["baseCoin"], s["quoteCoin"])
+        for s in info["result"]["list"]
+        if s.get("status") == "Trading"
+    }
+    data = await _get_json(session, f"{base_url}/v5/market/tickers?category=spot")
+    tickers = []
+    for t in data["result"]["list"]:
+        market = markets.get(t["symbol"])
+        if market is None:
+            continue
+        tickers.append(
+            Ticker(
+                f"{market[0]}/{market[1]}",
+                market[1],
+                float(t["lastPrice"]),
+                float(t["turnover24h"]),
+                float(t["bid1Price"] or 0),
+                float(t["ask1Price"] or 0),
+            )
+        )
+    return tickers
+
+
+FETCHERS: dict[str, Callable[[aiohttp.ClientSession, str], Awaitable[list[Ticker]]]] = {
+    "binance": _binance,
+    "bybit": _bybit,
+}
+
+
+async def fetch_tickers(session: aiohttp.ClientSession, exchange: str) -> list[Ticker]:
+    """Download the 24h tickers of all trading spot pairs of an exchange.
+
+    Args:
+        session: HTTP session
+        exchange: ccxt exchange id, a key of :data:`EXCHANGE_URLS`
+
+    Returns:
+        Normalized tickers
+
+    Raises:
+        aiohttp.ClientError: If the exchange cannot be reached or answers with an error
+    """
+    return await FETCHERS[exchange](session, EXCHANGE_URLS[exchange])
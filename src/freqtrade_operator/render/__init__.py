@@ -0,0 +1 @@
+"""Offline rendering and validation of FreqtradeBot and FreqtradeWebserver manifests."""
@@ -0,0 +1,94 @@
+"""Entry point for offline checks: ``python -m freqtrade_operator.render``.
+
+Reads FreqtradeBot and FreqtradeWebserver YAML from files, directories or
+stdin, renders their children and reports every problem found. Exits
+non-zero if any resource has errors, or warnings with ``--strict``.
+"""
+
+import argparse
+import difflib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from freqtrade_operator.render.batch import (
+    diff_render,
+    find_files,
+    load_file,
+    render_batch,
+    write_render,
+)
+from freqtrade_operator.render.schema import load_crd_schemas
+
+
+def _diff_lines(text: str) -> list[str]:
+    """Lines of a rendered child, with ConfigMap values split so diffs stay readable."""
+    if not text:
+        return []
+    manifest = json.loads(text)
+    for key, value in manifest.get("data", {}).items():
+        manifest["data"][key] = value.splitlines()
+    return [f"{line}\n" for line in json.dumps(manifest, indent=2, sort_keys=True).splitlines()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Render, check and optionally write or diff a set of resources."""
+    parser = argparse.ArgumentParser(prog="python -m freqtrade_operator.render")
+    parser.add_argument("paths", nargs="*", default=["-"], help="YAML files or directories")
+    parser.add_argument("--crds", type=Path, default=Path("deploy/crds"), help="CRD directory")
+    parser.add_argument("--namespace", default="default", help="namespace of unqualified objects")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--output", type=Path, help="write rendered children to this directory")
+    parser.add_argument("--diff", type=Path, help="compare with an earlier --output directory")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.paths if path != "-" and not Path(path).exists()]
+    if missing:
+        parser.error(f"no such file or directory: {', '.join(missing)}")
+
+    started = time.monotonic()
+    files = find_files(args.paths)
+    if args.jobs > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            resources = [r for loaded in pool.map(load_file, files) for r in loaded]
+    else:
+        resources = [r for path in files for r in load_file(path)]
+    results = render_batch(resources, load_crd_schemas(args.crds), args.namespace, args.jobs)
+
+    errors = warnings = 0
+    for result in results:
+        for message in result.errors:
+            print(f"error: {result.source}: {result.kind} {result.name}: {message}")
+        for message in result.warnings:
+            print(f"warning: {result.source}: {result.kind} {result.name}: {message}")
+        errors += len(result.errors)
+        warnings += len(result.warnings)
+
+    if args.diff:
+        for path, (before, after) in diff_render(results, args.diff).items():
+            sys.stdout.writelines(
+                difflib.unified_diff(
+                    _diff_lines(before),
+                    _diff_lines(after),
+                    f"a/{path}" if before else "/dev/null",
+                    f"b/{path}" if after else "/dev/null",
+                )
+            )
+    if args.output:
+        write_render(results, args.output)
+
+    manifests = sum(len(result.files) for result in results)
+    print(
+        f"{len(results)} resources, {manifests} manifests in "
+        f"{time.monotonic() - started:.2f}s: {errors} errors, {warnings} warnings",
+        file=sys.stderr,
+    )
+    return 1 if errors or (args.strict and warnings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+"""Render and check many FreqtradeBots and FreqtradeWebservers without a cluster.
+
+Every resource is defaulted and validated against its CRD, then rendered
+with the same resources/ functions the handlers use. Checks that need the
+whole fleet run afterwards. Resources are spread over worker processes.
+
+Secrets are not rendered, because their values are generated at creation.
+Resources the operator shares between bots (poolers, market data proxies,
+training Jobs) are not rendered either.
+"""
+
+import json
+import os
+import sys
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import kopf
+import yaml
+
+from freqtrade_operator.handlers.freqtradebot import assign_api_port
+from freqtrade_operator.handlers.webserver import render_children
+from freqtrade_operator.jobs.archival import create_archival_cronjob
+from freqtrade_operator.jobs.migration import SQLITE_URL
+from freqtrade_operator.render.schema import ResourceType, validate_resource
+from freqtrade_operator.resources.configmap import create_configmap
+from freqtrade_operator.resources.database import create_database, get_database_connection_string
+from freqtrade_operator.resources.deployment import (
+    create_data_pvc,
+    create_deployment,
+    create_service,
+)
+from freqtrade_operator.resources.pooler import pooler_enabled
+from freqtrade_operator.resources.producers import (
+    consumed_producers,
+    get_producer_host,
+    producer_enabled,
+)
+
+GROUP_VERSION = "trading.freqtrade.io/v1alpha1"
+RENDERED_KINDS = ("FreqtradeBot", "FreqtradeWebserver")
+# Rendered objects have no UID yet; a fixed one keeps renders comparable
+OFFLINE_UID = "00000000-0000-0000-0000-000000000000"
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Set in every worker process by _init_worker
+_schemas: dict[ResourceType, dict[str, Any]] = {}
+_producers: dict[tuple[str, str], bool] = {}
+
+
+@dataclass(slots=True)
+class Rendered:
+    """Children and findings of one input resource."""
+
+    source: str
+    kind: str
+    namespace: str
+    name: str
+    # Rendered child manifests as JSON, keyed by ``namespace/kind/name.json``
+    files: dict[str, str] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    # (namespace, CNPG cluster, database) of bots on PostgreSQL
+    database: tuple[str, str, str] | None = None
+
+
+def load_file(path: str) -> list[tuple[str, dict[str, Any]]]:
+    """Parse the resources of a YAML file, or of stdin for ``-``.
+
+    ``List`` documents are expanded into their items.
+
+    Returns:
+        Pairs of ``path:document`` source and resource
+    """
+    text = sys.stdin.read() if path == "-" else Path(path).read_text()
+    resources = []
+    for index, document in enumerate(yaml.load_all(text, Loader=_Loader)):
+        if not isinstance(document, dict):
+            continue
+        items = document.get("items", []) if document.get("kind") == "List" else [document]
+        for item in items:
+            resources.append((f"{path}:{index}", item))
+    return resources
+
+
+def find_files(paths: Iterable[str]) -> list[str]:
+    """Expand directories into the YAML files below them, in a stable order."""
+    files = []
+    for path in paths:
+        if path != "-" and Path(path).is_dir():
+            files.extend(
+                str(p) for p in sorted(Path(path).rglob("*")) if p.suffix in (".yaml", ".yml")
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def _init_worker(
+    schemas: dict[ResourceType, dict[str, Any]], producers: dict[tuple[str, str], bool]
+) -> None:
+    global _schemas, _producers
+    _schemas = schemas
+    _producers = producers
+
+
+def _dump(manifest: dict[str, Any]) -> str:
+    # JSON rather than YAML: kubectl applies either, and the C encoder keeps
+    # serialising from dominating the render
+    return json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+
+
+def _owner_references(kind: str, name: str) -> list[dict[str, Any]]:
+    return [
+        {
+            "apiVersion": GROUP_VERSION,
+            "kind": kind,
+            "name": name,
+            "uid": OFFLINE_UID,
+            "controller": True,
+            "blockOwnerDeletion": True,
+        }
+    ]
+
+
+def _resolve_producers(result: Rendered, spec: dict[str, Any]) -> dict[str, tuple[str, int]]:
+    """Resolve a consumer's producers among the input bots, like the handler does."""
+    producers = {}
+    for producer in consumed_producers(spec):
+        if producer == result.name:
+            result.errors.append("consumes from itself")
+        elif not _producers.get((result.namespace, producer), False):
+            result.errors.append(f"producer {producer} is not a producer bot in the input")
+        else:
+            host = get_producer_host(producer, result.namespace)
+            producers[producer] = (host, assign_api_port(producer))
+    return producers
+
+
+def _render_bot(result: Rendered, spec: dict[str, Any], body: dict[str, Any]) -> None:
+    name, namespace = result.name, result.namespace
+    owner_references = _owner_references("FreqtradeBot", name)
+    api_port = assign_api_port(name)
+
+    db_config = spec.get("database", {})
+    cluster_name = None
+    if db_config.get("type", "sqlite") == "postgresql":
+        cluster_name = db_config.get("postgresql", {}).get("clusterName", "freqtrade-db")
+        database_name = name.replace("-", "_")
+        result.database = (namespace, cluster_name, database_name)
+        # Created with its owner references only, not adopted
+        _add_files(result, [create_database(name, namespace, cluster_name, owner_references)])
+        db_url = get_database_connection_string(
+            cluster_name, namespace, database_name, pooled=pooler_enabled(db_config)
+        )
+    else:
+        db_url = SQLITE_URL
+
+    producers = _resolve_producers(result, spec)
+    manifests = [
+        create_configmap(name, namespace, spec, api_port, db_url, owner_references, producers),
+        create_data_pvc(name, namespace, spec),
+        create_deployment(name, namespace, spec, api_port, owner_references),
+        create_service(name, namespace, api_port),
+    ]
+    archival_config = spec.get("archival", {})
+    if archival_config.get("enabled", False):
+        manifests.append(
+            create_archival_cronjob(
+                name, namespace, archival_config, db_url, cluster_name, owner_references
+            )
+        )
+    for manifest in manifests:
+        kopf.adopt(manifest, owner=body)
+    _add_files(result, manifests)
+
+
+def _add_files(result: Rendered, manifests: Iterable[dict[str, Any]]) -> None:
+    for manifest in manifests:
+        metadata = manifest["metadata"]
+        if manifest["kind"] == "Deployment":
+            _check_pod_ports(result, manifest["spec"]["template"]["spec"])
+        path = f"{metadata['namespace']}/{manifest['kind'].lower()}/{metadata['name']}.json"
+        result.files[path] = _dump(manifest)
+
+
+def _check_pod_ports(result: Rendered, pod_spec: dict[str, Any]) -> None:
+    """Report containers of one pod listening on the same port."""
+    listeners: dict[int, str] = {}
+    for container in pod_spec["containers"]:
+        for port in container.get("ports", []):
+            other = listeners.setdefault(port["containerPort"], container["name"])
+            if other != container["name"]:
+                result.errors.append(
+                    f"containers {other} and {container['name']} both listen on "
+                    f"port {port['containerPort']}"
+                )
+
+
+def render_resource(source: str, resource: dict[str, Any], namespace: str) -> Rendered:
+    """Validate one FreqtradeBot or FreqtradeWebserver and render its children.
+
+    Args:
+        source: Where the resource was read, for messages
+        resource: Decoded resource; defaulted in place
+        namespace: Namespace of resources that do not set one
+
+    Returns:
+        Rendered children and the problems found
+    """
+    metadata = resource.setdefault("metadata", {})
+    metadata.setdefault("namespace", namespace)
+    metadata["uid"] = OFFLINE_UID
+    result = Rendered(
+        source, resource.get("kind", ""), metadata["namespace"], metadata.get("name", "")
+    )
+    schema = _schemas.get((resource.get("apiVersion", ""), result.kind))
+    if schema is None:
+        result.errors.append(f"no CRD for {resource.get('apiVersion')} {result.kind}")
+        return result
+    result.errors.extend(validate_resource(resource, schema))
+    if result.errors:
+        return result
+
+    spec = resource["spec"]
+    try:
+        if result.kind == "FreqtradeBot":
+            if spec.get("dryRun", False):
+                result.warnings.append("dryRun is set, the operator creates no children")
+            _render_bot(result, spec, resource)
+        else:
+            children = render_children(result.name, result.namespace, spec, metadata, resource)
+            _add_files(result, children.values())
+    except (KeyError, TypeError, ValueError) as e:
+        result.errors.append(f"failed to render: {type(e).__name__}: {e}")
+    return result
+
+
+def _render_chunk(chunk: list[tuple[str, dict[str, Any]]], namespace: str) -> list[Rendered]:
+    return [render_resource(source, resource, namespace) for source, resource in chunk]
+
+
+def render_batch(
+    resources: list[tuple[str, dict[str, Any]]],
+    schemas: dict[ResourceType, dict[str, Any]],
+    namespace: str = "default",
+    jobs: int | None = None,
+) -> list[Rendered]:
+    """Render and check a set of resources, spread over worker processes.
+
+    Resources of other kinds are skipped.
+
+    Args:
+        resources: Pairs of source and resource, as from :func:`load_file`
+        schemas: CRD schemas, as from ``load_crd_schemas``
+        namespace: Namespace of resources that do not set one
+        jobs: Worker processes (default: one per CPU, ``1`` renders in-process)
+
+    Returns:
+        One result per rendered resource, in input order, with the fleet checks applied
+    """
+    selected = [
+        (source, resource)
+        for source, resource in resources
+        if resource.get("kind") in RENDERED_KINDS
+    ]
+    producers = {
+        (r.get("metadata", {}).get("namespace", namespace), r.get("metadata", {}).get("name")): (
+            producer_enabled(r.get("spec") or {})
+        )
+        for _, r in selected
+        if r["kind"] == "FreqtradeBot"
+    }
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(selected) < 2:
+        _init_worker(schemas, producers)
+        results = _render_chunk(selected, namespace)
+    else:
+        # A few chunks per worker keeps them busy without paying per-resource IPC
+        size = max(1, len(selected) // (jobs * 4))
+        chunks = [selected[i : i + size] for i in range(0, len(selected), size)]
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(schemas, producers)
+        ) as pool:
+            rendered = pool.map(_render_chunk, chunks, [namespace] * len(chunks))
+            results = [result for chunk in rendered for result in chunk]
+    check_fleet(results)
+    return results
+
+
+def check_fleet(results: list[Rendered]) -> None:
+    """Add the findings that span several resources to their results.
+
+    Duplicate resources, children rendered by two owners and bots sharing a
+    database are errors. API ports are not compared between bots: each bot
+    listens on its own pod IP behind its own Service, so equal ports do not
+    clash. Ports clashing inside one pod are found while rendering.
+    """
+    by_identity: dict[tuple[str, str, str], list[Rendered]] = defaultdict(list)
+    by_file: dict[str, list[Rendered]] = defaultdict(list)
+    by_database: dict[tuple[str, str, str], list[Rendered]] = defaultdict(list)
+    for result in results:
+        by_identity[(result.kind, result.namespace, result.name)].append(result)
+        for path in result.files:
+            by_file[path].append(result)
+        if result.database is not None:
+            by_database[result.database].append(result)
+
+    for (kind, _, name), group in by_identity.items():
+        if len(group) > 1:
+            for result in group:
+                result.errors.append(f"{kind} {name} is defined {len(group)} times")
+    # A resource defined twice is reported once above, not as clashing with itself
+    for path, group in by_file.items():
+        for result in group:
+            if others := _others(result, group):
+                result.errors.append(f"{path} is also rendered by {others}")
+    for (_, cluster, database), group in by_database.items():
+        for result in group:
+            if others := _others(result, group):
+                result.errors.append(f"database {database} on {cluster} is shared with {others}")
+
+
+def _others(result: Rendered, group: list[Rendered]) -> str:
+    owner = (result.kind, result.name)
+    return ", ".join(sorted({f"{r.kind} {r.name}" for r in group if (r.kind, r.name) != owner}))
+
+
+def write_render(results: list[Rendered], directory: Path) -> None:
+    """Write every rendered child to ``directory/namespace/kind/name.json``."""
+    for result in results:
+        for path, text in result.files.items():
+            target = directory / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(text)
+
+
+def diff_render(results: list[Rendered], previous: Path) -> dict[str, tuple[str, str]]:
+    """Compare rendered children with an earlier :func:`write_render` output.
+
+    Returns:
+        Old and new text of every child that changed, keyed by path; a
+        child missing on one side has an empty text there
+    """
+    current = {path: text for result in results for path, text in result.files.items()}
+    before = {
+        str(path.relative_to(previous)): path.read_text() for path in previous.rglob("*.json")
+    }
+    return {
+        path: (before.get(path, ""), current.get(path, ""))
+        for path in sorted(current.keys() | before.keys())
+        if before.get(path) != current.get(path)
+    }
@@ -0,0 +1,129 @@
+"""Offline validation and defaulting against the structural schemas of the CRDs.
+
+Covers the subset of OpenAPI v3 the CRDs in ``deploy/crds`` use, applied
+the way the API server does: defaults fill in missing fields before the
+operator sees a spec, and fields without a schema are rejected unless
+``x-kubernetes-preserve-unknown-fields`` is set (the server would silently
+prune them).
+"""
+
+import copy
+import re
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+# (apiVersion, kind) of a custom resource
+ResourceType = tuple[str, str]
+
+# Services are named after bots, so bot names must be DNS-1035 labels
+DNS_1035_LABEL = re.compile(r"[a-z]([-a-z0-9]{0,61}[a-z0-9])?")
+
+_TYPES: dict[str, tuple[type, ...]] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+}
+
+
+def load_crd_schemas(directory: Path) -> dict[ResourceType, dict[str, Any]]:
+    """Read the ``openAPIV3Schema`` of every served CRD version in a directory.
+
+    Args:
+        directory: Directory holding CustomResourceDefinition YAML files
+
+    Returns:
+        Schemas keyed by apiVersion and kind
+    """
+    schemas = {}
+    for path in sorted(directory.glob("*.yaml")):
+        for crd in yaml.safe_load_all(path.read_text()):
+            if not crd or crd.get("kind") != "CustomResourceDefinition":
+                continue
+            group = crd["spec"]["group"]
+            kind = crd["spec"]["names"]["kind"]
+            for version in crd["spec"]["versions"]:
+                if version.get("served", True):
+                    key = (f"{group}/{version['name']}", kind)
+                    schemas[key] = version["schema"]["openAPIV3Schema"]
+    return schemas
+
+
+def validate(value: Any, schema: dict[str, Any], path: str = "") -> list[str]:
+    """Validate a value against a structural schema, applying defaults in place.
+
+    Args:
+        value: Decoded YAML value; dicts are defaulted in place
+        schema: Structural schema of the value
+        path: Dotted path of the value, for messages
+
+    Returns:
+        Messages for every violation, empty if the value is valid
+    """
+    label = path or "<root>"
+    expected = schema.get("type")
+    if expected is not None:
+        # bool is an int subclass, but not a valid integer or number
+        if not isinstance(value, _TYPES[expected]) or (
+            isinstance(value, bool) and expected != "boolean"
+        ):
+            return [f"{label}: expected {expected}, got {type(value).__name__}"]
+
+    errors = []
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{label}: {value!r} is not one of {schema['enum']}")
+    if "minimum" in schema and isinstance(value, int | float) and value < schema["minimum"]:
+        errors.append(f"{label}: {value} is less than {schema['minimum']}")
+    if "maximum" in schema and isinstance(value, int | float) and value > schema["maximum"]:
+        errors.append(f"{label}: {value} is greater than {schema['maximum']}")
+
+    if isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            errors.append(f"{label}: needs at least {schema['minItems']} items")
+        if "items" in schema:
+            for index, item in enumerate(value):
+                errors.extend(validate(item, schema["items"], f"{path}[{index}]"))
+
+    elif isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for field, field_schema in properties.items():
+            if field not in value and "default" in field_schema:
+                value[field] = copy.deepcopy(field_schema["default"])
+        for field in schema.get("required", []):
+            if field not in value:
+                errors.append(f"{_join(path, field)}: required")
+        extra = schema.get("additionalProperties")
+        for field, item in value.items():
+            if field in properties:
+                errors.extend(validate(item, properties[field], _join(path, field)))
+            elif isinstance(extra, dict):
+                errors.extend(validate(item, extra, _join(path, field)))
+            elif not (extra or schema.get("x-kubernetes-preserve-unknown-fields")):
+                errors.append(f"{_join(path, field)}: unknown field")
+    return errors
+
+
+def validate_resource(resource: dict[str, Any], schema: dict[str, Any]) -> list[str]:
+    """Validate and default the metadata and spec of a custom resource.
+
+    Status is written by the operator and not checked.
+    """
+    errors = []
+    name = resource.get("metadata", {}).get("name")
+    if not name:
+        errors.append("metadata.name: required")
+    elif not DNS_1035_LABEL.fullmatch(name):
+        errors.append(f"metadata.name: {name!r} is not a valid DNS-1035 label")
+    spec_schema = schema.get("properties", {}).get("spec")
+    if spec_schema is not None:
+        resource.setdefault("spec", {})
+        errors.extend(validate(resource["spec"], spec_schema, "spec"))
+    return errors
+
+
+def _join(path: str, field: str) -> str:
+    return f"{path}.{field}" if path else field
@@ -0,0 +1,57 @@
+"""Resource generation for the FreqtradeBots of a FreqtradeBotSet."""
+
+import copy
+from typing import Any
+
+from freqtrade_operator.utils.manifests import manifest_hash
+
+BOTSET_LABEL = "trading.freqtrade.io/botset"
+SHARD_LABEL = "trading.freqtrade.io/shard"
+# Digest of the template and labels a shard was rendered from
+TEMPLATE_ANNOTATION = "trading.freqtrade.io/template-hash"
+
+
+def get_shard_name(name: str, index: int) -> str:
+    """Return the FreqtradeBot name of one shard of a set."""
+    return f"{name}-{index}"
+
+
+def create_shard_bot(
+    name: str,
+    namespace: str,
+    index: int,
+    template: dict[str, Any],
+    pairs: list[str],
+    labels: dict[str, str],
+    owner_references: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create the FreqtradeBot trading one slice of a set's pairs.
+
+    Args:
+        name: FreqtradeBotSet name
+        namespace: Namespace
+        index: Shard index
+        template: FreqtradeBot spec shared by all shards
+        pairs: Pairs of this shard
+        labels: Labels of the set, copied so the shard stays in scope
+        owner_references: Owner references for garbage collection
+
+    Returns:
+        FreqtradeBot resource dict
+    """
+    spec = copy.deepcopy(template)
+    spec["pairs"] = pairs
+    return {
+        "apiVersion": "trading.freqtrade.io/v1alpha1",
+        "kind": "FreqtradeBot",
+        "metadata": {
+            "name": get_shard_name(name, index),
+            "namespace": namespace,
+            "labels": {**labels, BOTSET_LABEL: name, SHARD_LABEL: str(index)},
+            "annotations": {
+                TEMPLATE_ANNOTATION: manifest_hash({"template": template, "labels": labels}),
+            },
+            "ownerReferences": owner_references,
+        },
+        "spec": spec,
+    }
@@ -3,6 +3,17 @@
 import json
 from typing import Any
 
+from freqtrade_operator.resources.freqai import create_freqai_config, freqai_enabled
+from freqtrade_operator.resources.marketdata import (
+    get_market_data_proxy_url,
+    market_data_proxy_enabled,
+)
+from freqtrade_operator.resources.pairlist import create_remote_pairlist
+from freqtrade_operator.resources.producers import (
+    create_external_message_consumer,
+    producer_enabled,
+)
+
 
 def generate_freqtrade_config(
     name: str,
@@ -10,6 +21,7 @@ def generate_freqtrade_config(
     spec: dict[str, Any],
     api_port: int,
     database_url: str,
+    producers: dict[str, tuple[str, int]] | None = None,
 ) -> dict[str, Any]:
     """Generate Freqtrade configuration from FreqtradeBot spec.
 
@@ -19,6 +31,7 @@ def generate_freqtrade_config(
         spec: FreqtradeBot spec
         api_port: Assigned API server port
         database_url: PostgreSQL connection URL
+        producers: Resolved (host, port) of the producers a consumer bot reads from
 
     Returns:
         Complete Freqtrade configuration dict
@@ -29,6 +42,11 @@ def generate_freqtrade_config(
     api_server_config = spec.get("apiServer", {})
     webhooks = spec.get("webhooks", [])
 
+    # Public market data goes through the shared proxy of the exchange
+    ccxt_config: dict[str, Any] = {}
+    if market_data_proxy_enabled(exchange_config):
+        ccxt_config["proxyUrl"] = get_market_data_proxy_url(exchange_config["name"], namespace)
+
     # Build strategy list
     strategy_list = []
     for strategy in strategies:
@@ -71,14 +89,16 @@ def generate_freqtrade_config(
             "name": exchange_config["name"],
             "key": "${EXCHANGE_API_KEY}",
             "secret": "${EXCHANGE_API_SECRET}",
-            "ccxt_config": {},
-            "ccxt_async_config": {},
-            "pair_whitelist": [],
+            "ccxt_config": dict(ccxt_config),
+            "ccxt_async_config": dict(ccxt_config),
+            "pair_whitelist": spec.get("pairs", []),
             "pair_blacklist": [],
         },
-        # Pairlists
+        # Pairlists: a shared pairlist computed by the operator, if referenced
         "pairlists": [
-            {"method": "StaticPairList"},
+            create_remote_pairlist(namespace, spec["pairlist"])
+            if "pairlist" in spec
+            else {"method": "StaticPairList"},
         ],
         # Database
         "db_url": database_url,
@@ -86,7 +106,8 @@ def generate_freqtrade_config(
         "strategy_list": strategy_list,
         # API Server
         "api_server": {
-            "enabled": api_server_config.get("enabled", True),
+            # Producers serve their dataframes over the API server's websocket
+            "enabled": api_server_config.get("enabled", True) or producer_enabled(spec),
             "listen_ip_address": "0.0.0.0",
             "listen_port": api_port,
             "verbosity": api_server_config.get("verbosity", "info"),
@@ -109,6 +130,14 @@ def generate_freqtrade_config(
         },
     }
 
+    if producer_enabled(spec):
+        config["api_server"]["ws_token"] = "${WS_TOKEN}"
+    if producers:
+        config["external_message_consumer"] = create_external_message_consumer(spec, producers)
+    if freqai_enabled(spec):
+        config["freqaimodel"] = spec["freqai"]["model"]
+        config["freqai"] = create_freqai_config(spec)
+
     return config
 
 
@@ -119,6 +148,7 @@ def create_configmap(
     api_port: int,
     database_url: str,
     owner_references: list[dict[str, Any]],
+    producers: dict[str, tuple[str, int]] | None = None,
 ) -> dict[str, Any]:
     """Create ConfigMap resource for Freqtrade configuration.
 
@@ -129,11 +159,12 @@ def create_configmap(
         api_port: Assigned API server port
         database_url: Database connection URL
         owner_references: Owner references for garbage collection
+        producers: Resolved (host, port) of the producers a consumer bot reads from
 
     Returns:
         ConfigMap resource dict
     """
-    config = generate_freqtrade_config(name, namespace, spec, api_port, database_url)
+    config = generate_freqtrade_config(name, namespace, spec, api_port, database_url, producers)
 
     return {
         "apiVersion": "v1",
@@ -2,6 +2,8 @@
 
 from typing import Any
 
+from freqtrade_operator.resources.pooler import get_pooler_name
+
 
 def create_database(
     name: str,
@@ -47,6 +49,7 @@ def get_database_connection_string(
     namespace: str,
     database_name: str,
     username: str = "freqtrade",
+    pooled: bool = False,
 ) -> str:
     """Generate PostgreSQL connection string.
 
@@ -55,17 +58,50 @@ def get_database_connection_string(
         namespace: Namespace
         database_name: Database name
         username: Database username
+        pooled: Connect through the cluster's PgBouncer Pooler
 
     Returns:
         Connection string with environment variable placeholders
     """
-    # Use cluster service for connection
-    host = f"{cluster_name}-rw.{namespace}.svc.cluster.local"
+    # Use the pooler or cluster service for connection
+    service = get_pooler_name(cluster_name) if pooled else f"{cluster_name}-rw"
+    host = f"{service}.{namespace}.svc.cluster.local"
     port = 5432
 
     return f"postgresql://{username}:${{DB_PASSWORD}}@{host}:{port}/{database_name}"
 
 
+def create_database_env(db_url: str, cluster_name: str | None) -> list[dict[str, Any]]:
+    """Create container env exposing a connection string as ``DB_URL``.
+
+    Kubernetes expands ``$(VAR)`` in env values and args, but not the
+    ``${DB_PASSWORD}`` placeholder, so it is rewritten and the password is
+    read from the cluster's CNPG app Secret.
+
+    Args:
+        db_url: Connection string, as returned by get_database_connection_string
+        cluster_name: CNPG cluster name, or None for SQLite
+
+    Returns:
+        Container env entries
+    """
+    env = []
+    if cluster_name is not None:
+        env.append(
+            {
+                "name": "DB_PASSWORD",
+                "valueFrom": {
+                    "secretKeyRef": {
+                        "name": f"{cluster_name}-app",
+                        "key": "password",
+                    }
+                },
+            }
+        )
+    env.append({"name": "DB_URL", "value": db_url.replace("${DB_PASSWORD}", "$(DB_PASSWORD)")})
+    return env
+
+
 def create_database_secret(
     name: str,
     namespace: str,
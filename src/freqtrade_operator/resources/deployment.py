@@ -1,9 +1,29 @@
 """Deployment resource generation for Freqtrade bots."""
 
+import os
 from typing import Any
 
+from freqtrade_operator.resources.freqai import (
+    FREQAI_IMAGE,
+    MODELS_CLAIM,
+    create_bot_models_mount,
+    create_wait_for_models_container,
+    freqai_enabled,
+)
+from freqtrade_operator.resources.producers import create_producer_env
 from freqtrade_operator.utils.git_sync import create_git_sync_container, create_ssh_key_volume
 
+# Set to a digest to pin the image of bots and their Jobs
+FREQTRADE_IMAGE = os.getenv("FREQTRADE_IMAGE", "freqtradeorg/freqtrade:stable")
+
+# Startup probe period and failure threshold per profile: how long a bot may
+# take to answer its first API ping before it is restarted
+STARTUP_PROFILES = {
+    "fast": (2, 60),
+    "standard": (5, 60),
+    "slow": (10, 90),
+}
+
 
 def _build_freqtrade_args(strategies: list[dict[str, Any]]) -> list[str]:
     """Build freqtrade command arguments from strategy configuration."""
@@ -43,12 +63,13 @@ def create_deployment(
     exchange_config = spec["exchange"]
     resources = spec.get("resources", {})
     strategies = spec.get("strategies", [])
+    period, failure_threshold = STARTUP_PROFILES[spec.get("startupProfile", "standard")]
 
     # Build containers
     containers = [
         {
             "name": "freqtrade",
-            "image": "freqtradeorg/freqtrade:stable",
+            "image": FREQAI_IMAGE if freqai_enabled(spec) else FREQTRADE_IMAGE,
             "command": ["freqtrade"],
             "args": _build_freqtrade_args(strategies),
             "env": [
@@ -94,6 +115,7 @@ def create_deployment(
                         }
                     },
                 },
+                *create_producer_env(name, spec),
             ],
             "ports": [
                 {
@@ -116,12 +138,21 @@ def create_deployment(
                     "mountPath": "/freqtrade/user_data",
                 },
             ],
+            # The startup probe holds the other two back until the first ping,
+            # so a bot is Ready as soon as it answers instead of after a fixed delay
+            "startupProbe": {
+                "httpGet": {
+                    "path": "/api/v1/ping",
+                    "port": api_port,
+                },
+                "periodSeconds": period,
+                "failureThreshold": failure_threshold,
+            },
             "livenessProbe": {
                 "httpGet": {
                     "path": "/api/v1/ping",
                     "port": api_port,
                 },
-                "initialDelaySeconds": 30,
                 "periodSeconds": 10,
             },
             "readinessProbe": {
@@ -129,16 +160,20 @@ def create_deployment(
                     "path": "/api/v1/ping",
                     "port": api_port,
                 },
-                "initialDelaySeconds": 10,
                 "periodSeconds": 5,
             },
             "resources": resources,
         }
     ]
 
-    # Add git-sync sidecar only for strategies with a gitRepository
+    # Strategies from git are cloned once before Freqtrade starts, which
+    # would otherwise fail and be restarted until the sidecar has synced
+    init_containers: list[dict[str, Any]] = []
     for strategy in strategies:
         if "gitRepository" in strategy:
+            init_containers.append(
+                create_git_sync_container(strategy, volume_name="strategies", one_time=True)
+            )
             git_sync_container = create_git_sync_container(strategy, volume_name="strategies")
             containers.append(git_sync_container)
 
@@ -162,6 +197,14 @@ def create_deployment(
         },
     ]
 
+    # FreqAI bots load the models trained by the shared training workers.
+    # No init container creates the user data directories: the volume is
+    # mounted there, and Freqtrade creates any missing subdirectory on start
+    if freqai_enabled(spec):
+        containers[0]["volumeMounts"].append(create_bot_models_mount(spec))
+        init_containers.append(create_wait_for_models_container(spec))
+        volumes.append({"name": "models", "persistentVolumeClaim": {"claimName": MODELS_CLAIM}})
+
     # Add SSH key volume if any strategy uses it
     for strategy in strategies:
         ssh_key_secret = strategy.get("gitRepository", {}).get("sshKeySecret")
@@ -195,31 +238,9 @@ def create_deployment(
                         "app": "freqtrade",
                         "bot": name,
                     },
-                    "annotations": {
-                        "prometheus.io/scrape": "true",
-                        "prometheus.io/port": str(api_port),
-                        "prometheus.io/path": "/api/v1/metrics",
-                    },
                 },
                 "spec": {
-                    "initContainers": [
-                        {
-                            "name": "init-userdir",
-                            "image": "freqtradeorg/freqtrade:stable",
-                            "command": ["freqtrade"],
-                            "args": [
-                                "create-userdir",
-                                "--userdir",
-                                "/freqtrade/user_data",
-                            ],
-                            "volumeMounts": [
-                                {
-                                    "name": "data",
-                                    "mountPath": "/freqtrade/user_data",
-                                },
-                            ],
-                        },
-                    ],
+                    "initContainers": init_containers,
                     "containers": containers,
                     "volumes": volumes,
                     "securityContext": {
@@ -231,3 +252,71 @@ def create_deployment(
             },
         },
     }
+
+
+def create_data_pvc(name: str, namespace: str, spec: dict[str, Any]) -> dict[str, Any]:
+    """Create the PersistentVolumeClaim holding a bot's user data.
+
+    Args:
+        name: Bot instance name
+        namespace: Namespace
+        spec: FreqtradeBot spec
+
+    Returns:
+        PersistentVolumeClaim resource dict
+    """
+    storage_config = spec.get("storage", {})
+    pvc: dict[str, Any] = {
+        "apiVersion": "v1",
+        "kind": "PersistentVolumeClaim",
+        "metadata": {
+            "name": f"{name}-data",
+            "namespace": namespace,
+            "labels": {"app": "freqtrade", "bot": name},
+        },
+        "spec": {
+            "accessModes": ["ReadWriteOnce"],
+            "resources": {
+                "requests": {
+                    "storage": storage_config.get("size", "1Gi"),
+                }
+            },
+        },
+    }
+    if "storageClassName" in storage_config:
+        pvc["spec"]["storageClassName"] = storage_config["storageClassName"]
+    return pvc
+
+
+def create_service(name: str, namespace: str, api_port: int) -> dict[str, Any]:
+    """Create the Service exposing a bot's API server.
+
+    Args:
+        name: Bot instance name
+        namespace: Namespace
+        api_port: Assigned API server port
+
+    Returns:
+        Service resource dict
+    """
+    return {
+        "apiVersion": "v1",
+        "kind": "Service",
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "labels": {"app": "freqtrade", "bot": name},
+        },
+        "spec": {
+            "selector": {"app": "freqtrade", "bot": name},
+            "ports": [
+                {
+                    "name": "api",
+                    "port": api_port,
+                    "targetPort": api_port,
+                    "protocol": "TCP",
+                }
+            ],
+            "type": "ClusterIP",
+        },
+    }
@@ -0,0 +1,184 @@
+"""FreqAI configuration and the shared model storage of FreqAI bots."""
+
+import copy
+import os
+from typing import Any
+
+from freqtrade_operator.utils.manifests import manifest_hash
+
+FREQAI_IMAGE = os.getenv("FREQAI_IMAGE", "freqtradeorg/freqtrade:stable_freqai")
+MODELS_CLAIM = "freqai-models"
+MODELS_STORAGE = os.getenv("FREQAI_MODELS_STORAGE", "20Gi")
+# The claim is mounted by every FreqAI bot and training Job of a namespace
+MODELS_STORAGE_CLASS = os.getenv("FREQAI_STORAGE_CLASS")
+DEFAULT_RETRAIN_HOURS = 4
+# A bot only retrains itself once the workers have missed this many cycles
+SELF_TRAINING_CYCLES = 3
+
+# Spec fields deciding the trained models; bots agreeing on all of them share models
+TRAINING_FIELDS = (
+    "model",
+    "trainPeriodDays",
+    "backtestPeriodDays",
+    "retrainHours",
+    "featureParameters",
+    "dataSplitParameters",
+    "modelTrainingParameters",
+)
+
+
+def freqai_enabled(spec: dict[str, Any]) -> bool:
+    """Whether a bot runs a FreqAI strategy."""
+    return bool(spec.get("freqai", {}).get("enabled", False))
+
+
+def get_training_key(spec: dict[str, Any]) -> str:
+    """Digest of what a FreqAI bot's models are trained from.
+
+    Exchange, strategy and FreqAI parameters decide the models of a pair;
+    pairs, stake and dry-run mode do not, so bots differing only in those
+    share one set of models.
+    """
+    freqai = spec["freqai"]
+    strategies = spec.get("strategies", [])
+    return manifest_hash(
+        {
+            "exchange": spec["exchange"]["name"],
+            "strategy": strategies[0] if strategies else None,
+            **{field: freqai.get(field) for field in TRAINING_FIELDS},
+        }
+    )
+
+
+def get_training_name(key: str) -> str:
+    """Return the name of the training CronJob and ConfigMap of a training key."""
+    return f"freqai-train-{key}"
+
+
+def get_identifier(key: str) -> str:
+    """Return the FreqAI identifier, and model folder, of a training key."""
+    return f"shared-{key}"
+
+
+def create_freqai_config(spec: dict[str, Any], worker: bool = False) -> dict[str, Any]:
+    """Create the ``freqai`` section of a bot or training worker config.
+
+    Bots get a retrain interval several times the workers', so they load the
+    models the workers write and only train themselves if the workers stop
+    delivering.
+
+    Args:
+        spec: FreqtradeBot spec with FreqAI enabled
+        worker: Render for a training worker instead of a bot
+
+    Returns:
+        FreqAI configuration dict
+    """
+    freqai = spec["freqai"]
+    retrain_hours = freqai.get("retrainHours", DEFAULT_RETRAIN_HOURS)
+    config: dict[str, Any] = {
+        "enabled": True,
+        "identifier": get_identifier(get_training_key(spec)),
+        "purge_old_models": 2,
+        "train_period_days": freqai.get("trainPeriodDays", 30),
+        "backtest_period_days": freqai.get("backtestPeriodDays", 7),
+        "live_retrain_hours": retrain_hours if worker else retrain_hours * SELF_TRAINING_CYCLES,
+        "feature_parameters": copy.deepcopy(freqai.get("featureParameters", {})),
+        "data_split_parameters": copy.deepcopy(freqai.get("dataSplitParameters", {})),
+        "model_training_parameters": copy.deepcopy(freqai.get("modelTrainingParameters", {})),
+    }
+    if "expirationHours" in freqai:
+        config["expiration_hours"] = freqai["expirationHours"]
+    return config
+
+
+def create_training_config(
+    bot_config: dict[str, Any], spec: dict[str, Any], pairs: list[str]
+) -> dict[str, Any]:
+    """Turn a rendered bot config into the config of its training worker.
+
+    Args:
+        bot_config: Freqtrade config of one of the bots sharing the models
+        spec: That bot's spec
+        pairs: Pairs of all bots sharing the models
+
+    Returns:
+        Freqtrade config for the training Job
+    """
+    config = copy.deepcopy(bot_config)
+    config["dry_run"] = True
+    config["db_url"] = "sqlite://"
+    config["exchange"].update({"key": "", "secret": "", "pair_whitelist": pairs})
+    config["pairlists"] = [{"method": "StaticPairList"}]
+    config["api_server"] = {"enabled": False}
+    config["webhook"] = {"enabled": False}
+    config.pop("external_message_consumer", None)
+    config.pop("strategy_list", None)
+    strategy = spec["strategies"][0]
+    config["strategy"] = strategy.get("className", strategy["name"])
+    if "gitRepository" in strategy:
+        config["strategy_path"] = "/strategies"
+    config["freqai"] = create_freqai_config(spec, worker=True)
+    return config
+
+
+def create_models_pvc(namespace: str) -> dict[str, Any]:
+    """Create the ReadWriteMany claim holding the models of a namespace's FreqAI bots."""
+    pvc: dict[str, Any] = {
+        "apiVersion": "v1",
+        "kind": "PersistentVolumeClaim",
+        "metadata": {
+            "name": MODELS_CLAIM,
+            "namespace": namespace,
+            "labels": {"app": "freqai-models"},
+        },
+        "spec": {
+            "accessModes": ["ReadWriteMany"],
+            "resources": {"requests": {"storage": MODELS_STORAGE}},
+        },
+    }
+    if MODELS_STORAGE_CLASS:
+        pvc["spec"]["storageClassName"] = MODELS_STORAGE_CLASS
+    return pvc
+
+
+def create_training_configmap(key: str, namespace: str, config_json: str) -> dict[str, Any]:
+    """Create the ConfigMap holding a training worker's Freqtrade config."""
+    return {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {
+            "name": get_training_name(key),
+            "namespace": namespace,
+            "labels": {"app": "freqai-train", "training-key": key},
+        },
+        "data": {"config.json": config_json},
+    }
+
+
+def create_bot_models_mount(spec: dict[str, Any]) -> dict[str, Any]:
+    """Mount of the shared model folder into a FreqAI bot's user data."""
+    identifier = get_identifier(get_training_key(spec))
+    return {
+        "name": "models",
+        "mountPath": f"/freqtrade/user_data/models/{identifier}",
+        "subPath": f"models/{identifier}",
+    }
+
+
+def create_wait_for_models_container(spec: dict[str, Any]) -> dict[str, Any]:
+    """Init container holding a FreqAI bot back until its first models are trained.
+
+    Without it a new bot would find no models and train them itself.
+    """
+    mount = create_bot_models_mount(spec)
+    return {
+        "name": "wait-for-models",
+        "image": FREQAI_IMAGE,
+        "command": ["sh", "-c"],
+        "args": [
+            f"until [ -f {mount['mountPath']}/pair_dictionary.json ]; do "
+            "echo waiting for the training workers; sleep 15; done"
+        ],
+        "volumeMounts": [mount],
+    }
@@ -0,0 +1,248 @@
+"""Resource generation for the bot API gateway next to FreqUI."""
+
+import os
+from typing import Any
+
+from freqtrade_operator.resources.registry import REGISTRY_MOUNT_PATH
+
+# The gateway ships in the operator image
+GATEWAY_IMAGE = os.getenv("OPERATOR_IMAGE", "freqtrade-operator:latest")
+GATEWAY_PORT = 8000
+
+
+def _labels(name: str) -> dict[str, str]:
+    return {"app": "freqtrade-gateway", "instance": name}
+
+
+def gateway_enabled(spec: dict[str, Any]) -> bool:
+    """Whether the webserver spec asks for a gateway; it is opt-in."""
+    return bool(spec.get("gateway", {}).get("enabled", False))
+
+
+def create_gateway_rbac(
+    name: str,
+    namespace: str,
+    owner_references: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Create ServiceAccount, Role and RoleBinding for the gateway.
+
+    The gateway reads the API secrets of the bots listed in the registry,
+    and lists bot Services when running without a registry.
+
+    Args:
+        name: Webserver instance name
+        namespace: Namespace
+        owner_references: Owner references for garbage collection
+
+    Returns:
+        List of resource dicts
+    """
+
+    def metadata() -> dict[str, Any]:
+        return {
+            "name": f"{name}-gateway",
+            "namespace": namespace,
+            "labels": _labels(name),
+            "ownerReferences": list(owner_references),
+        }
+
+    return [
+        {
+            "apiVersion": "v1",
+            "kind": "ServiceAccount",
+            "metadata": metadata(),
+        },
+        {
+            "apiVersion": "rbac.authorization.k8s.io/v1",
+            "kind": "Role",
+            "metadata": metadata(),
+            "rules": [
+                {
+                    "apiGroups": [""],
+                    "resources": ["services"],
+                    "verbs": ["get", "list", "watch"],
+                },
+                {
+                    "apiGroups": [""],
+                    "resources": ["secrets"],
+                    "verbs": ["get"],
+                },
+            ],
+        },
+        {
+            "apiVersion": "rbac.authorization.k8s.io/v1",
+            "kind": "RoleBinding",
+            "metadata": metadata(),
+            "roleRef": {
+                "apiGroup": "rbac.authorization.k8s.io",
+                "kind": "Role",
+                "name": f"{name}-gateway",
+            },
+            "subjects": [
+                {
+                    "kind": "ServiceAccount",
+                    "name": f"{name}-gateway",
+                    "namespace": namespace,
+                }
+            ],
+        },
+    ]
+
+
+def create_gateway_deployment(
+    name: str,
+    namespace: str,
+    spec: dict[str, Any],
+    owner_references: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create Deployment resource for the gateway.
+
+    Args:
+        name: Webserver instance name
+        namespace: Namespace
+        spec: FreqtradeWebserver spec
+        owner_references: Owner references for garbage collection
+
+    Returns:
+        Deployment resource dict
+    """
+    gateway_config = spec.get("gateway", {})
+    env: list[dict[str, Any]] = [
+        {
+            "name": "GATEWAY_NAMESPACE",
+            "valueFrom": {"fieldRef": {"fieldPath": "metadata.namespace"}},
+        },
+        {
+            "name": "GATEWAY_PORT",
+            "value": str(GATEWAY_PORT),
+        },
+        {
+            "name": "REGISTRY_PATH",
+            "value": REGISTRY_MOUNT_PATH,
+        },
+    ]
+    if spec.get("authentication", {}).get("enabled", True):
+        env.append(
+            {
+                "name": "GATEWAY_PASSWORD",
+                "valueFrom": {
+                    "secretKeyRef": {
+                        "name": f"{name}-gateway",
+                        "key": "password",
+                    }
+                },
+            }
+        )
+
+    probe = {
+        "httpGet": {
+            "path": "/healthz",
+            "port": GATEWAY_PORT,
+        },
+        "periodSeconds": 10,
+    }
+
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {
+            "name": f"{name}-gateway",
+            "namespace": namespace,
+            "labels": _labels(name),
+            "ownerReferences": owner_references,
+        },
+        "spec": {
+            "replicas": 1,
+            "selector": {
+                "matchLabels": _labels(name),
+            },
+            "template": {
+                "metadata": {
+                    "labels": _labels(name),
+                },
+                "spec": {
+                    "serviceAccountName": f"{name}-gateway",
+                    "containers": [
+                        {
+                            "name": "gateway",
+                            "image": GATEWAY_IMAGE,
+                            "command": ["python", "-m", "freqtrade_operator.gateway"],
+                            "env": env,
+                            "ports": [
+                                {
+                                    "name": "http",
+                                    "containerPort": GATEWAY_PORT,
+                                }
+                            ],
+                            "volumeMounts": [
+                                {
+                                    "name": "registry",
+                                    "mountPath": REGISTRY_MOUNT_PATH,
+                                    "readOnly": True,
+                                }
+                            ],
+                            "livenessProbe": probe,
+                            "readinessProbe": probe,
+                            "resources": gateway_config.get(
+                                "resources",
+                                {
+                                    "requests": {"cpu": "50m", "memory": "64Mi"},
+                                    "limits": {"cpu": "500m", "memory": "256Mi"},
+                                },
+                            ),
+                        }
+                    ],
+                    "volumes": [
+                        {
+                            "name": "registry",
+                            "configMap": {
+                                "name": f"{name}-registry",
+                                "optional": True,
+                            },
+                        }
+                    ],
+                    "securityContext": {
+                        "runAsNonRoot": True,
+                        "runAsUser": 1000,
+                    },
+                },
+            },
+        },
+    }
+
+
+def create_gateway_service(
+    name: str,
+    namespace: str,
+    owner_references: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create Service resource for the gateway.
+
+    Args:
+        name: Webserver instance name
+        namespace: Namespace
+        owner_references: Owner references for garbage collection
+
+    Returns:
+        Service resource dict
+    """
+    return {
+        "apiVersion": "v1",
+        "kind": "Service",
+        "metadata": {
+            "name": f"{name}-gateway",
+            "namespace": namespace,
+            "labels": _labels(name),
+            "ownerReferences": owner_references,
+        },
+        "spec": {
+            "selector": _labels(name),
+            "ports": [
+                {
+                    "name": "http",
+                    "port": GATEWAY_PORT,
+                    "targetPort": GATEWAY_PORT,
+                }
+            ],
+        },
+    }
@@ -0,0 +1,131 @@
+"""Resource generation for the market-data proxies shared by bots of one exchange."""
+
+import os
+from typing import Any
+
+from freqtrade_operator.marketdata.routes import EXCHANGES
+
+# The proxy ships in the operator image
+MARKETDATA_IMAGE = os.getenv("OPERATOR_IMAGE", "freqtrade-operator:latest")
+MARKETDATA_PORT = 8080
+
+
+def _labels(exchange: str) -> dict[str, str]:
+    return {"app": "freqtrade-market-data", "exchange": exchange}
+
+
+def market_data_proxy_enabled(exchange_config: dict[str, Any]) -> bool:
+    """Whether a bot's exchange spec asks for the shared proxy.
+
+    Exchanges without a route table in the proxy are never proxied.
+    """
+    if exchange_config["name"] not in EXCHANGES:
+        return False
+    return bool(exchange_config.get("marketDataProxy", {}).get("enabled", False))
+
+
+def get_market_data_proxy_name(exchange: str) -> str:
+    """Return the name of the proxy Deployment and Service for an exchange."""
+    return f"{exchange}-market-data"
+
+
+def get_market_data_proxy_url(exchange: str, namespace: str) -> str:
+    """Build the ccxt ``proxyUrl`` of an exchange's proxy.
+
+    ccxt prepends it to every request URL, hence the trailing slash.
+    """
+    return (
+        f"http://{get_market_data_proxy_name(exchange)}.{namespace}.svc.cluster.local:"
+        f"{MARKETDATA_PORT}/"
+    )
+
+
+def create_market_data_proxy(exchange: str, namespace: str) -> list[dict[str, Any]]:
+    """Create Deployment and Service of the proxy for one exchange.
+
+    The proxy is shared by all bots on the exchange in the namespace, so it
+    has no owner; the operator removes it once no bot uses it.
+
+    Args:
+        exchange: ccxt exchange id
+        namespace: Namespace
+
+    Returns:
+        List of resource dicts
+    """
+    name = get_market_data_proxy_name(exchange)
+    metadata = {
+        "name": name,
+        "namespace": namespace,
+        "labels": {**_labels(exchange), "app.kubernetes.io/managed-by": "freqtrade-operator"},
+    }
+    probe = {
+        "httpGet": {
+            "path": "/healthz",
+            "port": MARKETDATA_PORT,
+        },
+        "periodSeconds": 10,
+    }
+
+    deployment = {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": metadata,
+        "spec": {
+            "replicas": 1,
+            "selector": {
+                "matchLabels": _labels(exchange),
+            },
+            "template": {
+                "metadata": {
+                    "labels": _labels(exchange),
+                },
+                "spec": {
+                    "automountServiceAccountToken": False,
+                    "containers": [
+                        {
+                            "name": "proxy",
+                            "image": MARKETDATA_IMAGE,
+                            "command": ["python", "-m", "freqtrade_operator.marketdata"],
+                            "env": [
+                                {"name": "MARKETDATA_EXCHANGE", "value": exchange},
+                                {"name": "MARKETDATA_PORT", "value": str(MARKETDATA_PORT)},
+                            ],
+                            "ports": [
+                                {
+                                    "name": "http",
+                                    "containerPort": MARKETDATA_PORT,
+                                }
+                            ],
+                            "livenessProbe": probe,
+                            "readinessProbe": probe,
+                            "resources": {
+                                "requests": {"cpu": "50m", "memory": "128Mi"},
+                                "limits": {"cpu": "1", "memory": "512Mi"},
+                            },
+                        }
+                    ],
+                    "securityContext": {
+                        "runAsNonRoot": True,
+                        "runAsUser": 1000,
+                    },
+                },
+            },
+        },
+    }
+    service = {
+        "apiVersion": "v1",
+        "kind": "Service",
+        "metadata": dict(metadata),
+        "spec": {
+            "selector": _labels(exchange),
+            "ports": [
+                {
+                    "name": "http",
+                    "port": MARKETDATA_PORT,
+                    "targetPort": MARKETDATA_PORT,
+                }
+            ],
+        },
+    }
+    return [deployment, service]
@@ -0,0 +1,196 @@
+"""Resource generation for shared pairlists and their RemotePairList server."""
+
+import json
+import os
+from typing import Any
+
+from freqtrade_operator.pairlist.ranking import DEFAULT_REFRESH_PERIOD
+
+# The pairlist server ships in the operator image
+PAIRLIST_IMAGE = os.getenv("OPERATOR_IMAGE", "freqtrade-operator:latest")
+PAIRLIST_PORT = 8000
+PAIRLIST_MOUNT_PATH = "/etc/freqtrade/pairlist"
+# Bots take every pair of the shared list unless they cap it themselves
+BOT_NUMBER_ASSETS = 200
+
+
+def _labels(name: str) -> dict[str, str]:
+    return {"app": "freqtrade-pairlist", "instance": name}
+
+
+def get_pairlist_url(name: str, namespace: str) -> str:
+    """Return the URL bots fetch a shared pairlist from."""
+    return f"http://{name}-pairlist.{namespace}.svc.cluster.local:{PAIRLIST_PORT}/pairlist"
+
+
+def create_remote_pairlist(namespace: str, pairlist_config: dict[str, Any]) -> dict[str, Any]:
+    """Create the RemotePairList entry of a bot referencing a shared pairlist.
+
+    Args:
+        namespace: Namespace of the bot and the pairlist
+        pairlist_config: ``pairlist`` section of the FreqtradeBot spec
+
+    Returns:
+        Freqtrade pairlist handler configuration
+    """
+    return {
+        "method": "RemotePairList",
+        "mode": "whitelist",
+        "processing_mode": "filter",
+        "pairlist_url": get_pairlist_url(pairlist_config["name"], namespace),
+        "number_assets": pairlist_config.get("numberAssets", BOT_NUMBER_ASSETS),
+        "refresh_period": pairlist_config.get("refreshPeriod", DEFAULT_REFRESH_PERIOD),
+        "keep_pairlist_on_failure": True,
+        "read_timeout": 60,
+    }
+
+
+def create_pairlist_configmap(
+    name: str,
+    namespace: str,
+    pairs: list[str],
+    version: str,
+    refresh_period: int,
+    owner_references: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create ConfigMap resource holding a computed pairlist.
+
+    ``pairlist.json`` is the document RemotePairList expects. The version
+    is stored as a separate key, so the server can poll it and only re-read
+    the document when it changes.
+
+    Args:
+        name: FreqtradePairlist name
+        namespace: Namespace
+        pairs: Ranked pairs
+        version: Digest of the pairs, served as ETag
+        refresh_period: Seconds until the list is recomputed
+        owner_references: Owner references for garbage collection
+
+    Returns:
+        ConfigMap resource dict
+    """
+    return {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {
+            "name": f"{name}-pairlist",
+            "namespace": namespace,
+            "labels": _labels(name),
+            "ownerReferences": owner_references,
+        },
+        "data": {
+            "version": version,
+            "pairlist.json": json.dumps(
+                {"pairs": pairs, "refresh_period": refresh_period}, separators=(",", ":")
+            ),
+        },
+    }
+
+
+def create_pairlist_server(
+    name: str,
+    namespace: str,
+    owner_references: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Create Deployment and Service of the server of one pairlist.
+
+    Args:
+        name: FreqtradePairlist name
+        namespace: Namespace
+        owner_references: Owner references for garbage collection
+
+    Returns:
+        List of resource dicts
+    """
+    metadata = {
+        "name": f"{name}-pairlist",
+        "namespace": namespace,
+        "labels": _labels(name),
+        "ownerReferences": owner_references,
+    }
+    probe = {
+        "httpGet": {
+            "path": "/healthz",
+            "port": PAIRLIST_PORT,
+        },
+        "periodSeconds": 10,
+    }
+    deployment = {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": metadata,
+        "spec": {
+            "replicas": 1,
+            "selector": {
+                "matchLabels": _labels(name),
+            },
+            "template": {
+                "metadata": {
+                    "labels": _labels(name),
+                },
+                "spec": {
+                    "automountServiceAccountToken": False,
+                    "containers": [
+                        {
+                            "name": "server",
+                            "image": PAIRLIST_IMAGE,
+                            "command": ["python", "-m", "freqtrade_operator.pairlist"],
+                            "env": [
+                                {"name": "PAIRLIST_PATH", "value": PAIRLIST_MOUNT_PATH},
+                                {"name": "PAIRLIST_PORT", "value": str(PAIRLIST_PORT)},
+                            ],
+                            "ports": [
+                                {
+                                    "name": "http",
+                                    "containerPort": PAIRLIST_PORT,
+                                }
+                            ],
+                            "volumeMounts": [
+                                {
+                                    "name": "pairlist",
+                                    "mountPath": PAIRLIST_MOUNT_PATH,
+                                    "readOnly": True,
+                                }
+                            ],
+                            "livenessProbe": probe,
+                            "readinessProbe": probe,
+                            "resources": {
+                                "requests": {"cpu": "10m", "memory": "48Mi"},
+                                "limits": {"cpu": "200m", "memory": "128Mi"},
+                            },
+                        }
+                    ],
+                    "volumes": [
+                        {
+                            "name": "pairlist",
+                            "configMap": {
+                                "name": f"{name}-pairlist",
+                                "optional": True,
+                            },
+                        }
+                    ],
+                    "securityContext": {
+                        "runAsNonRoot": True,
+                        "runAsUser": 1000,
+                    },
+                },
+            },
+        },
+    }
+    service = {
+        "apiVersion": "v1",
+        "kind": "Service",
+        "metadata": dict(metadata),
+        "spec": {
+            "selector": _labels(name),
+            "ports": [
+                {
+                    "name": "http",
+                    "port": PAIRLIST_PORT,
+                    "targetPort": PAIRLIST_PORT,
+                }
+            ],
+        },
+    }
+    return [deployment, service]
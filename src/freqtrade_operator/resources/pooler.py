@@ -0,0 +1,91 @@
+"""Resource generation for CloudNativePG PgBouncer Poolers shared by bots."""
+
+import math
+from typing import Any
+
+POOLER_INSTANCES = 2
+# CNPG clusters default to max_connections=100; leave room for superuser,
+# replication and clients that bypass the pooler
+POOLER_SERVER_CONNECTIONS = 80
+# SQLAlchemy's default QueuePool: pool_size 5 plus max_overflow 10
+CLIENT_CONNECTIONS_PER_BOT = 15
+MAX_POOL_SIZE_PER_BOT = 5
+
+
+def get_pooler_name(cluster_name: str) -> str:
+    """Return the name of the read-write Pooler (and its Service) for a cluster."""
+    return f"{cluster_name}-pooler-rw"
+
+
+def pooler_enabled(db_config: dict[str, Any]) -> bool:
+    """Whether a bot's database spec asks for pooled connections."""
+    if db_config.get("type", "sqlite") != "postgresql":
+        return False
+    return bool(db_config.get("postgresql", {}).get("pooler", {}).get("enabled", False))
+
+
+def pool_parameters(bots: int, instances: int = POOLER_INSTANCES) -> dict[str, str]:
+    """Derive PgBouncer limits from the number of bots sharing a cluster.
+
+    Every bot has its own database, so PgBouncer keeps one pool per bot.
+    Server connections are split evenly between the pools and capped in
+    total per instance, so the cluster stays within ``max_connections``
+    however many bots are added.
+
+    Args:
+        bots: Number of bots routed through the pooler
+        instances: Number of PgBouncer instances
+
+    Returns:
+        PgBouncer parameters (values as strings, as CNPG expects)
+    """
+    bots = max(bots, 1)
+    server_connections = max(POOLER_SERVER_CONNECTIONS // instances, 1)
+    pool_size = max(1, min(MAX_POOL_SIZE_PER_BOT, server_connections // bots))
+    return {
+        "max_client_conn": str(max(100, bots * CLIENT_CONNECTIONS_PER_BOT)),
+        "default_pool_size": str(pool_size),
+        "max_db_connections": str(pool_size),
+        "max_user_connections": str(server_connections),
+        "min_pool_size": "0",
+        "reserve_pool_size": str(min(math.ceil(server_connections / 10), 5)),
+        "server_idle_timeout": "60",
+    }
+
+
+def create_pooler(cluster_name: str, namespace: str, bots: int) -> dict[str, Any]:
+    """Create a transaction-mode PgBouncer Pooler in front of a CNPG cluster.
+
+    The Pooler is shared by all bots on the cluster, so it has no owner;
+    the operator removes it once no bot uses it.
+
+    Args:
+        cluster_name: CNPG cluster name
+        namespace: Namespace
+        bots: Number of bots routed through the pooler
+
+    Returns:
+        Pooler resource dict
+    """
+    return {
+        "apiVersion": "postgresql.cnpg.io/v1",
+        "kind": "Pooler",
+        "metadata": {
+            "name": get_pooler_name(cluster_name),
+            "namespace": namespace,
+            "labels": {
+                "app": "freqtrade",
+                "cluster": cluster_name,
+                "app.kubernetes.io/managed-by": "freqtrade-operator",
+            },
+        },
+        "spec": {
+            "cluster": {"name": cluster_name},
+            "instances": POOLER_INSTANCES,
+            "type": "rw",
+            "pgbouncer": {
+                "poolMode": "transaction",
+                "parameters": pool_parameters(bots),
+            },
+        },
+    }
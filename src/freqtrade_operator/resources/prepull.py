@@ -0,0 +1,78 @@
+"""DaemonSet keeping the images of bot pods pulled on every node."""
+
+import os
+from typing import Any
+
+from freqtrade_operator.resources.deployment import FREQTRADE_IMAGE
+from freqtrade_operator.resources.freqai import FREQAI_IMAGE, freqai_enabled
+from freqtrade_operator.utils.git_sync import GIT_SYNC_IMAGE
+
+PREPULL_NAME = "freqtrade-image-prepull"
+# Namespace of the DaemonSet; pre-pulling is off when unset
+PREPULL_NAMESPACE = os.getenv("IMAGE_PREPULL_NAMESPACE")
+PAUSE_IMAGE = "registry.k8s.io/pause:3.9"
+
+# Images without a shell get a command that exits at once
+_EXIT_COMMANDS: dict[str, dict[str, list[str]]] = {
+    GIT_SYNC_IMAGE: {"args": ["--version"]},
+}
+
+
+def bot_images(spec: dict[str, Any]) -> frozenset[str]:
+    """Return the images a bot's pod starts."""
+    images = {FREQAI_IMAGE if freqai_enabled(spec) else FREQTRADE_IMAGE}
+    if any("gitRepository" in strategy for strategy in spec.get("strategies", [])):
+        images.add(GIT_SYNC_IMAGE)
+    return frozenset(images)
+
+
+def create_prepull_daemonset(namespace: str, images: set[str]) -> dict[str, Any]:
+    """Create the DaemonSet pulling ``images`` onto every node.
+
+    Each image is started once as an init container that exits right away;
+    the pod then idles in a pause container, so the kubelet keeps the images
+    and a bot rescheduled onto the node starts without pulling.
+
+    Args:
+        namespace: Namespace of the DaemonSet
+        images: Images to keep pulled
+
+    Returns:
+        DaemonSet resource dict
+    """
+    labels = {"app": PREPULL_NAME}
+    resources = {
+        "requests": {"cpu": "1m", "memory": "8Mi"},
+        "limits": {"cpu": "50m", "memory": "64Mi"},
+    }
+    init_containers = [
+        {
+            "name": f"pull-{index}",
+            "image": image,
+            **_EXIT_COMMANDS.get(image, {"command": ["sh", "-c", "true"]}),
+            "resources": resources,
+        }
+        for index, image in enumerate(sorted(images))
+    ]
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "DaemonSet",
+        "metadata": {
+            "name": PREPULL_NAME,
+            "namespace": namespace,
+            "labels": labels,
+        },
+        "spec": {
+            "selector": {"matchLabels": labels},
+            "template": {
+                "metadata": {"labels": labels},
+                "spec": {
+                    "initContainers": init_containers,
+                    "containers": [
+                        {"name": "pause", "image": PAUSE_IMAGE, "resources": resources},
+                    ],
+                    "terminationGracePeriodSeconds": 0,
+                },
+            },
+        },
+    }
@@ -0,0 +1,93 @@
+"""Producer/consumer wiring between bots sharing analyzed dataframes.
+
+A producer bot exposes its analyzed candles over the API server's message
+websocket; consumer bots receive them through Freqtrade's
+``external_message_consumer`` instead of computing the indicators again.
+Producers must run in the consumer's namespace, because the consumer reads
+the producer's websocket token from the producer's ``{name}-api`` Secret.
+"""
+
+from typing import Any
+
+WS_TOKEN_KEY = "ws-token"
+
+
+def producer_enabled(spec: dict[str, Any]) -> bool:
+    """Whether a bot spec declares the bot a producer."""
+    return bool(spec.get("producer", {}).get("enabled", False))
+
+
+def consumed_producers(spec: dict[str, Any]) -> list[str]:
+    """Return the names of the producer bots a bot consumes from, in spec order."""
+    return [producer["name"] for producer in spec.get("consumer", {}).get("producers", [])]
+
+
+def producer_token_env(index: int) -> str:
+    """Return the environment variable holding the token of the ``index``-th producer."""
+    return f"PRODUCER_{index}_WS_TOKEN"
+
+
+def create_producer_env(name: str, spec: dict[str, Any]) -> list[dict[str, Any]]:
+    """Create the websocket token environment variables of a bot's container.
+
+    Args:
+        name: Bot instance name
+        spec: FreqtradeBot spec
+
+    Returns:
+        Environment variables, empty for bots that neither produce nor consume
+    """
+    env = []
+    if producer_enabled(spec):
+        env.append(
+            {
+                "name": "WS_TOKEN",
+                "valueFrom": {"secretKeyRef": {"name": f"{name}-api", "key": WS_TOKEN_KEY}},
+            }
+        )
+    for index, producer in enumerate(consumed_producers(spec)):
+        env.append(
+            {
+                "name": producer_token_env(index),
+                "valueFrom": {"secretKeyRef": {"name": f"{producer}-api", "key": WS_TOKEN_KEY}},
+            }
+        )
+    return env
+
+
+def create_external_message_consumer(
+    spec: dict[str, Any],
+    producers: dict[str, tuple[str, int]],
+) -> dict[str, Any]:
+    """Create the ``external_message_consumer`` section of a consumer's config.
+
+    Args:
+        spec: FreqtradeBot spec
+        producers: Producer name -> (Service host, API port), resolved by the operator
+
+    Returns:
+        Freqtrade ``external_message_consumer`` configuration
+    """
+    consumer_config = spec.get("consumer", {})
+    return {
+        "enabled": True,
+        "producers": [
+            {
+                "name": name,
+                "host": producers[name][0],
+                "port": producers[name][1],
+                "secure": False,
+                "ws_token": f"${{{producer_token_env(index)}}}",
+            }
+            for index, name in enumerate(consumed_producers(spec))
+        ],
+        "wait_timeout": consumer_config.get("waitTimeout", 300),
+        "ping_timeout": 10,
+        "sleep_time": 10,
+        "remove_entry_exit_signals": consumer_config.get("removeEntryExitSignals", False),
+    }
+
+
+def get_producer_host(name: str, namespace: str) -> str:
+    """Return the in-cluster host name of a producer's Service."""
+    return f"{name}.{namespace}.svc.cluster.local"
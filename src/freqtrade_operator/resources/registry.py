@@ -0,0 +1,83 @@
+"""Resource generation for the published bot registry of a webserver."""
+
+import json
+from typing import Any
+
+from freqtrade_operator.utils.bot_api import API_USERNAME, get_bot_api_url
+
+REGISTRY_VERSION_ANNOTATION = "trading.freqtrade.io/registry-version"
+REGISTRY_MOUNT_PATH = "/etc/freqtrade/registry"
+
+
+def create_registry_entry(
+    name: str,
+    namespace: str,
+    spec: dict[str, Any],
+    api_port: int,
+) -> dict[str, Any]:
+    """Describe one bot for the registry document.
+
+    Credentials are referenced by Secret name, never inlined.
+
+    Args:
+        name: Bot instance name
+        namespace: Namespace
+        spec: FreqtradeBot spec
+        api_port: Assigned API server port
+
+    Returns:
+        Registry entry dict
+    """
+    return {
+        "name": name,
+        "namespace": namespace,
+        "url": get_bot_api_url(name, namespace, api_port),
+        "apiPort": api_port,
+        "username": API_USERNAME,
+        "credentialsSecret": f"{name}-api",
+        "exchange": spec.get("exchange", {}).get("name"),
+        "dryRun": spec.get("exchange", {}).get("dryRun", True),
+        "strategies": [s["name"] for s in spec.get("strategies", [])],
+    }
+
+
+def create_registry_configmap(
+    name: str,
+    namespace: str,
+    document: dict[str, Any],
+    owner_references: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create ConfigMap resource holding a webserver's bot registry.
+
+    The version is stored as a separate key so readers can poll it and
+    only parse ``registry.json`` when it changes.
+
+    Args:
+        name: Webserver instance name
+        namespace: Namespace
+        document: Registry document with ``version`` and ``bots``
+        owner_references: Owner references for garbage collection
+
+    Returns:
+        ConfigMap resource dict
+    """
+    return {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {
+            "name": f"{name}-registry",
+            "namespace": namespace,
+            "labels": {
+                "app": "freqtrade-webserver",
+                "instance": name,
+            },
+            "annotations": {
+                REGISTRY_VERSION_ANNOTATION: document["version"],
+            },
+            "ownerReferences": owner_references,
+        },
+        "data": {
+            "version": document["version"],
+            "registry.json": json.dumps(document, separators=(",", ":")),
+        },
+    }
@@ -0,0 +1,189 @@
+"""Resource generation for the FreqUI webserver."""
+
+from typing import Any
+
+from freqtrade_operator.resources.gateway import GATEWAY_PORT, gateway_enabled
+
+FREQUI_IMAGE = "freqtradeorg/freqtrade:stable_freqaiui"
+FREQUI_PORT = 80
+
+
+def _labels(name: str) -> dict[str, str]:
+    return {"app": "freqtrade-webserver", "instance": name}
+
+
+def create_frequi_deployment(
+    name: str,
+    namespace: str,
+    spec: dict[str, Any],
+    owner_references: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create Deployment resource for FreqUI.
+
+    Args:
+        name: Webserver instance name
+        namespace: Namespace
+        spec: FreqtradeWebserver spec
+        owner_references: Owner references for garbage collection
+
+    Returns:
+        Deployment resource dict
+    """
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {
+            "name": f"{name}-frequi",
+            "namespace": namespace,
+            "labels": _labels(name),
+            "ownerReferences": owner_references,
+        },
+        "spec": {
+            "replicas": 1,
+            "selector": {
+                "matchLabels": _labels(name),
+            },
+            "template": {
+                "metadata": {
+                    "labels": _labels(name),
+                },
+                "spec": {
+                    "containers": [
+                        {
+                            "name": "frequi",
+                            "image": FREQUI_IMAGE,
+                            "ports": [
+                                {
+                                    "name": "http",
+                                    "containerPort": FREQUI_PORT,
+                                }
+                            ],
+                            "resources": spec.get("resources", {}),
+                        }
+                    ],
+                },
+            },
+        },
+    }
+
+
+def create_frequi_service(
+    name: str,
+    namespace: str,
+    owner_references: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create Service resource for FreqUI.
+
+    Args:
+        name: Webserver instance name
+        namespace: Namespace
+        owner_references: Owner references for garbage collection
+
+    Returns:
+        Service resource dict
+    """
+    return {
+        "apiVersion": "v1",
+        "kind": "Service",
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "labels": _labels(name),
+            "ownerReferences": owner_references,
+        },
+        "spec": {
+            "selector": _labels(name),
+            "ports": [
+                {
+                    "name": "http",
+                    "port": FREQUI_PORT,
+                    "targetPort": FREQUI_PORT,
+                }
+            ],
+        },
+    }
+
+
+def create_frequi_ingress(
+    name: str,
+    namespace: str,
+    spec: dict[str, Any],
+    owner_references: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Create Ingress resource for FreqUI.
+
+    Args:
+        name: Webserver instance name
+        namespace: Namespace
+        spec: FreqtradeWebserver spec
+        owner_references: Owner references for garbage collection
+
+    Returns:
+        Ingress resource dict
+    """
+    ingress_spec = spec["ingress"]
+    host = ingress_spec["host"]
+
+    paths = [
+        {
+            "path": "/",
+            "pathType": "Prefix",
+            "backend": {
+                "service": {
+                    "name": name,
+                    "port": {"number": FREQUI_PORT},
+                }
+            },
+        }
+    ]
+    if gateway_enabled(spec):
+        paths.insert(
+            0,
+            {
+                "path": "/bots",
+                "pathType": "Prefix",
+                "backend": {
+                    "service": {
+                        "name": f"{name}-gateway",
+                        "port": {"number": GATEWAY_PORT},
+                    }
+                },
+            },
+        )
+
+    ingress = {
+        "apiVersion": "networking.k8s.io/v1",
+        "kind": "Ingress",
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "labels": _labels(name),
+            "annotations": ingress_spec.get("annotations", {}),
+            "ownerReferences": owner_references,
+        },
+        "spec": {
+            "rules": [
+                {
+                    "host": host,
+                    "http": {"paths": paths},
+                }
+            ],
+        },
+    }
+
+    if ingress_spec.get("tls", True):
+        ingress["spec"]["tls"] = [
+            {
+                "hosts": [host],
+                "secretName": ingress_spec.get("tlsSecretName", f"{name}-tls"),
+            }
+        ]
+
+    return ingress
+
+
+def get_webserver_url(spec: dict[str, Any]) -> str:
+    """Build the public URL of a webserver from its ingress spec."""
+    ingress_spec = spec["ingress"]
+    protocol = "https" if ingress_spec.get("tls", True) else "http"
+    return f"{protocol}://{ingress_spec['host']}"
@@ -0,0 +1 @@
+"""Bulk teardown of FreqtradeBots and their databases."""
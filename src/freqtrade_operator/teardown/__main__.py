@@ -0,0 +1,90 @@
+"""Entry point for bulk teardown: ``python -m freqtrade_operator.teardown``.
+
+Deletes the FreqtradeBots of a namespace, or of all namespaces, that match
+a label selector. It then reports progress until they and their databases
+are gone. Exits non-zero if a bot could not be deleted or the wait timed
+out.
+"""
+
+import argparse
+import sys
+
+from kubernetes import client, config
+
+from freqtrade_operator.teardown.bulk import (
+    PARALLEL,
+    POLL_INTERVAL,
+    Progress,
+    delete_bots,
+    select_bots,
+    wait_for_teardown,
+)
+
+
+def _report(progress: Progress) -> None:
+    print(
+        f"[{progress.elapsed:5.0f}s] bots {progress.bots - len(progress.bots_left)}"
+        f"/{progress.bots} gone, databases "
+        f"{progress.databases - len(progress.databases_left)}/{progress.databases} gone",
+        file=sys.stderr,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Tear down the selected bots and wait for them."""
+    parser = argparse.ArgumentParser(prog="python -m freqtrade_operator.teardown")
+    scope = parser.add_mutually_exclusive_group(required=True)
+    scope.add_argument("-n", "--namespace", help="namespace of the bots")
+    scope.add_argument("-A", "--all-namespaces", action="store_true", help="bots of all namespaces")
+    parser.add_argument("-l", "--selector", help="label selector, e.g. env=research")
+    parser.add_argument(
+        "--databases",
+        choices=("retain", "drop"),
+        default="retain",
+        help="keep the bots' PostgreSQL databases in their clusters, or drop them",
+    )
+    parser.add_argument("--parallel", type=int, default=PARALLEL, help="deletes at a time")
+    parser.add_argument("--timeout", type=float, default=600.0, help="seconds to wait")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="seconds per poll")
+    parser.add_argument("--dry-run", action="store_true", help="only list what would be deleted")
+    args = parser.parse_args(argv)
+    if args.all_namespaces and not args.selector:
+        parser.error("--all-namespaces needs a --selector")
+
+    try:
+        config.load_incluster_config()
+    except config.ConfigException:
+        config.load_kube_config()
+    configuration = client.Configuration.get_default_copy()
+    # One pooled connection per concurrent delete
+    configuration.connection_pool_maxsize = max(
+        configuration.connection_pool_maxsize, args.parallel
+    )
+    client.Configuration.set_default(configuration)
+
+    targets = select_bots(args.namespace, args.selector)
+    for target in targets:
+        database = f" (database {target.database})" if target.database else ""
+        print(f"{target.namespace}/{target.name}{database}")
+    if args.dry_run or not targets:
+        print(f"{len(targets)} bots selected", file=sys.stderr)
+        return 0
+
+    failed = delete_bots(targets, args.databases == "drop", args.parallel)
+    for target, reason in failed.items():
+        print(f"error: {target.namespace}/{target.name}: {reason}", file=sys.stderr)
+    deleted = [target for target in targets if target not in failed]
+
+    progress = wait_for_teardown(deleted, args.timeout, args.interval, _report)
+    if not progress.done:
+        for kind, left in (("bot", progress.bots_left), ("database", progress.databases_left)):
+            for (namespace, name), finalizers in sorted(left.items()):
+                print(
+                    f"timeout: {kind} {namespace}/{name} is held by {', '.join(finalizers) or '-'}",
+                    file=sys.stderr,
+                )
+    return 0 if progress.done and not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""Delete many FreqtradeBots at once and wait until everything they owned is gone.
+
+Bots are deleted with foreground propagation, so the API server keeps each
+bot until all of its dependents are gone. That covers the Deployment and
+its pods, the data claim, Jobs such as backtests, migrations and archival
+runs, and the CNPG Database. When a bot disappears, its teardown is
+therefore complete. Databases are retained in the cluster by default. To
+drop them, their ``databaseReclaimPolicy`` is set to ``delete`` first, and
+CNPG's finalizer then drops each database before the Database goes.
+
+Deletes run ``parallel`` at a time and progress is polled with one list
+call per namespace. The time taken therefore depends on the slowest bot,
+not on how many there are.
+"""
+
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability.instrumentation import api_call, api_send
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.registry import ObjectKey
+
+BOT_API = {"group": "trading.freqtrade.io", "version": "v1alpha1", "plural": "freqtradebots"}
+DATABASE_API = {"group": "postgresql.cnpg.io", "version": "v1", "plural": "databases"}
+PARALLEL = 16
+POLL_INTERVAL = 2.0
+
+
+@dataclass(frozen=True, slots=True)
+class Target:
+    """A bot to tear down, with the CNPG Database it owns, if any."""
+
+    namespace: str
+    name: str
+    database: str | None = None
+
+
+@dataclass(slots=True)
+class Progress:
+    """What is left of a teardown."""
+
+    bots: int
+    databases: int
+    elapsed: float = 0.0
+    # Remaining bots and databases with the finalizers still holding them
+    bots_left: dict[ObjectKey, list[str]] = field(default_factory=dict)
+    databases_left: dict[ObjectKey, list[str]] = field(default_factory=dict)
+
+    @property
+    def done(self) -> bool:
+        return not self.bots_left and not self.databases_left
+
+
+def _list(
+    resource: str, api: dict[str, str], namespace: str | None, selector: str | None
+) -> list[dict[str, Any]]:
+    custom_api = client.CustomObjectsApi(api_client())
+    if namespace is None:
+        return api_call(
+            "list",
+            resource,
+            custom_api.list_cluster_custom_object,
+            label_selector=selector,
+            **api,
+        )["items"]
+    return api_call(
+        "list",
+        resource,
+        custom_api.list_namespaced_custom_object,
+        namespace=namespace,
+        label_selector=selector,
+        **api,
+    )["items"]
+
+
+def _bot_databases(namespace: str | None) -> dict[ObjectKey, str]:
+    """Return the Database of each bot, from the ``bot`` label the operator sets."""
+    try:
+        databases = _list("database", DATABASE_API, namespace, "app=freqtrade")
+    except ApiException as e:
+        # Without CloudNativePG there are no databases to handle
+        if e.status == 404:
+            return {}
+        raise
+    return {
+        (item["metadata"]["namespace"], item["metadata"]["labels"]["bot"]): item["metadata"]["name"]
+        for item in databases
+        if "bot" in item["metadata"].get("labels", {})
+    }
+
+
+def select_bots(namespace: str | None, selector: str | None) -> list[Target]:
+    """List the bots to tear down.
+
+    Args:
+        namespace: Namespace of the bots, or None for all namespaces
+        selector: Label selector, e.g. ``env=research``
+
+    Returns:
+        Bots with their Databases, sorted by namespace and name
+    """
+    bots = _list("freqtradebot", BOT_API, namespace, selector or None)
+    databases = _bot_databases(namespace)
+    keys = sorted((bot["metadata"]["namespace"], bot["metadata"]["name"]) for bot in bots)
+    return [Target(ns, name, databases.get((ns, name))) for ns, name in keys]
+
+
+def _teardown(target: Target, drop_database: bool) -> None:
+    """Delete one bot, after marking its database to be dropped if asked to."""
+    if drop_database and target.database is not None:
+        try:
+            api_send(
+                "patch",
+                "database",
+                client.CustomObjectsApi(api_client()).patch_namespaced_custom_object,
+                namespace=target.namespace,
+                name=target.database,
+                body={"spec": {"databaseReclaimPolicy": "delete"}},
+                **DATABASE_API,
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise
+    try:
+        api_send(
+            "delete",
+            "freqtradebot",
+            client.CustomObjectsApi(api_client()).delete_namespaced_custom_object,
+            namespace=target.namespace,
+            name=target.name,
+            propagation_policy="Foreground",
+            **BOT_API,
+        )
+    except ApiException as e:
+        if e.status != 404:
+            raise
+
+
+def delete_bots(
+    targets: list[Target], drop_databases: bool = False, parallel: int = PARALLEL
+) -> dict[Target, str]:
+    """Delete bots ``parallel`` at a time.
+
+    Returns:
+        The reason for each bot that could not be deleted
+    """
+
+    def teardown(target: Target) -> str | None:
+        try:
+            _teardown(target, drop_databases)
+        except ApiException as e:
+            return str(e.reason)
+        return None
+
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+        results = list(pool.map(teardown, targets))
+    return {
+        target: error for target, error in zip(targets, results, strict=True) if error is not None
+    }
+
+
+def _left(items: list[dict[str, Any]], wanted: set[ObjectKey]) -> dict[ObjectKey, list[str]]:
+    left = {}
+    for item in items:
+        key = (item["metadata"]["namespace"], item["metadata"]["name"])
+        if key in wanted:
+            left[key] = item["metadata"].get("finalizers", [])
+    return left
+
+
+def progress(targets: list[Target]) -> Progress:
+    """Check which of the targets' bots and databases still exist."""
+    bots = {(t.namespace, t.name) for t in targets}
+    databases = {(t.namespace, t.database) for t in targets if t.database is not None}
+    result = Progress(len(bots), len(databases))
+    for namespace in sorted({t.namespace for t in targets}):
+        result.bots_left.update(_left(_list("freqtradebot", BOT_API, namespace, None), bots))
+        if databases:
+            items = _list("database", DATABASE_API, namespace, "app=freqtrade")
+            result.databases_left.update(_left(items, databases))
+    return result
+
+
+def wait_for_teardown(
+    targets: list[Target],
+    timeout: float,
+    interval: float = POLL_INTERVAL,
+    report: Callable[[Progress], None] | None = None,
+) -> Progress:
+    """Poll until the targets' bots and databases are gone, or ``timeout`` passes.
+
+    Args:
+        targets: Bots being torn down
+        timeout: Seconds to wait
+        interval: Seconds between polls
+        report: Called with the progress after each poll
+
+    Returns:
+        The last progress; ``done`` is False after a timeout
+    """
+    started = time.monotonic()
+    while True:
+        current = progress(targets)
+        current.elapsed = time.monotonic() - started
+        if report is not None:
+            report(current)
+        if current.done or current.elapsed >= timeout:
+            return current
+        time.sleep(interval)
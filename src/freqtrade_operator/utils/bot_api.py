@@ -0,0 +1,144 @@
+"""Pooled HTTP client for the Freqtrade REST API of managed bots."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import aiohttp
+
+API_USERNAME = "freqtrade"
+
+
+def get_bot_api_url(name: str, namespace: str, port: int) -> str:
+    """Build the in-cluster base URL of a bot's API server.
+
+    Args:
+        name: Bot instance name (also the name of its Service)
+        namespace: Namespace
+        port: Assigned API server port
+
+    Returns:
+        Base URL without trailing slash
+    """
+    return f"http://{name}.{namespace}.svc.cluster.local:{port}"
+
+
+@dataclass(frozen=True, slots=True)
+class BotEndpoint:
+    """Where and how to reach one bot's API server."""
+
+    name: str
+    namespace: str
+    url: str
+    password: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class BotResponse:
+    """Raw response from a bot's API server."""
+
+    status: int
+    body: bytes
+    content_type: str
+
+
+def _auth_headers(endpoint: BotEndpoint) -> dict[str, str] | None:
+    if endpoint.password is None:
+        return None
+    return {"Authorization": aiohttp.encode_basic_auth(API_USERNAME, endpoint.password)}
+
+
+class BotApiClient:
+    """Shared client keeping pooled keep-alive connections to all bots."""
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 4,
+        timeout: float = 10.0,
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._session: aiohttp.ClientSession | None = None
+
+    async def start(self) -> None:
+        """Open the underlying connection pool."""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(
+        self,
+        endpoint: BotEndpoint,
+        path: str,
+        params: Mapping[str, str] | None = None,
+    ) -> BotResponse:
+        """Perform a GET request against a bot's API.
+
+        Args:
+            endpoint: Target bot
+            path: API path, e.g. ``/api/v1/status``
+            params: Query parameters
+
+        Returns:
+            Response status, body and content type
+        """
+        await self.start()
+        assert self._session is not None
+        async with self._session.get(
+            f"{endpoint.url}{path}", params=params, headers=_auth_headers(endpoint)
+        ) as resp:
+            body = await resp.read()
+            return BotResponse(resp.status, body, resp.content_type)
+
+    async def get_json(
+        self,
+        endpoint: BotEndpoint,
+        path: str,
+        params: Mapping[str, str] | None = None,
+    ) -> Any:
+        """Perform a GET request and decode the JSON body.
+
+        Raises:
+            aiohttp.ClientResponseError: If the bot answers with an error status
+        """
+        await self.start()
+        assert self._session is not None
+        async with self._session.get(
+            f"{endpoint.url}{path}", params=params, headers=_auth_headers(endpoint)
+        ) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+    async def post(self, endpoint: BotEndpoint, path: str) -> BotResponse:
+        """Perform a POST request without a body, e.g. ``/api/v1/reload_config``.
+
+        Args:
+            endpoint: Target bot
+            path: API path
+
+        Returns:
+            Response status, body and content type
+        """
+        await self.start()
+        assert self._session is not None
+        async with self._session.post(
+            f"{endpoint.url}{path}", headers=_auth_headers(endpoint)
+        ) as resp:
+            body = await resp.read()
+            return BotResponse(resp.status, body, resp.content_type)
@@ -0,0 +1,101 @@
+"""In-memory TTL cache with coalescing of identical in-flight requests."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class CoalescingCache(Generic[T]):
+    """Cache results for a short TTL and share in-flight fetches.
+
+    Concurrent callers asking for the same key while a fetch is running
+    await that single fetch instead of starting their own, so upstream load
+    depends on the number of distinct keys, not on the number of callers.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future[T]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _lookup(self, key: Hashable) -> tuple[bool, T | None]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: T, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        ttl: float,
+        fetch: Callable[[], Awaitable[T]],
+        cacheable: Callable[[T], bool] = lambda _: True,
+    ) -> T:
+        """Return a cached value or fetch it once for all concurrent callers.
+
+        Args:
+            key: Cache key
+            ttl: Seconds to keep the result; 0 only coalesces in-flight calls
+            fetch: Coroutine factory producing the value
+            cacheable: Predicate deciding whether a result may be stored
+
+        Returns:
+            Cached, shared or freshly fetched value
+        """
+        if ttl > 0:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value  # type: ignore[return-value]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if ttl > 0 and cacheable(value):
+                self._store(key, value, ttl)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single cached entry."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
@@ -0,0 +1,117 @@
+"""Per-object debouncing of bursts of spec edits.
+
+GitOps tools and people often apply several edits to one object within
+seconds. An edit that follows a quiet period is reconciled straight away.
+Edits arriving within the window after it open a burst, and the update
+handler defers with :class:`Debounced` until the object has gone unedited
+for the window. kopf then retries it with the newest body, and its diff
+still starts at the last reconciled state, so the rest of the burst is
+reconciled once at its latest generation. A burst that never quiets down
+is reconciled once it is ``max_delay`` old, and again for whatever arrives
+after that."""
+
+import threading
+import time
+from dataclasses import dataclass
+
+import kopf
+
+WINDOW = 3.0
+MAX_DELAY = 30.0
+
+ObjectKey = tuple[str, str]  # namespace, name
+
+
+class Debounced(kopf.TemporaryError):
+    """Raised to defer a handler while edits of its object keep arriving.
+
+    A temporary error, so kopf logs it as a retry and runs the handler again
+    after ``delay`` instead of reporting a failure.
+    """
+
+
+@dataclass(slots=True)
+class Burst:
+    """Edits of one object waiting to be reconciled together."""
+
+    generation: int
+    first: float
+    last: float
+    edits: int = 1
+
+
+class Debouncer:
+    """Hold back reconciles while an object's edits keep arriving.
+
+    The first edit after a quiet window goes through at once. Later edits
+    to a generation not reconciled yet are deferred until the object has
+    been quiet for the window, or for at most ``max_delay``. Retries of a
+    generation already let through go straight through.
+    """
+
+    def __init__(self, window: float = WINDOW, max_delay: float = MAX_DELAY) -> None:
+        self.window = window
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._bursts: dict[ObjectKey, Burst] = {}
+        self._settled: dict[ObjectKey, int] = {}
+        self._edited: dict[ObjectKey, float] = {}
+
+    def settle(self, namespace: str, name: str, generation: int) -> Burst | None:
+        """Let a reconcile of an object through once its edits have settled.
+
+        Args:
+            namespace: Namespace of the object
+            name: Name of the object
+            generation: ``metadata.generation`` the handler was invoked for
+
+        Returns:
+            The burst that settled, a single edit for one that followed a
+            quiet period, or None if this generation was already let through
+            or debouncing is disabled
+
+        Raises:
+            Debounced: While the object is still being edited
+        """
+        if self.window <= 0:
+            return None
+        key = (namespace, name)
+        now = time.monotonic()
+        with self._lock:
+            if self._settled.get(key) == generation:
+                return None
+            burst = self._bursts.get(key)
+            if burst is None:
+                edited = self._edited.get(key)
+                if edited is None or now - edited >= self.window:
+                    self._settled[key] = generation
+                    self._edited[key] = now
+                    return Burst(generation, first=now, last=now)
+                burst = self._bursts[key] = Burst(generation, first=now, last=now)
+            elif burst.generation != generation:
+                # The generation goes up by one per spec edit, including the
+                # edits kopf folded into a single retry
+                burst.edits += generation - burst.generation
+                burst.generation = generation
+                burst.last = now
+
+            quiet_at = burst.last + self.window
+            deadline = burst.first + self.max_delay
+            if now < quiet_at and now < deadline:
+                delay = min(quiet_at, deadline) - now
+                raise Debounced(
+                    f"{namespace}/{name} is still being edited; "
+                    f"retrying in {delay:.1f}s (pending edits: {burst.edits})",
+                    delay=delay,
+                )
+            del self._bursts[key]
+            self._settled[key] = generation
+            self._edited[key] = burst.last
+        return burst
+
+    def forget(self, namespace: str, name: str) -> None:
+        """Drop everything known about a deleted object."""
+        with self._lock:
+            self._bursts.pop((namespace, name), None)
+            self._settled.pop((namespace, name), None)
+            self._edited.pop((namespace, name), None)
@@ -2,11 +2,14 @@
 
 from typing import Any
 
+GIT_SYNC_IMAGE = "registry.k8s.io/git-sync/git-sync:v4.0.0"
+
 
 def create_git_sync_container(
     strategy_config: dict[str, Any],
     volume_name: str = "strategies",
     sync_interval: int = 60,
+    one_time: bool = False,
 ) -> dict[str, Any]:
     """Create a git-sync sidecar container specification.
 
@@ -14,6 +17,7 @@ def create_git_sync_container(
         strategy_config: Strategy configuration from FreqtradeBot spec
         volume_name: Name of the volume to mount
         sync_interval: Sync interval in seconds
+        one_time: Sync once and exit, as an init container
 
     Returns:
         Container specification dict
@@ -23,8 +27,8 @@ def create_git_sync_container(
     branch = git_repo.get("branch", "main")
 
     container = {
-        "name": f"git-sync-{strategy_config['name']}",
-        "image": "registry.k8s.io/git-sync/git-sync:v4.0.0",
+        "name": f"{'git-clone' if one_time else 'git-sync'}-{strategy_config['name']}",
+        "image": GIT_SYNC_IMAGE,
         "args": [
             f"--repo={url}",
             f"--branch={branch}",
@@ -50,6 +54,8 @@ def create_git_sync_container(
             },
         },
     }
+    if one_time:
+        container["args"].append("--one-time")
 
     # Add SSH key if specified
     ssh_key_secret = git_repo.get("sshKeySecret")
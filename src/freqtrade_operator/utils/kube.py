@@ -0,0 +1,24 @@
+"""Shared Kubernetes API client."""
+
+import functools
+
+from kubernetes import client
+
+# Content type for JSON merge patches (RFC 7386). Without it the generated
+# patch methods send dicts as strategic merge patches, which merge lists
+# such as containers or env by key, so removed entries would survive.
+MERGE_PATCH = "application/merge-patch+json"
+
+
+@functools.cache
+def api_client() -> client.ApiClient:
+    """Return the process-wide API client.
+
+    Every ``client.*Api()`` created without an explicit client builds its
+    own connection pool, so handlers share this one instead. Must only be
+    called after the Kubernetes configuration has been loaded.
+
+    Returns:
+        Shared ApiClient
+    """
+    return client.ApiClient()
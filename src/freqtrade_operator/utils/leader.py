@@ -0,0 +1,207 @@
+"""Lease-based leader election between operator replicas."""
+
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability.instrumentation import api_call, api_send
+from freqtrade_operator.utils.kube import api_client
+
+logger = logging.getLogger(__name__)
+
+# client-go's defaults: a crashed leader is replaced within LEASE_DURATION
+# plus RETRY_PERIOD, a leader that shuts down cleanly within RETRY_PERIOD
+LEASE_DURATION = 15.0
+RENEW_DEADLINE = 10.0
+RETRY_PERIOD = 2.0
+
+
+class LeaderElector:
+    """Acquire and renew a ``coordination.k8s.io/v1`` Lease.
+
+    Like client-go, a Lease counts as expired once it has gone unchanged for
+    its duration as measured by this process's clock, so clock skew between
+    nodes does not matter. A standby therefore waits up to one lease
+    duration after it first sees a Lease, even if the holder is long gone.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        namespace: str,
+        identity: str,
+        lease_duration: float = LEASE_DURATION,
+        renew_deadline: float = RENEW_DEADLINE,
+        retry_period: float = RETRY_PERIOD,
+    ) -> None:
+        self.name = name
+        self.namespace = namespace
+        self.identity = identity
+        self.lease_duration = lease_duration
+        self.renew_deadline = renew_deadline
+        self.retry_period = retry_period
+        self.holder: str | None = None
+        self._observed: tuple[Any, ...] | None = None
+        self._observed_at = 0.0
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process held the Lease at the last attempt."""
+        return self.holder == self.identity
+
+    def _lease(self, spec: dict[str, Any], resource_version: str | None = None) -> dict[str, Any]:
+        metadata: dict[str, Any] = {"name": self.name, "namespace": self.namespace}
+        if resource_version is not None:
+            metadata["resourceVersion"] = resource_version
+        return {
+            "apiVersion": "coordination.k8s.io/v1",
+            "kind": "Lease",
+            "metadata": metadata,
+            "spec": spec,
+        }
+
+    def try_acquire_or_renew(self) -> bool:
+        """Make one attempt to take or renew the Lease.
+
+        Returns:
+            Whether this process holds the Lease now
+        """
+        api = client.CoordinationV1Api(api_client())
+        now = datetime.now(UTC)
+        spec = {
+            "holderIdentity": self.identity,
+            "leaseDurationSeconds": round(self.lease_duration),
+            "acquireTime": now,
+            "renewTime": now,
+            "leaseTransitions": 0,
+        }
+        try:
+            lease = api_call(
+                "get", "lease", api.read_namespaced_lease, name=self.name, namespace=self.namespace
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            try:
+                api_send(
+                    "create",
+                    "lease",
+                    api.create_namespaced_lease,
+                    namespace=self.namespace,
+                    body=self._lease(spec),
+                )
+            except ApiException as e:
+                if e.status == 409:
+                    return False
+                raise
+            self.holder = self.identity
+            return True
+
+        current = lease.spec
+        record = (current.holder_identity, current.renew_time, current.lease_transitions)
+        if record != self._observed:
+            self._observed = record
+            self._observed_at = time.monotonic()
+        self.holder = current.holder_identity or None
+
+        duration = current.lease_duration_seconds or self.lease_duration
+        if (
+            self.holder is not None
+            and self.holder != self.identity
+            and time.monotonic() < self._observed_at + duration
+        ):
+            return False
+
+        transitions = current.lease_transitions or 0
+        if self.holder == self.identity:
+            spec["acquireTime"] = current.acquire_time or now
+        else:
+            transitions += 1
+        spec["leaseTransitions"] = transitions
+        try:
+            api_send(
+                "replace",
+                "lease",
+                api.replace_namespaced_lease,
+                name=self.name,
+                namespace=self.namespace,
+                body=self._lease(spec, lease.metadata.resource_version),
+            )
+        except ApiException as e:
+            if e.status == 409:
+                # Another replica wrote first; find out who on the next attempt
+                return False
+            raise
+        if self.holder != self.identity:
+            logger.info(f"Acquired lease {self.namespace}/{self.name} from {self.holder}")
+        self.holder = self.identity
+        return True
+
+    def release(self) -> None:
+        """Give up the Lease so that a standby can take over right away."""
+        if not self.is_leader:
+            return
+        api = client.CoordinationV1Api(api_client())
+        try:
+            lease = api_call(
+                "get", "lease", api.read_namespaced_lease, name=self.name, namespace=self.namespace
+            )
+            if lease.spec.holder_identity != self.identity:
+                return
+            api_send(
+                "replace",
+                "lease",
+                api.replace_namespaced_lease,
+                name=self.name,
+                namespace=self.namespace,
+                body=self._lease(
+                    {
+                        "holderIdentity": None,
+                        "leaseDurationSeconds": 1,
+                        "acquireTime": lease.spec.acquire_time,
+                        "renewTime": datetime.now(UTC),
+                        "leaseTransitions": lease.spec.lease_transitions,
+                    },
+                    lease.metadata.resource_version,
+                ),
+            )
+            logger.info(f"Released lease {self.namespace}/{self.name}")
+        except ApiException as e:
+            logger.warning(f"Failed to release lease {self.namespace}/{self.name}: {e.reason}")
+        self.holder = None
+
+    async def _attempt(self) -> bool:
+        try:
+            return await asyncio.to_thread(self.try_acquire_or_renew)
+        except Exception as e:
+            logger.warning(f"Lease {self.namespace}/{self.name} attempt failed: {e}")
+            return False
+
+    async def acquire(self) -> None:
+        """Wait until this process holds the Lease."""
+        logger.info(f"Waiting for lease {self.namespace}/{self.name} as {self.identity}")
+        while not await self._attempt():
+            await asyncio.sleep(self.retry_period)
+
+    async def hold(self) -> None:
+        """Keep renewing the Lease; return once leadership is lost.
+
+        Leadership is lost when another replica holds the Lease, or when no
+        renewal succeeded within the renew deadline.
+        """
+        renewed = time.monotonic()
+        while True:
+            await asyncio.sleep(self.retry_period)
+            if await self._attempt():
+                renewed = time.monotonic()
+            elif self.holder not in (None, self.identity):
+                break
+            elif time.monotonic() - renewed > self.renew_deadline:
+                break
+        logger.error(f"Lost lease {self.namespace}/{self.name} to {self.holder}")
+        self.holder = None
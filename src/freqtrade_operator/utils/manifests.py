@@ -0,0 +1,45 @@
+"""Helpers for comparing and patching rendered manifests."""
+
+import hashlib
+import json
+from typing import Any
+
+
+def manifest_hash(manifest: dict[str, Any]) -> str:
+    """Compute a stable digest of a rendered manifest.
+
+    Args:
+        manifest: Resource dict as produced by the resources/ functions
+
+    Returns:
+        Short hex digest that only changes when the manifest content changes
+    """
+    encoded = json.dumps(manifest, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+def merge_patch(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Compute a JSON merge patch (RFC 7386) turning ``old`` into ``new``.
+
+    Keys removed in ``new`` are set to None so the apiserver deletes them.
+    Lists are replaced as a whole, as merge patch semantics require.
+
+    Args:
+        old: Previously rendered manifest
+        new: Newly rendered manifest
+
+    Returns:
+        Minimal patch dict (empty if both manifests are equal)
+    """
+    patch: dict[str, Any] = {}
+    for key in old.keys() - new.keys():
+        patch[key] = None
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = merge_patch(previous, value)
+            if nested:
+                patch[key] = nested
+        elif key not in old or previous != value:
+            patch[key] = value
+    return patch
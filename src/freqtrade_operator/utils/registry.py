@@ -0,0 +1,112 @@
+"""Incrementally maintained registry of bots per webserver."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from freqtrade_operator.utils.manifests import manifest_hash
+
+# (namespace, name)
+ObjectKey = tuple[str, str]
+
+
+@dataclass(slots=True)
+class WebserverScope:
+    """Which bots a webserver serves: same namespace, matching labels."""
+
+    uid: str
+    match_labels: dict[str, str] = field(default_factory=dict)
+
+    def matches(self, labels: dict[str, str]) -> bool:
+        """Whether a bot with these labels belongs to the webserver."""
+        return all(labels.get(k) == v for k, v in self.match_labels.items())
+
+
+class BotRegistry:
+    """Per-webserver bot registry updated from individual watch events.
+
+    Every add, update or delete touches only the webservers of the bot's
+    namespace, and the published document is only regenerated for
+    webservers whose bot set actually changed.
+    """
+
+    def __init__(self) -> None:
+        # namespace -> bot name -> (labels, entry)
+        self._bots: dict[str, dict[str, tuple[dict[str, str], dict[str, Any]]]] = {}
+        self._webservers: dict[ObjectKey, WebserverScope] = {}
+
+    def _webservers_for(self, namespace: str, labels: dict[str, str]) -> set[ObjectKey]:
+        return {
+            key
+            for key, scope in self._webservers.items()
+            if key[0] == namespace and scope.matches(labels)
+        }
+
+    def has_bot(self, namespace: str, name: str) -> bool:
+        """Whether a bot is currently registered."""
+        return name in self._bots.get(namespace, {})
+
+    def upsert_bot(
+        self,
+        namespace: str,
+        name: str,
+        labels: dict[str, str],
+        entry: dict[str, Any],
+    ) -> set[ObjectKey]:
+        """Add or update a bot.
+
+        Returns:
+            Webservers whose document may have changed
+        """
+        bots = self._bots.setdefault(namespace, {})
+        previous = bots.get(name)
+        if previous == (labels, entry):
+            return set()
+        bots[name] = (labels, entry)
+        affected = self._webservers_for(namespace, labels)
+        if previous is not None:
+            affected |= self._webservers_for(namespace, previous[0])
+        return affected
+
+    def remove_bot(self, namespace: str, name: str) -> set[ObjectKey]:
+        """Remove a bot.
+
+        Returns:
+            Webservers whose document may have changed
+        """
+        bots = self._bots.get(namespace, {})
+        previous = bots.pop(name, None)
+        if previous is None:
+            return set()
+        if not bots:
+            del self._bots[namespace]
+        return self._webservers_for(namespace, previous[0])
+
+    def upsert_webserver(self, namespace: str, name: str, scope: WebserverScope) -> bool:
+        """Add or update a webserver. Returns whether its scope changed."""
+        key = (namespace, name)
+        if self._webservers.get(key) == scope:
+            return False
+        self._webservers[key] = scope
+        return True
+
+    def remove_webserver(self, namespace: str, name: str) -> None:
+        """Forget a webserver."""
+        self._webservers.pop((namespace, name), None)
+
+    def scope(self, namespace: str, name: str) -> WebserverScope | None:
+        """Return the scope of a known webserver."""
+        return self._webservers.get((namespace, name))
+
+    def document(self, namespace: str, name: str) -> dict[str, Any]:
+        """Build the registry document of a webserver.
+
+        The version is a digest of the bot entries, so it stays stable
+        across operator restarts and only changes with the content.
+        """
+        scope = self._webservers.get((namespace, name))
+        bots = [
+            entry
+            for _, (labels, entry) in sorted(self._bots.get(namespace, {}).items())
+            if scope is not None and scope.matches(labels)
+        ]
+        return {"version": manifest_hash({"bots": bots}), "bots": bots}
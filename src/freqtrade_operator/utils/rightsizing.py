@@ -0,0 +1,181 @@
+"""Rolling usage history of bot pods and the resources recommended from it.
+
+Samples come from the metrics API, one per bot and interval: the usage of
+the ``freqtrade`` container, in millicores and MiB. Each bot keeps a fixed
+ring of samples (two bytes per value, about 3 KB per bot with the default
+24 hours at two-minute intervals), so memory does not grow with uptime.
+
+Requests follow a high percentile of the window plus a safety margin, so
+bots stop reserving capacity they never use. Limits follow the window's
+peak with headroom, so the short CPU bursts around candle closes are not
+throttled and memory peaks do not end in an OOM kill.
+"""
+
+import math
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from kubernetes.utils import parse_quantity
+
+INTERVAL = 120.0
+SAMPLES = 720
+# An hour of samples before anything is recommended
+MIN_SAMPLES = 30
+
+CPU_PERCENTILE = 90
+MEMORY_PERCENTILE = 95
+MARGIN = 0.15
+CPU_LIMIT_HEADROOM = 1.5
+MEMORY_LIMIT_HEADROOM = 1.3
+MIN_CPU_MILLICORES = 25
+MIN_MEMORY_MIB = 128
+CPU_STEP_MILLICORES = 5
+MEMORY_STEP_MIB = 16
+# Recommendations within this fraction of the published ones are not republished
+TOLERANCE = 0.1
+
+_MAX_SAMPLE = 0xFFFF
+
+ObjectKey = tuple[str, str]  # namespace, name
+
+
+@dataclass(slots=True)
+class _Series:
+    cpu: array
+    memory: array
+    size: int = 0
+    next: int = 0
+    missed: int = 0
+
+
+class UsageHistory:
+    """Ring buffers of CPU and memory samples per bot."""
+
+    def __init__(self, samples: int = SAMPLES) -> None:
+        self.samples = samples
+        self._series: dict[ObjectKey, _Series] = {}
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def add_round(self, usage: Mapping[ObjectKey, tuple[int, int]]) -> None:
+        """Add one sample round.
+
+        Bots missing from a round keep their history; a bot missing for a
+        whole window is dropped.
+
+        Args:
+            usage: CPU millicores and memory MiB per bot
+        """
+        for key, (cpu, memory) in usage.items():
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(
+                    array("H", bytes(2 * self.samples)), array("H", bytes(2 * self.samples))
+                )
+            series.cpu[series.next] = min(cpu, _MAX_SAMPLE)
+            series.memory[series.next] = min(memory, _MAX_SAMPLE)
+            series.next = (series.next + 1) % self.samples
+            series.size = min(series.size + 1, self.samples)
+            series.missed = 0
+        for key, series in list(self._series.items()):
+            if key not in usage:
+                series.missed += 1
+                if series.missed >= self.samples:
+                    del self._series[key]
+
+    def forget(self, key: ObjectKey) -> None:
+        """Drop the history of a bot."""
+        self._series.pop(key, None)
+
+    def size(self, key: ObjectKey) -> int:
+        """Number of samples held for a bot."""
+        series = self._series.get(key)
+        return series.size if series is not None else 0
+
+    def recommend(self, key: ObjectKey) -> dict[str, dict[str, str]] | None:
+        """Recommend requests and limits for a bot's ``freqtrade`` container.
+
+        Args:
+            key: Namespace and name of the bot
+
+        Returns:
+            ``requests`` and ``limits`` as Kubernetes quantities, or None
+            while fewer than ``MIN_SAMPLES`` samples are held
+        """
+        series = self._series.get(key)
+        if series is None or series.size < MIN_SAMPLES:
+            return None
+        cpu = sorted(series.cpu[: series.size])
+        memory = sorted(series.memory[: series.size])
+
+        cpu_request = _round_up(
+            max(_percentile(cpu, CPU_PERCENTILE) * (1 + MARGIN), MIN_CPU_MILLICORES),
+            CPU_STEP_MILLICORES,
+        )
+        memory_request = _round_up(
+            max(_percentile(memory, MEMORY_PERCENTILE) * (1 + MARGIN), MIN_MEMORY_MIB),
+            MEMORY_STEP_MIB,
+        )
+        cpu_limit = _round_up(
+            max(cpu[-1] * CPU_LIMIT_HEADROOM, 2 * cpu_request), CPU_STEP_MILLICORES
+        )
+        memory_limit = _round_up(
+            max(memory[-1] * MEMORY_LIMIT_HEADROOM, memory_request), MEMORY_STEP_MIB
+        )
+        return {
+            "requests": {"cpu": f"{cpu_request}m", "memory": f"{memory_request}Mi"},
+            "limits": {"cpu": f"{cpu_limit}m", "memory": f"{memory_limit}Mi"},
+        }
+
+
+def _percentile(values: list[int], q: float) -> float:
+    return float(values[min(len(values) - 1, math.ceil(q / 100 * len(values)) - 1)])
+
+
+def _round_up(value: float, step: int) -> int:
+    return math.ceil(value / step) * step
+
+
+def cpu_millicores(quantity: str) -> int:
+    """Convert a CPU quantity such as ``1234567n`` or ``250m`` to millicores."""
+    return math.ceil(parse_quantity(quantity) * 1000)
+
+
+def memory_mib(quantity: str) -> int:
+    """Convert a memory quantity such as ``301234Ki`` to MiB."""
+    return math.ceil(parse_quantity(quantity) / 2**20)
+
+
+def differs(recommended: dict[str, Any], published: dict[str, Any] | None) -> bool:
+    """Whether a recommendation moved more than ``TOLERANCE`` from the published one."""
+    if not published:
+        return True
+    for section in ("requests", "limits"):
+        for resource in ("cpu", "memory"):
+            try:
+                new = parse_quantity(recommended[section][resource])
+                old = parse_quantity(published[section][resource])
+            except (KeyError, ValueError):
+                return True
+            if old == 0 or abs(new - old) / old > Decimal(str(TOLERANCE)):
+                return True
+    return False
+
+
+def applied_resources(spec: dict[str, Any], status: dict[str, Any]) -> dict[str, Any] | None:
+    """The published recommendation, if the bot opted into applying it.
+
+    Args:
+        spec: FreqtradeBot spec
+        status: FreqtradeBot status
+
+    Returns:
+        ``resources`` for the ``freqtrade`` container, or None to use ``spec.resources``
+    """
+    if not spec.get("rightsizing", {}).get("apply"):
+        return None
+    return status.get("rightsizing", {}).get("recommended")
@@ -0,0 +1,151 @@
+"""Which namespaces and objects this operator instance is responsible for.
+
+``WATCH_NAMESPACE`` takes a comma-separated list of namespaces (kopf glob
+patterns such as ``team-*`` work too) and ``WATCH_LABEL_SELECTOR`` an
+equality-based label selector such as ``team=quant,shard=1``. Several
+operators can then split one cluster between them.
+
+The selector is passed to the API server as the ``labelSelector`` of the
+watch and list calls of the scoped resources, which needs kopf 1.45 or
+newer. The handlers filter the received events as well, through
+``WATCHED_LABELS`` and ``in_scope``.
+"""
+
+import os
+import re
+from collections.abc import Mapping
+from typing import Any
+
+import kopf
+
+GROUP = "trading.freqtrade.io"
+
+# Resources whose handlers are limited to ``WATCH_LABEL_SELECTOR``
+SCOPED_PLURALS = (
+    "freqtradebots",
+    "freqtradewebservers",
+    "freqtradebotsets",
+    "freqtradepairlists",
+)
+
+_LABEL_KEY = re.compile(
+    r"([a-z0-9]([-a-z0-9.]*[a-z0-9])?/)?[A-Za-z0-9]([-A-Za-z0-9_.]*[A-Za-z0-9])?"
+)
+_LABEL_VALUE = re.compile(r"([A-Za-z0-9]([-A-Za-z0-9_.]*[A-Za-z0-9])?)?")
+
+
+def watch_namespaces(value: str | None = None) -> list[str]:
+    """Return the namespaces to watch; empty means all namespaces.
+
+    Args:
+        value: Comma-separated namespaces, defaults to ``WATCH_NAMESPACE``
+
+    Returns:
+        Namespace names or patterns
+    """
+    value = os.getenv("WATCH_NAMESPACE", "") if value is None else value
+    return [namespace.strip() for namespace in value.split(",") if namespace.strip()]
+
+
+def parse_label_selector(selector: str) -> dict[str, Any]:
+    """Turn an equality-based label selector into a kopf ``labels`` filter.
+
+    Supports ``key=value``, ``key==value``, ``key`` (present) and ``!key``
+    (absent). Set-based terms cannot be expressed as a kopf filter.
+
+    Args:
+        selector: Label selector
+
+    Returns:
+        Label filter, empty when the selector is
+
+    Raises:
+        ValueError: For set-based or inequality terms and malformed keys or values
+    """
+    labels: dict[str, Any] = {}
+    for term in (term.strip() for term in selector.split(",")):
+        if not term:
+            continue
+        if "!=" in term or " in " in term or " notin " in term:
+            raise ValueError(f"Unsupported label selector term: {term}")
+        if term.startswith("!"):
+            key, value = term[1:].strip(), kopf.ABSENT
+        elif "=" in term:
+            key, value = (part.strip() for part in term.replace("==", "=").split("=", 1))
+            if not _LABEL_VALUE.fullmatch(value):
+                raise ValueError(f"Malformed label selector term: {term}")
+        else:
+            key, value = term, kopf.PRESENT
+        if not _LABEL_KEY.fullmatch(key):
+            raise ValueError(f"Malformed label selector term: {term}")
+        labels[key] = value
+    return labels
+
+
+def format_label_selector(labels: Mapping[str, Any]) -> str:
+    """Turn a label filter from ``parse_label_selector`` back into a selector string."""
+    terms = []
+    for key, value in labels.items():
+        if value is kopf.PRESENT:
+            terms.append(key)
+        elif value is kopf.ABSENT:
+            terms.append(f"!{key}")
+        else:
+            terms.append(f"{key}={value}")
+    return ",".join(terms)
+
+
+def select_on_server(settings: kopf.OperatorSettings) -> bool:
+    """Pass ``WATCH_LABEL_SELECTOR`` to the watch and list calls of the scoped resources.
+
+    Objects outside the selector then never reach the operator. Relabelling an
+    object out of it arrives as a deletion from the watch stream.
+
+    Args:
+        settings: Operator settings being configured on startup
+
+    Returns:
+        Whether a selector is set
+
+    Raises:
+        kopf.PermanentError: If kopf is older than 1.45 and cannot pass the
+            selector on, which would have every object sent to the operator
+    """
+    if not LABEL_FILTER:
+        return False
+    selectors = getattr(settings.watching, "label_selectors", None)
+    if selectors is None:
+        raise kopf.PermanentError(
+            "WATCH_LABEL_SELECTOR needs kopf 1.45 or newer to select objects on the API server"
+        )
+    selector = format_label_selector(LABEL_FILTER)
+    for plural in SCOPED_PLURALS:
+        selectors[GROUP, plural] = selector
+    return True
+
+
+def kopf_scope() -> dict[str, Any]:
+    """Keyword arguments scoping ``kopf.run``/``kopf.operator`` to the watched namespaces."""
+    namespaces = watch_namespaces()
+    return {"namespaces": namespaces} if namespaces else {"clusterwide": True}
+
+
+def in_scope(labels: Mapping[str, str]) -> bool:
+    """Whether an object with these labels matches ``WATCH_LABEL_SELECTOR``."""
+    for key, value in LABEL_FILTER.items():
+        if value is kopf.PRESENT:
+            matched = key in labels
+        elif value is kopf.ABSENT:
+            matched = key not in labels
+        else:
+            matched = labels.get(key) == value
+        if not matched:
+            return False
+    return True
+
+
+LABEL_FILTER = parse_label_selector(os.getenv("WATCH_LABEL_SELECTOR", ""))
+
+# ``labels=`` for the handlers of the scoped resources, so that the event of an
+# object relabelled out of the selector is not handled either
+WATCHED_LABELS = LABEL_FILTER or None
@@ -0,0 +1,9 @@
+"""Secret generation utilities."""
+
+import random
+import string
+
+
+def generate_random_secret(length: int = 32) -> str:
+    """Generate a random secret string."""
+    return "".join(random.choices(string.ascii_letters + string.digits, k=length))
@@ -0,0 +1,92 @@
+"""Assignment of a pair universe to bot shards with few migrations."""
+
+import math
+from collections.abc import Mapping
+
+
+def shard_count(pairs: int, shards: int | None, pairs_per_shard: int | None) -> int:
+    """Number of shards for a universe of ``pairs`` pairs.
+
+    Args:
+        pairs: Size of the pair universe
+        shards: Fixed shard count, if set
+        pairs_per_shard: Target pairs per shard, used when no count is set
+
+    Returns:
+        At least one shard
+    """
+    if shards:
+        return shards
+    if pairs_per_shard:
+        return max(1, math.ceil(pairs / pairs_per_shard))
+    return 1
+
+
+def assign_pairs(
+    universe: list[str],
+    current: Mapping[str, list[str]],
+    shards: list[str],
+    pinned: Mapping[str, set[str]] | None = None,
+) -> dict[str, list[str]]:
+    """Split a pair universe into disjoint, balanced slices.
+
+    Pairs stay on their current shard while it exists and holds no more than
+    its share, so adding or removing a shard only moves the pairs it gains
+    or loses. Pinned pairs, such as pairs with open trades, never move: a
+    removed shard holding pinned pairs is kept with just those until they
+    are released, including pinned pairs dropped from the universe.
+
+    Args:
+        universe: Pairs to trade, in priority order
+        current: Pairs each existing shard trades now
+        shards: Shards to spread the universe over
+        pinned: Pairs that must stay on their current shard
+
+    Returns:
+        Pairs per shard in universe order, including removed shards that
+        still hold pinned pairs
+    """
+    pinned = pinned or {}
+    order = {pair: i for i, pair in enumerate(universe)}
+    capacity = math.ceil(len(universe) / len(shards)) if shards else 0
+    plan: dict[str, list[str]] = {shard: [] for shard in shards}
+    placed: set[str] = set()
+
+    # Existing shards first, so pairs found on two shards stay on the first
+    for shard in [*(s for s in shards if s in current), *(s for s in current if s not in plan)]:
+        held = [pair for pair in current[shard] if pair in order and pair not in placed]
+        keep = [pair for pair in held if pair in pinned.get(shard, set())]
+        if shard in plan:
+            keep += [pair for pair in held if pair not in keep][: max(0, capacity - len(keep))]
+        else:
+            keep += sorted(pinned.get(shard, set()) - order.keys() - placed)
+        if keep:
+            plan.setdefault(shard, []).extend(keep)
+            placed.update(keep)
+
+    for pair in universe:
+        if pair in placed:
+            continue
+        shard = min(shards, key=lambda s: len(plan[s]))
+        plan[shard].append(pair)
+        placed.add(pair)
+
+    # Pinned pairs outside the universe go last
+    return {
+        shard: sorted(pairs, key=lambda pair: order.get(pair, len(order)))
+        for shard, pairs in plan.items()
+    }
+
+
+def moved_pairs(current: Mapping[str, list[str]], plan: Mapping[str, list[str]]) -> dict[str, str]:
+    """Pairs leaving their current shard, with the shard they leave.
+
+    Pairs dropped from the universe are not counted as moves.
+    """
+    destination = {pair: shard for shard, pairs in plan.items() for pair in pairs}
+    return {
+        pair: shard
+        for shard, pairs in current.items()
+        for pair in pairs
+        if pair in destination and destination[pair] != shard
+    }
@@ -0,0 +1,49 @@
+"""Compact per-bot state kept by the operator between reconciles."""
+
+import sys
+from dataclasses import dataclass
+
+from freqtrade_operator.utils.registry import ObjectKey
+
+
+@dataclass(slots=True)
+class BotRecord:
+    """What the operator remembers about a reconciled FreqtradeBot.
+
+    Bodies and rendered manifests are dropped once a reconcile finishes;
+    only their digests are kept, which is enough to skip children that
+    did not change.
+    """
+
+    api_port: int
+    spec_digest: str
+    config_hash: str
+    deployment_hash: str
+    status: str
+
+
+class BotStateStore:
+    """Records of all reconciled bots, keyed by namespace and name."""
+
+    def __init__(self) -> None:
+        self._records: dict[ObjectKey, BotRecord] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, namespace: str, name: str) -> BotRecord | None:
+        """Return the record of a bot, if it was reconciled by this process."""
+        return self._records.get((namespace, name))
+
+    def put(self, namespace: str, name: str, record: BotRecord) -> None:
+        """Store the record of a bot, replacing any previous one."""
+        # Namespaces repeat across many bots; share one string per namespace
+        self._records[(sys.intern(namespace), name)] = record
+
+    def remove(self, namespace: str, name: str) -> BotRecord | None:
+        """Forget a bot and return its last record."""
+        return self._records.pop((namespace, name), None)
+
+    def clear(self) -> None:
+        """Forget all bots."""
+        self._records.clear()
@@ -0,0 +1,176 @@
+"""Fleet trading telemetry read from the bots' REST APIs.
+
+Each scrape reads profit, open trades, balance and the time since the last
+loop iteration of every bot. The values become gauge series labelled by
+namespace, bot and stake currency. Two things bound what reaches the
+collector:
+
+- Per-label limits. Bots and namespaces over their limit share an
+  ``other`` series. Profit, trades and balance are summed into it, and the
+  loop lag is the worst one, so fleet totals stay right. Bots keep their
+  own series for as long as they exist, so it does not move between bots
+  as the fleet changes.
+- Change filtering. A series is only exported when its value changed,
+  or once per refresh interval so backends do not mark it stale.
+"""
+
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from freqtrade_operator.utils.registry import ObjectKey
+
+INTERVAL = 60.0
+MAX_NAMESPACES = 50
+MAX_BOTS = 200
+# Unchanged series are sent again after this long; Prometheus forgets
+# series not seen for five minutes
+REFRESH = 240.0
+OVERFLOW = "other"
+
+# Gauge name, description and unit per reading field
+GAUGES = {
+    "profit_closed": ("freqtrade_bot_profit_closed", "Profit of closed trades", "{stake}"),
+    "profit_all": ("freqtrade_bot_profit_all", "Profit including open trades", "{stake}"),
+    "open_trades": ("freqtrade_bot_open_trades", "Open trades", "1"),
+    "balance": ("freqtrade_bot_balance", "Balance available to the bot", "{stake}"),
+    "loop_lag": ("freqtrade_bot_loop_lag_seconds", "Time since the last bot loop", "s"),
+}
+# Fields of the overflow series that take the worst value instead of the sum
+_MAX_FIELDS = {"loop_lag"}
+
+Series = tuple[str, str, str]  # namespace, bot, currency
+
+
+@dataclass(frozen=True, slots=True)
+class BotReading:
+    """One scrape of a bot's API."""
+
+    currency: str
+    profit_closed: float
+    profit_all: float
+    open_trades: int
+    balance: float
+    loop_lag: float | None
+
+
+def parse_reading(
+    profit: Mapping[str, Any],
+    count: Mapping[str, Any],
+    balance: Mapping[str, Any],
+    health: Mapping[str, Any],
+    now: float,
+) -> BotReading:
+    """Build a reading from the ``/profit``, ``/count``, ``/balance`` and ``/health`` bodies.
+
+    The loop lag is rounded to whole seconds. Otherwise it would differ on
+    every scrape and defeat change filtering.
+    """
+    last_process = health.get("last_process_ts")
+    return BotReading(
+        currency=str(balance.get("stake", "")),
+        profit_closed=float(profit["profit_closed_coin"]),
+        profit_all=float(profit["profit_all_coin"]),
+        open_trades=int(count["current"]),
+        balance=float(balance.get("total_bot", balance["total"])),
+        loop_lag=float(max(0, round(now - last_process))) if last_process else None,
+    )
+
+
+class FleetTelemetry:
+    """Latest readings of the fleet, as bounded and change-filtered gauge series.
+
+    Readings are stored from the event loop and observed from the metric
+    exporter's thread.
+    """
+
+    def __init__(
+        self,
+        max_namespaces: int = MAX_NAMESPACES,
+        max_bots: int = MAX_BOTS,
+        refresh: float = REFRESH,
+    ) -> None:
+        self.max_namespaces = max_namespaces
+        self.max_bots = max_bots
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._readings: dict[ObjectKey, BotReading] = {}
+        self._namespaces: set[str] = set()
+        self._bots: set[ObjectKey] = set()
+        self._series: dict[str, dict[Series, float]] = {field: {} for field in GAUGES}
+        # field -> series -> (value, monotonic time) last sent
+        self._sent: dict[str, dict[Series, tuple[float, float]]] = {field: {} for field in GAUGES}
+
+    def _labels(self, key: ObjectKey) -> tuple[str, str]:
+        """Return the namespace and bot labels of a bot, admitting it if there is room."""
+        namespace, name = key
+        if namespace not in self._namespaces:
+            if len(self._namespaces) >= self.max_namespaces:
+                return OVERFLOW, OVERFLOW
+            self._namespaces.add(namespace)
+        if key not in self._bots:
+            if len(self._bots) >= self.max_bots:
+                return namespace, OVERFLOW
+            self._bots.add(key)
+        return namespace, name
+
+    def update(self, bots: Iterable[ObjectKey], readings: Mapping[ObjectKey, BotReading]) -> None:
+        """Replace the readings after a scrape.
+
+        Args:
+            bots: All bots that exist; the labels of others are released
+            readings: Readings of the bots that answered
+        """
+        live = set(bots)
+        with self._lock:
+            self._bots &= live
+            self._namespaces &= {namespace for namespace, _ in live}
+            self._readings = {key: readings[key] for key in sorted(readings) if key in live}
+
+            series: dict[str, dict[Series, float]] = {field: {} for field in GAUGES}
+            for key, reading in self._readings.items():
+                labels = (*self._labels(key), reading.currency)
+                for field, values in series.items():
+                    value = getattr(reading, field)
+                    if value is None:
+                        continue
+                    if labels not in values:
+                        values[labels] = value
+                    elif field in _MAX_FIELDS:
+                        values[labels] = max(values[labels], value)
+                    else:
+                        values[labels] += value
+            self._series = series
+
+    def observe(self, field: str) -> list[tuple[float, dict[str, str]]]:
+        """Return the series of one gauge to export now.
+
+        Returns:
+            Values and attributes of the series that changed or are due
+            for a refresh
+        """
+        now = time.monotonic()
+        observations = []
+        with self._lock:
+            sent = self._sent[field]
+            for labels in set(sent) - set(self._series[field]):
+                del sent[labels]
+            for labels, value in self._series[field].items():
+                previous = sent.get(labels)
+                if previous is not None and previous[0] == value:
+                    if now - previous[1] < self.refresh:
+                        continue
+                sent[labels] = (value, now)
+                namespace, bot, currency = labels
+                attributes = {"namespace": namespace, "bot": bot}
+                if currency:
+                    attributes["currency"] = currency
+                observations.append((value, attributes))
+        return observations
+
+    def size(self) -> int:
+        """Return the number of series across all gauges."""
+        with self._lock:
+            return sum(len(values) for values in self._series.values())
@@ -0,0 +1 @@
+"""Scale and rendering benchmarks for the operator."""
@@ -0,0 +1,53 @@
+"""Fixtures for the benchmarks.
+
+Scale is set through the environment so the default test run stays quick:
+
+- ``BENCH_BOTS``: synthetic FreqtradeBots per storm (default 50, e.g. 10000)
+- ``BENCH_LATENCY``: seconds added to every fake API request (default 0)
+- ``BENCH_WORKERS``: handler threads (default: ThreadPoolExecutor default, as kopf)
+"""
+
+import os
+from collections.abc import Iterator
+
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.handlers.freqtradebot import update_debouncer
+from freqtrade_operator.utils.kube import api_client
+from tests.fakes.apiserver import FakeApiClient, serve
+
+BENCH_BOTS = int(os.getenv("BENCH_BOTS", "50"))
+BENCH_LATENCY = float(os.getenv("BENCH_LATENCY", "0"))
+BENCH_WORKERS = int(os.environ["BENCH_WORKERS"]) if os.getenv("BENCH_WORKERS") else None
+
+
+@pytest.fixture
+def fake_apiserver() -> Iterator[FakeApiClient]:
+    """Run the fake API server in a subprocess and point the client at it.
+
+    The subprocess keeps the fake's own memory out of the RSS figures.
+    """
+    previous = client.Configuration.get_default_copy()
+    with serve(latency=BENCH_LATENCY, subprocess=True) as fake:
+        configuration = client.Configuration(host=fake.url)
+        # Enough pooled connections for every handler thread
+        configuration.connection_pool_maxsize = 64
+        client.Configuration.set_default(configuration)
+        api_client.cache_clear()
+        try:
+            yield fake
+        finally:
+            client.Configuration.set_default(previous)
+            api_client.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def no_debounce() -> Iterator[None]:
+    """Reconcile every update straight away, as the storms measure handler throughput."""
+    window = update_debouncer.window
+    update_debouncer.window = 0.0
+    try:
+        yield
+    finally:
+        update_debouncer.window = window
@@ -0,0 +1,361 @@
+"""Drive the FreqtradeBot handlers the way kopf does and collect measurements.
+
+:class:`OperatorDriver` watches FreqtradeBots on the fake API server and
+runs the real handlers from ``handlers/freqtradebot.py`` in a thread pool,
+like kopf runs synchronous handlers. After a create or update it patches
+the handler result into the object's status and the handled spec into
+the last-handled-configuration annotation, as kopf does, so request
+counts include that bookkeeping and no bodies are held in memory between
+events. A handler deferred with ``Debounced`` is retried after its delay
+with the newest body, as kopf does. kopf's finalizer patches and
+per-object event queues are not reproduced: events for an object that is
+being handled or deferred are dropped.
+
+Results are written to ``.benchmarks/<version>/<name>.json`` (or
+``BENCH_RESULTS_DIR``) and compared with the newest result of the same
+name from any other version.
+"""
+
+import importlib.metadata
+import json
+import os
+import resource
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import kopf
+from kubernetes import client, watch
+from kubernetes.client.rest import ApiException
+
+import freqtrade_operator
+from freqtrade_operator.handlers.freqtradebot import (
+    create_freqtradebot,
+    delete_freqtradebot,
+    update_freqtradebot,
+)
+from freqtrade_operator.utils.debounce import Debounced
+from tests.fakes.bots import GROUP, PLURAL, VERSION
+
+LAST_HANDLED = "kopf.zalando.org/last-handled-configuration"
+
+RESULTS_DIR = Path(
+    os.getenv("BENCH_RESULTS_DIR", Path(__file__).resolve().parents[2] / ".benchmarks")
+)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass(slots=True)
+class Reconcile:
+    """Timing of one handler invocation."""
+
+    action: str
+    handler_seconds: float
+    finished: float
+    error: str | None = None
+
+
+@dataclass
+class PhaseResult:
+    """Measurements of one create, update or delete storm."""
+
+    action: str
+    bots: int
+    seconds: float
+    reconciles: list[Reconcile] = field(repr=False)
+    requests: dict[str, int]
+    rss_bytes: int
+
+    def summary(self) -> dict[str, Any]:
+        """Summarise as a JSON-serialisable dict."""
+        handler = [r.handler_seconds for r in self.reconciles]
+        end_to_end = [r.finished for r in self.reconciles]
+        total_requests = sum(self.requests.values())
+        return {
+            "bots": self.bots,
+            "seconds": round(self.seconds, 4),
+            "throughput": round(self.bots / self.seconds, 2) if self.seconds else 0.0,
+            "handler_p50_ms": round(percentile(handler, 50) * 1000, 3),
+            "handler_p99_ms": round(percentile(handler, 99) * 1000, 3),
+            "end_to_end_p50_ms": round(percentile(end_to_end, 50) * 1000, 3),
+            "end_to_end_p99_ms": round(percentile(end_to_end, 99) * 1000, 3),
+            "errors": sum(1 for r in self.reconciles if r.error),
+            "requests": dict(sorted(self.requests.items())),
+            "requests_per_bot": round(total_requests / self.bots, 3) if self.bots else 0.0,
+            "rss_bytes": self.rss_bytes,
+        }
+
+
+class OperatorDriver:
+    """Watch FreqtradeBots and dispatch events to the real handlers."""
+
+    def __init__(self, workers: int | None = None) -> None:
+        # kopf's default executor for sync handlers is a default ThreadPoolExecutor
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.custom_api = client.CustomObjectsApi()
+        self._inflight: set[str] = set()
+        self._reconciles: list[Reconcile] = []
+        self._completed: Counter[str] = Counter()
+        self.deferrals = 0
+        self._timers: set[threading.Timer] = set()
+        self._condition = threading.Condition()
+        self._phase_started = 0.0
+        self._watch = watch.Watch()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        """Start watching FreqtradeBots in all namespaces."""
+        self._thread.start()
+
+    def stop(self, cancel_pending: bool = False) -> None:
+        """Stop dispatching and wait for running handlers.
+
+        Args:
+            cancel_pending: Drop queued handlers instead of running them, as
+                when the operator process dies
+        """
+        self._stopping.set()
+        self._watch.stop()
+        for timer in list(self._timers):
+            timer.cancel()
+        self.executor.shutdown(wait=True, cancel_futures=cancel_pending)
+
+    def _run(self) -> None:
+        try:
+            for event in self._watch.stream(
+                self.custom_api.list_cluster_custom_object, GROUP, VERSION, PLURAL
+            ):
+                self._dispatch(event["type"], event["object"])
+        except Exception:
+            # The stream breaks when the fake API server shuts down
+            if not self._stopping.is_set():
+                raise
+
+    def _dispatch(self, event_type: str, obj: dict[str, Any]) -> None:
+        metadata = obj["metadata"]
+        key = f"{metadata['namespace']}/{metadata['name']}"
+        if event_type == "DELETED":
+            self.executor.submit(self._reconcile, key, "delete", obj, None)
+            return
+        if key in self._inflight:
+            return
+
+        last_handled = (metadata.get("annotations") or {}).get(LAST_HANDLED)
+        if last_handled is None:
+            self._inflight.add(key)
+            self.executor.submit(self._reconcile, key, "create", obj, None)
+        else:
+            old = json.loads(last_handled)
+            if old["spec"] != obj["spec"]:
+                self._inflight.add(key)
+                self.executor.submit(self._reconcile, key, "update", obj, old)
+
+    def _reconcile(
+        self, key: str, action: str, obj: dict[str, Any], old: dict[str, Any] | None
+    ) -> None:
+        metadata = obj["metadata"]
+        kwargs: dict[str, Any] = {
+            "name": metadata["name"],
+            "namespace": metadata["namespace"],
+            "body": obj,
+        }
+        error = None
+        started = time.perf_counter()
+        try:
+            if action == "create":
+                result = create_freqtradebot(spec=obj["spec"], meta=metadata, **kwargs)
+            elif action == "update":
+                result = update_freqtradebot(
+                    spec=obj["spec"],
+                    meta=metadata,
+                    old=old,
+                    new={"spec": obj["spec"]},
+                    status=obj.get("status", {}),
+                    patch=kopf.Patch(),
+                    **kwargs,
+                )
+            else:
+                result = delete_freqtradebot(**kwargs)
+        except Debounced as e:
+            timer = threading.Timer(e.delay or 0.0, lambda: self._retry(timer, key, metadata, old))
+            timer.daemon = True
+            with self._condition:
+                self.deferrals += 1
+                self._timers.add(timer)
+            timer.start()
+            return
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        handler_seconds = time.perf_counter() - started
+
+        if error is None and action != "delete":
+            try:
+                self.custom_api.patch_namespaced_custom_object(
+                    GROUP,
+                    VERSION,
+                    metadata["namespace"],
+                    PLURAL,
+                    metadata["name"],
+                    {
+                        "metadata": {
+                            "annotations": {LAST_HANDLED: json.dumps({"spec": obj["spec"]})}
+                        },
+                        "status": {f"{action}_freqtradebot": result},
+                    },
+                )
+            except ApiException as e:
+                error = f"status patch: {e.reason}"
+        self._inflight.discard(key)
+
+        with self._condition:
+            self._reconciles.append(
+                Reconcile(action, handler_seconds, time.perf_counter() - self._phase_started, error)
+            )
+            self._completed[action] += 1
+            self._condition.notify_all()
+
+    def _retry(
+        self,
+        timer: threading.Timer,
+        key: str,
+        metadata: dict[str, Any],
+        old: dict[str, Any] | None,
+    ) -> None:
+        """Run a deferred update again with the newest version of its object."""
+        with self._condition:
+            self._timers.discard(timer)
+        if self._stopping.is_set():
+            return
+        try:
+            obj = self.custom_api.get_namespaced_custom_object(
+                GROUP, VERSION, metadata["namespace"], PLURAL, metadata["name"]
+            )
+            if not self._stopping.is_set():
+                self.executor.submit(self._reconcile, key, "update", obj, old)
+                return
+        except ApiException as e:
+            if e.status != 404:
+                raise
+        self._inflight.discard(key)
+
+    def wait_for_success(self, timeout: float = 60.0) -> float:
+        """Wait for the first handler that succeeds.
+
+        Args:
+            timeout: Seconds to wait before failing
+
+        Returns:
+            ``time.perf_counter()`` at which that handler finished
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: any(r.error is None for r in self._reconciles), timeout
+            ):
+                raise TimeoutError("No handler succeeded")
+            return self._phase_started + min(
+                r.finished for r in self._reconciles if r.error is None
+            )
+
+    def run_phase(
+        self, action: str, bots: int, trigger: Any, fake: Any, timeout: float = 3600.0
+    ) -> PhaseResult:
+        """Trigger a storm and wait until ``bots`` handlers for ``action`` finished.
+
+        Args:
+            action: ``create``, ``update`` or ``delete``
+            bots: Number of handler invocations to wait for
+            trigger: Callable that seeds or deletes the bots
+            fake: Client of the fake API server, for request counts
+            timeout: Seconds to wait before failing
+
+        Returns:
+            Phase measurements
+        """
+        fake.reset()
+        with self._condition:
+            self._reconciles = []
+            self._completed[action] = 0
+            self._phase_started = time.perf_counter()
+        trigger()
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._completed[action] >= bots, timeout):
+                raise TimeoutError(f"{self._completed[action]}/{bots} {action} handlers finished")
+            reconciles = self._reconciles
+        seconds = time.perf_counter() - self._phase_started
+        return PhaseResult(action, bots, seconds, reconciles, fake.stats()["requests"], rss_bytes())
+
+
+def version_label() -> str:
+    """Version the results are filed under, with an optional ``BENCH_LABEL``."""
+    try:
+        version = importlib.metadata.version("freqtrade-operator")
+    except importlib.metadata.PackageNotFoundError:
+        version = freqtrade_operator.__version__
+    label = os.getenv("BENCH_LABEL")
+    return f"{version}-{label}" if label else version
+
+
+def save_results(name: str, result: dict[str, Any]) -> dict[str, Any] | None:
+    """Store a result and return the newest result of another version, if any.
+
+    Args:
+        name: Benchmark name, used as the file name
+        result: JSON-serialisable result
+
+    Returns:
+        Previous result to compare against, or None
+    """
+    version = version_label()
+    previous = sorted(
+        (path for path in RESULTS_DIR.glob(f"*/{name}.json") if path.parent.name != version),
+        key=lambda path: path.stat().st_mtime,
+    )
+
+    target = RESULTS_DIR / version / f"{name}.json"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps({"version": version, **result}, indent=2) + "\n")
+
+    return json.loads(previous[-1].read_text()) if previous else None
+
+
+def compare(
+    current: dict[str, Any], previous: dict[str, Any] | None, prefix: str = ""
+) -> list[str]:
+    """List the numeric values of ``current`` next to those of ``previous``."""
+    lines = []
+    for key, value in current.items():
+        old = (previous or {}).get(key)
+        if isinstance(value, dict):
+            lines.extend(compare(value, old if isinstance(old, dict) else None, f"{prefix}{key}."))
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            line = f"{prefix}{key}: {value}"
+            if isinstance(old, int | float) and old:
+                line += f" (was {old}, {(value - old) / old:+.1%})"
+            lines.append(line)
+    return lines
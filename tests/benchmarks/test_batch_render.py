@@ -0,0 +1,53 @@
+"""Offline rendering of a fleet: time in one process and in worker processes.
+
+``BENCH_BOTS`` bots are written one per file and rendered from there, so the
+timings include reading and parsing the YAML. tests/test_render.py checks
+what is rendered.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from freqtrade_operator.render.batch import find_files, load_file, render_batch
+from freqtrade_operator.render.schema import load_crd_schemas
+from tests.benchmarks.conftest import BENCH_BOTS
+from tests.benchmarks.harness import compare, save_results
+from tests.fakes.bots import bot_object
+
+CRDS = Path(__file__).resolve().parents[2] / "deploy" / "crds"
+WORKERS = max(2, min(4, os.cpu_count() or 1))
+
+
+def _write_fleet(directory: Path, bots: list[dict[str, Any]]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for index, bot in enumerate(bots):
+        (directory / f"{index:05d}.yaml").write_text(yaml.safe_dump(bot))
+
+
+def _render(directory: Path, jobs: int) -> tuple[list[Any], float]:
+    started = time.perf_counter()
+    resources = [r for path in find_files([str(directory)]) for r in load_file(path)]
+    results = render_batch(resources, load_crd_schemas(CRDS), jobs=jobs)
+    return results, time.perf_counter() - started
+
+
+def test_batch_render(tmp_path: Path) -> None:
+    """Time rendering a fleet in one process and in worker processes."""
+    _write_fleet(tmp_path / "bots", [bot_object(i) for i in range(BENCH_BOTS)])
+
+    serial, serial_seconds = _render(tmp_path / "bots", jobs=1)
+    _, parallel_seconds = _render(tmp_path / "bots", jobs=WORKERS)
+
+    result = {
+        "bots": BENCH_BOTS,
+        "manifests": sum(len(r.files) for r in serial),
+        "serial_ms": round(serial_seconds * 1000, 1),
+        "parallel_ms": round(parallel_seconds * 1000, 1),
+        "workers": WORKERS,
+    }
+    previous = save_results("batch_render", result)
+    print("\n" + "\n".join(compare(result, previous)))
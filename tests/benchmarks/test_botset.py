@@ -0,0 +1,53 @@
+"""FreqtradeBotSet sharding: disjoint slices and small migrations on rescaling.
+
+The pair universe is resharded through a series of shard counts. Moves are
+compared with slicing the universe afresh at every count.
+"""
+
+import math
+
+from freqtrade_operator.utils.sharding import assign_pairs, moved_pairs
+from tests.benchmarks.conftest import BENCH_BOTS
+from tests.benchmarks.harness import compare, save_results
+
+SHARD_COUNTS = [4, 5, 6, 3, 8, 7]
+
+
+def _universe(size: int) -> list[str]:
+    return [f"T{i:04d}/USDT" for i in range(size)]
+
+
+def _sliced(universe: list[str], count: int) -> dict[str, list[str]]:
+    """Contiguous slices, as when whitelists are split by hand."""
+    size = math.ceil(len(universe) / count)
+    return {f"s-{i}": universe[i * size : (i + 1) * size] for i in range(count)}
+
+
+def test_rebalance_moves() -> None:
+    """Rescaling moves only the pairs the added or removed shards gain or lose."""
+    universe = _universe(BENCH_BOTS * 4)
+    plan: dict[str, list[str]] = {}
+    moves = resliced = 0
+    for count in SHARD_COUNTS:
+        shards = [f"s-{i}" for i in range(count)]
+        previous, plan = plan, assign_pairs(universe, plan, shards)
+        capacity = math.ceil(len(universe) / count)
+
+        assigned = [pair for pairs in plan.values() for pair in pairs]
+        assert sorted(assigned) == universe
+        assert max(len(pairs) for pairs in plan.values()) == capacity
+        if previous:
+            moves += len(moved_pairs(previous, plan))
+            resliced += len(moved_pairs(_sliced(universe, len(previous)), _sliced(universe, count)))
+            # Pairs only leave removed shards and shards holding more than their share
+            assert len(moved_pairs(previous, plan)) <= sum(
+                max(0, len(pairs) - capacity) if shard in plan else len(pairs)
+                for shard, pairs in previous.items()
+            )
+
+    result = {"pairs": len(universe), "rescales": len(SHARD_COUNTS) - 1, "moves": moves}
+    result["resliced_moves"] = resliced
+    previous_result = save_results("botset", result)
+    print("\n" + "\n".join(compare(result, previous_result)))
+
+    assert moves < resliced
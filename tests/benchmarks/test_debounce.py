@@ -0,0 +1,107 @@
+"""Bursts of edits to the same bots: reconciles per burst and starvation under churn.
+
+Windows are shortened from the production defaults so the test stays quick.
+"""
+
+import json
+import time
+from collections.abc import Iterator
+
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.handlers import freqtradebot
+from freqtrade_operator.utils.debounce import Debouncer
+from freqtrade_operator.utils.kube import api_client
+from tests.benchmarks.conftest import BENCH_BOTS, BENCH_WORKERS
+from tests.benchmarks.harness import OperatorDriver, compare, save_results
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import BOTS_PATH, NAMESPACE, bot_name, bot_object
+
+WINDOW = 0.5
+MAX_DELAY = 1.5
+EDITS = 5
+CHURN_SECONDS = 4.0
+
+
+@pytest.fixture
+def driver(
+    fake_apiserver: FakeApiClient, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[OperatorDriver]:
+    """An operator whose bots have been created, debouncing with the short windows."""
+    monkeypatch.setattr(freqtradebot, "update_debouncer", Debouncer(WINDOW, MAX_DELAY))
+    driver = OperatorDriver(workers=BENCH_WORKERS)
+    driver.start()
+    try:
+        driver.run_phase(
+            "create",
+            BENCH_BOTS,
+            lambda: fake_apiserver.seed(BOTS_PATH, [bot_object(i) for i in range(BENCH_BOTS)]),
+            fake_apiserver,
+        )
+        yield driver
+    finally:
+        driver.stop()
+
+
+def test_burst_coalesced(driver: OperatorDriver, fake_apiserver: FakeApiClient) -> None:
+    """Several quick edits to a bot: the first is reconciled at once, the rest together."""
+
+    def burst() -> None:
+        for edit in range(EDITS):
+            fake_apiserver.seed(
+                BOTS_PATH, [bot_object(i, stake=str(200 + edit)) for i in range(BENCH_BOTS)]
+            )
+            time.sleep(WINDOW / EDITS)
+
+    phase = driver.run_phase("update", 2 * BENCH_BOTS, burst, fake_apiserver)
+    # Nothing trails the burst once it has been reconciled
+    time.sleep(WINDOW * 2)
+    requests = fake_apiserver.stats()["requests"]
+    configmap = client.CoreV1Api(api_client()).read_namespaced_config_map(
+        f"{bot_name(0)}-config", NAMESPACE
+    )
+
+    result = {
+        "bots": BENCH_BOTS,
+        "edits": EDITS,
+        "seconds": round(phase.seconds, 3),
+        "reconciles": len(phase.reconciles),
+        "deferrals": driver.deferrals,
+        "replace_configmaps": requests.get("replace configmaps", 0),
+    }
+    previous = save_results("debounce-burst", result)
+    print("\n" + "\n".join(compare(result, previous)))
+
+    assert not [r.error for r in phase.reconciles if r.error]
+    assert result["reconciles"] == 2 * BENCH_BOTS
+    assert result["replace_configmaps"] == 2 * BENCH_BOTS
+    assert json.loads(configmap.data["config.json"])["stake_amount"] == str(200 + EDITS - 1)
+
+
+def test_churn_does_not_starve(driver: OperatorDriver, fake_apiserver: FakeApiClient) -> None:
+    """Bots edited without pause are still reconciled once per maximum delay."""
+
+    def churn() -> None:
+        started = time.perf_counter()
+        edit = 0
+        while time.perf_counter() - started < CHURN_SECONDS:
+            fake_apiserver.seed(
+                BOTS_PATH, [bot_object(i, stake=str(300 + edit)) for i in range(BENCH_BOTS)]
+            )
+            edit += 1
+            time.sleep(WINDOW / 2)
+
+    phase = driver.run_phase("update", BENCH_BOTS, churn, fake_apiserver)
+    during_churn = sum(1 for r in phase.reconciles if r.finished < CHURN_SECONDS)
+
+    result = {
+        "bots": BENCH_BOTS,
+        "reconciles_during_churn": during_churn,
+        "deferrals": driver.deferrals,
+    }
+    previous = save_results("debounce-churn", result)
+    print("\n" + "\n".join(compare(result, previous)))
+
+    assert not [r.error for r in phase.reconciles if r.error]
+    assert during_churn >= 2 * BENCH_BOTS
@@ -0,0 +1,123 @@
+"""Active/standby failover: time until the standby reconciles after the leader goes.
+
+Two replicas share a Lease on the fake API server. The leader runs the
+handlers; the standby only polls the Lease. Timings are shortened from
+the production defaults so the test stays quick; takeover scales with them.
+"""
+
+import threading
+import time
+
+from freqtrade_operator.handlers.freqtradebot import bot_state
+from freqtrade_operator.utils.leader import LeaderElector
+from tests.benchmarks.conftest import BENCH_BOTS, BENCH_WORKERS
+from tests.benchmarks.harness import OperatorDriver, compare, save_results
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import BOTS_PATH, NAMESPACE, bot_object
+
+LEASE_DURATION = 3.0
+RENEW_DEADLINE = 2.0
+RETRY_PERIOD = 0.25
+
+
+class Replica:
+    """An operator replica: runs the handlers while it holds the Lease."""
+
+    def __init__(self, identity: str) -> None:
+        self.elector = LeaderElector(
+            "freqtrade-operator",
+            NAMESPACE,
+            identity,
+            lease_duration=LEASE_DURATION,
+            renew_deadline=RENEW_DEADLINE,
+            retry_period=RETRY_PERIOD,
+        )
+        self.driver: OperatorDriver | None = None
+        self.leading = threading.Event()
+        self.leading_at = 0.0
+        self._killed = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self.elector.try_acquire_or_renew():
+            if self._killed.wait(RETRY_PERIOD):
+                return
+        self.leading_at = time.perf_counter()
+        # A new operator process starts without the old leader's records
+        bot_state.clear()
+        self.driver = OperatorDriver(workers=BENCH_WORKERS)
+        self.driver.start()
+        self.leading.set()
+        while not self._killed.wait(RETRY_PERIOD):
+            self.elector.try_acquire_or_renew()
+
+    def kill(self) -> None:
+        """Stop without releasing the Lease, dropping queued handlers."""
+        self._killed.set()
+        self._thread.join()
+        if self.driver is not None:
+            self.driver.stop(cancel_pending=True)
+
+    def shut_down(self) -> None:
+        """Stop cleanly and hand the Lease over."""
+        self.kill()
+        self.elector.release()
+
+
+def _failover(fake: FakeApiClient, graceful: bool) -> dict[str, float]:
+    leader, standby = Replica("operator-a"), Replica("operator-b")
+    leader.start()
+    assert leader.leading.wait(10)
+    standby.start()
+    try:
+        assert leader.driver is not None
+        bots = range(BENCH_BOTS)
+        leader.driver.run_phase(
+            "create", BENCH_BOTS, lambda: fake.seed(BOTS_PATH, [bot_object(i) for i in bots]), fake
+        )
+        # Take the leader down halfway through an update storm
+        leader.driver.run_phase(
+            "update",
+            BENCH_BOTS // 2,
+            lambda: fake.seed(BOTS_PATH, [bot_object(i, stake="250") for i in bots]),
+            fake,
+        )
+        stopped = time.perf_counter()
+        if graceful:
+            leader.shut_down()
+        else:
+            leader.kill()
+
+        assert standby.leading.wait(LEASE_DURATION * 4)
+        assert standby.driver is not None
+        first_reconcile = standby.driver.wait_for_success(timeout=30)
+    finally:
+        leader.kill()
+        standby.kill()
+
+    return {
+        "takeover_seconds": round(standby.leading_at - stopped, 3),
+        "first_reconcile_seconds": round(first_reconcile - stopped, 3),
+    }
+
+
+def test_leader_killed_under_load(fake_apiserver: FakeApiClient) -> None:
+    """A crashed leader is replaced once its Lease expires."""
+    result = _failover(fake_apiserver, graceful=False)
+    previous = save_results("failover-crash", result)
+    print("\n" + "\n".join(compare(result, previous)))
+
+    assert result["first_reconcile_seconds"] < LEASE_DURATION + 2 * RETRY_PERIOD + 2.0
+
+
+def test_leader_hands_over_on_shutdown(fake_apiserver: FakeApiClient) -> None:
+    """A leader that shuts down releases its Lease for an immediate takeover."""
+    result = _failover(fake_apiserver, graceful=True)
+    previous = save_results("failover-shutdown", result)
+    print("\n" + "\n".join(compare(result, previous)))
+
+    assert result["takeover_seconds"] < 2 * RETRY_PERIOD + 0.5
+    assert result["first_reconcile_seconds"] < 2 * RETRY_PERIOD + 2.0
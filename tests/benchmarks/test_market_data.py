@@ -0,0 +1,99 @@
+"""Market-data proxy: bots on one exchange share public requests, against a fake exchange.
+
+Each simulated bot does what freqtrade does on a candle close: load
+markets, fetch tickers, candles of several pairs and an order book, then
+query its account and place an order. Requests are sent the way ccxt
+sends them through ``proxyUrl``: the full exchange URL appended to the
+proxy's.
+"""
+
+import asyncio
+import time
+
+import aiohttp
+
+from freqtrade_operator.marketdata.routes import (
+    EXCHANGES,
+    ORDERBOOK_TTL,
+    TICKER_TTL,
+    ExchangeRoutes,
+    candle_ttl,
+)
+from freqtrade_operator.marketdata.server import UpstreamClient, create_app
+from tests.benchmarks.conftest import BENCH_BOTS
+from tests.benchmarks.harness import compare, save_results
+from tests.fakes.exchange import FakeExchange, serve_app
+
+PAIRS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+# The fake exchange runs locally instead of on Binance's hosts
+LOCAL_BINANCE = ExchangeRoutes(hosts=frozenset({"127.0.0.1"}), routes=EXCHANGES["binance"].routes)
+
+
+async def _bot(session: aiohttp.ClientSession, upstream: str, index: int) -> dict[str, object]:
+    async def get(path: str, **headers: str) -> aiohttp.ClientResponse:
+        async with session.get(f"{upstream}{path}", headers=headers) as resp:
+            await resp.read()
+            return resp
+
+    await get("/api/v3/exchangeInfo")
+    await get("/api/v3/ticker/24hr")
+    candles = await asyncio.gather(
+        *(get(f"/api/v3/klines?symbol={pair}&interval=5m&limit=500") for pair in PAIRS)
+    )
+    await get("/api/v3/depth?symbol=BTCUSDT&limit=1")
+
+    key = f"key-{index}"
+    async with session.get(
+        f"{upstream}/api/v3/account?timestamp={index}&signature=sig{index}",
+        headers={"X-MBX-APIKEY": key},
+    ) as resp:
+        account = await resp.json()
+    async with session.post(
+        f"{upstream}/api/v3/order?symbol=BTCUSDT&side=BUY&type=MARKET&quantity=0.001",
+        headers={"X-MBX-APIKEY": key},
+    ) as resp:
+        await resp.read()
+    return {"candles": [c.status for c in candles], "account": account.get("apiKey"), "key": key}
+
+
+async def _storm(exchange: FakeExchange, bots: int) -> tuple[list[dict[str, object]], float]:
+    async with (
+        serve_app(exchange.app()) as exchange_url,
+        serve_app(create_app(LOCAL_BINANCE, UpstreamClient())) as proxy_url,
+        aiohttp.ClientSession() as session,
+    ):
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(_bot(session, f"{proxy_url}/{exchange_url}", i) for i in range(bots))
+        )
+        return results, time.perf_counter() - started
+
+
+def test_public_requests_are_shared() -> None:
+    """Public requests reach the exchange once per distinct URL, private ones once per bot."""
+    # Start well inside a 5m candle, so every bot fetches the same one
+    while candle_ttl(300) < 10:
+        time.sleep(1)
+    exchange = FakeExchange()
+    results, seconds = asyncio.run(_storm(exchange, BENCH_BOTS))
+
+    public = {k: v for k, v in exchange.requests.items() if "account" not in k and "order" not in k}
+    result = {
+        "bots": BENCH_BOTS,
+        "seconds": round(seconds, 3),
+        "upstream_public_requests": sum(public.values()),
+        "public_requests_without_proxy": BENCH_BOTS * (4 + len(PAIRS)),
+    }
+    previous = save_results("market-data", result)
+    print("\n" + "\n".join(compare(result, previous)))
+
+    assert exchange.requests["GET /api/v3/exchangeInfo"] == 1
+    # Short-lived entries may be refetched once they expire during a long storm
+    assert exchange.requests["GET /api/v3/ticker/24hr"] <= 1 + int(seconds / TICKER_TTL)
+    assert exchange.requests["GET /api/v3/depth"] <= 1 + int(seconds / ORDERBOOK_TTL)
+    assert exchange.requests["GET /api/v3/klines"] == len(PAIRS)
+    # Private endpoints are passed through, each bot sees its own account
+    assert exchange.requests["GET /api/v3/account"] == BENCH_BOTS
+    assert exchange.requests["POST /api/v3/order"] == BENCH_BOTS
+    assert all(r["account"] == r["key"] for r in results)
+    assert all(r["candles"] == [200] * len(PAIRS) for r in results)
@@ -0,0 +1,108 @@
+"""Memory held by the operator per bot.
+
+``BENCH_MEMORY_BOTS`` sets the fleet size (default 5000).
+"""
+
+import gc
+import os
+import tracemalloc
+
+from freqtrade_operator.handlers.freqtradebot import assign_api_port, bot_state
+from freqtrade_operator.resources.registry import create_registry_entry
+from freqtrade_operator.utils.manifests import manifest_hash
+from freqtrade_operator.utils.registry import BotRegistry
+from freqtrade_operator.utils.state import BotRecord, BotStateStore
+from tests.benchmarks.harness import OperatorDriver, compare, rss_bytes, save_results
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import BOTS_PATH, NAMESPACE, bot_name, bot_object, bot_spec
+
+BENCH_MEMORY_BOTS = int(os.getenv("BENCH_MEMORY_BOTS", "5000"))
+
+# Retained state per bot: its BotRecord plus its entry in the webserver registry
+STATE_BYTES_PER_BOT = 2048
+# Half the chart's 512Mi limit, leaving the rest for kopf and request bursts
+RSS_BUDGET_BYTES = 256 * 1024 * 1024
+
+
+def test_retained_state_per_bot() -> None:
+    """The operator's own state stays within a fixed size per bot."""
+    store = BotStateStore()
+    registry = BotRegistry()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(BENCH_MEMORY_BOTS):
+            name, spec = bot_name(i), bot_spec(i)
+            port = assign_api_port(name)
+            store.put(
+                NAMESPACE,
+                name,
+                BotRecord(
+                    api_port=port,
+                    spec_digest=manifest_hash(spec),
+                    config_hash=manifest_hash({"config": spec}),
+                    deployment_hash=manifest_hash({"deployment": spec}),
+                    status="Created",
+                ),
+            )
+            registry.upsert_bot(
+                NAMESPACE,
+                name,
+                {"fleet": "bench"},
+                create_registry_entry(name, NAMESPACE, spec, port),
+            )
+        gc.collect()
+        per_bot = (tracemalloc.get_traced_memory()[0] - before) / BENCH_MEMORY_BOTS
+    finally:
+        tracemalloc.stop()
+
+    result = {"bots": BENCH_MEMORY_BOTS, "bytes_per_bot": round(per_bot)}
+    previous = save_results("state", result)
+    print("\n" + "\n".join(compare(result, previous)))
+    assert per_bot < STATE_BYTES_PER_BOT
+
+
+def test_rss_under_budget(fake_apiserver: FakeApiClient) -> None:
+    """Operator RSS stays under budget while reconciling a large fleet."""
+    bots = range(BENCH_MEMORY_BOTS)
+    baseline = rss_bytes()
+
+    driver = OperatorDriver()
+    driver.start()
+    try:
+        driver.run_phase(
+            "create",
+            BENCH_MEMORY_BOTS,
+            lambda: fake_apiserver.seed(BOTS_PATH, [bot_object(i) for i in bots]),
+            fake_apiserver,
+        )
+        assert len(bot_state) == BENCH_MEMORY_BOTS
+        driver.run_phase(
+            "update",
+            BENCH_MEMORY_BOTS,
+            lambda: fake_apiserver.seed(BOTS_PATH, [bot_object(i, stake="250") for i in bots]),
+            fake_apiserver,
+        )
+        gc.collect()
+        rss = rss_bytes()
+        driver.run_phase(
+            "delete",
+            BENCH_MEMORY_BOTS,
+            lambda: fake_apiserver.delete(BOTS_PATH, NAMESPACE, [bot_name(i) for i in bots]),
+            fake_apiserver,
+        )
+    finally:
+        driver.stop()
+
+    result = {
+        "bots": BENCH_MEMORY_BOTS,
+        "baseline_rss_bytes": baseline,
+        "rss_bytes": rss,
+        "rss_per_bot_bytes": round((rss - baseline) / BENCH_MEMORY_BOTS),
+    }
+    previous = save_results("memory", result)
+    print("\n" + "\n".join(compare(result, previous)))
+
+    assert len(bot_state) == 0
+    assert rss < RSS_BUDGET_BYTES
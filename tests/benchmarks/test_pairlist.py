@@ -0,0 +1,109 @@
+"""Shared pairlists: one ranking per exchange and filter set, served with ETags.
+
+Pairlists are ranked from a local fake exchange and published to the fake
+API server, as the operator does on its refresh tick.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.handlers import pairlist
+from freqtrade_operator.pairlist import tickers
+from freqtrade_operator.utils.kube import api_client
+from tests.benchmarks.conftest import BENCH_BOTS
+from tests.benchmarks.harness import compare, save_results
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import GROUP, NAMESPACE, VERSION
+from tests.fakes.exchange import FakeExchange, serve_app
+
+PAIRLISTS_PATH = f"/apis/{GROUP}/{VERSION}/freqtradepairlists"
+FILTER_SETS = [
+    {"exchange": "binance", "stakeCurrency": "USDT", "numberAssets": 10},
+    {
+        "exchange": "binance",
+        "stakeCurrency": "USDT",
+        "numberAssets": 20,
+        "filters": {"maxSpreadRatio": 0.005, "minPrice": 0.01, "blacklist": ["T00[0-4]/.*"]},
+    },
+]
+
+
+def _pairlist_object(index: int) -> dict[str, Any]:
+    return {
+        "apiVersion": f"{GROUP}/{VERSION}",
+        "kind": "FreqtradePairlist",
+        "metadata": {
+            "name": f"pairlist-{index:05d}",
+            "namespace": NAMESPACE,
+            "uid": f"00000000-0000-0000-0000-{index:012d}",
+        },
+        "spec": FILTER_SETS[index % len(FILTER_SETS)],
+    }
+
+
+@pytest.fixture(autouse=True)
+def no_pairlists(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start every test without tracked pairlists."""
+    monkeypatch.setattr(pairlist, "pairlists", {})
+
+
+def test_one_ranking_per_filter_set(
+    fake_apiserver: FakeApiClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Many pairlists on one exchange cost one ticker download and one ranking per filter set."""
+    objects = [_pairlist_object(i) for i in range(BENCH_BOTS)]
+    fake_apiserver.seed(PAIRLISTS_PATH, objects)
+    exchange = FakeExchange(latency=0)
+
+    async def run() -> tuple[int, int, float]:
+        for obj in objects:
+            await pairlist.pairlist_event(
+                event={"type": "ADDED"},
+                spec=obj["spec"],
+                name=obj["metadata"]["name"],
+                namespace=NAMESPACE,
+                meta=obj["metadata"],
+                labels={},
+                status={},
+            )
+        async with serve_app(exchange.app()) as url:
+            monkeypatch.setitem(tickers.EXCHANGE_URLS, "binance", url)
+            started = time.perf_counter()
+            computed = await pairlist.refresh(now=1000.0)
+            seconds = time.perf_counter() - started
+            # Within the refresh period nothing is due
+            again = await pairlist.refresh(now=1000.0 + 60)
+        return computed, again, seconds
+
+    fake_apiserver.reset()
+    computed, again, seconds = asyncio.run(run())
+    requests = fake_apiserver.stats()["requests"]
+
+    result = {
+        "pairlists": BENCH_BOTS,
+        "refresh_ms": round(seconds * 1000, 3),
+        "rankings": computed,
+        "exchange_requests": exchange.requests.total(),
+    }
+    previous = save_results("pairlist", result)
+    print("\n" + "\n".join(compare(result, previous)))
+
+    assert computed == len(FILTER_SETS)
+    assert again == 0
+    assert exchange.requests["GET /api/v3/exchangeInfo"] == 1
+    assert exchange.requests["GET /api/v3/ticker/24hr"] == 1
+    assert requests.get("create configmaps", 0) == BENCH_BOTS
+
+    configmaps = client.CoreV1Api(api_client()).list_namespaced_config_map(NAMESPACE).items
+    documents = {cm.metadata.name: json.loads(cm.data["pairlist.json"]) for cm in configmaps}
+    plain = documents["pairlist-00000-pairlist"]["pairs"]
+    filtered = documents["pairlist-00001-pairlist"]["pairs"]
+    assert len(plain) == 10
+    assert all(pair.endswith("/USDT") for pair in plain + filtered)
+    assert not [pair for pair in filtered if pair[:4] in ("T000", "T001", "T002", "T003", "T004")]
+    assert documents["pairlist-00000-pairlist"]["refresh_period"] == 1800
@@ -0,0 +1,54 @@
+"""Microbenchmarks for manifest rendering on the reconcile hot path."""
+
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from freqtrade_operator.resources.configmap import create_configmap, generate_freqtrade_config
+from freqtrade_operator.resources.deployment import create_deployment
+from tests.benchmarks.harness import compare, save_results
+from tests.fakes.bots import bot_spec
+
+OWNER_REFERENCES = [
+    {
+        "apiVersion": "trading.freqtrade.io/v1alpha1",
+        "kind": "FreqtradeBot",
+        "name": "bot-00001",
+        "uid": "00000000-0000-0000-0000-000000000001",
+        "controller": True,
+        "blockOwnerDeletion": True,
+    }
+]
+DB_URL = "postgresql://freqtrade@freqtrade-db-rw.bench.svc.cluster.local:5432/bot_00001"
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5) -> dict[str, float]:
+    """Time ``fn``, returning the best and median cost per call in microseconds."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = sorted(t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number))
+    return {"best_us": round(runs[0], 3), "median_us": round(runs[len(runs) // 2], 3)}
+
+
+def test_render_microbenchmarks() -> None:
+    """Time config and Deployment rendering for a representative spec."""
+    spec = bot_spec(1)
+
+    config = generate_freqtrade_config("bot-00001", "bench", spec, 8080, DB_URL)
+    assert config["strategy_list"][0].startswith("/strategies/sample/")
+    deployment = create_deployment("bot-00001", "bench", spec, 8080, OWNER_REFERENCES)
+    assert deployment["kind"] == "Deployment"
+
+    result = {
+        "generate_freqtrade_config": measure(
+            lambda: generate_freqtrade_config("bot-00001", "bench", spec, 8080, DB_URL)
+        ),
+        "create_configmap": measure(
+            lambda: create_configmap("bot-00001", "bench", spec, 8080, DB_URL, OWNER_REFERENCES)
+        ),
+        "create_deployment": measure(
+            lambda: create_deployment("bot-00001", "bench", spec, 8080, OWNER_REFERENCES)
+        ),
+    }
+    previous = save_results("render", result)
+    print("\n" + "\n".join(compare(result, previous)))
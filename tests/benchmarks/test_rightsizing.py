@@ -0,0 +1,127 @@
+"""Resource recommendations from observed usage, against a metrics-server stand-in.
+
+Idle bots use a fraction of the default 100m/256Mi requests; every tenth
+bot bursts to 800m around candle closes, caught by one sample in twelve.
+"""
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from typing import Any
+
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.handlers import rightsizing
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.rightsizing import MIN_SAMPLES, SAMPLES, UsageHistory, cpu_millicores
+from tests.benchmarks.conftest import BENCH_BOTS
+from tests.benchmarks.harness import compare, save_results
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import BOTS_PATH, GROUP, NAMESPACE, PLURAL, VERSION, bot_name, bot_object
+from tests.fakes.metrics import METRICS_PATH, pod_metrics
+
+DEFAULT_CPU_REQUEST = 100
+SPIKE_MILLICORES = 800
+
+
+def _usage(index: int, sample: int) -> tuple[int, int]:
+    if index % 10 == 0:
+        return (SPIKE_MILLICORES if sample % 12 == 0 else 60), 300
+    return 15 + sample % 7, 150 + index % 20
+
+
+@pytest.fixture(autouse=True)
+def recommender(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start every test with an empty history."""
+    monkeypatch.setattr(rightsizing, "history", UsageHistory())
+    monkeypatch.setattr(rightsizing, "_bots", {})
+
+
+def _track(bots: range) -> None:
+    async def track() -> None:
+        for i in bots:
+            await rightsizing.rightsizing_bot_event(
+                event={"type": "ADDED"}, name=bot_name(i), namespace=NAMESPACE, labels={}, status={}
+            )
+
+    asyncio.run(track())
+
+
+def _collect(fake: FakeApiClient, bots: range, rounds: range) -> tuple[int, float]:
+    """Run sample rounds; return the status patches sent and seconds per round."""
+    patched = 0
+    started = time.perf_counter()
+    for sample in rounds:
+        fake.seed(
+            METRICS_PATH, [pod_metrics(NAMESPACE, bot_name(i), *_usage(i, sample)) for i in bots]
+        )
+        patched += rightsizing.publish(list(rightsizing.sample()))
+    return patched, (time.perf_counter() - started) / len(rounds)
+
+
+def _recommendations() -> dict[str, Any]:
+    bots = client.CustomObjectsApi(api_client()).list_namespaced_custom_object(
+        GROUP, VERSION, NAMESPACE, PLURAL
+    )["items"]
+    return {
+        bot["metadata"]["name"]: bot.get("status", {}).get("rightsizing", {}).get("recommended")
+        for bot in bots
+    }
+
+
+def test_recommendations_pack_the_fleet(fake_apiserver: FakeApiClient) -> None:
+    """Idle bots are sized down, bursting bots get CPU limits above their bursts."""
+    bots = range(BENCH_BOTS)
+    fake_apiserver.seed(BOTS_PATH, [bot_object(i) for i in bots])
+    _track(bots)
+
+    patched, round_seconds = _collect(fake_apiserver, bots, range(MIN_SAMPLES))
+    # The same usage again stays within the tolerance
+    repatched, _ = _collect(fake_apiserver, bots, range(MIN_SAMPLES, MIN_SAMPLES + 5))
+    recommendations = _recommendations()
+
+    cpu_requests = [cpu_millicores(r["requests"]["cpu"]) for r in recommendations.values() if r]
+    result = {
+        "bots": BENCH_BOTS,
+        "round_ms": round(round_seconds * 1000, 3),
+        "status_patches": patched,
+        "repeated_status_patches": repatched,
+        "cpu_requested_millicores": sum(cpu_requests),
+        "cpu_requested_before_millicores": DEFAULT_CPU_REQUEST * BENCH_BOTS,
+    }
+    previous = save_results("rightsizing", result)
+    print("\n" + "\n".join(compare(result, previous)))
+
+    assert patched == BENCH_BOTS
+    assert repatched == 0
+    assert all(recommendations.values())
+    for i in bots:
+        recommended = recommendations[bot_name(i)]
+        if i % 10 == 0:
+            assert cpu_millicores(recommended["limits"]["cpu"]) >= SPIKE_MILLICORES * 1.5
+        else:
+            assert cpu_millicores(recommended["requests"]["cpu"]) < DEFAULT_CPU_REQUEST
+    assert result["cpu_requested_millicores"] < result["cpu_requested_before_millicores"] / 2
+
+
+def test_history_bytes_per_bot() -> None:
+    """A full window of samples stays within a few KB per bot."""
+    history = UsageHistory()
+    bots = [(NAMESPACE, bot_name(i)) for i in range(BENCH_BOTS)]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for sample in range(SAMPLES):
+            history.add_round({key: _usage(i, sample) for i, key in enumerate(bots)})
+        gc.collect()
+        per_bot = (tracemalloc.get_traced_memory()[0] - before) / BENCH_BOTS
+    finally:
+        tracemalloc.stop()
+
+    result = {"bots": BENCH_BOTS, "samples": SAMPLES, "bytes_per_bot": round(per_bot)}
+    previous = save_results("rightsizing-history", result)
+    print("\n" + "\n".join(compare(result, previous)))
+    assert per_bot < 4096
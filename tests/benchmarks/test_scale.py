@@ -0,0 +1,77 @@
+"""Create, update and delete storms of synthetic FreqtradeBots.
+
+Run at scale with::
+
+    BENCH_BOTS=10000 BENCH_LATENCY=0.005 pytest tests/benchmarks -s
+"""
+
+import json
+
+from tests.benchmarks.conftest import BENCH_BOTS, BENCH_LATENCY, BENCH_WORKERS
+from tests.benchmarks.harness import (
+    OperatorDriver,
+    compare,
+    peak_rss_bytes,
+    rss_bytes,
+    save_results,
+)
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import BOTS_PATH, NAMESPACE, bot_name, bot_object
+
+
+def test_bot_storms(fake_apiserver: FakeApiClient) -> None:
+    """Reconcile a fleet through create, update and delete storms."""
+    bots = range(BENCH_BOTS)
+    baseline_rss = rss_bytes()
+
+    driver = OperatorDriver(workers=BENCH_WORKERS)
+    driver.start()
+    try:
+        phases = [
+            driver.run_phase(
+                "create",
+                BENCH_BOTS,
+                lambda: fake_apiserver.seed(BOTS_PATH, [bot_object(i) for i in bots]),
+                fake_apiserver,
+            ),
+            driver.run_phase(
+                "update",
+                BENCH_BOTS,
+                lambda: fake_apiserver.seed(BOTS_PATH, [bot_object(i, stake="250") for i in bots]),
+                fake_apiserver,
+            ),
+            driver.run_phase(
+                "delete",
+                BENCH_BOTS,
+                lambda: fake_apiserver.delete(BOTS_PATH, NAMESPACE, [bot_name(i) for i in bots]),
+                fake_apiserver,
+            ),
+        ]
+    finally:
+        driver.stop()
+
+    result = {
+        "bots": BENCH_BOTS,
+        "latency": BENCH_LATENCY,
+        "workers": driver.executor._max_workers,
+        "baseline_rss_bytes": baseline_rss,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "phases": {phase.action: phase.summary() for phase in phases},
+    }
+    previous = save_results("scale", result)
+    print("\n" + "\n".join(compare(result, previous)))
+
+    errors = {phase.action: [r.error for r in phase.reconciles if r.error][:5] for phase in phases}
+    assert not any(errors.values()), json.dumps(errors, indent=2)
+
+    # One create per child object plus the status patch; PostgreSQL bots add a Database
+    create = result["phases"]["create"]["requests"]
+    assert create["create secrets"] == BENCH_BOTS
+    assert create["create deployments"] == BENCH_BOTS
+    assert create["create databases"] == BENCH_BOTS // 2
+    assert create["patch freqtradebots"] == BENCH_BOTS
+
+    # A stake change only alters the config; the unchanged Deployment is skipped
+    update = result["phases"]["update"]["requests"]
+    assert update["replace configmaps"] == BENCH_BOTS
+    assert "replace deployments" not in update
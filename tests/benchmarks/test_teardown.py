@@ -0,0 +1,59 @@
+"""Bulk teardown: serial against parallel deletes at ``BENCH_LATENCY`` or 10 ms per request."""
+
+import time
+
+from freqtrade_operator.teardown.bulk import (
+    PARALLEL,
+    delete_bots,
+    progress,
+    select_bots,
+)
+from tests.benchmarks.conftest import BENCH_BOTS, BENCH_LATENCY
+from tests.benchmarks.harness import compare, save_results
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import BOTS_PATH, NAMESPACE, bot_name, bot_object
+
+DATABASES_PATH = "/apis/postgresql.cnpg.io/v1/databases"
+LATENCY = BENCH_LATENCY or 0.01
+
+
+def _database(index: int) -> dict[str, object]:
+    return {
+        "apiVersion": "postgresql.cnpg.io/v1",
+        "kind": "Database",
+        "metadata": {
+            "name": f"{bot_name(index)}-db",
+            "namespace": NAMESPACE,
+            "labels": {"app": "freqtrade", "bot": bot_name(index)},
+        },
+        "spec": {"name": bot_name(index).replace("-", "_"), "databaseReclaimPolicy": "retain"},
+    }
+
+
+def test_bulk_teardown(fake_apiserver: FakeApiClient) -> None:
+    """Half the bots are deleted one at a time and half in parallel."""
+    fake_apiserver.seed(BOTS_PATH, [bot_object(i) for i in range(BENCH_BOTS)])
+    fake_apiserver.seed(DATABASES_PATH, [_database(i) for i in range(0, BENCH_BOTS, 2)])
+    fake_apiserver.set_latency(LATENCY)
+
+    targets = select_bots(NAMESPACE, None)
+    assert len(targets) == BENCH_BOTS
+    half = len(targets) // 2
+
+    started = time.perf_counter()
+    assert delete_bots(targets[:half], drop_databases=True, parallel=1) == {}
+    serial_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    assert delete_bots(targets[half:], drop_databases=True, parallel=PARALLEL) == {}
+    parallel_seconds = time.perf_counter() - started
+    assert parallel_seconds < serial_seconds
+
+    assert progress(targets).bots_left == {}
+
+    result = {
+        "bots": len(targets),
+        "serial_per_bot_ms": round(serial_seconds / half * 1000, 2),
+        "parallel_per_bot_ms": round(parallel_seconds / (len(targets) - half) * 1000, 2),
+    }
+    previous = save_results("teardown", result)
+    print("\n" + "\n".join(compare(result, previous)))
@@ -0,0 +1,37 @@
+"""Fleet telemetry: cost of turning a scrape into bounded gauge series."""
+
+import time
+
+from freqtrade_operator.utils.telemetry import GAUGES, BotReading, FleetTelemetry
+from tests.benchmarks.conftest import BENCH_BOTS
+from tests.benchmarks.harness import compare, save_results
+
+NAMESPACES = 20
+
+
+def test_fleet_telemetry_cost() -> None:
+    """Time an update and a full observation of every gauge for a ``BENCH_BOTS`` * 20 fleet."""
+    fleet = BENCH_BOTS * 20
+    telemetry = FleetTelemetry()
+    bots = [(f"ns-{i % NAMESPACES:02d}", f"bot-{i:05d}") for i in range(fleet)]
+    readings = {
+        key: BotReading("USDT", float(i), float(i), i % 3, 100.0, float(i % 7))
+        for i, key in enumerate(bots)
+    }
+
+    started = time.perf_counter()
+    telemetry.update(bots, readings)
+    update_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    first = {field: telemetry.observe(field) for field in GAUGES}
+    observe_seconds = time.perf_counter() - started
+    assert telemetry.size() == sum(len(values) for values in first.values())
+
+    result = {
+        "bots": fleet,
+        "series": telemetry.size(),
+        "update_ms": round(update_seconds * 1000, 2),
+        "observe_ms": round(observe_seconds * 1000, 2),
+    }
+    previous = save_results("telemetry", result)
+    print("\n" + "\n".join(compare(result, previous)))
@@ -0,0 +1,23 @@
+"""Fixtures shared by the unit tests."""
+
+from collections.abc import Iterator
+
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.utils.kube import api_client
+from tests.fakes.apiserver import FakeApiClient, serve
+
+
+@pytest.fixture
+def fake_apiserver() -> Iterator[FakeApiClient]:
+    """Run the fake API server in a thread and point the client at it."""
+    previous = client.Configuration.get_default_copy()
+    with serve() as fake:
+        client.Configuration.set_default(client.Configuration(host=fake.url))
+        api_client.cache_clear()
+        try:
+            yield fake
+        finally:
+            client.Configuration.set_default(previous)
+            api_client.cache_clear()
@@ -0,0 +1,506 @@
+"""In-memory fake of the Kubernetes API server.
+
+Implements enough of the REST API for the operator's handlers and the
+official client: list (with equality label selectors), watch, get, create,
+replace, patch (merge and JSON patch, including the status subresource)
+and delete for any namespaced resource under ``/api/v1`` or
+``/apis/{group}/{version}``. Objects are stored as plain dicts and never
+validated.
+
+Test-only endpoints live under ``/_fake``: they seed or delete objects
+without being counted, change the injected latency, and return request
+counts keyed by ``"{verb} {resource}"``.
+
+Use :func:`serve` to run it in a background thread, or in a subprocess
+when the memory of the caller is being measured.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import itertools
+import json
+import os
+import subprocess as _subprocess
+import sys
+import threading
+import urllib.request
+import uuid
+from collections import Counter, deque
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from aiohttp import web
+
+CollectionKey = tuple[str, str]  # (api prefix, plural)
+ObjectKey = tuple[str, str]  # (namespace, name)
+
+HISTORY_SIZE = 100_000
+
+
+@dataclass(slots=True)
+class _Watcher:
+    collection: CollectionKey
+    namespace: str | None
+    selector: dict[str, str]
+    queue: asyncio.Queue[dict[str, Any] | None]
+
+
+def _status(code: int, reason: str, message: str) -> web.Response:
+    return web.json_response(
+        {
+            "kind": "Status",
+            "apiVersion": "v1",
+            "status": "Failure",
+            "message": message,
+            "reason": reason,
+            "code": code,
+        },
+        status=code,
+    )
+
+
+def _parse_selector(selector: str) -> dict[str, str]:
+    pairs = (term.split("=", 1) for term in selector.split(",") if "=" in term)
+    return {key.rstrip("!="): value.lstrip("=") for key, value in pairs}
+
+
+def _matches(obj: dict[str, Any], selector: dict[str, str]) -> bool:
+    labels = obj.get("metadata", {}).get("labels") or {}
+    return all(labels.get(key) == value for key, value in selector.items())
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """Apply an RFC 7386 merge patch."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def json_patch(target: dict[str, Any], operations: list[dict[str, Any]]) -> dict[str, Any]:
+    """Apply the add, replace and remove operations of an RFC 6902 JSON patch."""
+    result = copy.deepcopy(target)
+    for operation in operations:
+        *parents, last = [
+            part.replace("~1", "/").replace("~0", "~") for part in operation["path"].split("/")[1:]
+        ]
+        node: Any = result
+        for part in parents:
+            node = node[int(part)] if isinstance(node, list) else node.setdefault(part, {})
+        if operation["op"] == "remove":
+            del node[int(last) if isinstance(node, list) else last]
+        elif isinstance(node, list):
+            if last == "-":
+                node.append(operation["value"])
+            elif operation["op"] == "add":
+                node.insert(int(last), operation["value"])
+            else:
+                node[int(last)] = operation["value"]
+        else:
+            node[last] = operation["value"]
+    return result
+
+
+class FakeApiServer:
+    """State and request handling of the fake API server."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.objects: dict[CollectionKey, dict[ObjectKey, dict[str, Any]]] = {}
+        self.requests: Counter[str] = Counter()
+        self.history: deque[tuple[int, CollectionKey, str, dict[str, Any]]] = deque(
+            maxlen=HISTORY_SIZE
+        )
+        self.watchers: list[_Watcher] = []
+        self._versions = itertools.count(1)
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_get("/_fake/stats", self._stats)
+        app.router.add_post("/_fake/reset", self._reset)
+        app.router.add_post("/_fake/config", self._config)
+        app.router.add_post("/_fake/seed", self._seed)
+        app.router.add_post("/_fake/delete", self._bulk_delete)
+        app.router.add_route("*", "/{path:.*}", self._dispatch)
+        return app
+
+    # Storage
+
+    def _record(self, collection: CollectionKey, event_type: str, obj: dict[str, Any]) -> None:
+        version = int(obj["metadata"]["resourceVersion"])
+        self.history.append((version, collection, event_type, obj))
+        namespace = obj["metadata"].get("namespace")
+        for watcher in self.watchers:
+            if (
+                watcher.collection == collection
+                and watcher.namespace in (None, namespace)
+                and _matches(obj, watcher.selector)
+            ):
+                watcher.queue.put_nowait({"type": event_type, "object": obj})
+
+    def _store(
+        self, collection: CollectionKey, obj: dict[str, Any], event_type: str
+    ) -> dict[str, Any]:
+        metadata = obj["metadata"]
+        metadata["resourceVersion"] = str(next(self._versions))
+        self.objects.setdefault(collection, {})[
+            (metadata.get("namespace", ""), metadata["name"])
+        ] = obj
+        self._record(collection, event_type, obj)
+        return obj
+
+    def create(
+        self, collection: CollectionKey, namespace: str, obj: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Store a new object, filling in server-side metadata."""
+        obj = copy.deepcopy(obj)
+        metadata = obj.setdefault("metadata", {})
+        if "name" not in metadata:
+            metadata["name"] = f"{metadata.get('generateName', 'obj-')}{uuid.uuid4().hex[:5]}"
+        metadata["namespace"] = namespace
+        metadata["uid"] = str(uuid.uuid4())
+        metadata["generation"] = 1
+        metadata["creationTimestamp"] = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return self._store(collection, obj, "ADDED")
+
+    def update(
+        self, collection: CollectionKey, current: dict[str, Any], obj: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Store a new revision of an existing object."""
+        metadata = obj.setdefault("metadata", {})
+        for key in ("name", "namespace", "uid", "creationTimestamp"):
+            metadata[key] = current["metadata"][key]
+        generation = current["metadata"].get("generation", 1)
+        if obj.get("spec") != current.get("spec"):
+            generation += 1
+        metadata["generation"] = generation
+        return self._store(collection, obj, "MODIFIED")
+
+    def delete(self, collection: CollectionKey, key: ObjectKey) -> dict[str, Any] | None:
+        """Remove an object and notify watchers."""
+        obj = self.objects.get(collection, {}).pop(key, None)
+        if obj is not None:
+            obj = copy.deepcopy(obj)
+            obj["metadata"]["resourceVersion"] = str(next(self._versions))
+            self._record(collection, "DELETED", obj)
+        return obj
+
+    # REST API
+
+    @staticmethod
+    def _parse_path(path: str) -> tuple[CollectionKey, str | None, str | None, str | None]:
+        segments = [segment for segment in path.split("/") if segment]
+        if segments[:1] == ["api"]:
+            prefix, rest = "/".join(segments[:2]), segments[2:]
+        else:
+            prefix, rest = "/".join(segments[:3]), segments[3:]
+        namespace = None
+        if len(rest) >= 3 and rest[0] == "namespaces":
+            namespace, rest = rest[1], rest[2:]
+        plural = rest[0]
+        name = rest[1] if len(rest) > 1 else None
+        subresource = rest[2] if len(rest) > 2 else None
+        return (prefix, plural), namespace, name, subresource
+
+    async def _dispatch(self, request: web.Request) -> web.StreamResponse:
+        if not request.path.startswith(("/api/", "/apis/")):
+            return _status(404, "NotFound", f"{request.path} not found")
+        collection, namespace, name, subresource = self._parse_path(request.path)
+        resource = collection[1] + (f"/{subresource}" if subresource else "")
+        watch = request.query.get("watch", "").lower() in ("true", "1")
+
+        verb = {
+            "GET": "watch" if watch else "get" if name else "list",
+            "POST": "create",
+            "PUT": "replace",
+            "PATCH": "patch",
+            "DELETE": "delete",
+        }.get(request.method, request.method.lower())
+        self.requests[f"{verb} {resource}"] += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if verb == "watch":
+            return await self._watch(request, collection, namespace)
+        if verb == "list":
+            selector = _parse_selector(request.query.get("labelSelector", ""))
+            items = [
+                obj
+                for (ns, _), obj in self.objects.get(collection, {}).items()
+                if namespace in (None, ns) and _matches(obj, selector)
+            ]
+            return web.json_response(
+                {
+                    "kind": "List",
+                    "apiVersion": "v1",
+                    "metadata": {"resourceVersion": str(self._current_version())},
+                    "items": items,
+                }
+            )
+
+        ns = namespace or ""
+        if verb == "create":
+            body = await request.json()
+            key = (ns, body.get("metadata", {}).get("name", ""))
+            if key in self.objects.get(collection, {}):
+                return _status(409, "AlreadyExists", f"{resource} {key[1]} already exists")
+            return web.json_response(self.create(collection, ns, body), status=201)
+
+        assert name is not None
+        current = self.objects.get(collection, {}).get((ns, name))
+        if current is None:
+            return _status(404, "NotFound", f"{resource} {name} not found")
+
+        if verb == "get":
+            return web.json_response(current)
+        if verb == "delete":
+            self.delete(collection, (ns, name))
+            return web.json_response({"kind": "Status", "apiVersion": "v1", "status": "Success"})
+
+        body = await request.json()
+        if verb == "replace":
+            obj = body
+            if subresource == "status":
+                obj = {**current, "status": body.get("status")}
+        elif request.content_type == "application/json-patch+json":
+            obj = json_patch(current, body)
+        else:
+            patch = {"status": body.get("status")} if subresource == "status" else body
+            obj = merge_patch(current, patch)
+
+        expected = (
+            (body.get("metadata") or {}).get("resourceVersion") if isinstance(body, dict) else None
+        )
+        if expected and expected != current["metadata"]["resourceVersion"]:
+            return _status(409, "Conflict", f"{resource} {name} has been modified")
+        return web.json_response(self.update(collection, current, copy.deepcopy(obj)))
+
+    def close_watches(self) -> None:
+        """End all open watch streams."""
+        for watcher in self.watchers:
+            watcher.queue.put_nowait(None)
+
+    def _current_version(self) -> int:
+        return self.history[-1][0] if self.history else 0
+
+    async def _watch(
+        self, request: web.Request, collection: CollectionKey, namespace: str | None
+    ) -> web.StreamResponse:
+        selector = _parse_selector(request.query.get("labelSelector", ""))
+        since = request.query.get("resourceVersion", "")
+        timeout = float(request.query.get("timeoutSeconds", 300))
+
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+
+        queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        if since in ("", "0"):
+            for (ns, _), obj in self.objects.get(collection, {}).items():
+                if namespace in (None, ns) and _matches(obj, selector):
+                    queue.put_nowait({"type": "ADDED", "object": obj})
+        else:
+            if self.history and int(since) < self.history[0][0] - 1:
+                gone = {"kind": "Status", "code": 410, "reason": "Expired", "message": "too old"}
+                await response.write(json.dumps({"type": "ERROR", "object": gone}).encode() + b"\n")
+                return response
+            for version, key, event_type, obj in self.history:
+                if (
+                    version > int(since)
+                    and key == collection
+                    and namespace in (None, obj["metadata"].get("namespace"))
+                    and _matches(obj, selector)
+                ):
+                    queue.put_nowait({"type": event_type, "object": obj})
+
+        watcher = _Watcher(collection, namespace, selector, queue)
+        self.watchers.append(watcher)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    event = await asyncio.wait_for(queue.get(), remaining)
+                except TimeoutError:
+                    break
+                if event is None:
+                    break
+                await response.write(json.dumps(event).encode() + b"\n")
+        except ConnectionResetError:
+            pass
+        finally:
+            self.watchers.remove(watcher)
+        return response
+
+    # Test endpoints
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "requests": dict(self.requests),
+                "total": sum(self.requests.values()),
+                "objects": {
+                    f"{prefix}/{plural}": len(items)
+                    for (prefix, plural), items in self.objects.items()
+                },
+            }
+        )
+
+    async def _reset(self, request: web.Request) -> web.Response:
+        self.requests.clear()
+        return web.json_response({})
+
+    async def _config(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.latency = float(body.get("latency", self.latency))
+        return web.json_response({"latency": self.latency})
+
+    async def _seed(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        collection, _, _, _ = self._parse_path(body["path"])
+        for item in body["items"]:
+            metadata = item["metadata"]
+            current = self.objects.get(collection, {}).get(
+                (metadata["namespace"], metadata["name"])
+            )
+            if current is None:
+                self.create(collection, metadata["namespace"], item)
+            else:
+                self.update(collection, current, merge_patch(current, item))
+        return web.json_response({"count": len(body["items"])})
+
+    async def _bulk_delete(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        collection, _, _, _ = self._parse_path(body["path"])
+        for name in body["names"]:
+            self.delete(collection, (body["namespace"], name))
+        return web.json_response({"count": len(body["names"])})
+
+
+class FakeApiClient:
+    """Blocking client for the test endpoints of a running fake."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+    def _call(self, path: str, body: Any = None) -> Any:
+        request = urllib.request.Request(
+            f"{self.url}{path}",
+            data=None if body is None else json.dumps(body).encode(),
+            headers={"Content-Type": "application/json"},
+            method="GET" if body is None else "POST",
+        )
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return json.loads(response.read())
+
+    def stats(self) -> dict[str, Any]:
+        """Return request counts since the last reset and object counts."""
+        return self._call("/_fake/stats")
+
+    def reset(self) -> None:
+        """Zero the request counters."""
+        self._call("/_fake/reset", {})
+
+    def set_latency(self, latency: float) -> None:
+        """Delay every API request by ``latency`` seconds."""
+        self._call("/_fake/config", {"latency": latency})
+
+    def seed(self, path: str, items: list[dict[str, Any]]) -> None:
+        """Create or merge objects into a collection without counting requests.
+
+        Args:
+            path: Collection path, e.g. ``/apis/trading.freqtrade.io/v1alpha1/freqtradebots``
+            items: Objects with ``metadata.name`` and ``metadata.namespace``
+        """
+        self._call("/_fake/seed", {"path": path, "items": items})
+
+    def delete(self, path: str, namespace: str, names: list[str]) -> None:
+        """Delete objects from a collection without counting requests."""
+        self._call("/_fake/delete", {"path": path, "namespace": namespace, "names": names})
+
+
+async def _run(server: FakeApiServer, ready: Any, stop: asyncio.Event) -> None:
+    runner = web.AppRunner(server.app(), access_log=None, handler_cancellation=True)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    ready(site._server.sockets[0].getsockname()[1])  # type: ignore[union-attr]
+    try:
+        await stop.wait()
+    finally:
+        server.close_watches()
+        await runner.cleanup()
+
+
+@contextlib.contextmanager
+def serve(latency: float = 0.0, subprocess: bool = False) -> Iterator[FakeApiClient]:
+    """Run a fake API server for the duration of the context.
+
+    Args:
+        latency: Seconds to delay every API request
+        subprocess: Run in a separate process, so its memory and CPU are not
+            attributed to the caller
+
+    Yields:
+        Client for the test endpoints; its ``url`` is the API server address
+    """
+    if subprocess:
+        process = _subprocess.Popen(
+            [sys.executable, "-m", "tests.fakes.apiserver", "--latency", str(latency)],
+            stdout=_subprocess.PIPE,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+            text=True,
+        )
+        assert process.stdout is not None
+        port = int(process.stdout.readline())
+        try:
+            yield FakeApiClient(f"http://127.0.0.1:{port}")
+        finally:
+            process.terminate()
+            process.wait(5)
+        return
+
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+    started = threading.Event()
+    ports: list[int] = []
+
+    def ready(port: int) -> None:
+        ports.append(port)
+        started.set()
+
+    thread = threading.Thread(
+        target=loop.run_until_complete,
+        args=(_run(FakeApiServer(latency), ready, stop),),
+        daemon=True,
+    )
+    thread.start()
+    started.wait(10)
+    try:
+        yield FakeApiClient(f"http://127.0.0.1:{ports[0]}")
+    finally:
+        loop.call_soon_threadsafe(stop.set)
+        thread.join(10)
+        if not thread.is_alive():
+            loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    def announce(port: int) -> None:
+        print(port, flush=True)
+
+    asyncio.run(_run(FakeApiServer(args.latency), announce, asyncio.Event()))
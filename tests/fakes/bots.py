@@ -0,0 +1,54 @@
+"""Synthetic FreqtradeBots for seeding the fake API server."""
+
+from typing import Any
+
+GROUP = "trading.freqtrade.io"
+VERSION = "v1alpha1"
+PLURAL = "freqtradebots"
+BOTS_PATH = f"/apis/{GROUP}/{VERSION}/{PLURAL}"
+NAMESPACE = "bench"
+
+
+def bot_spec(index: int, stake: str = "100") -> dict[str, Any]:
+    """Return a representative FreqtradeBot spec; every other bot uses PostgreSQL."""
+    return {
+        "exchange": {"name": "binance", "dryRun": True},
+        "stake": {"currency": "USDT", "amount": stake},
+        "strategies": [
+            {
+                "name": "sample",
+                "gitRepository": {
+                    "url": "https://github.com/freqtrade/freqtrade-strategies.git",
+                    "branch": "main",
+                    "path": "user_data/strategies/Strategy001.py",
+                },
+                "weight": 2,
+            },
+            {"name": "builtin", "className": "SampleStrategy"},
+        ],
+        "database": {"type": "postgresql"} if index % 2 else {"type": "sqlite"},
+        "webhooks": [{"url": "https://hooks.example.com/bot", "events": ["entry", "exit"]}],
+        "resources": {
+            "requests": {"cpu": "100m", "memory": "256Mi"},
+            "limits": {"cpu": "500m", "memory": "512Mi"},
+        },
+    }
+
+
+def bot_name(index: int) -> str:
+    """Return the name of synthetic bot ``index``."""
+    return f"bot-{index:05d}"
+
+
+def bot_object(index: int, stake: str = "100") -> dict[str, Any]:
+    """Return a complete FreqtradeBot object for seeding the fake API server."""
+    return {
+        "apiVersion": f"{GROUP}/{VERSION}",
+        "kind": "FreqtradeBot",
+        "metadata": {
+            "name": bot_name(index),
+            "namespace": NAMESPACE,
+            "labels": {"fleet": "bench"},
+        },
+        "spec": bot_spec(index, stake),
+    }
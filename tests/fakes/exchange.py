@@ -0,0 +1,145 @@
+"""Local stand-in for an exchange's REST API, shaped like Binance spot.
+
+Serves markets, tickers, order books and candles, plus a signed account
+endpoint that answers with the caller's API key, so tests can tell
+whether a private response reached the right bot. Every request is
+counted by ``"{method} {path}"``.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import Counter
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from aiohttp import web
+from aiohttp.typedefs import Handler
+
+
+@dataclass(frozen=True, slots=True)
+class FakeMarket:
+    """A spot market with its 24h statistics."""
+
+    base: str
+    quote: str
+    price: float
+    quote_volume: float
+    spread: float = 0.001
+
+    @property
+    def symbol(self) -> str:
+        """Exchange symbol, e.g. ``BTCUSDT``."""
+        return f"{self.base}{self.quote}"
+
+
+def default_markets(count: int = 60) -> list[FakeMarket]:
+    """Return ``count`` markets quoted mostly in USDT, with shuffled volumes and spreads."""
+    return [
+        FakeMarket(
+            base=f"T{i:03d}",
+            quote="BTC" if i % 3 == 2 else "USDT",
+            price=0.001 * (i + 1) ** 2,
+            quote_volume=1e6 * ((i * 37) % count + 1),
+            spread=0.001 * (i % 10),
+        )
+        for i in range(count)
+    ]
+
+
+class FakeExchange:
+    """Fake exchange counting the requests it serves."""
+
+    def __init__(self, latency: float = 0.05, markets: list[FakeMarket] | None = None) -> None:
+        self.latency = latency
+        self.markets = default_markets() if markets is None else markets
+        self.requests: Counter[str] = Counter()
+
+    @web.middleware
+    async def _count(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        self.requests[f"{request.method} {request.path}"] += 1
+        # Keep requests in flight long enough for concurrent callers to overlap
+        await asyncio.sleep(self.latency)
+        return await handler(request)
+
+    async def exchange_info(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "symbols": [
+                    {
+                        "symbol": m.symbol,
+                        "baseAsset": m.base,
+                        "quoteAsset": m.quote,
+                        "status": "TRADING",
+                    }
+                    for m in self.markets
+                ]
+            },
+            headers={"X-MBX-USED-WEIGHT-1M": str(self.requests.total())},
+        )
+
+    async def ticker(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            [
+                {
+                    "symbol": m.symbol,
+                    "lastPrice": f"{m.price:.8f}",
+                    "quoteVolume": f"{m.quote_volume:.2f}",
+                    "bidPrice": f"{m.price * (1 - m.spread):.8f}",
+                    "askPrice": f"{m.price:.8f}",
+                }
+                for m in self.markets
+            ]
+        )
+
+    async def depth(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "symbol": request.query["symbol"],
+                "bids": [["59999.00", "1.0"]],
+                "asks": [["60001.00", "1.0"]],
+            }
+        )
+
+    async def klines(self, request: web.Request) -> web.Response:
+        now = int(time.time() // 60 * 60 * 1000)
+        return web.json_response(
+            [[now, "60000", "60010", "59990", "60005", "12.5", request.query["symbol"]]]
+        )
+
+    async def account(self, request: web.Request) -> web.Response:
+        if "signature" not in request.query:
+            return web.json_response({"code": -1102, "msg": "Signature missing"}, status=400)
+        return web.json_response({"apiKey": request.headers.get("X-MBX-APIKEY")})
+
+    async def order(self, request: web.Request) -> web.Response:
+        return web.json_response({"orderId": self.requests[f"POST {request.path}"]})
+
+    def app(self) -> web.Application:
+        """Build the application serving the fake endpoints."""
+        app = web.Application(middlewares=[self._count])
+        app.router.add_get("/api/v3/exchangeInfo", self.exchange_info)
+        app.router.add_get("/api/v3/ticker/24hr", self.ticker)
+        app.router.add_get("/api/v3/depth", self.depth)
+        app.router.add_get("/api/v3/klines", self.klines)
+        app.router.add_get("/api/v3/account", self.account)
+        app.router.add_post("/api/v3/order", self.order)
+        return app
+
+
+@contextlib.asynccontextmanager
+async def serve_app(app: web.Application) -> AsyncIterator[str]:
+    """Serve an application on a free local port.
+
+    Yields:
+        Base URL without trailing slash
+    """
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,47 @@
+"""Stand-in for metrics-server: PodMetrics of bot pods for the fake API server.
+
+Seed the objects returned by :func:`pod_metrics` under :data:`METRICS_PATH`
+and the recommender reads them through the regular ``metrics.k8s.io`` list
+call. Usage is written in the units metrics-server reports: nanocores and
+KiB.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+METRICS_PATH = "/apis/metrics.k8s.io/v1beta1/pods"
+
+
+def pod_metrics(namespace: str, bot: str, cpu_millicores: int, memory_mib: int) -> dict[str, Any]:
+    """Return the PodMetrics of a bot's pod.
+
+    Args:
+        namespace: Namespace of the bot
+        bot: Name of the bot
+        cpu_millicores: CPU usage of the ``freqtrade`` container
+        memory_mib: Memory usage of the ``freqtrade`` container
+
+    Returns:
+        PodMetrics object, including a git-sync sidecar
+    """
+    return {
+        "apiVersion": "metrics.k8s.io/v1beta1",
+        "kind": "PodMetrics",
+        "metadata": {
+            "name": f"{bot}-0",
+            "namespace": namespace,
+            "labels": {"app": "freqtrade", "bot": bot},
+        },
+        "timestamp": datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "window": "30s",
+        "containers": [
+            {
+                "name": "freqtrade",
+                "usage": {
+                    "cpu": f"{cpu_millicores * 1_000_000}n",
+                    "memory": f"{memory_mib * 1024}Ki",
+                },
+            },
+            {"name": "git-sync", "usage": {"cpu": "1234567n", "memory": "20480Ki"}},
+        ],
+    }
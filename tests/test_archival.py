@@ -0,0 +1,166 @@
+"""Trade-history archival: CronJob, retention cutoff and status reporting."""
+
+import asyncio
+import json
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.handlers import archival
+from freqtrade_operator.jobs.archival import (
+    ARCHIVABLE_TRADES,
+    ARCHIVE_SCRIPT,
+    CUTOFF_FORMAT,
+    DEFAULT_SCHEDULE,
+    create_archival_cronjob,
+)
+from freqtrade_operator.utils.kube import api_client
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import BOTS_PATH, GROUP, NAMESPACE, PLURAL, VERSION, bot_name, bot_object
+
+NAME = bot_name(1)
+JOB = f"{NAME}-archive-29000000"
+SUMMARY = {"archivedTrades": 12, "archivedOrders": 30, "hotTrades": 4, "archiveBytes": 2048}
+
+
+def _env(cronjob: dict[str, Any]) -> dict[str, str]:
+    container = cronjob["spec"]["jobTemplate"]["spec"]["template"]["spec"]["containers"][0]
+    return {e["name"]: e.get("value") for e in container["env"]}
+
+
+def test_cronjob_manifest() -> None:
+    """The CronJob runs next to the bot on its volume, never overlapping itself."""
+    cronjob = create_archival_cronjob(NAME, NAMESPACE, {}, "sqlite:///x", None, [])
+    assert cronjob["spec"]["schedule"] == DEFAULT_SCHEDULE
+    assert cronjob["spec"]["concurrencyPolicy"] == "Forbid"
+    assert _env(cronjob)["RETENTION_DAYS"] == "90"
+    pod = cronjob["spec"]["jobTemplate"]["spec"]["template"]["spec"]
+    (affinity,) = pod["affinity"]["podAffinity"]["requiredDuringSchedulingIgnoredDuringExecution"]
+    assert affinity["labelSelector"]["matchLabels"] == {"app": "freqtrade", "bot": NAME}
+    assert pod["volumes"][0]["persistentVolumeClaim"]["claimName"] == f"{NAME}-data"
+    compile(ARCHIVE_SCRIPT, "archive", "exec")
+
+    custom = create_archival_cronjob(
+        NAME, NAMESPACE, {"schedule": "0 * * * *", "retentionDays": 7}, "sqlite:///x", None, []
+    )
+    assert custom["spec"]["schedule"] == "0 * * * *"
+    assert _env(custom)["RETENTION_DAYS"] == "7"
+
+
+def test_retention_cutoff_selects_old_closed_trades() -> None:
+    """Only closed trades that closed before the cutoff are archived."""
+    now = datetime(2026, 10, 1, 3, 30, tzinfo=UTC)
+    cutoff = (now - timedelta(days=90)).strftime(CUTOFF_FORMAT)
+
+    def stored(days_ago: float) -> str:
+        # Freqtrade's naive UTC datetimes, with microseconds
+        return (now - timedelta(days=days_ago)).replace(tzinfo=None).isoformat(" ")
+
+    trades = [
+        (1, False, stored(120)),
+        (2, False, stored(90.001)),
+        (3, False, stored(90) + ".5"),
+        (4, False, stored(10)),
+        (5, True, None),
+        (6, True, stored(200)),
+    ]
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE trades (id INTEGER PRIMARY KEY, is_open BOOLEAN, close_date DATETIME)")
+    db.executemany("INSERT INTO trades VALUES (?, ?, ?)", trades)
+    archived = [row[0] for row in db.execute(ARCHIVABLE_TRADES, {"cutoff": cutoff})]
+    assert sorted(archived) == [1, 2]
+
+
+@pytest.fixture(autouse=True)
+def nothing_reported(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start every test without reported Jobs."""
+    monkeypatch.setattr(archival, "_reported", set())
+
+
+def _pod(message: str, exit_code: int = 0) -> dict[str, Any]:
+    return {
+        "metadata": {"name": f"{JOB}-x", "namespace": NAMESPACE, "labels": {"job-name": JOB}},
+        "status": {
+            "containerStatuses": [
+                {
+                    "name": "archive",
+                    "image": "freqtrade",
+                    "imageID": "",
+                    "ready": False,
+                    "restartCount": 0,
+                    "state": {"terminated": {"exitCode": exit_code, "message": message}},
+                }
+            ]
+        },
+    }
+
+
+def _job_status(condition: str | None) -> dict[str, Any]:
+    status: dict[str, Any] = {"startTime": "2026-10-01T03:30:00Z"}
+    if condition is not None:
+        status["conditions"] = [{"type": condition, "status": "True"}]
+    if condition == "Complete":
+        status["completionTime"] = "2026-10-01T03:31:00Z"
+    return status
+
+
+async def _event(condition: str | None, uid: str = "job-1", event_type: str = "MODIFIED") -> None:
+    await archival.archive_job_event(
+        event={"type": event_type},
+        status=_job_status(condition),
+        name=JOB,
+        namespace=NAMESPACE,
+        labels={"app": "freqtrade-archive", "bot": NAME},
+        meta={"uid": uid},
+    )
+
+
+def _archive_status() -> dict[str, Any] | None:
+    bot = client.CustomObjectsApi(api_client()).get_namespaced_custom_object(
+        GROUP, VERSION, NAMESPACE, PLURAL, NAME
+    )
+    return bot.get("status", {}).get("archive")
+
+
+def test_job_summary_is_reported_once(fake_apiserver: FakeApiClient) -> None:
+    """A finished Job's summary lands in the bot status, once per Job."""
+    fake_apiserver.seed(BOTS_PATH, [bot_object(1)])
+    fake_apiserver.seed("/api/v1/pods", [_pod(json.dumps(SUMMARY))])
+
+    async def run() -> None:
+        await _event(None)
+        assert _archive_status() is None
+        await _event("Complete")
+        await _event("Complete")
+
+    asyncio.run(run())
+    assert _archive_status() == {
+        "lastRun": "2026-10-01T03:31:00Z",
+        "lastResult": "Succeeded",
+        **SUMMARY,
+    }
+    assert fake_apiserver.stats()["requests"]["patch freqtradebots/status"] == 1
+
+
+def test_failed_job_is_reported(fake_apiserver: FakeApiClient) -> None:
+    """A failed Job is reported without a summary, and forgotten once deleted."""
+    fake_apiserver.seed(BOTS_PATH, [bot_object(1)])
+    fake_apiserver.seed("/api/v1/pods", [_pod("Traceback ...", exit_code=1)])
+
+    async def run() -> None:
+        await _event("Failed", uid="job-2")
+        assert archival._reported == {"job-2"}
+        await _event("Failed", uid="job-2", event_type="DELETED")
+
+    asyncio.run(run())
+    assert _archive_status() == {"lastRun": "2026-10-01T03:30:00Z", "lastResult": "Failed"}
+    assert archival._reported == set()
+
+
+def test_deleted_bot_is_not_retried(fake_apiserver: FakeApiClient) -> None:
+    """A Job whose bot is gone is marked reported instead of failing forever."""
+    asyncio.run(_event("Failed", uid="job-3"))
+    assert archival._reported == {"job-3"}
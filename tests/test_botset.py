@@ -0,0 +1,131 @@
+"""FreqtradeBotSet handler against the fake API server."""
+
+from typing import Any
+
+import kopf
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.handlers import botset
+from freqtrade_operator.resources.botset import BOTSET_LABEL
+from freqtrade_operator.utils.kube import api_client
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import GROUP, NAMESPACE, VERSION, bot_spec
+
+BOTSETS_PATH = f"/apis/{GROUP}/{VERSION}/freqtradebotsets"
+
+
+def _universe(size: int) -> list[str]:
+    return [f"T{i:04d}/USDT" for i in range(size)]
+
+
+def _botset_object(shards: int, pairs: list[str]) -> dict[str, Any]:
+    return {
+        "apiVersion": f"{GROUP}/{VERSION}",
+        "kind": "FreqtradeBotSet",
+        "metadata": {
+            "name": "grid",
+            "namespace": NAMESPACE,
+            "uid": "00000000-0000-0000-0000-000000000001",
+            "labels": {"team": "quant"},
+        },
+        "spec": {"template": bot_spec(0), "pairs": pairs, "shards": shards},
+    }
+
+
+def _shards() -> dict[str, list[str]]:
+    items = client.CustomObjectsApi(api_client()).list_namespaced_custom_object(
+        GROUP, VERSION, NAMESPACE, "freqtradebots", label_selector=f"{BOTSET_LABEL}=grid"
+    )["items"]
+    return {item["metadata"]["name"]: item["spec"]["pairs"] for item in items}
+
+
+def _status() -> dict[str, Any]:
+    return client.CustomObjectsApi(api_client()).get_namespaced_custom_object(
+        GROUP, VERSION, NAMESPACE, "freqtradebotsets", "grid"
+    )["status"]
+
+
+def test_botset_shards(fake_apiserver: FakeApiClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The handler creates disjoint shards and holds back pairs with open trades."""
+    universe = _universe(24)
+    obj = _botset_object(3, universe)
+    fake_apiserver.seed(BOTSETS_PATH, [obj])
+
+    botset.create_botset(
+        spec=obj["spec"], name="grid", namespace=NAMESPACE, meta=obj["metadata"], body=obj
+    )
+    created = _shards()
+    assert sorted(created) == ["grid-0", "grid-1", "grid-2"]
+    assert sorted(pair for pairs in created.values() for pair in pairs) == universe
+
+    # grid-0 has open trades on all its pairs, so it keeps them for now
+    def open_pairs(
+        namespace: str, current: dict[str, list[str]], bots: set[str]
+    ) -> dict[str, set[str]]:
+        return {bot: set(current[bot]) if bot == "grid-0" else set() for bot in bots}
+
+    monkeypatch.setattr(botset, "_open_pairs", open_pairs)
+    obj["spec"]["shards"] = 4
+    with pytest.raises(kopf.TemporaryError):
+        botset.update_botset(
+            spec=obj["spec"], name="grid", namespace=NAMESPACE, meta=obj["metadata"], body=obj
+        )
+
+    rebalanced = _shards()
+    status = _status()
+    assert sorted(rebalanced) == ["grid-0", "grid-1", "grid-2", "grid-3"]
+    assert sorted(pair for pairs in rebalanced.values() for pair in pairs) == universe
+    assert rebalanced["grid-0"] == created["grid-0"]
+    assert status["pendingPairs"] == created["grid-0"][6:]
+
+    # Once the trades have closed, the held back pairs move
+    monkeypatch.setattr(botset, "_open_pairs", lambda namespace, current, bots: {})
+    botset.update_botset(
+        spec=obj["spec"], name="grid", namespace=NAMESPACE, meta=obj["metadata"], body=obj
+    )
+    settled = _shards()
+    assert max(len(pairs) for pairs in settled.values()) == 6
+    assert settled["grid-0"] == created["grid-0"][:6]
+
+
+def test_removed_shard_waits_for_trades_on_dropped_pairs(
+    fake_apiserver: FakeApiClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A removed shard with open trades only on dropped pairs is kept until they close."""
+    universe = _universe(12)
+    obj = _botset_object(3, universe)
+    fake_apiserver.seed(BOTSETS_PATH, [obj])
+    botset.create_botset(
+        spec=obj["spec"], name="grid", namespace=NAMESPACE, meta=obj["metadata"], body=obj
+    )
+    created = _shards()
+    dropped = created["grid-2"][0]
+
+    # grid-2 is removed and its one open trade is on a pair leaving the set
+    asked: list[set[str]] = []
+
+    def open_pairs(
+        namespace: str, current: dict[str, list[str]], bots: set[str]
+    ) -> dict[str, set[str]]:
+        asked.append(bots)
+        return {bot: {dropped} if bot == "grid-2" else set() for bot in bots}
+
+    monkeypatch.setattr(botset, "_open_pairs", open_pairs)
+    obj["spec"] = {**obj["spec"], "shards": 2, "pairs": [p for p in universe if p != dropped]}
+    with pytest.raises(kopf.TemporaryError, match="grid-2"):
+        botset.update_botset(
+            spec=obj["spec"], name="grid", namespace=NAMESPACE, meta=obj["metadata"], body=obj
+        )
+    assert "grid-2" in asked[0]
+    assert _shards()["grid-2"] == [dropped]
+    status = _status()
+    assert (status["draining"], status["pendingPairs"]) == (["grid-2"], [])
+
+    # Once the trade has closed, the shard is deleted
+    monkeypatch.setattr(botset, "_open_pairs", lambda namespace, current, bots: {})
+    botset.update_botset(
+        spec=obj["spec"], name="grid", namespace=NAMESPACE, meta=obj["metadata"], body=obj
+    )
+    assert sorted(_shards()) == ["grid-0", "grid-1"]
+    assert _status()["draining"] == []
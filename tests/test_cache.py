@@ -0,0 +1,145 @@
+"""TTL cache with coalescing of in-flight fetches."""
+
+import asyncio
+
+import pytest
+
+from freqtrade_operator.utils import cache
+from freqtrade_operator.utils.cache import CoalescingCache
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", fake)
+    return fake
+
+
+def test_entries_expire_after_ttl(clock: FakeClock) -> None:
+    """A value is served from cache until its TTL passes, then fetched again."""
+    calls = []
+
+    async def fetch() -> int:
+        calls.append(clock.now)
+        return len(calls)
+
+    async def run() -> list[int]:
+        c: CoalescingCache[int] = CoalescingCache()
+        values = [await c.get_or_fetch("k", 5.0, fetch)]
+        clock.now += 4.0
+        values.append(await c.get_or_fetch("k", 5.0, fetch))
+        clock.now += 2.0
+        values.append(await c.get_or_fetch("k", 5.0, fetch))
+        assert (c.hits, c.misses) == (1, 2)
+        return values
+
+    assert asyncio.run(run()) == [1, 1, 2]
+
+
+def test_zero_ttl_and_uncacheable_results_are_not_stored(clock: FakeClock) -> None:
+    """TTL 0 and results rejected by ``cacheable`` are fetched every time."""
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def run() -> None:
+        c: CoalescingCache[int] = CoalescingCache()
+        await c.get_or_fetch("a", 0.0, fetch)
+        await c.get_or_fetch("a", 0.0, fetch)
+        await c.get_or_fetch("b", 5.0, fetch, cacheable=lambda v: v > 10)
+        await c.get_or_fetch("b", 5.0, fetch, cacheable=lambda v: v > 10)
+
+    asyncio.run(run())
+    assert calls == 4
+
+
+def test_concurrent_callers_share_one_fetch() -> None:
+    """Callers arriving while a fetch runs await it instead of fetching themselves."""
+    calls = 0
+
+    async def run() -> list[str]:
+        nonlocal calls
+        release = asyncio.Event()
+
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "value"
+
+        c: CoalescingCache[str] = CoalescingCache()
+        tasks = [asyncio.create_task(c.get_or_fetch("k", 0.0, fetch)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        values = await asyncio.gather(*tasks)
+        assert c.coalesced == 9
+        return values
+
+    assert asyncio.run(run()) == ["value"] * 10
+    assert calls == 1
+
+
+def test_errors_reach_every_waiter_and_are_not_cached() -> None:
+    """A failed fetch raises in all coalesced callers and the next call retries."""
+    calls = 0
+
+    async def run() -> list[BaseException | str]:
+        release = asyncio.Event()
+
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            if calls == 1:
+                raise ConnectionError("bot down")
+            return "recovered"
+
+        c: CoalescingCache[str] = CoalescingCache()
+        tasks = [asyncio.create_task(c.get_or_fetch("k", 5.0, fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results.append(await c.get_or_fetch("k", 5.0, fetch))
+        return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ConnectionError) for r in results[:3])
+    assert results[3] == "recovered"
+    assert calls == 2
+
+
+def test_least_recently_used_entries_are_evicted(clock: FakeClock) -> None:
+    """Past ``max_entries`` the entry used longest ago is dropped."""
+
+    async def run() -> int:
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+        c: CoalescingCache[int] = CoalescingCache(max_entries=2)
+        await c.get_or_fetch("a", 60.0, fetch)
+        await c.get_or_fetch("b", 60.0, fetch)
+        await c.get_or_fetch("a", 60.0, fetch)
+        await c.get_or_fetch("c", 60.0, fetch)
+        await c.get_or_fetch("a", 60.0, fetch)
+        await c.get_or_fetch("b", 60.0, fetch)
+        return calls
+
+    # a, b and c are fetched; b was evicted by c and is fetched again
+    assert asyncio.run(run()) == 4
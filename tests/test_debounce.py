@@ -0,0 +1,116 @@
+"""Per-object debouncing of spec edits."""
+
+import kopf
+import pytest
+
+from freqtrade_operator.utils import debounce
+from freqtrade_operator.utils.debounce import Debounced, Debouncer
+
+WINDOW = 3.0
+MAX_DELAY = 10.0
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(debounce.time, "monotonic", fake)
+    return fake
+
+
+def test_first_edit_is_reconciled_immediately(clock: FakeClock) -> None:
+    """An edit after a quiet window goes through without a delay."""
+    debouncer = Debouncer(WINDOW, MAX_DELAY)
+    burst = debouncer.settle("ns", "bot", 2)
+    assert burst is not None
+    assert (burst.generation, burst.edits, burst.first) == (2, 1, clock.now)
+    # A retry of the same generation is not held back either
+    assert debouncer.settle("ns", "bot", 2) is None
+
+    clock.now += WINDOW
+    assert debouncer.settle("ns", "bot", 3) is not None
+    assert debouncer.settle("ns", "other", 2) is not None
+
+
+def test_follow_up_edits_are_coalesced(clock: FakeClock) -> None:
+    """Edits within the window of the last one wait until the object is quiet."""
+    debouncer = Debouncer(WINDOW, MAX_DELAY)
+    debouncer.settle("ns", "bot", 2)
+
+    clock.now += 1
+    with pytest.raises(Debounced) as deferred:
+        debouncer.settle("ns", "bot", 3)
+    assert deferred.value.delay == WINDOW
+    clock.now += 2
+    with pytest.raises(Debounced) as deferred:
+        debouncer.settle("ns", "bot", 5)
+    assert deferred.value.delay == WINDOW
+
+    clock.now += WINDOW
+    burst = debouncer.settle("ns", "bot", 5)
+    assert burst is not None
+    assert (burst.generation, burst.edits) == (5, 3)
+    assert debouncer.settle("ns", "bot", 5) is None
+
+    # The burst has been quiet for the window, so the next edit is a first one
+    clock.now += 0.5
+    assert debouncer.settle("ns", "bot", 6) is not None
+
+
+def test_endless_edits_are_reconciled_at_max_delay(clock: FakeClock) -> None:
+    """A burst that never quiets down is still reconciled once it is old enough."""
+    debouncer = Debouncer(WINDOW, MAX_DELAY)
+    debouncer.settle("ns", "bot", 1)
+    clock.now += 1
+    generation = 2
+    started = clock.now
+    while True:
+        try:
+            burst = debouncer.settle("ns", "bot", generation)
+        except Debounced as e:
+            assert e.delay is not None and e.delay <= WINDOW
+            clock.now += 1
+            generation += 1
+            continue
+        break
+    assert burst is not None
+    assert clock.now - started == MAX_DELAY
+    assert burst.edits == MAX_DELAY + 1
+
+    # Edits keep coming, so the next one opens another burst
+    clock.now += 1
+    with pytest.raises(Debounced):
+        debouncer.settle("ns", "bot", generation + 1)
+
+
+def test_deferral_is_a_readable_retry(clock: FakeClock) -> None:
+    """Deferrals are temporary errors telling what is waiting and for how long."""
+    debouncer = Debouncer(WINDOW, MAX_DELAY)
+    debouncer.settle("ns", "bot", 1)
+    clock.now += 1
+    with pytest.raises(kopf.TemporaryError) as deferred:
+        debouncer.settle("ns", "bot", 3)
+    assert str(deferred.value) == (
+        "ns/bot is still being edited; retrying in 3.0s (pending edits: 1)"
+    )
+
+
+def test_forget_and_disabled(clock: FakeClock) -> None:
+    """A deleted object starts over, and a zero window disables debouncing."""
+    debouncer = Debouncer(WINDOW, MAX_DELAY)
+    debouncer.settle("ns", "bot", 1)
+    debouncer.forget("ns", "bot")
+    assert debouncer.settle("ns", "bot", 1) is not None
+
+    disabled = Debouncer(0.0, 0.0)
+    assert disabled.settle("ns", "bot", 1) is None
+    assert disabled.settle("ns", "bot", 2) is None
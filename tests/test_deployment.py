@@ -0,0 +1,36 @@
+"""Bot Deployment rendering."""
+
+from freqtrade_operator.resources.deployment import FREQTRADE_IMAGE, create_deployment
+from freqtrade_operator.resources.prepull import bot_images, create_prepull_daemonset
+from freqtrade_operator.utils.git_sync import GIT_SYNC_IMAGE
+from tests.fakes.bots import bot_spec
+
+OWNER_REFERENCES = [
+    {
+        "apiVersion": "trading.freqtrade.io/v1alpha1",
+        "kind": "FreqtradeBot",
+        "name": "bot-00001",
+        "uid": "00000000-0000-0000-0000-000000000001",
+        "controller": True,
+        "blockOwnerDeletion": True,
+    }
+]
+
+
+def test_render_cold_start() -> None:
+    """Bot pods clone strategies once up front and are pre-pulled with their images."""
+    spec = {**bot_spec(1), "startupProfile": "fast"}
+    pod = create_deployment("bot-00001", "bench", spec, 8080, OWNER_REFERENCES)["spec"]["template"][
+        "spec"
+    ]
+    assert [c["name"] for c in pod["initContainers"]] == ["git-clone-sample"]
+    assert "--one-time" in pod["initContainers"][0]["args"]
+    freqtrade = pod["containers"][0]
+    assert freqtrade["startupProbe"]["periodSeconds"] == 2
+    assert "initialDelaySeconds" not in freqtrade["livenessProbe"]
+
+    images = bot_images(spec)
+    assert images == {FREQTRADE_IMAGE, GIT_SYNC_IMAGE}
+    daemonset = create_prepull_daemonset("operator", set(images))
+    init = daemonset["spec"]["template"]["spec"]["initContainers"]
+    assert sorted(c["image"] for c in init) == sorted(images)
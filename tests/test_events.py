@@ -0,0 +1,191 @@
+"""Aggregated, rate-limited Events."""
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from freqtrade_operator.observability import events
+from freqtrade_operator.observability.events import EVENT_TTL, EventSink
+from tests.fakes.bots import NAMESPACE, bot_name
+
+INTERVAL = 30.0
+
+
+def _body(index: int) -> dict[str, Any]:
+    return {
+        "apiVersion": "trading.freqtrade.io/v1alpha1",
+        "kind": "FreqtradeBot",
+        "metadata": {"name": bot_name(index), "namespace": NAMESPACE, "uid": str(index)},
+    }
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakePoster:
+    """Stand-in for ``api_call``/``api_send`` recording the Events written."""
+
+    def __init__(self) -> None:
+        self.created: list[dict[str, Any]] = []
+        self.patched: list[tuple[str, dict[str, Any]]] = []
+        self.missing: set[str] = set()
+
+    def create(self, verb: str, resource: str, fn: Any, namespace: str, body: Any) -> Any:
+        name = f"{body['metadata']['generateName']}{len(self.created)}"
+        self.created.append(body)
+        return SimpleNamespace(metadata=SimpleNamespace(name=name))
+
+    def patch(
+        self, verb: str, resource: str, fn: Any, name: str, namespace: str, body: Any
+    ) -> None:
+        if name in self.missing:
+            raise ApiException(status=404, reason="Not Found")
+        self.patched.append((name, body))
+
+    def posts(self) -> list[tuple[str, str, int]]:
+        """Reason, object and count of each created Event."""
+        return [(e["reason"], e["involvedObject"]["name"], e["count"]) for e in self.created]
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(events.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def poster(monkeypatch: pytest.MonkeyPatch) -> FakePoster:
+    fake = FakePoster()
+    monkeypatch.setattr(events, "api_call", fake.create)
+    monkeypatch.setattr(events, "api_send", fake.patch)
+    return fake
+
+
+def _sink(transitions_only: bool = True) -> EventSink:
+    sink = EventSink(transitions_only=transitions_only, min_interval=INTERVAL)
+    sink.running = True
+    return sink
+
+
+def test_repeats_are_aggregated(clock: FakeClock, poster: FakePoster) -> None:
+    """Repeats of one reason become one Event whose count grows across flushes."""
+    sink = _sink()
+    for attempt in range(3):
+        sink.record(_body(0), "ReconcileFailed", f"attempt {attempt}", "Warning")
+    sink.flush()
+    assert poster.posts() == [("ReconcileFailed", bot_name(0), 3)]
+    assert poster.created[0]["message"] == "attempt 2"
+    assert poster.created[0]["type"] == "Warning"
+
+    sink.record(_body(0), "ReconcileFailed", "attempt 3", "Warning")
+    sink.record(_body(0), "ReconcileFailed", "attempt 4", "Warning")
+    clock.now += INTERVAL
+    sink.flush()
+    ((name, patch),) = poster.patched
+    assert name == f"{bot_name(0)}.0"
+    assert (patch["count"], patch["message"]) == (5, "attempt 4")
+    assert len(poster.created) == 1
+
+
+def test_expired_or_deleted_events_are_created_again(clock: FakeClock, poster: FakePoster) -> None:
+    """An Event the API server no longer has, or that has expired, is posted anew."""
+    sink = _sink()
+    sink.record(_body(0), "ReconcileFailed", "boom", "Warning")
+    sink.flush()
+
+    poster.missing.add(f"{bot_name(0)}.0")
+    sink.record(_body(0), "ReconcileFailed", "boom", "Warning")
+    clock.now += INTERVAL
+    sink.flush()
+    assert poster.patched == []
+    assert poster.posts() == [("ReconcileFailed", bot_name(0), 1)] * 2
+
+    # An hour later the count is not continued in the expired Event
+    sink.record(_body(0), "ReconcileFailed", "boom", "Warning")
+    clock.now += EVENT_TTL + INTERVAL
+    sink.flush()
+    assert poster.patched == []
+    assert len(poster.created) == 3
+
+
+def test_only_transitions_are_posted(clock: FakeClock, poster: FakePoster) -> None:
+    """A Normal Event repeating the object's previous reason is only logged."""
+    sink = _sink()
+    sink.record(_body(0), "Ready", "running")
+    sink.record(_body(0), "Ready", "running")
+    sink.record(_body(1), "Ready", "running")
+    sink.flush()
+    assert poster.posts() == [("Ready", bot_name(0), 1), ("Ready", bot_name(1), 1)]
+
+    # Warnings always count, and a change of reason is a transition again
+    clock.now += INTERVAL
+    sink.record(_body(0), "Ready", "running")
+    sink.record(_body(0), "Degraded", "restarting", "Warning")
+    sink.record(_body(0), "Degraded", "restarting", "Warning")
+    sink.record(_body(0), "Ready", "running")
+    sink.flush()
+    assert poster.posts()[2:] == [("Degraded", bot_name(0), 2)]
+    assert [(name, body["count"]) for name, body in poster.patched] == [(f"{bot_name(0)}.0", 2)]
+
+
+def test_all_mode_posts_repeats(clock: FakeClock, poster: FakePoster) -> None:
+    """With transitions-only off, repeated Normal Events are aggregated as well."""
+    sink = _sink(transitions_only=False)
+    sink.record(_body(0), "Ready", "running")
+    sink.record(_body(0), "Ready", "running")
+    sink.flush()
+    assert poster.posts() == [("Ready", bot_name(0), 2)]
+
+
+def test_posts_are_rate_limited_per_object(clock: FakeClock, poster: FakePoster) -> None:
+    """An object gets at most one flush per interval; its Events wait, others do not."""
+    sink = _sink()
+    sink.record(_body(0), "Created", "created")
+    sink.flush()
+
+    sink.record(_body(0), "Updated", "updated")
+    sink.record(_body(1), "Created", "created")
+    clock.now += INTERVAL - 1
+    sink.flush()
+    assert poster.posts() == [("Created", bot_name(0), 1), ("Created", bot_name(1), 1)]
+
+    clock.now += 1
+    sink.flush()
+    assert poster.posts()[2:] == [("Updated", bot_name(0), 1)]
+    sink.flush()
+    assert len(poster.created) == 3
+
+
+def test_forget_resets_transitions(clock: FakeClock, poster: FakePoster) -> None:
+    """A deleted object's pending Events are still posted, and a new one starts fresh."""
+    sink = _sink()
+    sink.record(_body(0), "Deleted", "deleted")
+    sink.record(_body(1), "Deleted", "deleted")
+    sink.forget(NAMESPACE, "FreqtradeBot", bot_name(0))
+    sink.flush()
+    assert poster.posts() == [("Deleted", bot_name(0), 1), ("Deleted", bot_name(1), 1)]
+
+    # Recreated under the same name, the same reason is a transition again
+    clock.now += INTERVAL
+    sink.record(_body(0), "Deleted", "deleted")
+    sink.record(_body(1), "Deleted", "deleted")
+    sink.flush()
+    assert [body["count"] for _, body in poster.patched] == [2]
+
+
+def test_nothing_is_buffered_while_stopped(clock: FakeClock, poster: FakePoster) -> None:
+    """Without a running sink Events are only logged."""
+    sink = EventSink()
+    sink.record(_body(0), "Created", "created")
+    sink.flush()
+    assert poster.created == []
@@ -0,0 +1,174 @@
+"""Shared FreqAI training: config keys, rendering and training Jobs."""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.handlers import freqai as handlers
+from freqtrade_operator.resources.configmap import generate_freqtrade_config
+from freqtrade_operator.resources.deployment import create_deployment
+from freqtrade_operator.resources.freqai import (
+    FREQAI_IMAGE,
+    TRAINING_FIELDS,
+    create_training_config,
+    get_identifier,
+    get_training_key,
+    get_training_name,
+)
+from freqtrade_operator.utils.kube import api_client
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import NAMESPACE, bot_name, bot_spec
+
+OWNER_REFERENCES = [
+    {
+        "apiVersion": "trading.freqtrade.io/v1alpha1",
+        "kind": "FreqtradeBot",
+        "name": "bot-00001",
+        "uid": "00000000-0000-0000-0000-000000000001",
+        "controller": True,
+        "blockOwnerDeletion": True,
+    }
+]
+DB_URL = "postgresql://freqtrade@freqtrade-db-rw.bench.svc.cluster.local:5432/bot_00001"
+
+
+def test_render_freqai_training() -> None:
+    """Bots differing only in pairs and stake share one training key and its models."""
+    freqai = {"enabled": True, "model": "LightGBMRegressor", "retrainHours": 2}
+    first = {**bot_spec(1), "pairs": ["BTC/USDT"], "freqai": freqai}
+    second = {**bot_spec(3, stake="250"), "pairs": ["ETH/USDT"], "freqai": freqai}
+    other = {**first, "freqai": {**freqai, "model": "XGBoostRegressor"}}
+
+    key = get_training_key(first)
+    assert get_training_key(second) == key
+    assert get_training_key(other) != key
+
+    config = generate_freqtrade_config("bot-00001", "bench", first, 8080, DB_URL)
+    assert config["freqaimodel"] == "LightGBMRegressor"
+    assert config["freqai"]["identifier"] == get_identifier(key)
+    assert config["freqai"]["live_retrain_hours"] == 6
+
+    training = create_training_config(config, first, ["BTC/USDT", "ETH/USDT"])
+    assert training["exchange"]["pair_whitelist"] == ["BTC/USDT", "ETH/USDT"]
+    assert training["freqai"]["live_retrain_hours"] == 2
+    assert training["api_server"] == {"enabled": False}
+
+    pod = create_deployment("bot-00001", "bench", first, 8080, OWNER_REFERENCES)["spec"][
+        "template"
+    ]["spec"]
+    assert pod["containers"][0]["image"] == FREQAI_IMAGE
+    assert [c["name"] for c in pod["initContainers"]][-1] == "wait-for-models"
+    assert any(
+        mount["subPath"] == f"models/{get_identifier(key)}"
+        for mount in pod["containers"][0]["volumeMounts"]
+        if mount["name"] == "models"
+    )
+
+
+FREQAI = {"enabled": True, "model": "LightGBMRegressor", "retrainHours": 2}
+
+
+def _freqai_spec(index: int, pairs: list[str], **freqai: Any) -> dict[str, Any]:
+    return {**bot_spec(index), "pairs": pairs, "freqai": {**FREQAI, **freqai}}
+
+
+def test_training_key_covers_what_the_models_depend_on() -> None:
+    """Every field deciding the models changes the key; trading-only fields do not."""
+    spec = _freqai_spec(1, ["BTC/USDT"])
+    key = get_training_key(spec)
+
+    same = {
+        **spec,
+        "pairs": ["ETH/USDT"],
+        "stake": {"currency": "USDT", "amount": "999"},
+        "exchange": {**spec["exchange"], "dryRun": False},
+        "resources": {},
+        "freqai": {"retrainHours": 2, "model": "LightGBMRegressor", "enabled": True},
+    }
+    assert get_training_key(same) == key
+
+    different = [
+        {**spec, "exchange": {**spec["exchange"], "name": "kraken"}},
+        {**spec, "strategies": spec["strategies"][1:]},
+        *({**spec, "freqai": {**spec["freqai"], field: "changed"}} for field in TRAINING_FIELDS),
+    ]
+    keys = {get_training_key(other) for other in different}
+    assert key not in keys
+    assert len(keys) == len(different)
+
+
+@pytest.fixture
+def no_training(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start without tracked bots, claims or applied training workers."""
+    monkeypatch.setattr(handlers, "trained_bots", {})
+    monkeypatch.setattr(handlers, "_bots", {})
+    monkeypatch.setattr(handlers, "_claims", set())
+    monkeypatch.setattr(handlers, "_applied", {})
+    monkeypatch.setattr(handlers, "_pending", {})
+    monkeypatch.setattr(handlers, "_locks", {})
+
+
+async def _bot_event(index: int, spec: dict[str, Any], event_type: str = "ADDED") -> None:
+    await handlers.freqai_bot_event(
+        event={"type": event_type}, spec=spec, name=bot_name(index), namespace=NAMESPACE, labels={}
+    )
+
+
+async def _drain() -> None:
+    """Run the scheduled reconciles now instead of after their delay."""
+    for key, handle in list(handlers._pending.items()):
+        handle.cancel()
+        await handlers._flush(key)
+
+
+def _training_pairs(key: str) -> list[str]:
+    configmap = client.CoreV1Api(api_client()).read_namespaced_config_map(
+        get_training_name(key), NAMESPACE
+    )
+    return json.loads(configmap.data["config.json"])["exchange"]["pair_whitelist"]
+
+
+def test_bots_with_one_config_share_a_training_job(
+    fake_apiserver: FakeApiClient, no_training: None
+) -> None:
+    """Bots with the same training config get one worker; a different config its own."""
+    shared = get_training_key(_freqai_spec(1, []))
+    other = get_training_key(_freqai_spec(3, [], model="XGBoostRegressor"))
+
+    async def run() -> list[dict[str, int]]:
+        counts = []
+        await _bot_event(1, _freqai_spec(1, ["BTC/USDT"]))
+        await _bot_event(2, _freqai_spec(2, ["ETH/USDT", "BTC/USDT"]))
+        await _bot_event(3, _freqai_spec(3, ["SOL/USDT"], model="XGBoostRegressor"))
+        await _drain()
+        counts.append(fake_apiserver.stats()["requests"])
+
+        # Replayed events change nothing
+        fake_apiserver.reset()
+        await _bot_event(2, _freqai_spec(2, ["ETH/USDT", "BTC/USDT"]))
+        await _drain()
+        counts.append(fake_apiserver.stats()["requests"])
+
+        # Switching to the shared config moves the bot and removes its old worker
+        await _bot_event(3, _freqai_spec(3, ["SOL/USDT"]))
+        await _drain()
+        counts.append(fake_apiserver.stats()["requests"])
+        return counts
+
+    first, replayed, moved = asyncio.run(run())
+    assert first["create cronjobs"] == 2
+    assert first["create jobs"] == 2
+    assert first["create persistentvolumeclaims"] == 1
+    assert handlers.trained_bots == {
+        (NAMESPACE, shared): {bot_name(1), bot_name(2), bot_name(3)},
+        (NAMESPACE, other): set(),
+    }
+    assert replayed == {}
+    assert moved["delete cronjobs"] == 1
+    assert moved["patch configmaps"] == 1
+    assert "create jobs" not in moved
+    assert _training_pairs(shared) == ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    assert (NAMESPACE, other) not in handlers._applied
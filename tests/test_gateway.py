@@ -0,0 +1,180 @@
+"""Gateway routes and authentication against a local fake bot API."""
+
+import asyncio
+import json
+from collections import Counter
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+from freqtrade_operator.gateway.server import create_app
+from freqtrade_operator.gateway.tokens import issue_token, signing_key, verify_token
+from freqtrade_operator.utils.bot_api import BotApiClient, BotEndpoint
+from tests.fakes.exchange import serve_app
+
+PASSWORD = "viewer-secret"
+
+
+@dataclass
+class Directory:
+    """Static bot directory in place of registry discovery."""
+
+    endpoints: Mapping[str, BotEndpoint] = field(default_factory=dict)
+    version: str = "v1"
+
+
+def _bot_app(requests: Counter[str]) -> web.Application:
+    async def status(request: web.Request) -> web.Response:
+        requests[request.path] += 1
+        return web.json_response([{"trade_id": 1}])
+
+    async def missing(request: web.Request) -> web.Response:
+        requests[request.path] += 1
+        raise web.HTTPNotFound()
+
+    app = web.Application()
+    app.router.add_get("/api/v1/status", status)
+    app.router.add_get("/api/v1/missing", missing)
+    return app
+
+
+@asynccontextmanager
+async def _gateway(password: str | None = PASSWORD) -> AsyncIterator[tuple[str, Counter[str]]]:
+    requests: Counter[str] = Counter()
+    async with serve_app(_bot_app(requests)) as bot_url:
+        directory = Directory({"bot-a": BotEndpoint("bot-a", "bench", bot_url, "bot-password")})
+        async with serve_app(create_app(directory, BotApiClient(), password=password)) as url:
+            yield url, requests
+
+
+def _run(scenario: Any) -> Any:
+    async def run() -> Any:
+        async with _gateway() as (url, requests), aiohttp.ClientSession() as session:
+            return await scenario(url, requests, session)
+
+    return asyncio.run(run())
+
+
+def test_reads_need_credentials() -> None:
+    """Bot reads need the viewer password; health checks do not."""
+
+    async def scenario(url: str, requests: Counter[str], session: aiohttp.ClientSession) -> None:
+        async with session.get(f"{url}/healthz") as resp:
+            assert resp.status == 200
+        async with session.get(f"{url}/bots/bot-a/api/v1/status") as resp:
+            assert resp.status == 401
+        wrong = {"Authorization": aiohttp.encode_basic_auth("freqtrade", "guess")}
+        async with session.get(f"{url}/bots/bot-a/api/v1/status", headers=wrong) as resp:
+            assert resp.status == 401
+        malformed = {"Authorization": "Basic not-base64"}
+        async with session.get(f"{url}/bots/bot-a/api/v1/status", headers=malformed) as resp:
+            assert resp.status == 401
+        auth = {"Authorization": aiohttp.encode_basic_auth("freqtrade", PASSWORD)}
+        async with session.get(f"{url}/bots/bot-a/api/v1/status", headers=auth) as resp:
+            assert resp.status == 200
+            assert await resp.json() == [{"trade_id": 1}]
+        assert requests["/api/v1/status"] == 1
+
+    _run(scenario)
+
+
+def test_frequi_token_login() -> None:
+    """FreqUI's login, bearer reads and token refresh all work through the gateway."""
+
+    async def scenario(url: str, requests: Counter[str], session: aiohttp.ClientSession) -> None:
+        base = f"{url}/bots/bot-a/api/v1"
+        async with session.post(f"{base}/token/login") as resp:
+            assert resp.status == 401
+        auth = {"Authorization": aiohttp.encode_basic_auth("freqtrade", PASSWORD)}
+        async with session.post(f"{base}/token/login", headers=auth) as resp:
+            assert resp.status == 200
+            tokens = await resp.json()
+
+        bearer = {"Authorization": f"Bearer {tokens['access_token']}"}
+        async with session.get(f"{base}/status", headers=bearer) as resp:
+            assert resp.status == 200
+        # A refresh token is not an access token
+        refresh = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+        async with session.get(f"{base}/status", headers=refresh) as resp:
+            assert resp.status == 401
+        async with session.post(f"{base}/token/refresh", headers=bearer) as resp:
+            assert resp.status == 401
+        async with session.post(f"{base}/token/refresh", headers=refresh) as resp:
+            assert resp.status == 200
+            renewed = (await resp.json())["access_token"]
+        async with session.get(
+            f"{base}/status", headers={"Authorization": f"Bearer {renewed}"}
+        ) as resp:
+            assert resp.status == 200
+        async with session.post(f"{url}/bots/unknown/api/v1/token/login", headers=auth) as resp:
+            assert resp.status == 404
+
+    _run(scenario)
+
+
+def test_tokens_expire_and_are_bound_to_the_password() -> None:
+    """Tokens stop validating after their lifetime or once the password changes."""
+    key = signing_key(PASSWORD)
+    token = issue_token(key, "access", "freqtrade", now=1000.0)
+    assert verify_token(key, token, "access", now=1000.0 + 60) == "freqtrade"
+    assert verify_token(key, token, "access", now=1000.0 + 16 * 60) is None
+    assert verify_token(signing_key("rotated"), token, "access", now=1000.0) is None
+    assert verify_token(key, token, "refresh", now=1000.0) is None
+    assert verify_token(key, "not-a-token", "access") is None
+    header, payload, signature = token.split(".")
+    assert verify_token(key, f"{header}.{payload}x.{signature}", "access", now=1000.0) is None
+
+
+def test_reads_are_cached_and_errors_passed_through() -> None:
+    """Cached endpoints hit the bot once; errors and unknown bots are answered as such."""
+
+    async def scenario(url: str, requests: Counter[str], session: aiohttp.ClientSession) -> None:
+        auth = {"Authorization": aiohttp.encode_basic_auth("freqtrade", PASSWORD)}
+        for _ in range(3):
+            async with session.get(f"{url}/bots/bot-a/api/v1/status", headers=auth) as resp:
+                assert resp.status == 200
+        for _ in range(2):
+            async with session.get(f"{url}/bots/bot-a/api/v1/missing", headers=auth) as resp:
+                assert resp.status == 404
+        async with session.get(f"{url}/bots/unknown/api/v1/status", headers=auth) as resp:
+            assert resp.status == 404
+            assert await resp.text() == "Unknown bot"
+        assert requests == {"/api/v1/status": 1, "/api/v1/missing": 2}
+
+    _run(scenario)
+
+
+def test_bot_list_etag() -> None:
+    """``/bots`` lists the known bots with the registry version as ETag."""
+
+    async def scenario(url: str, requests: Counter[str], session: aiohttp.ClientSession) -> None:
+        auth = {"Authorization": aiohttp.encode_basic_auth("freqtrade", PASSWORD)}
+        async with session.get(f"{url}/bots", headers=auth) as resp:
+            assert resp.headers["ETag"] == '"v1"'
+            assert json.loads(await resp.read()) == {
+                "bots": [{"name": "bot-a", "url": "/bots/bot-a"}]
+            }
+        headers = {**auth, "If-None-Match": '"v1"'}
+        async with session.get(f"{url}/bots", headers=headers) as resp:
+            assert resp.status == 304
+
+    _run(scenario)
+
+
+def test_without_password_login_still_issues_tokens() -> None:
+    """With auth disabled reads are open and FreqUI's login succeeds with any credentials."""
+
+    async def run() -> None:
+        async with _gateway(password=None) as (url, _), aiohttp.ClientSession() as session:
+            async with session.get(f"{url}/bots/bot-a/api/v1/status") as resp:
+                assert resp.status == 200
+            auth = {"Authorization": aiohttp.encode_basic_auth("anyone", "anything")}
+            async with session.post(f"{url}/bots/bot-a/api/v1/token/login", headers=auth) as resp:
+                assert resp.status == 200
+                assert set(await resp.json()) == {"access_token", "refresh_token"}
+
+    asyncio.run(run())
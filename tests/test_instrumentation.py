@@ -0,0 +1,182 @@
+"""Spans and metrics recorded around API calls and handlers."""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from freqtrade_operator.observability import instrumentation
+from freqtrade_operator.observability.instrumentation import (
+    api_call,
+    api_send,
+    instrumented,
+    reconcile_span,
+)
+from freqtrade_operator.observability.otel import create_operator_metrics
+from freqtrade_operator.utils.debounce import Debounced
+from freqtrade_operator.utils.kube import api_client
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import NAMESPACE
+
+
+@dataclass
+class Telemetry:
+    spans: InMemorySpanExporter
+    reader: InMemoryMetricReader
+
+    def points(self, metric: str) -> list[Any]:
+        """Return the data points of one metric."""
+        data = self.reader.get_metrics_data()
+        return [
+            point
+            for resource in data.resource_metrics
+            for scope in resource.scope_metrics
+            for m in scope.metrics
+            if m.name == metric
+            for point in m.data.data_points
+        ]
+
+
+@pytest.fixture
+def telemetry(monkeypatch: pytest.MonkeyPatch) -> Iterator[Telemetry]:
+    """Record the operator's spans and metrics in memory."""
+    exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+    reader = InMemoryMetricReader()
+    meter_provider = MeterProvider(metric_readers=[reader])
+    monkeypatch.setattr(instrumentation, "tracer", tracer_provider.get_tracer("test"))
+    monkeypatch.setattr(
+        instrumentation, "_metrics", create_operator_metrics(meter_provider.get_meter("test"))
+    )
+    yield Telemetry(exporter, reader)
+    tracer_provider.shutdown()
+    meter_provider.shutdown()
+
+
+def test_api_call_records_span_and_latency(telemetry: Telemetry) -> None:
+    """A successful call gets a span with the object's name and a latency sample."""
+    result = api_call(
+        "create",
+        "configmap",
+        lambda **kwargs: "ok",
+        namespace="ns",
+        body={"metadata": {"name": "a"}},
+    )
+    assert result == "ok"
+
+    (span,) = telemetry.spans.get_finished_spans()
+    assert span.name == "k8s create configmap"
+    assert span.attributes["k8s.namespace"] == "ns"
+    assert span.attributes["k8s.name"] == "a"
+    assert span.status.status_code == StatusCode.UNSET
+
+    (duration,) = telemetry.points("freqtrade_operator_api_request_duration_seconds")
+    assert duration.count == 1
+    assert dict(duration.attributes) == {"verb": "create", "resource": "configmap"}
+    (inflight,) = telemetry.points("freqtrade_operator_api_requests_inflight")
+    assert inflight.value == 0
+    assert telemetry.points("freqtrade_operator_api_errors_total") == []
+
+
+def test_api_call_records_errors(telemetry: Telemetry) -> None:
+    """API errors set the span status and count an error by reason and status."""
+
+    def fail(**kwargs: Any) -> None:
+        raise ApiException(status=409, reason="Conflict")
+
+    with pytest.raises(ApiException):
+        api_call("patch", "deployment", fail, name="bot", namespace="ns")
+
+    (span,) = telemetry.spans.get_finished_spans()
+    assert span.status.status_code == StatusCode.ERROR
+    assert span.status.description == "Conflict"
+    assert span.attributes["http.status_code"] == 409
+    (errors,) = telemetry.points("freqtrade_operator_api_errors_total")
+    assert errors.value == 1
+    assert dict(errors.attributes) == {
+        "verb": "patch",
+        "resource": "deployment",
+        "reason": "Conflict",
+        "status": 409,
+    }
+    (duration,) = telemetry.points("freqtrade_operator_api_request_duration_seconds")
+    assert duration.count == 1
+
+
+def test_api_send_drains_the_raw_response(telemetry: Telemetry) -> None:
+    """``api_send`` asks for the raw response and returns its connection to the pool."""
+    calls: list[dict[str, Any]] = []
+
+    class Response:
+        drained = released = False
+
+        def drain_conn(self) -> None:
+            self.drained = True
+
+        def release_conn(self) -> None:
+            self.released = True
+
+    response = Response()
+
+    def fn(**kwargs: Any) -> Response:
+        calls.append(kwargs)
+        return response
+
+    assert api_send("delete", "service", fn, name="bot", namespace="ns") is None
+    assert calls == [{"name": "bot", "namespace": "ns", "_preload_content": False}]
+    assert response.drained and response.released
+    (span,) = telemetry.spans.get_finished_spans()
+    assert span.name == "k8s delete service"
+
+
+def test_api_send_against_the_api_server(
+    telemetry: Telemetry, fake_apiserver: FakeApiClient
+) -> None:
+    """The generated client methods accept the raw-response path end to end."""
+    core_v1 = client.CoreV1Api(api_client())
+    body = {"metadata": {"name": "cm"}, "data": {"a": "1"}}
+    api_send("create", "configmap", core_v1.create_namespaced_config_map, NAMESPACE, body)
+    assert core_v1.read_namespaced_config_map("cm", NAMESPACE).data == {"a": "1"}
+    assert fake_apiserver.stats()["requests"]["create configmaps"] == 1
+
+
+def test_reconcile_span_outcomes(telemetry: Telemetry) -> None:
+    """Handlers are timed by outcome; only real failures count as errors."""
+
+    @instrumented("FreqtradeBot", "update")
+    def handler(name: str, namespace: str, error: BaseException | None = None) -> str:
+        if error is not None:
+            raise error
+        return "done"
+
+    assert handler(name="bot", namespace="ns") == "done"
+    with pytest.raises(Debounced):
+        handler(name="bot", namespace="ns", error=Debounced("settling", delay=1))
+    with pytest.raises(RuntimeError):
+        with reconcile_span("FreqtradeBot", "update", "ns", "bot"):
+            raise RuntimeError from ApiException(status=500, reason="InternalError")
+
+    spans = telemetry.spans.get_finished_spans()
+    assert [s.name for s in spans] == ["reconcile FreqtradeBot update"] * 3
+    assert spans[0].attributes["k8s.name"] == "bot"
+    assert spans[2].status.status_code == StatusCode.ERROR
+
+    outcomes = {
+        point.attributes["outcome"]: point.count
+        for point in telemetry.points("freqtrade_reconciliation_duration_seconds")
+    }
+    assert outcomes == {"success": 1, "debounced": 1, "error": 1}
+    (errors,) = telemetry.points("freqtrade_bot_errors_total")
+    assert errors.attributes["reason"] == "InternalError"
+    (inflight,) = telemetry.points("freqtrade_reconciliations_inflight")
+    assert inflight.value == 0
@@ -0,0 +1,115 @@
+"""Running kopf only while holding the leader Lease."""
+
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from kubernetes import client
+
+import freqtrade_operator.__main__ as entry
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.leader import LeaderElector
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import NAMESPACE
+
+LEASES_PATH = "/apis/coordination.k8s.io/v1/leases"
+LEASE = "freqtrade-operator"
+LIVENESS = "http://127.0.0.1:0/healthz"
+
+
+class FakeOperator:
+    """Stand-in for ``kopf.operator`` that runs until its stop flag is set."""
+
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.stop_flag: asyncio.Event | None = None
+
+    async def __call__(self, stop_flag: asyncio.Event, **kwargs: Any) -> None:
+        self.stop_flag = stop_flag
+        self.started.set()
+        await stop_flag.wait()
+
+
+@pytest.fixture
+def fake_operator(monkeypatch: pytest.MonkeyPatch) -> FakeOperator:
+    fake = FakeOperator()
+    monkeypatch.setattr(entry.kopf, "operator", fake)
+    return fake
+
+
+def _elector(identity: str) -> LeaderElector:
+    return LeaderElector(
+        LEASE, NAMESPACE, identity, lease_duration=1.0, renew_deadline=0.5, retry_period=0.05
+    )
+
+
+def _holder() -> str | None:
+    api = client.CoordinationV1Api(api_client())
+    return api.read_namespaced_lease(LEASE, NAMESPACE).spec.holder_identity
+
+
+def _take_lease(fake: FakeApiClient, identity: str) -> None:
+    now = datetime.now(UTC).isoformat()
+    fake.seed(
+        LEASES_PATH,
+        [
+            {
+                "metadata": {"name": LEASE, "namespace": NAMESPACE},
+                "spec": {
+                    "holderIdentity": identity,
+                    "leaseDurationSeconds": 1,
+                    "acquireTime": now,
+                    "renewTime": now,
+                },
+            }
+        ],
+    )
+
+
+def test_standby_runs_kopf_once_the_lease_is_released(
+    fake_apiserver: FakeApiClient, fake_operator: FakeOperator
+) -> None:
+    """kopf starts only after the holder releases; losing the Lease stops it."""
+
+    async def scenario() -> None:
+        leader = _elector("operator-a")
+        assert await asyncio.to_thread(leader.try_acquire_or_renew)
+        standby = _elector("operator-b")
+        run = asyncio.create_task(entry.run_elected(standby, LIVENESS))
+
+        await asyncio.sleep(0.3)
+        assert not fake_operator.started.is_set()
+        await asyncio.to_thread(leader.release)
+        await asyncio.wait_for(fake_operator.started.wait(), 2)
+        assert await asyncio.to_thread(_holder) == "operator-b"
+
+        # Another replica overwrites the Lease, as after a missed renewal
+        await asyncio.to_thread(_take_lease, fake_apiserver, "operator-c")
+        assert await asyncio.wait_for(run, 2)
+        assert fake_operator.stop_flag is not None and fake_operator.stop_flag.is_set()
+        # A replica that lost the Lease does not release it from the new holder
+        assert await asyncio.to_thread(_holder) == "operator-c"
+
+    asyncio.run(scenario())
+
+
+def test_shutdown_releases_the_lease(
+    fake_apiserver: FakeApiClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """When kopf stops on its own, the Lease is handed over for an immediate takeover."""
+
+    async def stopped(stop_flag: asyncio.Event, **kwargs: Any) -> None:
+        await asyncio.sleep(0.1)
+
+    monkeypatch.setattr(entry.kopf, "operator", stopped)
+
+    async def scenario() -> None:
+        leader = _elector("operator-a")
+        assert not await entry.run_elected(leader, LIVENESS)
+        assert await asyncio.to_thread(_holder) is None
+
+        standby = _elector("operator-b")
+        assert await asyncio.to_thread(standby.try_acquire_or_renew)
+
+    asyncio.run(scenario())
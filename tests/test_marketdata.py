@@ -0,0 +1,50 @@
+"""Market-data proxy: host allowlist and cache lifetimes."""
+
+import asyncio
+
+import aiohttp
+
+from freqtrade_operator.marketdata.routes import (
+    CANDLE_SETTLE,
+    EXCHANGES,
+    cache_ttl,
+    candle_ttl,
+    parse_timeframe,
+)
+from freqtrade_operator.marketdata.server import UpstreamClient, create_app
+from tests.fakes.exchange import serve_app
+
+
+def test_other_hosts_are_refused() -> None:
+    """The proxy only reaches the hosts of its exchange."""
+
+    async def request() -> int:
+        async with (
+            serve_app(create_app(EXCHANGES["binance"], UpstreamClient())) as proxy_url,
+            aiohttp.ClientSession() as session,
+            session.get(f"{proxy_url}/https://example.com/api/v3/klines") as resp,
+        ):
+            return resp.status
+
+    assert asyncio.run(request()) == 403
+
+
+def test_candle_ttl_is_aligned_to_candle_close() -> None:
+    """Candles are cached until the next close, and only briefly right after one."""
+    close = 1_700_000_100  # a 5m boundary
+    assert candle_ttl(300, close + 100) == 200
+    assert candle_ttl(300, close + 299) == 1
+    assert candle_ttl(300, close + 0.5) == CANDLE_SETTLE - 0.5
+    # Weekly candles close on Monday 00:00 UTC (2023-11-20)
+    assert candle_ttl(604800, 1_700_438_400 + 3600) == 604800 - 3600
+
+    assert parse_timeframe("5m") == 300
+    assert parse_timeframe("1H") == parse_timeframe("1hour") == parse_timeframe("60") == 3600
+    assert parse_timeframe("1Dutc") == parse_timeframe("D") == 86400
+    assert parse_timeframe("1M") is None
+
+    routes = EXCHANGES["binance"]
+    assert cache_ttl(routes, "/api/v3/klines", {"interval": "1h"}, close + 100) == 3600 - (
+        (close + 100) % 3600
+    )
+    assert cache_ttl(routes, "/api/v3/time", {}) == 0
@@ -0,0 +1,65 @@
+"""Shared pairlists: ranking filters and the ETag-aware server."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import aiohttp
+
+from freqtrade_operator.pairlist import tickers
+from freqtrade_operator.pairlist.ranking import rank_pairs
+from freqtrade_operator.pairlist.server import PairlistDocument, create_app
+from freqtrade_operator.resources.pairlist import create_pairlist_configmap
+from tests.fakes.bots import NAMESPACE
+from tests.fakes.exchange import FakeExchange, serve_app
+
+FILTER = {
+    "exchange": "binance",
+    "stakeCurrency": "USDT",
+    "numberAssets": 20,
+    "filters": {"maxSpreadRatio": 0.005, "minPrice": 0.01, "blacklist": ["T00[0-4]/.*"]},
+}
+
+
+def test_ranking_filters() -> None:
+    """Volume order, spread and price filters match the fake exchange's markets."""
+    exchange = FakeExchange()
+    normalized = [
+        tickers.Ticker(
+            f"{m.base}/{m.quote}",
+            m.quote,
+            m.price,
+            m.quote_volume,
+            m.price * (1 - m.spread),
+            m.price,
+        )
+        for m in exchange.markets
+    ]
+    ranked = rank_pairs(normalized, FILTER)
+    volumes = {f"{m.base}/{m.quote}": m for m in exchange.markets}
+
+    assert ranked == sorted(ranked, key=lambda pair: -volumes[pair].quote_volume)
+    assert all(volumes[pair].spread <= 0.005 and volumes[pair].price >= 0.01 for pair in ranked)
+
+
+def test_server_answers_with_etag(tmp_path: Path) -> None:
+    """Unchanged lists are answered with 304 to clients sending the ETag."""
+    configmap = create_pairlist_configmap("shared", NAMESPACE, ["T001/USDT"], "abc123", 1800, [])
+    for key, value in configmap["data"].items():
+        (tmp_path / key).write_text(value)
+    document = PairlistDocument(str(tmp_path))
+    document.refresh()
+
+    async def fetch() -> list[tuple[int, str | None, bytes]]:
+        responses = []
+        async with serve_app(create_app(document)) as url, aiohttp.ClientSession() as session:
+            for headers in ({}, {"If-None-Match": '"abc123"'}, {"If-None-Match": '"old"'}):
+                async with session.get(f"{url}/pairlist", headers=headers) as resp:
+                    responses.append((resp.status, resp.headers.get("ETag"), await resp.read()))
+        return responses
+
+    first, cached, stale = asyncio.run(fetch())
+    assert first[0] == 200 and first[1] == '"abc123"'
+    assert json.loads(first[2]) == {"pairs": ["T001/USDT"], "refresh_period": 1800}
+    assert cached[0] == 304 and cached[2] == b""
+    assert stale[0] == 200
@@ -0,0 +1,131 @@
+"""Shared PgBouncer Pooler sizing and lifecycle."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.handlers import pooler as handlers
+from freqtrade_operator.resources.pooler import (
+    MAX_POOL_SIZE_PER_BOT,
+    POOLER_INSTANCES,
+    POOLER_SERVER_CONNECTIONS,
+    pool_parameters,
+)
+from freqtrade_operator.utils.kube import api_client
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import NAMESPACE, bot_name, bot_spec
+
+POOLER = "freqtrade-db-pooler-rw"
+
+
+@pytest.mark.parametrize(
+    ("bots", "pool_size", "max_client_conn"),
+    [(0, 5, 100), (1, 5, 100), (8, 5, 120), (20, 2, 300), (40, 1, 600), (100, 1, 1500)],
+)
+def test_pool_parameters(bots: int, pool_size: int, max_client_conn: int) -> None:
+    """Per-bot pools shrink as bots are added; client slots grow with them."""
+    parameters = pool_parameters(bots)
+    assert parameters["default_pool_size"] == str(pool_size)
+    assert parameters["max_db_connections"] == str(pool_size)
+    assert parameters["max_client_conn"] == str(max_client_conn)
+    assert parameters["max_user_connections"] == str(POOLER_SERVER_CONNECTIONS // POOLER_INSTANCES)
+
+
+@pytest.mark.parametrize("instances", [1, 2, 3])
+def test_pools_fit_the_cluster(instances: int) -> None:
+    """However many bots share the pooler, its server connections fit the cluster."""
+    for bots in range(1, 200):
+        parameters = pool_parameters(bots, instances)
+        per_instance = int(parameters["max_user_connections"])
+        pool_size = int(parameters["default_pool_size"])
+        assert per_instance * instances <= POOLER_SERVER_CONNECTIONS
+        assert 1 <= pool_size <= MAX_POOL_SIZE_PER_BOT
+        if bots * pool_size > per_instance:
+            # Only the one-connection floor may oversubscribe; max_user_connections caps it
+            assert pool_size == 1
+        assert int(parameters["reserve_pool_size"]) <= 5
+
+
+@pytest.fixture(autouse=True)
+def no_poolers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start every test without tracked bots or applied poolers."""
+    for name in ("pooled_bots", "_clusters", "_applied", "_pending", "_locks"):
+        monkeypatch.setattr(handlers, name, {})
+
+
+def _spec(index: int, pooled: bool = True) -> dict[str, Any]:
+    database = {"type": "postgresql", "postgresql": {"pooler": {"enabled": pooled}}}
+    return {**bot_spec(index), "database": database}
+
+
+async def _event(index: int, event_type: str = "ADDED", pooled: bool = True) -> None:
+    await handlers.pooler_bot_event(
+        event={"type": event_type},
+        spec=_spec(index, pooled),
+        name=bot_name(index),
+        namespace=NAMESPACE,
+        labels={},
+    )
+
+
+async def _drain() -> None:
+    """Run the scheduled reconciles now instead of after their delay."""
+    for key, handle in list(handlers._pending.items()):
+        handle.cancel()
+        await handlers._flush(key)
+
+
+def _pooler() -> dict[str, Any] | None:
+    poolers = client.CustomObjectsApi(api_client()).list_namespaced_custom_object(
+        "postgresql.cnpg.io", "v1", NAMESPACE, "poolers"
+    )["items"]
+    return poolers[0] if poolers else None
+
+
+def test_pooler_follows_the_bots_using_it(fake_apiserver: FakeApiClient) -> None:
+    """The pooler is created with the first bot, resized as bots come and go, then removed."""
+
+    async def run() -> list[tuple[dict[str, int], dict[str, Any] | None]]:
+        steps = []
+
+        async def step() -> None:
+            await _drain()
+            steps.append((fake_apiserver.stats()["requests"], _pooler()))
+            fake_apiserver.reset()
+
+        await _event(0)
+        await step()
+        for i in range(1, 20):
+            await _event(i)
+        await step()
+        # Bots without the pooler, and replayed events, change nothing
+        await _event(100, pooled=False)
+        await _event(5)
+        await step()
+        await _event(5, pooled=False)
+        await _event(6, "DELETED")
+        await step()
+        for i in range(20):
+            await _event(i, "DELETED")
+        await step()
+        return steps
+
+    first, grown, unchanged, shrunk, gone = asyncio.run(run())
+
+    assert first[0] == {"patch poolers": 1, "create poolers": 1}
+    assert first[1]["metadata"]["name"] == POOLER
+    assert first[1]["spec"]["pgbouncer"]["parameters"]["default_pool_size"] == "5"
+
+    assert grown[0] == {"patch poolers": 1}
+    assert grown[1]["spec"]["pgbouncer"]["parameters"]["default_pool_size"] == "2"
+    assert grown[1]["spec"]["pgbouncer"]["parameters"]["max_client_conn"] == "300"
+
+    assert unchanged[0] == {}
+    assert shrunk[0] == {"patch poolers": 1}
+    assert shrunk[1]["spec"]["pgbouncer"]["parameters"]["max_client_conn"] == "270"
+
+    assert gone[0] == {"delete poolers": 1}
+    assert gone[1] is None
+    assert handlers.pooled_bots == {}
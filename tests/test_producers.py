@@ -0,0 +1,142 @@
+"""Producer and consumer wiring through external_message_consumer."""
+
+from typing import Any
+
+import kopf
+import pytest
+
+from freqtrade_operator.handlers.freqtradebot import _resolve_producers
+from freqtrade_operator.resources.configmap import generate_freqtrade_config
+from freqtrade_operator.resources.deployment import create_deployment
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import BOTS_PATH, NAMESPACE, bot_name, bot_object, bot_spec
+
+OWNER_REFERENCES = [
+    {
+        "apiVersion": "trading.freqtrade.io/v1alpha1",
+        "kind": "FreqtradeBot",
+        "name": "bot-00001",
+        "uid": "00000000-0000-0000-0000-000000000001",
+        "controller": True,
+        "blockOwnerDeletion": True,
+    }
+]
+SERVICES_PATH = "/api/v1/services"
+DB_URL = "postgresql://freqtrade@freqtrade-db-rw.bench.svc.cluster.local:5432/bot_00001"
+
+
+def test_render_consumer_config() -> None:
+    """Consumers get their resolved producers and the producers' tokens."""
+    spec = {**bot_spec(1), "consumer": {"producers": [{"name": "producer"}]}}
+    host = "producer.bench.svc.cluster.local"
+
+    config = generate_freqtrade_config(
+        "bot-00001", "bench", spec, 8080, DB_URL, {"producer": (host, 8123)}
+    )
+    assert config["external_message_consumer"]["producers"] == [
+        {
+            "name": "producer",
+            "host": host,
+            "port": 8123,
+            "secure": False,
+            "ws_token": "${PRODUCER_0_WS_TOKEN}",
+        }
+    ]
+    deployment = create_deployment("bot-00001", "bench", spec, 8080, OWNER_REFERENCES)
+    env = deployment["spec"]["template"]["spec"]["containers"][0]["env"]
+    assert {
+        "name": "PRODUCER_0_WS_TOKEN",
+        "valueFrom": {"secretKeyRef": {"name": "producer-api", "key": "ws-token"}},
+    } in env
+
+
+def test_render_producer_and_plain_configs() -> None:
+    """Producers serve their websocket with a token; other bots get neither section."""
+    producer = {**bot_spec(1), "producer": {"enabled": True}, "apiServer": {"enabled": False}}
+    config = generate_freqtrade_config("producer", "bench", producer, 8080, DB_URL)
+    assert config["api_server"]["enabled"]
+    assert config["api_server"]["ws_token"] == "${WS_TOKEN}"
+    assert "external_message_consumer" not in config
+    env = create_deployment("producer", "bench", producer, 8080, OWNER_REFERENCES)["spec"][
+        "template"
+    ]["spec"]["containers"][0]["env"]
+    assert {
+        "name": "WS_TOKEN",
+        "valueFrom": {"secretKeyRef": {"name": "producer-api", "key": "ws-token"}},
+    } in env
+
+    plain = generate_freqtrade_config("bot-00001", "bench", bot_spec(1), 8080, DB_URL)
+    assert "ws_token" not in plain["api_server"]
+    assert "external_message_consumer" not in plain
+
+
+def test_render_several_producers_in_spec_order() -> None:
+    """Each producer gets its own token variable, numbered in spec order."""
+    spec = {
+        **bot_spec(1),
+        "consumer": {
+            "producers": [{"name": "b"}, {"name": "a"}],
+            "waitTimeout": 60,
+            "removeEntryExitSignals": True,
+        },
+    }
+    consumer = generate_freqtrade_config(
+        "bot-00001", "bench", spec, 8080, DB_URL, {"a": ("a.bench", 8081), "b": ("b.bench", 8082)}
+    )["external_message_consumer"]
+    assert [(p["name"], p["port"], p["ws_token"]) for p in consumer["producers"]] == [
+        ("b", 8082, "${PRODUCER_0_WS_TOKEN}"),
+        ("a", 8081, "${PRODUCER_1_WS_TOKEN}"),
+    ]
+    assert consumer["wait_timeout"] == 60
+    assert consumer["remove_entry_exit_signals"] is True
+
+
+def _consumer(*producers: str) -> dict[str, Any]:
+    body = bot_object(1)
+    body["spec"]["consumer"] = {"producers": [{"name": p} for p in producers]}
+    return body
+
+
+def _resolve(body: dict[str, Any]) -> dict[str, tuple[str, int]]:
+    return _resolve_producers(body["metadata"]["name"], NAMESPACE, body["spec"], body)
+
+
+def _seed_producer(fake: FakeApiClient, name: str, enabled: bool = True) -> None:
+    producer = bot_object(2)
+    producer["metadata"]["name"] = name
+    producer["spec"]["producer"] = {"enabled": enabled}
+    fake.seed(BOTS_PATH, [producer])
+    fake.seed(
+        SERVICES_PATH,
+        [
+            {
+                "metadata": {"name": name, "namespace": NAMESPACE},
+                "spec": {"ports": [{"name": "api", "port": 8123}]},
+            }
+        ],
+    )
+
+
+def test_producers_are_resolved(fake_apiserver: FakeApiClient) -> None:
+    """A consumer gets the Service host and API port of each producer."""
+    _seed_producer(fake_apiserver, "producer")
+    assert _resolve(_consumer("producer")) == {
+        "producer": (f"producer.{NAMESPACE}.svc.cluster.local", 8123)
+    }
+
+
+def test_missing_producer_is_retried(fake_apiserver: FakeApiClient) -> None:
+    """A producer that does not exist yet, or is not a producer, defers the consumer."""
+    with pytest.raises(kopf.TemporaryError, match="Producer producer of .* is not ready"):
+        _resolve(_consumer("producer"))
+
+    _seed_producer(fake_apiserver, "producer", enabled=False)
+    with pytest.raises(kopf.TemporaryError, match="not ready"):
+        _resolve(_consumer("producer"))
+
+
+def test_consumer_cannot_consume_from_itself(fake_apiserver: FakeApiClient) -> None:
+    """A bot listing itself as producer fails permanently without any API call."""
+    with pytest.raises(kopf.PermanentError, match="cannot consume from itself"):
+        _resolve(_consumer(bot_name(1)))
+    assert fake_apiserver.stats()["requests"] == {}
@@ -0,0 +1,121 @@
+"""On-demand profiler endpoint."""
+
+import asyncio
+import threading
+import tracemalloc
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from freqtrade_operator.observability import profiler
+
+TOKEN = "s3cret"
+AUTH = {"Authorization": f"Bearer {TOKEN}"}
+
+
+def _run(scenario: Callable[[TestClient], Awaitable[Any]]) -> Any:
+    async def run() -> Any:
+        async with TestClient(TestServer(profiler.create_app(TOKEN))) as client:
+            return await scenario(client)
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def instant_sampling(monkeypatch: pytest.MonkeyPatch) -> list[tuple[float, float]]:
+    """Replace stack sampling with an instant one recording its arguments."""
+    calls: list[tuple[float, float]] = []
+
+    def sample(seconds: float, interval: float) -> Counter[str]:
+        calls.append((seconds, interval))
+        return Counter({"MainThread;main (app.py:1)": 3})
+
+    monkeypatch.setattr(profiler, "sample_stacks", sample)
+    return calls
+
+
+def test_token_is_required(instant_sampling: list[tuple[float, float]]) -> None:
+    """Requests without the bearer token are refused before anything is sampled."""
+
+    async def scenario(client: TestClient) -> list[int]:
+        statuses = []
+        for headers in ({}, {"Authorization": "Bearer wrong"}, {"Authorization": TOKEN}):
+            async with client.get("/debug/profile", headers=headers) as resp:
+                statuses.append(resp.status)
+        return statuses
+
+    assert _run(scenario) == [401, 401, 401]
+    assert instant_sampling == []
+
+
+def test_duration_and_interval_are_bounded(instant_sampling: list[tuple[float, float]]) -> None:
+    """Out-of-range parameters are clamped and non-numbers rejected."""
+
+    async def scenario(client: TestClient) -> list[Any]:
+        results = []
+        for query in ("seconds=0&interval=0", "seconds=3600&interval=5", "seconds=2"):
+            async with client.get(f"/debug/profile?{query}", headers=AUTH) as resp:
+                results.append(await resp.json())
+        async with client.get("/debug/profile?seconds=soon", headers=AUTH) as resp:
+            results.append(resp.status)
+        async with client.get("/debug/profile?format=collapsed", headers=AUTH) as resp:
+            results.append(await resp.text())
+        return results
+
+    low, high, plain, invalid, collapsed = _run(scenario)
+    assert instant_sampling[:3] == [
+        (0.1, profiler.MIN_INTERVAL),
+        (profiler.MAX_SECONDS, 1.0),
+        (2.0, profiler.DEFAULT_INTERVAL),
+    ]
+    assert (low["seconds"], high["seconds"]) == (0.1, profiler.MAX_SECONDS)
+    assert plain["samples"] == 3
+    assert invalid == 400
+    assert collapsed == "MainThread;main (app.py:1) 3\n"
+
+
+def test_concurrent_profile_is_refused(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A second request while a profile runs gets 409 instead of queueing."""
+    started, release = threading.Event(), threading.Event()
+
+    def sample(seconds: float, interval: float) -> Counter[str]:
+        started.set()
+        release.wait(5)
+        return Counter()
+
+    monkeypatch.setattr(profiler, "sample_stacks", sample)
+
+    async def scenario(client: TestClient) -> tuple[int, int]:
+        first = asyncio.create_task(client.get("/debug/profile", headers=AUTH))
+        await asyncio.to_thread(started.wait, 5)
+        async with client.get("/debug/profile", headers=AUTH) as resp:
+            second = resp.status
+        release.set()
+        async with await first as resp:
+            return resp.status, second
+
+    assert _run(scenario) == (200, 409)
+
+
+def test_tracemalloc_stops_after_the_window() -> None:
+    """Allocation tracing is only on while profiling, unless it was already on."""
+    assert not tracemalloc.is_tracing()
+
+    async def scenario(client: TestClient) -> dict[str, Any]:
+        async with client.get("/debug/profile?seconds=0.1&top=5", headers=AUTH) as resp:
+            return await resp.json()
+
+    result = _run(scenario)
+    assert not tracemalloc.is_tracing()
+    assert result["samples"] > 0
+    assert len(result["memory"]["top"]) <= 5
+
+    tracemalloc.start()
+    try:
+        profiler.profile(0.05, 0.01, 1)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
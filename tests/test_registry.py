@@ -0,0 +1,163 @@
+"""Bot registry maintenance and publishing."""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.handlers import registry as handlers
+from freqtrade_operator.resources.registry import create_registry_entry
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.registry import BotRegistry, WebserverScope
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import GROUP, NAMESPACE, VERSION, bot_name, bot_spec
+
+WEBSERVERS_PATH = f"/apis/{GROUP}/{VERSION}/freqtradewebservers"
+UI = (NAMESPACE, "ui")
+FLEET_UI = (NAMESPACE, "fleet-ui")
+
+
+def _entry(index: int) -> dict[str, Any]:
+    return create_registry_entry(bot_name(index), NAMESPACE, bot_spec(index), 8100 + index)
+
+
+def test_updates_touch_only_affected_webservers() -> None:
+    """Bot changes report the webservers whose scope matches the old or new labels."""
+    registry = BotRegistry()
+    registry.upsert_webserver(*UI, WebserverScope(uid="1"))
+    registry.upsert_webserver(*FLEET_UI, WebserverScope(uid="2", match_labels={"fleet": "a"}))
+    registry.upsert_webserver("other", "ui", WebserverScope(uid="3"))
+
+    assert registry.upsert_bot(NAMESPACE, bot_name(0), {}, _entry(0)) == {UI}
+    assert registry.upsert_bot(NAMESPACE, bot_name(1), {"fleet": "a"}, _entry(1)) == {
+        UI,
+        FLEET_UI,
+    }
+    # An unchanged bot affects nothing; a relabelled one leaves FLEET_UI
+    assert registry.upsert_bot(NAMESPACE, bot_name(1), {"fleet": "a"}, _entry(1)) == set()
+    assert registry.upsert_bot(NAMESPACE, bot_name(1), {"fleet": "b"}, _entry(1)) == {
+        UI,
+        FLEET_UI,
+    }
+    assert [bot["name"] for bot in registry.document(*FLEET_UI)["bots"]] == []
+    assert registry.remove_bot(NAMESPACE, bot_name(0)) == {UI}
+    assert registry.remove_bot(NAMESPACE, bot_name(0)) == set()
+    assert [bot["name"] for bot in registry.document(*UI)["bots"]] == [bot_name(1)]
+
+
+def test_version_is_stable_across_insertion_order() -> None:
+    """The document version depends on the bot entries only, not on event order."""
+    forward, backward = BotRegistry(), BotRegistry()
+    for registry in (forward, backward):
+        registry.upsert_webserver(*UI, WebserverScope(uid="1"))
+    for i in range(5):
+        forward.upsert_bot(NAMESPACE, bot_name(i), {}, _entry(i))
+    for i in reversed(range(5)):
+        backward.upsert_bot(NAMESPACE, bot_name(i), {}, _entry(i))
+
+    version = forward.document(*UI)["version"]
+    assert backward.document(*UI) == forward.document(*UI)
+
+    backward.upsert_bot(NAMESPACE, bot_name(2), {}, {**_entry(2), "dryRun": False})
+    assert backward.document(*UI)["version"] != version
+    backward.upsert_bot(NAMESPACE, bot_name(2), {}, _entry(2))
+    assert backward.document(*UI)["version"] == version
+
+
+@pytest.fixture
+def empty_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start with an empty registry and nothing published."""
+    monkeypatch.setattr(handlers, "registry", BotRegistry())
+    monkeypatch.setattr(handlers, "_published", {})
+    monkeypatch.setattr(handlers, "_pending", {})
+    monkeypatch.setattr(handlers, "_locks", {})
+
+
+async def _bot_event(index: int, event_type: str = "ADDED") -> None:
+    await handlers.registry_bot_event(
+        event={"type": event_type},
+        spec=bot_spec(index),
+        name=bot_name(index),
+        namespace=NAMESPACE,
+        labels={},
+    )
+
+
+async def _drain() -> None:
+    """Run the scheduled publishes now instead of after their delay."""
+    for key, handle in list(handlers._pending.items()):
+        handle.cancel()
+        await handlers._flush(key)
+
+
+def _published_bots() -> list[str]:
+    configmap = client.CoreV1Api(api_client()).read_namespaced_config_map("ui-registry", NAMESPACE)
+    return [bot["name"] for bot in json.loads(configmap.data["registry.json"])["bots"]]
+
+
+def test_publish_only_when_the_document_changes(
+    fake_apiserver: FakeApiClient, empty_registry: None
+) -> None:
+    """Repeated or reordered events do not rewrite the ConfigMap or the status."""
+    fake_apiserver.seed(
+        WEBSERVERS_PATH,
+        [{"metadata": {"name": "ui", "namespace": NAMESPACE}, "spec": {}}],
+    )
+
+    async def run() -> list[dict[str, int]]:
+        counts = []
+        await handlers.registry_webserver_event(
+            event={"type": "ADDED"},
+            spec={},
+            name="ui",
+            namespace=NAMESPACE,
+            meta={"uid": "1"},
+            labels={},
+        )
+        for i in range(3):
+            await _bot_event(i)
+        await _drain()
+        counts.append(fake_apiserver.stats()["requests"])
+
+        # Replayed events, as after a watch restart, change nothing
+        fake_apiserver.reset()
+        for i in reversed(range(3)):
+            await _bot_event(i)
+        await _drain()
+        counts.append(fake_apiserver.stats()["requests"])
+
+        await _bot_event(1, "DELETED")
+        await _drain()
+        counts.append(fake_apiserver.stats()["requests"])
+        return counts
+
+    first, replayed, deleted = asyncio.run(run())
+    assert first["create configmaps"] == 1
+    assert first["patch freqtradewebservers/status"] == 1
+    assert replayed == {}
+    assert deleted["patch configmaps"] == 1
+    assert _published_bots() == [bot_name(0), bot_name(2)]
+
+
+def test_failed_publish_is_retried(fake_apiserver: FakeApiClient, empty_registry: None) -> None:
+    """A publish that fails is not recorded as published and is scheduled again."""
+
+    async def run() -> None:
+        await handlers.registry_webserver_event(
+            event={"type": "ADDED"},
+            spec={},
+            name="ui",
+            namespace=NAMESPACE,
+            meta={"uid": "1"},
+            labels={},
+        )
+        await _bot_event(0)
+        # The webserver object does not exist, so its status patch fails with 404
+        await _drain()
+        assert handlers._published == {}
+        assert UI in handlers._pending
+        handlers._pending[UI].cancel()
+
+    asyncio.run(run())
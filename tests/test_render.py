@@ -0,0 +1,154 @@
+"""Offline rendering and checking of FreqtradeBots against the CRDs."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from freqtrade_operator.render.batch import (
+    Rendered,
+    _check_pod_ports,
+    check_fleet,
+    diff_render,
+    render_batch,
+    write_render,
+)
+from freqtrade_operator.render.schema import load_crd_schemas, validate_resource
+from tests.fakes.bots import GROUP, NAMESPACE, VERSION, bot_name, bot_object
+
+CRDS = Path(__file__).resolve().parents[1] / "deploy" / "crds"
+
+
+@pytest.fixture(scope="module")
+def schemas() -> dict[tuple[str, str], dict[str, Any]]:
+    return load_crd_schemas(CRDS)
+
+
+def _render(
+    bots: list[dict[str, Any]], schemas: dict[tuple[str, str], dict[str, Any]], jobs: int = 1
+) -> list[Rendered]:
+    return render_batch(
+        [(f"fleet.yaml:{i}", bot) for i, bot in enumerate(bots)], schemas, jobs=jobs
+    )
+
+
+def _result(kind: str, name: str, files: tuple[str, ...] = ()) -> Rendered:
+    return Rendered("fleet.yaml:0", kind, NAMESPACE, name, files=dict.fromkeys(files, "{}\n"))
+
+
+def test_crd_schema_defaults_and_errors(schemas: dict[tuple[str, str], dict[str, Any]]) -> None:
+    """Missing fields get the CRD defaults; unknown, mistyped and invalid fields are errors."""
+    schema = schemas[(f"{GROUP}/{VERSION}", "FreqtradeBot")]
+    bot = bot_object(0)
+    del bot["spec"]["exchange"]["dryRun"]
+    assert validate_resource(bot, schema) == []
+    assert bot["spec"]["exchange"]["dryRun"] is True
+    assert bot["spec"]["stake"]["strategy"] == "limited"
+
+    broken = bot_object(1)
+    broken["metadata"]["name"] = "Bot_1"
+    broken["spec"]["exchange"]["dryRun"] = "yes"
+    broken["spec"]["stake"] = {"amount": "100", "amout": "100", "strategy": "all"}
+    assert validate_resource(broken, schema) == [
+        "metadata.name: 'Bot_1' is not a valid DNS-1035 label",
+        "spec.exchange.dryRun: expected boolean, got str",
+        "spec.stake.currency: required",
+        "spec.stake.amout: unknown field",
+        "spec.stake.strategy: 'all' is not one of ['unlimited', 'limited']",
+    ]
+
+
+def test_render_batch_findings(schemas: dict[tuple[str, str], dict[str, Any]]) -> None:
+    """Invalid bots, unknown producers and duplicates are reported on the bots concerned."""
+    bots = [bot_object(i) for i in range(5)]
+    bots[1]["spec"]["stake"]["amout"] = "100"
+    bots[2]["spec"]["consumer"] = {"producers": [{"name": "missing"}]}
+    bots.append(bot_object(3))
+
+    results = _render(bots, schemas)
+    errors = {r.name: r.errors for r in results if r.errors}
+    assert errors == {
+        bot_name(1): ["spec.stake.amout: unknown field"],
+        bot_name(2): ["producer missing is not a producer bot in the input"],
+        bot_name(3): ["FreqtradeBot bot-00003 is defined 2 times"],
+    }
+    # Invalid bots render nothing; bots on PostgreSQL also get a Database
+    assert [len(r.files) for r in results] == [4, 0, 4, 5, 4, 5]
+    assert all(path.endswith(".json") for r in results for path in r.files)
+
+
+def test_workers_render_like_one_process(schemas: dict[tuple[str, str], dict[str, Any]]) -> None:
+    """Rendering in worker processes gives the same children in the same order."""
+    bots = [bot_object(i) for i in range(8)]
+    serial = _render(bots, schemas)
+    parallel = _render([bot_object(i) for i in range(8)], schemas, jobs=2)
+    assert [r.files for r in parallel] == [r.files for r in serial]
+
+
+def test_check_fleet() -> None:
+    """Duplicates, children with two owners and shared databases are errors on both sides."""
+    configmap = f"{NAMESPACE}/configmap/shared-config.json"
+    first = _result("FreqtradeBot", "a", (configmap,))
+    first.database = (NAMESPACE, "freqtrade-db", "bots")
+    second = _result("FreqtradeWebserver", "b", (configmap,))
+    third = _result("FreqtradeBot", "c")
+    third.database = (NAMESPACE, "freqtrade-db", "bots")
+    twice = [_result("FreqtradeBot", "d", ("x.json",)), _result("FreqtradeBot", "d", ("x.json",))]
+
+    check_fleet([first, second, third, *twice])
+    assert first.errors == [
+        f"{configmap} is also rendered by FreqtradeWebserver b",
+        "database bots on freqtrade-db is shared with FreqtradeBot c",
+    ]
+    assert second.errors == [f"{configmap} is also rendered by FreqtradeBot a"]
+    assert third.errors == ["database bots on freqtrade-db is shared with FreqtradeBot a"]
+    # A resource defined twice does not clash with its own children
+    assert [r.errors for r in twice] == [["FreqtradeBot d is defined 2 times"]] * 2
+
+
+def test_check_pod_ports() -> None:
+    """Containers of one pod may not listen on the same port."""
+    result = _result("FreqtradeBot", "a")
+    _check_pod_ports(
+        result,
+        {
+            "containers": [
+                {"name": "freqtrade", "ports": [{"containerPort": 8080}]},
+                {"name": "sidecar", "ports": [{"containerPort": 9090}]},
+                {"name": "exporter"},
+            ]
+        },
+    )
+    assert result.errors == []
+
+    _check_pod_ports(
+        result,
+        {
+            "containers": [
+                {"name": "freqtrade", "ports": [{"containerPort": 8080}]},
+                {"name": "sidecar", "ports": [{"containerPort": 9090}, {"containerPort": 8080}]},
+            ]
+        },
+    )
+    assert result.errors == ["containers freqtrade and sidecar both listen on port 8080"]
+
+
+def test_diff_render(tmp_path: Path, schemas: dict[tuple[str, str], dict[str, Any]]) -> None:
+    """Only the children of changed or removed bots differ from an earlier render."""
+    bots = [bot_object(i) for i in range(4)]
+    write_render(_render(bots, schemas), tmp_path)
+    assert diff_render(_render([bot_object(i) for i in range(4)], schemas), tmp_path) == {}
+
+    changed = [bot_object(0, stake="250"), bot_object(1), bot_object(2)]
+    diff = diff_render(_render(changed, schemas), tmp_path)
+    assert {path.split("/")[-1].removesuffix(".json") for path in diff} == {
+        f"{bot_name(0)}-config",
+        bot_name(3),
+        f"{bot_name(3)}-config",
+        f"{bot_name(3)}-data",
+        f"{bot_name(3)}-db",
+    }
+    old, new = diff[f"{NAMESPACE}/configmap/{bot_name(0)}-config.json"]
+    assert old and new and old != new
+    # A removed bot's children are missing from the new render
+    assert all(text == "" for path, (_, text) in diff.items() if bot_name(3) in path)
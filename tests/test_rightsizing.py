@@ -0,0 +1,117 @@
+"""Recommendations reach opted-in bots at their next rollout."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from kubernetes import client
+
+from freqtrade_operator.handlers import freqtradebot, rightsizing
+from freqtrade_operator.utils.debounce import Debouncer
+from freqtrade_operator.utils.kube import api_client
+from freqtrade_operator.utils.rightsizing import MIN_SAMPLES, UsageHistory
+from tests.benchmarks.harness import OperatorDriver
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import BOTS_PATH, GROUP, NAMESPACE, PLURAL, VERSION, bot_name, bot_object
+from tests.fakes.metrics import METRICS_PATH, pod_metrics
+
+BOTS = 4
+SPIKE_MILLICORES = 800
+
+
+@pytest.fixture(autouse=True)
+def no_debounce(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Reconcile every edit straight away."""
+    monkeypatch.setattr(freqtradebot, "update_debouncer", Debouncer(0.0, 0.0))
+
+
+def _usage(index: int, sample: int) -> tuple[int, int]:
+    if index % 10 == 0:
+        return (SPIKE_MILLICORES if sample % 12 == 0 else 60), 300
+    return 15 + sample % 7, 150 + index % 20
+
+
+@pytest.fixture(autouse=True)
+def recommender(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start every test with an empty history."""
+    monkeypatch.setattr(rightsizing, "history", UsageHistory())
+    monkeypatch.setattr(rightsizing, "_bots", {})
+
+
+def _track(bots: range) -> None:
+    async def track() -> None:
+        for i in bots:
+            await rightsizing.rightsizing_bot_event(
+                event={"type": "ADDED"}, name=bot_name(i), namespace=NAMESPACE, labels={}, status={}
+            )
+
+    asyncio.run(track())
+
+
+def _collect(fake: FakeApiClient, bots: range, rounds: range) -> int:
+    """Run sample rounds; return the status patches sent."""
+    patched = 0
+    for sample in rounds:
+        fake.seed(
+            METRICS_PATH, [pod_metrics(NAMESPACE, bot_name(i), *_usage(i, sample)) for i in bots]
+        )
+        patched += rightsizing.publish(list(rightsizing.sample()))
+    return patched
+
+
+def _recommendations() -> dict[str, Any]:
+    bots = client.CustomObjectsApi(api_client()).list_namespaced_custom_object(
+        GROUP, VERSION, NAMESPACE, PLURAL
+    )["items"]
+    return {
+        bot["metadata"]["name"]: bot.get("status", {}).get("rightsizing", {}).get("recommended")
+        for bot in bots
+    }
+
+
+def test_applied_at_next_rollout(fake_apiserver: FakeApiClient) -> None:
+    """Opted-in bots take the recommendation only when their Deployment is replaced."""
+    bots = range(BOTS)
+    driver = OperatorDriver()
+    driver.start()
+    try:
+        driver.run_phase(
+            "create",
+            BOTS,
+            lambda: fake_apiserver.seed(BOTS_PATH, [bot_object(i) for i in bots]),
+            fake_apiserver,
+        )
+        _track(bots)
+        _collect(fake_apiserver, bots, range(MIN_SAMPLES))
+
+        def edit(drop_strategy: bool) -> None:
+            edited = []
+            for i in bots:
+                bot = bot_object(i, stake="250")
+                bot["spec"]["rightsizing"] = {"apply": i % 2 == 0}
+                if drop_strategy:
+                    bot["spec"]["strategies"] = bot["spec"]["strategies"][:1]
+                edited.append(bot)
+            fake_apiserver.seed(BOTS_PATH, edited)
+
+        opt_in = driver.run_phase("update", BOTS, lambda: edit(False), fake_apiserver)
+        rollout = driver.run_phase("update", BOTS, lambda: edit(True), fake_apiserver)
+        deployments = {
+            d.metadata.name: d.spec.template.spec.containers[0].resources
+            for d in client.AppsV1Api(api_client()).list_namespaced_deployment(NAMESPACE).items
+        }
+    finally:
+        driver.stop()
+    recommendations = _recommendations()
+
+    assert not [r.error for r in opt_in.reconciles + rollout.reconciles if r.error]
+    # Opting in alone restarts nothing
+    assert "replace deployments" not in opt_in.requests
+    assert rollout.requests["replace deployments"] == BOTS
+    for i in bots:
+        resources = deployments[bot_name(i)]
+        expected = (
+            recommendations[bot_name(i)] if i % 2 == 0 else bot_object(i)["spec"]["resources"]
+        )
+        assert resources.requests == expected["requests"]
+        assert resources.limits == expected["limits"]
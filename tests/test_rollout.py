@@ -0,0 +1,179 @@
+"""Rollout tracking from spec change to ready pod."""
+
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+import kopf
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from freqtrade_operator.observability import rollout
+from freqtrade_operator.observability.rollout import (
+    ROLLOUT_TIMEOUT,
+    STAGES,
+    RolloutTracker,
+    traced_rollout,
+)
+
+
+def _condition(kind: str, time: str, status: str = "True") -> dict[str, Any]:
+    return {"type": kind, "status": status, "lastTransitionTime": time}
+
+
+def _at(offset: float) -> str:
+    return datetime.fromtimestamp(time.time() + offset, UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def test_rollout_report() -> None:
+    """A rollout ends with the first ready pod created after its Deployment write."""
+    tracker = RolloutTracker()
+    assert tracker.begin("bench", "bot-00001", 2) is not None
+    tracker.replaced("bench", "bot-00001", "template-1")
+    assert tracker.applied("bench", "bot-00001") is None
+    # Only the pod handler ends it, and a retry of the same generation is not traced
+    assert tracker.begin("bench", "bot-00001", 2) is None
+
+    status = {
+        "conditions": [
+            _condition("PodScheduled", _at(2)),
+            _condition("Initialized", _at(6)),
+            _condition("Ready", _at(20)),
+        ],
+        "containerStatuses": [
+            {
+                "name": "freqtrade",
+                "state": {"running": {"startedAt": _at(9)}},
+                "lastState": {"terminated": {"startedAt": _at(8)}},
+            }
+        ],
+    }
+    old_pod = {"creationTimestamp": _at(-60)}
+    assert tracker.pod_ready("bench", "bot-00001", "old", old_pod, status) is None
+    report = tracker.pod_ready("bench", "bot-00001", "new", {"creationTimestamp": _at(1)}, status)
+    assert report is not None
+    assert report["pod"] == "new"
+    assert report["generation"] == 2
+    assert list(report["stages"]) == list(STAGES)
+    assert report["stages"]["init"] == 4
+    assert report["stages"]["pull"] == 2
+    assert report["stages"]["start"] == 12
+    assert abs(sum(report["stages"].values()) - report["seconds"]) < 0.5
+
+    # A spec change that leaves the Deployment alone ends with the reconcile
+    assert tracker.begin("bench", "bot-00001", 3) is not None
+    report = tracker.applied("bench", "bot-00001")
+    assert report is not None
+    assert list(report["stages"]) == ["wait", "apply"]
+
+
+@pytest.fixture
+def spans(monkeypatch: pytest.MonkeyPatch) -> Iterator[InMemorySpanExporter]:
+    """Record the rollout spans in memory."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(rollout, "tracer", provider.get_tracer("test"))
+    yield exporter
+    provider.shutdown()
+
+
+def _outcomes(spans: InMemorySpanExporter) -> list[str]:
+    return [
+        span.attributes["freqtrade.rollout.outcome"]
+        for span in spans.get_finished_spans()
+        if span.name == "rollout FreqtradeBot"
+    ]
+
+
+def test_replace_keeping_the_pod_template(spans: InMemorySpanExporter) -> None:
+    """A replace that starts no pod ends the rollout with the reconcile."""
+    tracker = RolloutTracker()
+    tracker.begin("bench", "bot-00001", 2)
+    tracker.replaced("bench", "bot-00001", "template-1")
+    assert tracker.applied("bench", "bot-00001") is None
+    ready = {"conditions": [_condition("Ready", _at(5))]}
+    assert tracker.pod_ready("bench", "bot-00001", "a", {"creationTimestamp": _at(1)}, ready)
+
+    tracker.begin("bench", "bot-00001", 3)
+    tracker.replaced("bench", "bot-00001", "template-1")
+    report = tracker.applied("bench", "bot-00001")
+    assert report is not None
+    assert list(report["stages"]) == ["wait", "apply"]
+    assert _outcomes(spans) == ["ready", "applied"]
+
+    # A bot recreated under the same name starts a pod even with the same template
+    tracker.begin("bench", "bot-00001", 1)
+    tracker.replaced("bench", "bot-00001", "template-1", created=True)
+    assert tracker.applied("bench", "bot-00001") is None
+
+
+def test_retry_keeps_waiting_for_the_first_pod() -> None:
+    """A retry writing the same template waits for the pod the first attempt started."""
+    tracker = RolloutTracker()
+    tracker.begin("bench", "bot-00001", 2)
+    tracker.replaced("bench", "bot-00001", "template-1")
+    # The attempt fails after the replace, and kopf retries it
+    assert tracker.begin("bench", "bot-00001", 2) is not None
+    tracker.replaced("bench", "bot-00001", "template-1")
+    assert tracker.applied("bench", "bot-00001") is None
+    ready = {"conditions": [_condition("Ready", _at(5))]}
+    assert tracker.pod_ready("bench", "bot-00001", "a", {"creationTimestamp": _at(0)}, ready)
+
+
+def test_permanent_error_fails_the_rollout(
+    spans: InMemorySpanExporter, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A handler failing permanently ends its rollout instead of leaving it open."""
+    tracker = RolloutTracker()
+    monkeypatch.setattr(rollout, "rollouts", tracker)
+
+    @traced_rollout
+    def handler(**kwargs: Any) -> None:
+        raise kopf.PermanentError("Invalid spec")
+
+    def call(generation: int) -> None:
+        with pytest.raises(kopf.PermanentError):
+            handler(
+                namespace="bench",
+                name="bot-00001",
+                meta={"generation": generation},
+                patch=kopf.Patch(),
+            )
+
+    call(2)
+    assert _outcomes(spans) == ["failed"]
+    (span,) = spans.get_finished_spans()
+    assert span.status.status_code == StatusCode.ERROR
+    assert span.status.description == "Invalid spec"
+    assert tracker.begin("bench", "bot-00001", 2) is None
+
+    # The next generation opens a rollout of its own
+    call(3)
+    assert _outcomes(spans) == ["failed", "failed"]
+
+
+def test_rollout_without_ready_pod_expires(
+    spans: InMemorySpanExporter, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A rollout whose pod never becomes ready is ended after the timeout."""
+    now = [time.time()]
+    monkeypatch.setattr(rollout.time, "time", lambda: now[0])
+    tracker = RolloutTracker()
+    tracker.begin("bench", "bot-00001", 2)
+    tracker.replaced("bench", "bot-00001", "template-1")
+    tracker.applied("bench", "bot-00001")
+
+    now[0] += ROLLOUT_TIMEOUT - 1
+    tracker.begin("bench", "bot-00002", 1)
+    assert _outcomes(spans) == []
+
+    now[0] += 2
+    assert tracker.pod_ready("bench", "bot-00002", "b", {"creationTimestamp": _at(0)}, {}) is None
+    assert _outcomes(spans) == ["expired"]
+    assert tracker.begin("bench", "bot-00001", 2) is None
+    assert tracker.begin("bench", "bot-00001", 3) is not None
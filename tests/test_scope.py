@@ -0,0 +1,115 @@
+"""Namespace and label scoping of an operator instance."""
+
+import kopf
+import pytest
+
+from freqtrade_operator.utils import scope
+from freqtrade_operator.utils.scope import (
+    GROUP,
+    SCOPED_PLURALS,
+    format_label_selector,
+    in_scope,
+    kopf_scope,
+    parse_label_selector,
+    select_on_server,
+    watch_namespaces,
+)
+
+
+def test_parse_equality_and_existence_terms() -> None:
+    """Equality, presence and absence terms become a kopf label filter."""
+    assert parse_label_selector("") == {}
+    assert parse_label_selector(" , ") == {}
+    assert parse_label_selector("team=quant, shard==1,canary,!paused") == {
+        "team": "quant",
+        "shard": "1",
+        "canary": kopf.PRESENT,
+        "paused": kopf.ABSENT,
+    }
+    assert parse_label_selector("trading.freqtrade.io/team=quant,empty=") == {
+        "trading.freqtrade.io/team": "quant",
+        "empty": "",
+    }
+
+
+@pytest.mark.parametrize(
+    "selector",
+    ["team!=quant", "team in (quant,ops)", "team notin (quant)"],
+)
+def test_set_based_terms_are_refused(selector: str) -> None:
+    """Set-based and inequality terms have no kopf filter equivalent."""
+    with pytest.raises(ValueError, match="Unsupported"):
+        parse_label_selector(selector)
+
+
+@pytest.mark.parametrize("selector", ["=quant", "!", "team=a b", "a b", "-team=quant", "team=a=b"])
+def test_malformed_terms_are_refused(selector: str) -> None:
+    """Empty or invalid keys and values are refused instead of never matching."""
+    with pytest.raises(ValueError, match="Malformed"):
+        parse_label_selector(selector)
+
+
+def test_format_round_trips() -> None:
+    """A parsed selector formats back to an equivalent canonical selector."""
+    selector = "team=quant,canary,!paused"
+    assert format_label_selector(parse_label_selector(" team == quant , canary, ! paused")) == (
+        selector
+    )
+    assert parse_label_selector(selector) == parse_label_selector(
+        format_label_selector(parse_label_selector(selector))
+    )
+
+
+def test_in_scope(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Every term of the selector has to match."""
+    assert in_scope({})
+    monkeypatch.setattr(scope, "LABEL_FILTER", parse_label_selector("team=quant,canary,!paused"))
+    assert in_scope({"team": "quant", "canary": ""})
+    assert not in_scope({"team": "ops", "canary": ""})
+    assert not in_scope({"team": "quant"})
+    assert not in_scope({"team": "quant", "canary": "", "paused": "true"})
+
+
+def test_watch_namespaces(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Namespaces come from ``WATCH_NAMESPACE``; none means the whole cluster."""
+    monkeypatch.delenv("WATCH_NAMESPACE", raising=False)
+    assert watch_namespaces() == []
+    assert kopf_scope() == {"clusterwide": True}
+
+    monkeypatch.setenv("WATCH_NAMESPACE", "bench, team-*,,")
+    assert watch_namespaces() == ["bench", "team-*"]
+    assert kopf_scope() == {"namespaces": ["bench", "team-*"]}
+    assert watch_namespaces("other") == ["other"]
+
+
+def test_selector_is_passed_to_the_api_server(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The selector is set on the watch streams of the scoped resources only."""
+    settings = kopf.OperatorSettings()
+    monkeypatch.setattr(scope, "LABEL_FILTER", {})
+    assert not select_on_server(settings)
+    assert list(settings.watching.label_selectors) == []
+
+    monkeypatch.setattr(scope, "LABEL_FILTER", parse_label_selector("team==quant,!paused"))
+    assert select_on_server(settings)
+    selectors = settings.watching.label_selectors
+    assert {(selector.group, selector.any_name) for selector in selectors} == {
+        (GROUP, plural) for plural in SCOPED_PLURALS
+    }
+    assert {selectors[GROUP, plural] for plural in SCOPED_PLURALS} == {"team=quant,!paused"}
+
+
+def test_selector_needs_kopf_support(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without ``label_selectors`` a selector stops the operator instead of filtering late."""
+
+    class Watching:
+        pass
+
+    class Settings:
+        watching = Watching()
+
+    monkeypatch.setattr(scope, "LABEL_FILTER", {})
+    assert not select_on_server(Settings())  # type: ignore[arg-type]
+
+    monkeypatch.setattr(scope, "LABEL_FILTER", parse_label_selector("team=quant"))
+    with pytest.raises(kopf.PermanentError, match="kopf 1.45"):
+        select_on_server(Settings())  # type: ignore[arg-type]
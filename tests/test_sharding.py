@@ -0,0 +1,19 @@
+"""Pair assignment across the shards of a FreqtradeBotSet."""
+
+from freqtrade_operator.utils.sharding import assign_pairs
+
+
+def _universe(size: int) -> list[str]:
+    return [f"T{i:04d}/USDT" for i in range(size)]
+
+
+def test_pinned_pairs_stay() -> None:
+    """Pairs with open trades keep their shard, even one being removed."""
+    universe = _universe(12)
+    current = assign_pairs(universe, {}, ["s-0", "s-1", "s-2", "s-3"])
+    pinned = {"s-3": {current["s-3"][0]}, "s-0": set(current["s-0"])}
+    plan = assign_pairs(universe, current, ["s-0", "s-1", "s-2"], pinned)
+
+    assert plan["s-3"] == [current["s-3"][0]]
+    assert set(current["s-0"]) <= set(plan["s-0"])
+    assert sorted(pair for pairs in plan.values() for pair in pairs) == universe
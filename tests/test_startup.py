@@ -0,0 +1,35 @@
+"""Startup timings reported for bot pods."""
+
+from typing import Any
+
+from freqtrade_operator.handlers.startup import startup_report
+
+
+def _condition(kind: str, time: str, status: str = "True") -> dict[str, Any]:
+    return {"type": kind, "status": status, "lastTransitionTime": time}
+
+
+def test_startup_report() -> None:
+    """Timings are reported once the pod is ready, with freqtrade restarts."""
+    status = {
+        "conditions": [
+            _condition("PodScheduled", "2024-01-01T00:00:00Z"),
+            _condition("Initialized", "2024-01-01T00:00:12Z"),
+            _condition("Ready", "2024-01-01T00:00:00Z", status="False"),
+        ],
+        "containerStatuses": [
+            {"name": "freqtrade", "restartCount": 1},
+            {"name": "git-sync-sample", "restartCount": 3},
+        ],
+    }
+    assert startup_report("bot-00001-abc", status) is None
+
+    status["conditions"][2] = _condition("Ready", "2024-01-01T00:00:41Z")
+    assert startup_report("bot-00001-abc", status) == {
+        "pod": "bot-00001-abc",
+        "scheduledAt": "2024-01-01T00:00:00Z",
+        "readyAt": "2024-01-01T00:00:41Z",
+        "initSeconds": 12,
+        "seconds": 41,
+        "restarts": 1,
+    }
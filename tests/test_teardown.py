@@ -0,0 +1,117 @@
+"""Bulk teardown against the fake API server."""
+
+from typing import Any
+
+from kubernetes import client
+
+from freqtrade_operator.teardown.bulk import (
+    Target,
+    delete_bots,
+    progress,
+    select_bots,
+    wait_for_teardown,
+)
+from freqtrade_operator.utils.kube import api_client
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import BOTS_PATH, NAMESPACE, bot_name, bot_object
+
+DATABASES_PATH = "/apis/postgresql.cnpg.io/v1/databases"
+BOTS = 6
+
+
+def database_object(index: int) -> dict[str, Any]:
+    """Return the CNPG Database the operator creates for bot ``index``."""
+    return {
+        "apiVersion": "postgresql.cnpg.io/v1",
+        "kind": "Database",
+        "metadata": {
+            "name": f"{bot_name(index)}-db",
+            "namespace": NAMESPACE,
+            "labels": {"app": "freqtrade", "bot": bot_name(index)},
+        },
+        "spec": {"name": bot_name(index).replace("-", "_"), "databaseReclaimPolicy": "retain"},
+    }
+
+
+def _reclaim_policies() -> dict[str, str]:
+    databases = client.CustomObjectsApi(api_client()).list_namespaced_custom_object(
+        "postgresql.cnpg.io", "v1", NAMESPACE, "databases"
+    )["items"]
+    return {d["metadata"]["name"]: d["spec"]["databaseReclaimPolicy"] for d in databases}
+
+
+def test_select_bots(fake_apiserver: FakeApiClient) -> None:
+    """Bots are matched by label and paired with the Database carrying their ``bot`` label."""
+    bots = [bot_object(i) for i in range(BOTS)]
+    bots[0]["metadata"]["labels"] = {"env": "keep"}
+    fake_apiserver.seed(BOTS_PATH, bots)
+    fake_apiserver.seed(DATABASES_PATH, [database_object(i) for i in range(0, BOTS, 2)])
+
+    targets = select_bots(NAMESPACE, "fleet=bench")
+    assert [t.name for t in targets] == [bot_name(i) for i in range(1, BOTS)]
+    assert targets[1] == Target(NAMESPACE, bot_name(2), f"{bot_name(2)}-db")
+    assert targets[0].database is None
+    assert len(select_bots(None, None)) == BOTS
+
+
+def test_retain_databases(fake_apiserver: FakeApiClient) -> None:
+    """By default bots are deleted and their databases left to CNPG's retain policy."""
+    fake_apiserver.seed(BOTS_PATH, [bot_object(i) for i in range(BOTS)])
+    fake_apiserver.seed(DATABASES_PATH, [database_object(i) for i in range(0, BOTS, 2)])
+
+    targets = select_bots(NAMESPACE, None)
+    assert delete_bots(targets, parallel=3) == {}
+    assert set(_reclaim_policies().values()) == {"retain"}
+    assert "patch databases" not in fake_apiserver.stats()["requests"]
+    assert progress(targets).bots_left == {}
+
+
+def test_drop_databases(fake_apiserver: FakeApiClient) -> None:
+    """Dropping marks each Database for deletion before its bot goes; missing bots are fine."""
+    fake_apiserver.seed(BOTS_PATH, [bot_object(i) for i in range(BOTS)])
+    fake_apiserver.seed(DATABASES_PATH, [database_object(i) for i in range(0, BOTS, 2)])
+    targets = select_bots(NAMESPACE, None)
+    fake_apiserver.delete(BOTS_PATH, NAMESPACE, [bot_name(1)])
+
+    assert delete_bots(targets, drop_databases=True, parallel=3) == {}
+    assert set(_reclaim_policies().values()) == {"delete"}
+    requests = fake_apiserver.stats()["requests"]
+    assert requests["delete freqtradebots"] == BOTS
+    assert requests["patch databases"] == BOTS // 2
+
+
+def test_wait_reports_what_is_left(fake_apiserver: FakeApiClient) -> None:
+    """Progress lists the objects still present with their finalizers; the wait times out."""
+    fake_apiserver.seed(BOTS_PATH, [bot_object(i) for i in range(BOTS)])
+    fake_apiserver.seed(DATABASES_PATH, [database_object(i) for i in range(0, BOTS, 2)])
+    targets = select_bots(NAMESPACE, None)
+    fake_apiserver.seed(
+        BOTS_PATH,
+        [
+            {
+                "metadata": {
+                    **bot_object(1)["metadata"],
+                    "finalizers": ["kopf.zalando.org/KopfFinalizerMarker"],
+                }
+            }
+        ],
+    )
+    assert delete_bots(targets[2:]) == {}
+
+    reports = []
+    final = wait_for_teardown(targets, timeout=0.0, report=reports.append)
+    assert reports == [final]
+    assert not final.done
+    assert final.bots == BOTS and final.databases == BOTS // 2
+    assert final.bots_left == {
+        (NAMESPACE, bot_name(0)): [],
+        (NAMESPACE, bot_name(1)): ["kopf.zalando.org/KopfFinalizerMarker"],
+    }
+    # The fake has no garbage collector, so the Databases stay
+    assert len(final.databases_left) == BOTS // 2
+
+    fake_apiserver.delete(BOTS_PATH, NAMESPACE, [bot_name(0), bot_name(1)])
+    fake_apiserver.delete(
+        DATABASES_PATH, NAMESPACE, [f"{bot_name(i)}-db" for i in range(0, BOTS, 2)]
+    )
+    assert wait_for_teardown(targets, timeout=5.0, interval=0.01).done
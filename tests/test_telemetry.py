@@ -0,0 +1,84 @@
+"""Fleet telemetry: series stay bounded and only changed values are exported."""
+
+import time
+
+from freqtrade_operator.utils.telemetry import (
+    GAUGES,
+    OVERFLOW,
+    BotReading,
+    FleetTelemetry,
+    parse_reading,
+)
+
+FLEET = 1000
+NAMESPACES = 20
+
+
+def _reading(index: int, profit: float = 1.0) -> BotReading:
+    return BotReading(
+        currency="USDT",
+        profit_closed=profit,
+        profit_all=profit * 2,
+        open_trades=index % 3,
+        balance=100.0,
+        loop_lag=float(index % 7),
+    )
+
+
+def test_parse_reading() -> None:
+    """The API bodies of a bot become one reading; the loop lag is whole seconds."""
+    now = float(int(time.time()))
+    reading = parse_reading(
+        {"profit_closed_coin": 12.5, "profit_all_coin": 10.25},
+        {"current": 2, "max": 3, "total_stake": 200.0},
+        {"total": 1100.0, "total_bot": 1010.5, "stake": "USDT"},
+        {"last_process_ts": int(now) - 4},
+        now=now,
+    )
+    assert reading == BotReading("USDT", 12.5, 10.25, 2, 1010.5, 4.0)
+    assert (
+        parse_reading(
+            {"profit_closed_coin": 0, "profit_all_coin": 0},
+            {"current": 0},
+            {"total": 0, "stake": "BTC"},
+            {},
+            now=now,
+        ).loop_lag
+        is None
+    )
+
+
+def test_fleet_telemetry() -> None:
+    """A large fleet fits the label limits with totals intact, then sends only changes."""
+    telemetry = FleetTelemetry(max_namespaces=10, max_bots=100, refresh=3600)
+    bots = [(f"ns-{i % NAMESPACES:02d}", f"bot-{i:05d}") for i in range(FLEET)]
+    readings = {key: _reading(i) for i, key in enumerate(bots)}
+
+    telemetry.update(bots, readings)
+    first = {field: telemetry.observe(field) for field in GAUGES}
+
+    profit = first["profit_closed"]
+    # 100 bots of their own plus an overflow series per admitted namespace and one for the rest
+    assert len(profit) <= 100 + 10 + 1
+    assert len({attributes["bot"] for _, attributes in profit}) == 101
+    assert len({attributes["namespace"] for _, attributes in profit}) == 11
+    assert sum(value for value, _ in profit) == FLEET
+    assert sum(value for value, _ in first["open_trades"]) == sum(i % 3 for i in range(FLEET))
+    overflow = [a for _, a in first["loop_lag"] if a["namespace"] == OVERFLOW]
+    assert [v for v, a in first["loop_lag"] if a in overflow] == [6.0]
+
+    # Nothing changed: nothing is sent
+    telemetry.update(bots, readings)
+    assert all(telemetry.observe(field) == [] for field in GAUGES)
+
+    # One bot changes: only its series, for the changed fields
+    readings[bots[0]] = _reading(0, profit=5.0)
+    telemetry.update(bots, readings)
+    changed = telemetry.observe("profit_closed")
+    assert changed == [(5.0, {"namespace": "ns-00", "bot": "bot-00000", "currency": "USDT"})]
+    assert telemetry.observe("balance") == []
+
+    # Ten of the named bots are deleted; ten bots of the overflow take their labels
+    telemetry.update(bots[100:], {key: readings[key] for key in bots[100:]})
+    named = {a["bot"] for _, a in telemetry.observe("profit_closed")} - {OVERFLOW}
+    assert len(named) == 10
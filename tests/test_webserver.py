@@ -0,0 +1,120 @@
+"""FreqtradeWebserver create and update handlers against the fake API server."""
+
+from typing import Any
+
+from kubernetes import client
+
+from freqtrade_operator.handlers.webserver import create_webserver, update_webserver
+from freqtrade_operator.utils.kube import api_client
+from tests.fakes.apiserver import FakeApiClient
+from tests.fakes.bots import NAMESPACE
+
+NAME = "ui"
+META = {"name": NAME, "namespace": NAMESPACE, "uid": "00000000-0000-0000-0000-00000000cafe"}
+BODY = {
+    "apiVersion": "trading.freqtrade.io/v1alpha1",
+    "kind": "FreqtradeWebserver",
+    "metadata": META,
+}
+SPEC: dict[str, Any] = {"ingress": {"host": "ui.example.com"}, "gateway": {"enabled": True}}
+
+
+def _create(spec: dict[str, Any]) -> None:
+    create_webserver(spec=spec, name=NAME, namespace=NAMESPACE, meta=META, body=BODY)
+
+
+def _update(old: dict[str, Any], new: dict[str, Any]) -> None:
+    update_webserver(
+        spec=new,
+        name=NAME,
+        namespace=NAMESPACE,
+        meta=META,
+        old={"spec": old},
+        new={"spec": new},
+        body=BODY,
+    )
+
+
+def _writes(fake: FakeApiClient) -> dict[str, int]:
+    """Return the counted writes, without the gateway Secret that is created every time."""
+    return {
+        request: count
+        for request, count in fake.stats()["requests"].items()
+        if request.split()[0] in ("create", "patch", "replace", "delete")
+        and request != "create secrets"
+    }
+
+
+def _deployment(name: str) -> dict[str, Any]:
+    return client.AppsV1Api(api_client()).read_namespaced_deployment(name, NAMESPACE).to_dict()
+
+
+def _ingress_paths() -> list[str]:
+    ingress = client.NetworkingV1Api(api_client()).read_namespaced_ingress(NAME, NAMESPACE)
+    return [path.path for path in ingress.spec.rules[0].http.paths]
+
+
+def test_unchanged_children_are_skipped(fake_apiserver: FakeApiClient) -> None:
+    """An update that renders the same children sends no writes."""
+    _create(SPEC)
+    fake_apiserver.reset()
+
+    _update(SPEC, {**SPEC})
+    assert _writes(fake_apiserver) == {}
+
+
+def test_changed_child_is_merge_patched(fake_apiserver: FakeApiClient) -> None:
+    """Only the changed child is patched, and only with the fields that changed."""
+    _create(SPEC)
+    before = _deployment(f"{NAME}-frequi")
+    fake_apiserver.reset()
+
+    resources = {"requests": {"cpu": "50m"}}
+    _update(SPEC, {**SPEC, "resources": resources})
+    assert _writes(fake_apiserver) == {"patch deployments": 1}
+
+    after = _deployment(f"{NAME}-frequi")
+    assert after["spec"]["template"]["spec"]["containers"][0]["resources"]["requests"] == {
+        "cpu": "50m"
+    }
+    assert after["metadata"]["uid"] == before["metadata"]["uid"]
+
+
+def test_added_children_are_created(fake_apiserver: FakeApiClient) -> None:
+    """Enabling the gateway creates its children and routes ``/bots`` to it."""
+    spec = {**SPEC, "gateway": {"enabled": False}}
+    _create(spec)
+    assert _ingress_paths() == ["/"]
+    fake_apiserver.reset()
+
+    _update(spec, SPEC)
+    writes = _writes(fake_apiserver)
+    # New children are patched whole first, and created on 404
+    for plural in ("serviceaccounts", "roles", "rolebindings"):
+        assert writes[f"create {plural}"] == 1
+    assert writes["create deployments"] == 1
+    assert writes["create services"] == 1
+    assert writes["patch ingresses"] == 1
+    assert _deployment(f"{NAME}-gateway")["metadata"]["name"] == f"{NAME}-gateway"
+    assert _ingress_paths() == ["/bots", "/"]
+
+
+def test_removed_children_are_deleted(fake_apiserver: FakeApiClient) -> None:
+    """Disabling the gateway deletes its children and drops its route from the Ingress."""
+    _create(SPEC)
+    fake_apiserver.reset()
+
+    _update(SPEC, {**SPEC, "gateway": {"enabled": False}})
+    writes = _writes(fake_apiserver)
+    for plural in ("serviceaccounts", "roles", "rolebindings", "deployments", "services"):
+        assert writes[f"delete {plural}"] == 1
+    assert writes["patch ingresses"] == 1
+    assert "create deployments" not in writes
+
+    names = [
+        d.metadata.name
+        for d in client.AppsV1Api(api_client()).list_namespaced_deployment(NAMESPACE).items
+    ]
+    assert names == [f"{NAME}-frequi"]
+    # A merge patch replaces the list, so the gateway path does not survive
+    assert _ingress_paths() == ["/"]